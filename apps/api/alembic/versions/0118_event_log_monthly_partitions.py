@@ -0,0 +1,282 @@
+"""monthly range partitions and promoted hot columns for event_log
+
+Revision ID: 0118_event_log_monthly_partitions
+Revises: 0117_trial_claims_and_anon_email
+Create Date: 2026-10-19 00:00:00
+
+`event_log` passa a ser particionada por mês em `created_at`. Os eventos quentes
+do Axion ganham colunas tipadas (`decision_id` uuid, `experiment_key`, `variant`)
+para que os CTEs de retenção usem índices em vez de regex + cast sobre o JSONB.
+
+A chave primária vira (id, created_at), exigência do Postgres para tabelas
+particionadas; a sequence `event_log_id_seq` é reaproveitada. As partições
+futuras são mantidas pelo job `event_log.partitions.maintain`.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0118_event_log_monthly_partitions"
+down_revision: str | None = "0117_trial_claims_and_anon_email"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+UUID_PATTERN = "^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
+
+LEGACY_INDEXES = (
+    "ix_event_log_tenant_id_created_at",
+    "ix_event_log_decision_id_created_at",
+    "ix_event_log_type_tenant_created_at",
+    "ix_event_log_type_decision_id_created_at",
+    "ix_event_log_type_decision_uuid_created_at",
+    "ix_event_log_brief_exposed_user_created_at",
+    "ix_event_log_session_completed_user_created_at",
+)
+
+PARTITIONS_AHEAD_MONTHS = 3
+
+
+def upgrade() -> None:
+    op.execute("ALTER SEQUENCE IF EXISTS event_log_id_seq OWNED BY NONE;")
+    op.execute("ALTER TABLE event_log RENAME TO event_log_legacy;")
+    op.execute(
+        """
+        ALTER TABLE event_log_legacy
+        RENAME CONSTRAINT event_log_pkey TO event_log_legacy_pkey;
+        """
+    )
+    for index_name in LEGACY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name};")
+
+    op.execute(
+        """
+        CREATE TABLE event_log (
+            id              INTEGER NOT NULL DEFAULT nextval('event_log_id_seq'),
+            tenant_id       INTEGER NOT NULL REFERENCES tenants (id),
+            actor_user_id   INTEGER NULL REFERENCES users (id),
+            child_id        INTEGER NULL REFERENCES child_profiles (id),
+            type            VARCHAR(255) NOT NULL,
+            payload         JSONB NOT NULL DEFAULT '{}'::jsonb,
+            decision_id     UUID NULL,
+            experiment_key  VARCHAR(80) NULL,
+            variant         VARCHAR(80) NULL,
+            created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT event_log_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+        """
+    )
+    op.execute("ALTER SEQUENCE event_log_id_seq OWNED BY event_log.id;")
+    op.execute("CREATE TABLE IF NOT EXISTS event_log_default PARTITION OF event_log DEFAULT;")
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            first_month DATE;
+            last_month DATE;
+            month_start DATE;
+        BEGIN
+            SELECT COALESCE(
+                date_trunc('month', MIN(created_at))::date,
+                date_trunc('month', now())::date
+            )
+              INTO first_month
+              FROM event_log_legacy;
+            last_month := (
+                date_trunc('month', now()) + INTERVAL '{PARTITIONS_AHEAD_MONTHS} months'
+            )::date;
+            month_start := first_month;
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF event_log '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'event_log_y' || to_char(month_start, 'YYYY')
+                        || 'm' || to_char(month_start, 'MM'),
+                    month_start::timestamptz,
+                    (month_start + INTERVAL '1 month')::date::timestamptz
+                );
+                month_start := (month_start + INTERVAL '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO event_log (
+            id, tenant_id, actor_user_id, child_id, type, payload,
+            decision_id, experiment_key, variant, created_at
+        )
+        SELECT
+            e.id,
+            e.tenant_id,
+            e.actor_user_id,
+            e.child_id,
+            e.type,
+            e.payload,
+            e.decision_uuid,
+            LEFT(
+                COALESCE(
+                    NULLIF(BTRIM(e.payload->>'experiment_key'), ''),
+                    d.experiment_key,
+                    d.experiment_id
+                ),
+                80
+            ),
+            LEFT(COALESCE(NULLIF(BTRIM(e.payload->>'variant'), ''), d.variant), 80),
+            e.created_at
+        FROM (
+            SELECT
+                legacy.*,
+                CASE
+                    WHEN (legacy.payload->>'decision_id') ~* '{UUID_PATTERN}'
+                    THEN (legacy.payload->>'decision_id')::uuid
+                END AS decision_uuid
+            FROM event_log_legacy legacy
+        ) e
+        LEFT JOIN axion_decisions d
+          ON d.id = e.decision_uuid;
+        """
+    )
+    op.execute("DROP TABLE event_log_legacy;")
+    op.execute(
+        """
+        SELECT setval('event_log_id_seq', COALESCE((SELECT MAX(id) FROM event_log), 0) + 1, false);
+        """
+    )
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_tenant_id_created_at
+        ON event_log (tenant_id, created_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_type_tenant_created_at
+        ON event_log (type, tenant_id, created_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_type_decision_id_created_at
+        ON event_log (type, decision_id, created_at)
+        WHERE decision_id IS NOT NULL;
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_decision_id_created_at
+        ON event_log (decision_id, created_at)
+        WHERE decision_id IS NOT NULL;
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_type_experiment_variant_created_at
+        ON event_log (type, experiment_key, variant, created_at)
+        WHERE experiment_key IS NOT NULL;
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_brief_exposed_user_created_at
+        ON event_log (actor_user_id, created_at)
+        WHERE type = 'axion_brief_exposed';
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_session_completed_user_created_at
+        ON event_log (actor_user_id, created_at)
+        WHERE type = 'axion_session_completed';
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE IF EXISTS event_log_id_seq OWNED BY NONE;")
+    op.execute("ALTER TABLE event_log RENAME TO event_log_partitioned;")
+    op.execute(
+        """
+        ALTER TABLE event_log_partitioned
+        RENAME CONSTRAINT event_log_pkey TO event_log_partitioned_pkey;
+        """
+    )
+    for index_name in (
+        *LEGACY_INDEXES,
+        "ix_event_log_type_experiment_variant_created_at",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index_name};")
+
+    op.execute(
+        """
+        CREATE TABLE event_log (
+            id              INTEGER NOT NULL DEFAULT nextval('event_log_id_seq') PRIMARY KEY,
+            tenant_id       INTEGER NOT NULL REFERENCES tenants (id),
+            actor_user_id   INTEGER NULL REFERENCES users (id),
+            child_id        INTEGER NULL REFERENCES child_profiles (id),
+            type            VARCHAR(255) NOT NULL,
+            payload         JSONB NOT NULL DEFAULT '{}'::jsonb,
+            created_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute("ALTER SEQUENCE event_log_id_seq OWNED BY event_log.id;")
+    op.execute(
+        """
+        INSERT INTO event_log (id, tenant_id, actor_user_id, child_id, type, payload, created_at)
+        SELECT id, tenant_id, actor_user_id, child_id, type, payload, created_at
+        FROM event_log_partitioned;
+        """
+    )
+    op.execute("DROP TABLE event_log_partitioned CASCADE;")
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_tenant_id_created_at
+        ON event_log (tenant_id, created_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_type_tenant_created_at
+        ON event_log (type, tenant_id, created_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_decision_id_created_at
+        ON event_log ((payload->>'decision_id'), created_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_type_decision_id_created_at
+        ON event_log (type, (payload->>'decision_id'), created_at)
+        WHERE payload ? 'decision_id';
+        """
+    )
+    op.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS ix_event_log_type_decision_uuid_created_at
+        ON event_log (type, ((payload->>'decision_id')::uuid), created_at)
+        WHERE payload ? 'decision_id'
+          AND (payload->>'decision_id') ~* '{UUID_PATTERN}';
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_brief_exposed_user_created_at
+        ON event_log (actor_user_id, created_at)
+        WHERE type = 'axion_brief_exposed';
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_event_log_session_completed_user_created_at
+        ON event_log (actor_user_id, created_at)
+        WHERE type = 'axion_session_completed';
+        """
+    )
@@ -0,0 +1,80 @@
+"""daily rollups for axion retention metrics
+
+Revision ID: 0119_axion_retention_daily_rollup
+Revises: 0118_event_log_monthly_partitions
+Create Date: 2026-10-19 00:00:00
+
+Rollup diário (coorte usuário-dia) de exposições, conversões CTA -> sessão e
+retenção D1/D7/D30, chaveado por (tenant, experiment_key, variant, context,
+persona, destination, day). `destination = ''` guarda o total sem filtro de
+destino. `rollup_watermarks` registra até onde cada rollup incremental já foi
+materializado.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0119_axion_retention_daily_rollup"
+down_revision: str | None = "0118_event_log_monthly_partitions"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rollup_watermarks (
+            rollup_name    VARCHAR(80) PRIMARY KEY,
+            watermark_day  DATE NOT NULL,
+            updated_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS axion_retention_daily_rollup (
+            tenant_id                             INTEGER NOT NULL REFERENCES tenants (id),
+            experiment_key                        VARCHAR(80) NOT NULL DEFAULT '',
+            variant                               VARCHAR(80) NOT NULL DEFAULT '',
+            context                               VARCHAR(40) NOT NULL DEFAULT '',
+            persona                               VARCHAR(80) NOT NULL DEFAULT '',
+            destination                           VARCHAR(80) NOT NULL DEFAULT '',
+            day                                   DATE NOT NULL,
+            exposures_total                       INTEGER NOT NULL DEFAULT 0,
+            unique_exposures_per_day              INTEGER NOT NULL DEFAULT 0,
+            cohort_users                          INTEGER NOT NULL DEFAULT 0,
+            retained_d1_users                     INTEGER NOT NULL DEFAULT 0,
+            retained_d7_users                     INTEGER NOT NULL DEFAULT 0,
+            retained_d30_users                    INTEGER NOT NULL DEFAULT 0,
+            total_sessions_30d                    INTEGER NOT NULL DEFAULT 0,
+            cta_click_users                       INTEGER NOT NULL DEFAULT 0,
+            session_started_users                 INTEGER NOT NULL DEFAULT 0,
+            cta_session_started_converted_users   INTEGER NOT NULL DEFAULT 0,
+            cta_session_converted_users           INTEGER NOT NULL DEFAULT 0,
+            updated_at                            TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT pk_axion_retention_daily_rollup PRIMARY KEY (
+                tenant_id, experiment_key, variant, context, persona, destination, day
+            )
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_retention_daily_rollup_experiment_day
+        ON axion_retention_daily_rollup (experiment_key, day, variant);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_retention_daily_rollup_tenant_day
+        ON axion_retention_daily_rollup (tenant_id, day);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_axion_retention_daily_rollup_tenant_day;")
+    op.execute("DROP INDEX IF EXISTS ix_axion_retention_daily_rollup_experiment_day;")
+    op.execute("DROP TABLE IF EXISTS axion_retention_daily_rollup;")
+    op.execute("DROP TABLE IF EXISTS rollup_watermarks;")
@@ -0,0 +1,50 @@
+"""async data export jobs
+
+Revision ID: 0120_data_export_jobs
+Revises: 0119_axion_retention_daily_rollup
+Create Date: 2026-10-19 00:00:00
+
+Exportações grandes saem do processo da API: o pedido vira uma linha em
+`data_export_jobs`, o worker grava um NDJSON gzip e o arquivo é baixado
+depois pelo endpoint de download.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0120_data_export_jobs"
+down_revision: str | None = "0119_axion_retention_daily_rollup"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_export_jobs (
+            id                    VARCHAR(36) PRIMARY KEY,
+            tenant_id             INTEGER NOT NULL REFERENCES tenants (id),
+            child_id              INTEGER NOT NULL REFERENCES child_profiles (id),
+            requested_by_user_id  INTEGER NULL REFERENCES users (id),
+            status                VARCHAR(16) NOT NULL DEFAULT 'PENDING',
+            row_count             INTEGER NOT NULL DEFAULT 0,
+            file_path             VARCHAR(512) NULL,
+            file_size_bytes       INTEGER NULL,
+            error                 TEXT NULL,
+            created_at            TIMESTAMPTZ NOT NULL DEFAULT now(),
+            completed_at          TIMESTAMPTZ NULL
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_data_export_jobs_tenant_created_at
+        ON data_export_jobs (tenant_id, created_at);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_data_export_jobs_tenant_created_at;")
+    op.execute("DROP TABLE IF EXISTS data_export_jobs;")
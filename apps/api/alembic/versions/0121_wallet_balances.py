@@ -0,0 +1,105 @@
+"""wallet balance snapshots
+
+Revision ID: 0121_wallet_balances
+Revises: 0120_data_export_jobs
+Create Date: 2026-10-19 00:00:00
+
+Saldos por carteira e por pote passam a ser mantidos a cada insert em
+`ledger_transactions`, em vez de reprocessar todo o ledger em cada leitura.
+`wallet_balance_checkpoints` guarda os saldos recalculados pelo job de
+verificação, que compara o ledger com `wallet_balances` e reporta drift.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0121_wallet_balances"
+down_revision: str | None = "0120_data_export_jobs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS wallet_balances (
+            wallet_id                   INTEGER PRIMARY KEY
+                                        REFERENCES wallets (id) ON DELETE CASCADE,
+            tenant_id                   INTEGER NOT NULL REFERENCES tenants (id),
+            total_cents                 INTEGER NOT NULL DEFAULT 0,
+            spend_cents                 INTEGER NOT NULL DEFAULT 0,
+            save_cents                  INTEGER NOT NULL DEFAULT 0,
+            donate_cents                INTEGER NOT NULL DEFAULT 0,
+            last_ledger_transaction_id  INTEGER NOT NULL DEFAULT 0,
+            updated_at                  TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS wallet_balance_checkpoints (
+            id                          SERIAL PRIMARY KEY,
+            tenant_id                   INTEGER NOT NULL REFERENCES tenants (id),
+            wallet_id                   INTEGER NOT NULL REFERENCES wallets (id) ON DELETE CASCADE,
+            last_ledger_transaction_id  INTEGER NOT NULL,
+            total_cents                 INTEGER NOT NULL,
+            spend_cents                 INTEGER NOT NULL,
+            save_cents                  INTEGER NOT NULL,
+            donate_cents                INTEGER NOT NULL,
+            drift_cents                 INTEGER NOT NULL DEFAULT 0,
+            created_at                  TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_wallet_balance_checkpoints_wallet_last_tx
+        ON wallet_balance_checkpoints (wallet_id, last_ledger_transaction_id);
+        """
+    )
+    # Backfill: mesmo cálculo de signed_amount_cents/extract_pot_split, feito em SQL.
+    op.execute(
+        """
+        WITH deltas AS (
+            SELECT
+                lt.wallet_id AS wallet_id,
+                lt.tenant_id AS tenant_id,
+                lt.id AS id,
+                CASE WHEN lt.type = 'SPEND' THEN -lt.amount_cents
+                     ELSE lt.amount_cents END AS signed,
+                CASE WHEN jsonb_typeof(lt.metadata->'pot_split'->'SPEND') = 'number'
+                     THEN (lt.metadata->'pot_split'->>'SPEND')::numeric::bigint ELSE 0 END AS spend,
+                CASE WHEN jsonb_typeof(lt.metadata->'pot_split'->'SAVE') = 'number'
+                     THEN (lt.metadata->'pot_split'->>'SAVE')::numeric::bigint ELSE 0 END AS save,
+                CASE WHEN jsonb_typeof(lt.metadata->'pot_split'->'DONATE') = 'number'
+                     THEN (lt.metadata->'pot_split'->>'DONATE')::numeric::bigint
+                     ELSE 0 END AS donate
+            FROM ledger_transactions lt
+        )
+        INSERT INTO wallet_balances (
+            wallet_id, tenant_id, total_cents, spend_cents, save_cents, donate_cents,
+            last_ledger_transaction_id, updated_at
+        )
+        SELECT
+            w.id,
+            w.tenant_id,
+            COALESCE(SUM(d.signed), 0),
+            COALESCE(SUM(CASE WHEN d.signed >= 0 THEN d.spend ELSE -d.spend END), 0),
+            COALESCE(SUM(CASE WHEN d.signed >= 0 THEN d.save ELSE -d.save END), 0),
+            COALESCE(SUM(CASE WHEN d.signed >= 0 THEN d.donate ELSE -d.donate END), 0),
+            COALESCE(MAX(d.id), 0),
+            now()
+        FROM wallets w
+        LEFT JOIN deltas d
+          ON d.wallet_id = w.id
+        GROUP BY w.id, w.tenant_id
+        ON CONFLICT (wallet_id) DO NOTHING;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_wallet_balance_checkpoints_wallet_last_tx;")
+    op.execute("DROP TABLE IF EXISTS wallet_balance_checkpoints;")
+    op.execute("DROP TABLE IF EXISTS wallet_balances;")
@@ -0,0 +1,46 @@
+"""game weekly leaderboard
+
+Revision ID: 0122_game_weekly_leaderboard
+Revises: 0121_wallet_balances
+Create Date: 2026-10-19 00:00:00
+
+Ranking semanal mantido incrementalmente por (tenant, jogo, semana, criança)
+a cada partida concluída, em vez de reagregar `game_sessions` a cada leitura.
+O backfill depende do fuso do ranking (`AXIORA_GAMES_RANKING_TZ`) e é feito
+pelo job `games.leaderboard.rebuild`.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0122_game_weekly_leaderboard"
+down_revision: str | None = "0121_wallet_balances"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS game_weekly_leaderboard (
+            id                     SERIAL PRIMARY KEY,
+            tenant_id              INTEGER NOT NULL REFERENCES tenants (id),
+            game_id                VARCHAR(64) NOT NULL,
+            week_start             DATE NOT NULL,
+            child_id               INTEGER NOT NULL
+                                   REFERENCES child_profiles (id) ON DELETE CASCADE,
+            best_score             INTEGER NOT NULL DEFAULT 0,
+            best_duration_seconds  INTEGER NULL,
+            best_streak            INTEGER NOT NULL DEFAULT 0,
+            last_played_at         TIMESTAMPTZ NOT NULL,
+            updated_at             TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_game_weekly_leaderboard_entry
+                UNIQUE (tenant_id, game_id, week_start, child_id)
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS game_weekly_leaderboard;")
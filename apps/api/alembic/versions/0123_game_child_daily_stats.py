@@ -0,0 +1,66 @@
+"""game child daily stats
+
+Revision ID: 0123_game_child_daily_stats
+Revises: 0122_game_weekly_leaderboard
+Create Date: 2026-10-19 00:00:00
+
+Estatísticas diárias (UTC) de partidas concluídas por criança, atualizadas a
+cada sessão registrada, para que o resumo de metagame não precise reagregar
+`game_sessions`. Adiciona também o índice (child_id, completed, created_at)
+usado pelas leituras com intervalos de data sem cast na coluna.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0123_game_child_daily_stats"
+down_revision: str | None = "0122_game_weekly_leaderboard"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_game_sessions_child_completed_created_at
+            ON game_sessions (child_id, completed, created_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS game_child_daily_stats (
+            id                  SERIAL PRIMARY KEY,
+            tenant_id           INTEGER NULL REFERENCES tenants (id),
+            child_id            INTEGER NOT NULL REFERENCES child_profiles (id) ON DELETE CASCADE,
+            stat_date           DATE NOT NULL,
+            sessions_completed  INTEGER NOT NULL DEFAULT 0,
+            xp_earned           INTEGER NOT NULL DEFAULT 0,
+            updated_at          TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_game_child_daily_stats_child_date UNIQUE (child_id, stat_date)
+        );
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO game_child_daily_stats (
+            tenant_id, child_id, stat_date, sessions_completed, xp_earned
+        )
+        SELECT
+            MAX(gs.tenant_id),
+            gs.child_id,
+            (gs.created_at AT TIME ZONE 'UTC')::date,
+            COUNT(*),
+            COALESCE(SUM(gs.xp_earned), 0)
+        FROM game_sessions gs
+        WHERE gs.child_id IS NOT NULL
+          AND gs.completed IS TRUE
+        GROUP BY gs.child_id, (gs.created_at AT TIME ZONE 'UTC')::date
+        ON CONFLICT (child_id, stat_date) DO NOTHING;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS game_child_daily_stats;")
+    op.execute("DROP INDEX IF EXISTS ix_game_sessions_child_completed_created_at;")
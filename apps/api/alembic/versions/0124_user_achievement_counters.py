@@ -0,0 +1,92 @@
+"""user achievement counters
+
+Revision ID: 0124_user_achievement_counters
+Revises: 0123_game_child_daily_stats
+Create Date: 2026-10-19 00:00:00
+
+Contadores por usuário (lições concluídas, XP por matéria, sequência de
+vitórias no Jogo da Velha) mantidos pelos listeners de `lesson_progress` e
+`game_sessions`, para que a avaliação de conquistas não recarregue o catálogo
+nem o histórico completo. O backfill reproduz os valores a partir dos dados
+existentes.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0124_user_achievement_counters"
+down_revision: str | None = "0123_game_child_daily_stats"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_achievement_counters (
+            id           SERIAL PRIMARY KEY,
+            user_id      INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            counter_key  VARCHAR(96) NOT NULL,
+            value        INTEGER NOT NULL DEFAULT 0,
+            updated_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_user_achievement_counters_user_key UNIQUE (user_id, counter_key)
+        );
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_achievement_counters (user_id, counter_key, value)
+        SELECT lp.user_id, 'lessons_completed', COUNT(*)
+        FROM lesson_progress lp
+        WHERE lp.completed IS TRUE
+        GROUP BY lp.user_id
+        ON CONFLICT (user_id, counter_key) DO NOTHING;
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_achievement_counters (user_id, counter_key, value)
+        SELECT
+            lp.user_id,
+            LEFT('subject_xp:' || translate(lower(s.name), 'áàâãéêíóôõúç', 'aaaaeeiooouc'), 96),
+            SUM(GREATEST(lp.xp_granted, 0))
+        FROM lesson_progress lp
+        JOIN lessons l ON l.id = lp.lesson_id
+        JOIN units u ON u.id = l.unit_id
+        JOIN subjects s ON s.id = u.subject_id
+        WHERE lp.completed IS TRUE
+        GROUP BY
+            lp.user_id,
+            LEFT(
+                'subject_xp:' || translate(lower(s.name), 'áàâãéêíóôõúç', 'aaaaeeiooouc'),
+                96
+            )
+        ON CONFLICT (user_id, counter_key) DO NOTHING;
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_achievement_counters (user_id, counter_key, value)
+        SELECT gs.user_id, 'tictactoe_win_streak', COUNT(*)
+        FROM game_sessions gs
+        WHERE gs.game_type = 'TICTACTOE'
+          AND gs.score >= 500
+          AND gs.created_at > COALESCE(
+              (
+                  SELECT MAX(loss.created_at)
+                  FROM game_sessions loss
+                  WHERE loss.user_id = gs.user_id
+                    AND loss.game_type = 'TICTACTOE'
+                    AND loss.score < 500
+              ),
+              '-infinity'::timestamptz
+          )
+        GROUP BY gs.user_id
+        ON CONFLICT (user_id, counter_key) DO NOTHING;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_achievement_counters;")
@@ -0,0 +1,40 @@
+"""sync processed items
+
+Revision ID: 0125_sync_processed_items
+Revises: 0124_user_achievement_counters
+Create Date: 2026-10-19 00:00:00
+
+Registra os ids de item enviados pelo cliente em `/sync/batch`, para que um
+reenvio da fila offline seja reconhecido com uma única consulta e não gere
+marcações ou eventos duplicados.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0125_sync_processed_items"
+down_revision: str | None = "0124_user_achievement_counters"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sync_processed_items (
+            id              SERIAL PRIMARY KEY,
+            tenant_id       INTEGER NOT NULL REFERENCES tenants (id),
+            user_id         INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            client_item_id  VARCHAR(128) NOT NULL,
+            item_type       VARCHAR(64) NOT NULL,
+            processed_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_sync_processed_items_client_item
+                UNIQUE (tenant_id, user_id, client_item_id)
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS sync_processed_items;")
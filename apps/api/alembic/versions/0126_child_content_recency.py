@@ -0,0 +1,58 @@
+"""child content recency
+
+Revision ID: 0126_child_content_recency
+Revises: 0125_sync_processed_items
+Create Date: 2026-10-19 00:00:00
+
+Índice de recência por criança e fingerprint de conteúdo: guarda apenas o
+último `served_at` (e o resultado) de cada fingerprint, mantido pelos
+listeners de `child_content_history`. O filtro de repetição passa a fazer uma
+única leitura por chave, independente do tamanho do histórico. O backfill
+copia a linha mais recente de cada fingerprint já servido.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0126_child_content_recency"
+down_revision: str | None = "0125_sync_processed_items"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS child_content_recency (
+            id                   SERIAL PRIMARY KEY,
+            tenant_id            INTEGER NOT NULL REFERENCES tenants (id),
+            child_id             INTEGER NOT NULL REFERENCES child_profiles (id) ON DELETE CASCADE,
+            content_fingerprint  VARCHAR(64) NOT NULL,
+            content_id           INTEGER NOT NULL REFERENCES axion_content_catalog (content_id),
+            history_id           INTEGER NOT NULL,
+            served_at            TIMESTAMPTZ NOT NULL,
+            outcome              VARCHAR(16),
+            updated_at           TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_child_content_recency_child_fingerprint
+                UNIQUE (tenant_id, child_id, content_fingerprint)
+        );
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO child_content_recency (
+            tenant_id, child_id, content_fingerprint, content_id, history_id, served_at, outcome
+        )
+        SELECT DISTINCT ON (h.tenant_id, h.child_id, h.content_fingerprint)
+            h.tenant_id, h.child_id, h.content_fingerprint, h.content_id, h.id, h.served_at,
+            h.outcome
+        FROM child_content_history h
+        ORDER BY h.tenant_id, h.child_id, h.content_fingerprint, h.served_at DESC, h.id DESC
+        ON CONFLICT (tenant_id, child_id, content_fingerprint) DO NOTHING;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS child_content_recency;")
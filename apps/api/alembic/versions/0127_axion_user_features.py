@@ -0,0 +1,54 @@
+"""axion user features
+
+Revision ID: 0127_axion_user_features
+Revises: 0126_child_content_recency
+Create Date: 2026-10-19 00:00:00
+
+Feature store do Axion: uma linha tipada por (usuário, versão de feature, dia)
+com as features do vetor v1, mantida pelo job noturno. A leitura online busca
+uma única linha e os jobs offline leem as colunas tipadas em vez de
+interpretar `features_json`. Sem backfill: a primeira execução do job noturno
+preenche o dia corrente e, enquanto isso, a leitura cai no cálculo ao vivo.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0127_axion_user_features"
+down_revision: str | None = "0126_child_content_recency"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS axion_user_features (
+            id                          SERIAL PRIMARY KEY,
+            user_id                     INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            tenant_id                   INTEGER REFERENCES tenants (id),
+            feature_version             INTEGER NOT NULL,
+            as_of_day                   DATE NOT NULL,
+            age_bucket                  VARCHAR(16) NOT NULL,
+            plan_type                   VARCHAR(32) NOT NULL,
+            streak_length               INTEGER NOT NULL DEFAULT 0,
+            last_session_gap            INTEGER NOT NULL DEFAULT 999,
+            historical_completion_rate  NUMERIC(7, 6) NOT NULL DEFAULT 0,
+            historical_retention_rate   NUMERIC(7, 6) NOT NULL DEFAULT 0,
+            computed_at                 TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_axion_user_features_user_version_day
+                UNIQUE (user_id, feature_version, as_of_day)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_user_features_tenant_version_day
+        ON axion_user_features (tenant_id, feature_version, as_of_day);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS axion_user_features;")
@@ -0,0 +1,97 @@
+"""axion feature histogram daily
+
+Revision ID: 0128_axion_feature_histogram_daily
+Revises: 0127_axion_user_features
+Create Date: 2026-10-19 00:00:00
+
+Histogramas diários por tenant dos valores de cada feature dos snapshots do NBA,
+incrementados no mesmo flush que grava `axion_feature_snapshot`. O cálculo de drift
+passa a ler essas contagens (custo proporcional aos valores distintos) em vez de
+varrer até 5000 snapshots por janela. A linha `__signature__` guarda o md5 do
+snapshot inteiro para o drift global. O backfill cobre os últimos 9 dias (UTC),
+que é o alcance das janelas de baseline e recente.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0128_axion_feature_histogram_daily"
+down_revision: str | None = "0127_axion_user_features"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS axion_feature_histogram_daily (
+            id             SERIAL PRIMARY KEY,
+            tenant_id      INTEGER NOT NULL REFERENCES tenants (id),
+            stat_date      DATE NOT NULL,
+            feature_name   VARCHAR(120) NOT NULL,
+            feature_value  TEXT NOT NULL,
+            sample_count   INTEGER NOT NULL DEFAULT 0,
+            CONSTRAINT uq_axion_feature_histogram_daily_bucket
+                UNIQUE (tenant_id, stat_date, feature_name, feature_value)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_feature_histogram_daily_stat_date
+        ON axion_feature_histogram_daily (stat_date);
+        """
+    )
+    op.execute(
+        """
+        WITH recent_snapshots AS (
+            SELECT
+                s.id,
+                s.tenant_id,
+                (s.snapshot_at AT TIME ZONE 'UTC')::date AS stat_date,
+                s.features_json
+            FROM axion_feature_snapshot s
+            WHERE s.snapshot_at
+                >= (date_trunc('day', now() AT TIME ZONE 'UTC') - INTERVAL '8 days')
+                    AT TIME ZONE 'UTC'
+              AND jsonb_typeof(s.features_json) = 'object'
+        ),
+        feature_values AS (
+            SELECT r.tenant_id, r.stat_date, f.key AS feature_name, f.value::text AS feature_value
+            FROM recent_snapshots r
+            CROSS JOIN LATERAL jsonb_each(r.features_json) f
+        ),
+        signatures AS (
+            SELECT
+                r.tenant_id,
+                r.stat_date,
+                '__signature__' AS feature_name,
+                md5(
+                    COALESCE(
+                        string_agg(f.key || '=' || f.value::text, '|' ORDER BY f.key COLLATE "C"),
+                        ''
+                    )
+                ) AS feature_value
+            FROM recent_snapshots r
+            LEFT JOIN LATERAL jsonb_each(r.features_json) f ON TRUE
+            GROUP BY r.id, r.tenant_id, r.stat_date
+        )
+        INSERT INTO axion_feature_histogram_daily (
+            tenant_id, stat_date, feature_name, feature_value, sample_count
+        )
+        SELECT tenant_id, stat_date, feature_name, feature_value, COUNT(*)::int
+        FROM (
+            SELECT tenant_id, stat_date, feature_name, feature_value FROM feature_values
+            UNION ALL
+            SELECT tenant_id, stat_date, feature_name, feature_value FROM signatures
+        ) buckets
+        GROUP BY tenant_id, stat_date, feature_name, feature_value
+        ON CONFLICT (tenant_id, stat_date, feature_name, feature_value)
+        DO UPDATE SET sample_count = EXCLUDED.sample_count;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS axion_feature_histogram_daily;")
@@ -0,0 +1,53 @@
+"""user unit progress
+
+Revision ID: 0129_user_unit_progress
+Revises: 0128_axion_feature_histogram_daily
+Create Date: 2026-10-19 00:00:00
+
+Contador de lições concluídas por (usuário, unidade), mantido pelos listeners de
+`lesson_progress`. A trilha do aprender e a checagem de conclusão de unidade em
+`complete_lesson` passam a ler esse contador em vez de contar `lesson_progress`
+a cada requisição. O backfill recalcula os contadores a partir do progresso
+já gravado.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0129_user_unit_progress"
+down_revision: str | None = "0128_axion_feature_histogram_daily"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_unit_progress (
+            id                 SERIAL PRIMARY KEY,
+            user_id            INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            unit_id            INTEGER NOT NULL REFERENCES units (id) ON DELETE CASCADE,
+            completed_lessons  INTEGER NOT NULL DEFAULT 0,
+            updated_at         TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_user_unit_progress_user_unit UNIQUE (user_id, unit_id)
+        );
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_unit_progress (user_id, unit_id, completed_lessons, updated_at)
+        SELECT lp.user_id, l.unit_id, COUNT(*)::int, now()
+        FROM lesson_progress AS lp
+        JOIN lessons AS l ON l.id = lp.lesson_id
+        WHERE lp.completed IS TRUE
+        GROUP BY lp.user_id, l.unit_id
+        ON CONFLICT (user_id, unit_id) DO UPDATE SET
+            completed_lessons = EXCLUDED.completed_lessons,
+            updated_at = EXCLUDED.updated_at;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_unit_progress;")
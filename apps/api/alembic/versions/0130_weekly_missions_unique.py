@@ -0,0 +1,135 @@
+"""weekly missions unique
+
+Revision ID: 0130_weekly_missions_unique
+Revises: 0129_user_unit_progress
+Create Date: 2026-10-19 00:00:00
+
+Índices únicos parciais em `weekly_missions`: um por (faixa etária, semana, tipo) para
+as missões base e um por (faixa etária, semana, tema) para as de temporada. Com eles o
+job `learning.missions.provision` e o fallback da leitura usam `ON CONFLICT DO NOTHING`
+sem criar duplicatas quando rodam em paralelo. Antes de criar os índices as duplicatas
+já existentes são consolidadas na missão mais antiga: o progresso dos usuários é mesclado
+(maior valor, conclusão e recompensa preservadas) e as linhas repetidas são removidas.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0130_weekly_missions_unique"
+down_revision: str | None = "0129_user_unit_progress"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TEMP TABLE weekly_mission_duplicates ON COMMIT DROP AS
+        SELECT id AS duplicate_id, canonical_id
+        FROM (
+            SELECT
+                id,
+                first_value(id) OVER (
+                    PARTITION BY
+                        age_group,
+                        start_date,
+                        end_date,
+                        is_seasonal,
+                        CASE WHEN is_seasonal THEN theme_key ELSE mission_type::text END
+                    ORDER BY created_at, id
+                ) AS canonical_id
+            FROM weekly_missions
+        ) ranked
+        WHERE id <> canonical_id;
+        """
+    )
+    op.execute(
+        """
+        UPDATE user_mission_progress AS canonical
+        SET
+            current_value = GREATEST(canonical.current_value, merged.current_value),
+            completed = canonical.completed OR merged.completed,
+            completed_at = LEAST(canonical.completed_at, merged.completed_at),
+            reward_granted = canonical.reward_granted OR merged.reward_granted
+        FROM (
+            SELECT
+                d.canonical_id,
+                p.user_id,
+                MAX(p.current_value) AS current_value,
+                bool_or(p.completed) AS completed,
+                MIN(p.completed_at) AS completed_at,
+                bool_or(p.reward_granted) AS reward_granted
+            FROM user_mission_progress p
+            JOIN weekly_mission_duplicates d ON d.duplicate_id = p.mission_id
+            GROUP BY d.canonical_id, p.user_id
+        ) merged
+        WHERE canonical.mission_id = merged.canonical_id
+          AND canonical.user_id = merged.user_id;
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_mission_progress p
+        USING weekly_mission_duplicates d
+        WHERE p.mission_id = d.duplicate_id
+          AND EXISTS (
+              SELECT 1
+              FROM user_mission_progress keep
+              WHERE keep.mission_id = d.canonical_id
+                AND keep.user_id = p.user_id
+          );
+        """
+    )
+    # Sem linha na missão canônica: mantém só a de maior progresso por usuário e a repontua.
+    op.execute(
+        """
+        DELETE FROM user_mission_progress p
+        USING (
+            SELECT
+                p2.id,
+                row_number() OVER (
+                    PARTITION BY d.canonical_id, p2.user_id
+                    ORDER BY p2.reward_granted DESC, p2.completed DESC, p2.current_value DESC, p2.id
+                ) AS rn
+            FROM user_mission_progress p2
+            JOIN weekly_mission_duplicates d ON d.duplicate_id = p2.mission_id
+        ) ranked
+        WHERE p.id = ranked.id
+          AND ranked.rn > 1;
+        """
+    )
+    op.execute(
+        """
+        UPDATE user_mission_progress p
+        SET mission_id = d.canonical_id
+        FROM weekly_mission_duplicates d
+        WHERE p.mission_id = d.duplicate_id;
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM weekly_missions m
+        USING weekly_mission_duplicates d
+        WHERE m.id = d.duplicate_id;
+        """
+    )
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_weekly_missions_base_week_type
+        ON weekly_missions (age_group, start_date, end_date, mission_type)
+        WHERE is_seasonal IS FALSE;
+        """
+    )
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_weekly_missions_seasonal_week_theme
+        ON weekly_missions (age_group, start_date, end_date, theme_key)
+        WHERE is_seasonal IS TRUE;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_weekly_missions_seasonal_week_theme;")
+    op.execute("DROP INDEX IF EXISTS uq_weekly_missions_base_week_type;")
@@ -0,0 +1,64 @@
+"""data export artifacts
+
+Revision ID: 0131_data_export_artifacts
+Revises: 0130_weekly_missions_unique
+Create Date: 2026-10-19 00:00:00
+
+Os exports gerados pelo worker passam a ser gravados no Postgres, em partes de
+`data_export_artifact_parts`, porque a API e o worker rodam em imagens separadas e não
+compartilham o sistema de arquivos. `data_export_jobs.file_path` vira `storage_key` e
+ganha `expires_at`; o job `export.data.purge_expired` apaga as partes vencidas. Os jobs
+concluídos antes desta revisão apontavam para arquivos locais do worker, inacessíveis à
+API, e por isso são marcados como `EXPIRED`.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0131_data_export_artifacts"
+down_revision: str | None = "0130_weekly_missions_unique"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE data_export_jobs RENAME COLUMN file_path TO storage_key;")
+    op.execute("ALTER TABLE data_export_jobs ADD COLUMN IF NOT EXISTS expires_at TIMESTAMPTZ NULL;")
+    op.execute(
+        """
+        UPDATE data_export_jobs
+        SET status = 'EXPIRED', storage_key = NULL, expires_at = COALESCE(completed_at, now())
+        WHERE status = 'DONE';
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_data_export_jobs_status_expires_at
+        ON data_export_jobs (status, expires_at);
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_export_artifact_parts (
+            job_id VARCHAR(36) NOT NULL REFERENCES data_export_jobs(id) ON DELETE CASCADE,
+            part INTEGER NOT NULL,
+            data BYTEA NOT NULL,
+            PRIMARY KEY (job_id, part)
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS data_export_artifact_parts;")
+    op.execute("DROP INDEX IF EXISTS ix_data_export_jobs_status_expires_at;")
+    op.execute("ALTER TABLE data_export_jobs DROP COLUMN IF EXISTS expires_at;")
+    op.execute(
+        """
+        UPDATE data_export_jobs
+        SET status = 'FAILED', storage_key = NULL
+        WHERE status IN ('DONE', 'EXPIRED');
+        """
+    )
+    op.execute("ALTER TABLE data_export_jobs RENAME COLUMN storage_key TO file_path;")
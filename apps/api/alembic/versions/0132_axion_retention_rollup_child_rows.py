@@ -0,0 +1,110 @@
+"""axion retention rollup child rows
+
+Revision ID: 0132_axion_retention_rollup_child_rows
+Revises: 0131_data_export_artifacts
+Create Date: 2026-10-19 00:00:00
+
+O rollup de retenção passa a guardar uma linha por primeira exposição de cada criança
+no dia (por experimento, variante, contexto e destino), com o usuário e os horários das
+sessões concluídas, em vez de contagens de usuários por dia. Somar contagens diárias
+transformava usuários distintos em usuário-dia; com as linhas por criança a leitura
+deduplica os usuários na janela inteira e resolve a persona no momento da consulta. A
+tabela é recriada e o watermark é apagado, então o próximo
+`axion.retention.rollup.refresh` refaz o backfill.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0132_axion_retention_rollup_child_rows"
+down_revision: str | None = "0131_data_export_artifacts"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS axion_retention_daily_rollup;")
+    op.execute("DELETE FROM rollup_watermarks WHERE rollup_name = 'axion_retention_daily';")
+    op.execute(
+        """
+        CREATE TABLE axion_retention_daily_rollup (
+            tenant_id                  INTEGER NOT NULL REFERENCES tenants (id),
+            experiment_key             VARCHAR(80) NOT NULL DEFAULT '',
+            variant                    VARCHAR(80) NOT NULL DEFAULT '',
+            context                    VARCHAR(40) NOT NULL DEFAULT '',
+            day                        DATE NOT NULL,
+            child_id                   INTEGER NOT NULL DEFAULT 0,
+            destination                VARCHAR(80) NOT NULL DEFAULT '',
+            user_id                    INTEGER NOT NULL,
+            first_exposed_at           TIMESTAMPTZ NOT NULL,
+            exposures_total            INTEGER NOT NULL DEFAULT 0,
+            completed_session_ats      TIMESTAMPTZ[] NOT NULL DEFAULT '{}'::timestamptz[],
+            session_started            BOOLEAN NOT NULL DEFAULT FALSE,
+            cta_clicked                BOOLEAN NOT NULL DEFAULT FALSE,
+            cta_started_within_24h     BOOLEAN NOT NULL DEFAULT FALSE,
+            cta_completed_within_24h   BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at                 TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT pk_axion_retention_daily_rollup PRIMARY KEY (
+                tenant_id, experiment_key, variant, context, day, child_id, destination
+            )
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_retention_daily_rollup_experiment_day
+        ON axion_retention_daily_rollup (experiment_key, day, variant);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_retention_daily_rollup_tenant_day
+        ON axion_retention_daily_rollup (tenant_id, day);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS axion_retention_daily_rollup;")
+    op.execute("DELETE FROM rollup_watermarks WHERE rollup_name = 'axion_retention_daily';")
+    op.execute(
+        """
+        CREATE TABLE axion_retention_daily_rollup (
+            tenant_id                             INTEGER NOT NULL REFERENCES tenants (id),
+            experiment_key                        VARCHAR(80) NOT NULL DEFAULT '',
+            variant                               VARCHAR(80) NOT NULL DEFAULT '',
+            context                               VARCHAR(40) NOT NULL DEFAULT '',
+            persona                               VARCHAR(80) NOT NULL DEFAULT '',
+            destination                           VARCHAR(80) NOT NULL DEFAULT '',
+            day                                   DATE NOT NULL,
+            exposures_total                       INTEGER NOT NULL DEFAULT 0,
+            unique_exposures_per_day              INTEGER NOT NULL DEFAULT 0,
+            cohort_users                          INTEGER NOT NULL DEFAULT 0,
+            retained_d1_users                     INTEGER NOT NULL DEFAULT 0,
+            retained_d7_users                     INTEGER NOT NULL DEFAULT 0,
+            retained_d30_users                    INTEGER NOT NULL DEFAULT 0,
+            total_sessions_30d                    INTEGER NOT NULL DEFAULT 0,
+            cta_click_users                       INTEGER NOT NULL DEFAULT 0,
+            session_started_users                 INTEGER NOT NULL DEFAULT 0,
+            cta_session_started_converted_users   INTEGER NOT NULL DEFAULT 0,
+            cta_session_converted_users           INTEGER NOT NULL DEFAULT 0,
+            updated_at                            TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT pk_axion_retention_daily_rollup PRIMARY KEY (
+                tenant_id, experiment_key, variant, context, persona, destination, day
+            )
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_retention_daily_rollup_experiment_day
+        ON axion_retention_daily_rollup (experiment_key, day, variant);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_axion_retention_daily_rollup_tenant_day
+        ON axion_retention_daily_rollup (tenant_id, day);
+        """
+    )
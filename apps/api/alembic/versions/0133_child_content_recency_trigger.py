@@ -0,0 +1,87 @@
+"""child content recency trigger
+
+Revision ID: 0133_child_content_recency_trigger
+Revises: 0132_axion_retention_rollup_child_rows
+Create Date: 2026-10-19 00:00:00
+
+`child_content_recency` passa a ser mantida por um trigger em
+`child_content_history` em vez dos listeners do ORM, que eram ignorados por
+`insert()` em lote, SQL direto e escritores externos. O trigger grava a linha
+como armazenada e só avança a recência quando o serviço é mais novo, então
+linhas atrasadas ou reprocessadas não a fazem voltar. O backfill corrige
+qualquer divergência acumulada enquanto só os listeners mantinham o índice.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0133_child_content_recency_trigger"
+down_revision: str | None = "0132_axion_retention_rollup_child_rows"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION child_content_history_apply_recency()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            INSERT INTO child_content_recency (
+                tenant_id, child_id, content_fingerprint, content_id, history_id, served_at,
+                outcome, updated_at
+            )
+            VALUES (
+                NEW.tenant_id, NEW.child_id, NEW.content_fingerprint, NEW.content_id, NEW.id,
+                NEW.served_at, NEW.outcome, CURRENT_TIMESTAMP
+            )
+            ON CONFLICT (tenant_id, child_id, content_fingerprint) DO UPDATE SET
+                content_id = EXCLUDED.content_id,
+                history_id = EXCLUDED.history_id,
+                served_at = EXCLUDED.served_at,
+                outcome = EXCLUDED.outcome,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE (EXCLUDED.served_at, EXCLUDED.history_id)
+                >= (child_content_recency.served_at, child_content_recency.history_id);
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        DROP TRIGGER IF EXISTS trg_child_content_history_recency ON child_content_history;
+        CREATE TRIGGER trg_child_content_history_recency
+        AFTER INSERT OR UPDATE OF served_at, outcome, content_id, content_fingerprint
+        ON child_content_history
+        FOR EACH ROW EXECUTE FUNCTION child_content_history_apply_recency();
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO child_content_recency (
+            tenant_id, child_id, content_fingerprint, content_id, history_id, served_at, outcome
+        )
+        SELECT DISTINCT ON (h.tenant_id, h.child_id, h.content_fingerprint)
+            h.tenant_id, h.child_id, h.content_fingerprint, h.content_id, h.id, h.served_at,
+            h.outcome
+        FROM child_content_history h
+        ORDER BY h.tenant_id, h.child_id, h.content_fingerprint, h.served_at DESC, h.id DESC
+        ON CONFLICT (tenant_id, child_id, content_fingerprint) DO UPDATE SET
+            content_id = EXCLUDED.content_id,
+            history_id = EXCLUDED.history_id,
+            served_at = EXCLUDED.served_at,
+            outcome = EXCLUDED.outcome,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE (EXCLUDED.served_at, EXCLUDED.history_id)
+            >= (child_content_recency.served_at, child_content_recency.history_id);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_child_content_history_recency ON child_content_history;")
+    op.execute("DROP FUNCTION IF EXISTS child_content_history_apply_recency();")
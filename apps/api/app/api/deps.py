@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterator
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from app.core.security import decode_token
 from app.db.session import SessionLocal
 from app.models import Membership, MembershipRole, Tenant, TenantType, User
+from app.services.auth_context import AuthContext, get_request_auth_context, load_auth_context
 from app.services.events import EventService
 
 auth_scheme = HTTPBearer(auto_error=False)
@@ -55,6 +56,7 @@ def resolve_tenant(
 def get_current_tenant(
     db: DBSession,
     request: Request,
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(auth_scheme)],
     x_tenant_slug: Annotated[str | None, Header(alias="X-Tenant-Slug")] = None,
 ) -> Tenant:
     if not x_tenant_slug:
@@ -63,7 +65,14 @@ def get_current_tenant(
             detail="X-Tenant-Slug header is required",
         )
 
-    tenant = resolve_tenant(db, request, tenant_slug=x_tenant_slug)
+    # With a usable access token, load the whole auth context now so the user and
+    # membership dependencies of this request reuse the same joined query.
+    context = _optional_auth_context(db, credentials, tenant_slug=x_tenant_slug)
+    if context is not None:
+        tenant = context.tenant
+        request.state.tenant_id = tenant.id if tenant is not None else None
+    else:
+        tenant = resolve_tenant(db, request, tenant_slug=x_tenant_slug)
     if tenant is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,6 +81,22 @@ def get_current_tenant(
     return tenant
 
 
+def _optional_auth_context(
+    db: Session,
+    credentials: HTTPAuthorizationCredentials | None,
+    *,
+    tenant_slug: str,
+) -> AuthContext | None:
+    try:
+        payload, user_id = _access_token_claims(credentials)
+    except HTTPException:
+        return None
+    context = load_auth_context(
+        db, user_id=user_id, tenant_slug=tenant_slug, jti=_token_jti(payload)
+    )
+    return context if context.user is not None else None
+
+
 def get_current_tenant_optional(
     db: DBSession,
     request: Request,
@@ -83,11 +108,9 @@ def get_current_tenant_optional(
     return resolve_tenant(db, request, tenant_slug=x_tenant_slug)
 
 
-def get_current_user(
-    db: DBSession,
-    request: Request,
-    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(auth_scheme)],
-) -> User:
+def _access_token_claims(
+    credentials: HTTPAuthorizationCredentials | None,
+) -> tuple[dict[str, Any], int]:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -114,8 +137,25 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token subject",
         )
+    return payload, int(sub)
+
 
-    user = db.get(User, int(sub))
+def _token_jti(payload: dict[str, Any]) -> str | None:
+    jti = payload.get("jti")
+    return jti if isinstance(jti, str) and jti else None
+
+
+def get_current_user(
+    db: DBSession,
+    request: Request,
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(auth_scheme)],
+    x_tenant_slug: Annotated[str | None, Header(alias="X-Tenant-Slug")] = None,
+) -> User:
+    payload, user_id = _access_token_claims(credentials)
+    context = load_auth_context(
+        db, user_id=user_id, tenant_slug=x_tenant_slug or None, jti=_token_jti(payload)
+    )
+    user = context.user
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -147,34 +187,8 @@ def get_current_tools_user(
     request: Request,
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(auth_scheme)],
 ) -> User:
-    if credentials is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization token",
-        )
-
-    try:
-        payload = decode_token(credentials.credentials)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        ) from exc
-
-    if payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid access token",
-        )
-
-    sub = payload.get("sub")
-    if not isinstance(sub, str) or not sub.isdigit():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token subject",
-        )
-
-    user = db.get(User, int(sub))
+    _payload, user_id = _access_token_claims(credentials)
+    user = db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -210,12 +224,16 @@ def get_current_membership(
     user: Annotated[User, Depends(get_current_user)],
     tenant: Annotated[Tenant, Depends(get_current_tenant)],
 ) -> Membership:
-    membership = db.scalar(
-        select(Membership).where(
-            Membership.user_id == user.id,
-            Membership.tenant_id == tenant.id,
-        ),
-    )
+    context = get_request_auth_context(db, user_id=user.id)
+    if context is not None and context.tenant_id == tenant.id:
+        membership = context.membership
+    else:
+        membership = db.scalar(
+            select(Membership).where(
+                Membership.user_id == user.id,
+                Membership.tenant_id == tenant.id,
+            ),
+        )
     if membership is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
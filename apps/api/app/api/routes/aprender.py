@@ -55,6 +55,7 @@ from app.services.aprender import (
     build_subject_path,
     complete_lesson,
     get_child_age_group,
+    invalidate_subject_structure_cache,
     list_lesson_contents,
 )
 from app.services.child_age import get_child_age
@@ -368,6 +369,7 @@ def create_unit(
     db.add(unit)
     db.commit()
     db.refresh(unit)
+    invalidate_subject_structure_cache(unit.subject_id)
     return UnitOut(
         id=unit.id,
         subjectId=unit.subject_id,
@@ -412,6 +414,7 @@ def create_lesson(
     db.add(lesson)
     db.commit()
     db.refresh(lesson)
+    invalidate_subject_structure_cache(unit.subject_id)
     return LessonOut(
         id=lesson.id,
         unitId=lesson.unit_id,
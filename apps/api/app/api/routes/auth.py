@@ -17,6 +17,7 @@ from app.core.config import settings
 from app.core.security import (
     CSRF_COOKIE_NAME,
     REFRESH_COOKIE_NAME,
+    PasswordHashingBusyError,
     create_access_token,
     create_primary_access_token,
     create_refresh_token,
@@ -24,6 +25,7 @@ from app.core.security import (
     generate_csrf_token,
     get_token_tenant_id,
     hash_password,
+    password_needs_rehash,
     validate_password_strength,
     verify_password,
 )
@@ -102,6 +104,12 @@ def _authenticate_user_credentials(db: DBSession, payload: LoginRequest) -> User
         db.commit()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    # Re-hash with the current argon2 costs; the caller commits it with the login.
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(payload.password)
+        except PasswordHashingBusyError:
+            pass
     return user
 
 
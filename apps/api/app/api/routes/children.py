@@ -10,6 +10,8 @@ from app.api.deps import DBSession, EventSvc, get_current_tenant, get_current_us
 from app.core.security import verify_password
 from app.models import ChildProfile, Membership, Tenant, TenantType, User
 from app.schemas.children import ChildCreateRequest, ChildDeleteRequest, ChildOut, ChildThemeResponse, ChildThemeUpdateRequest, ChildUpdateRequest
+from app.services.game_ranking import remove_child_from_weekly_leaderboards
+from app.services.learning_settings_cache import invalidate_tenant_learning_settings
 
 router = APIRouter(prefix="/children", tags=["children"])
 MAX_AVATAR_DATA_URL_CHARS = 1_500_000
@@ -94,6 +96,7 @@ def create_child(
         payload={"child_id": child.id},
     )
     db.commit()
+    invalidate_tenant_learning_settings(tenant.id, db=db)
     return _to_child_out(child)
 
 
@@ -212,4 +215,6 @@ def delete_child(
         payload={"child_id": child.id},
     )
     db.commit()
+    invalidate_tenant_learning_settings(tenant.id, db=db)
+    remove_child_from_weekly_leaderboards(db, tenant_id=tenant.id, child_id=child_id)
     return {"deleted": True}
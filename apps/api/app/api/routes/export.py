@@ -1,14 +1,32 @@
 from __future__ import annotations
 
-from typing import Annotated
+import logging
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from typing import Annotated, Any
+from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from app.api.deps import DBSession, get_current_tenant, require_role
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.jobs.data_export import (
+    EXPORT_JOB_DONE,
+    EXPORT_JOB_EXPIRED,
+    EXPORT_JOB_FAILED,
+    EXPORT_JOB_PENDING,
+    iter_export_artifact,
+)
+from app.jobs.enqueue import enqueue_data_export
 from app.models import (
     ChildProfile,
     DailyMood,
+    DataExportJob,
     LedgerTransaction,
     Membership,
     Recommendation,
@@ -22,6 +40,7 @@ from app.models import (
 from app.schemas.export import (
     ExportDataResponse,
     ExportGoalOut,
+    ExportJobOut,
     ExportLedgerTransactionOut,
     ExportMoodOut,
     ExportRecommendationOut,
@@ -29,26 +48,78 @@ from app.schemas.export import (
     ExportTaskLogOut,
     ExportTaskOut,
 )
+from app.services.data_export import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMATS,
+    EXPORT_SECTIONS,
+    ExportCursor,
+    InvalidExportCursorError,
+    count_export_rows,
+    decode_export_cursor,
+    iter_csv_chunks,
+    iter_export_records,
+    iter_ndjson_chunks,
+)
 
 router = APIRouter(tags=["export"])
+logger = logging.getLogger("axiora.api.export")
 
 
-@router.get("/export-data", response_model=ExportDataResponse)
-def export_data(
-    child_id: Annotated[int, Query()],
-    db: DBSession,
-    tenant: Annotated[Tenant, Depends(get_current_tenant)],
-    _: Annotated[Membership, Depends(require_role(["PARENT"]))],
-) -> ExportDataResponse:
+def _stream_with_own_session[T](produce: Callable[[Session], Iterator[T]]) -> Iterator[T]:
+    """Run a streaming body on its own session.
+
+    The request-scoped session is closed once the handler returns on older FastAPI
+    releases, while the response body is still being sent.
+    """
+    db = SessionLocal()
+    try:
+        yield from produce(db)
+    finally:
+        db.close()
+
+
+def _get_child_or_404(db: DBSession, *, tenant_id: int, child_id: int) -> ChildProfile:
     child = db.scalar(
         select(ChildProfile).where(
             ChildProfile.id == child_id,
-            ChildProfile.tenant_id == tenant.id,
+            ChildProfile.tenant_id == tenant_id,
             ChildProfile.deleted_at.is_(None),
         ),
     )
     if child is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
+    return child
+
+
+def _export_job_out(job: DataExportJob) -> ExportJobOut:
+    return ExportJobOut(
+        id=job.id,
+        child_id=job.child_id,
+        status=job.status,
+        row_count=int(job.row_count or 0),
+        file_size_bytes=job.file_size_bytes,
+        error=job.error,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+        expires_at=job.expires_at,
+    )
+
+
+def _get_export_job_or_404(db: DBSession, *, tenant_id: int, job_id: str) -> DataExportJob:
+    job = db.get(DataExportJob, job_id)
+    if job is None or job.tenant_id != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    return job
+
+
+@router.get("/export-data", response_model=ExportDataResponse)
+def export_data(
+    child_id: Annotated[int, Query()],
+    db: DBSession,
+    tenant: Annotated[Tenant, Depends(get_current_tenant)],
+    _: Annotated[Membership, Depends(require_role(["PARENT"]))],
+) -> ExportDataResponse:
+    _get_child_or_404(db, tenant_id=tenant.id, child_id=child_id)
 
     tasks = db.scalars(
         select(Task).where(Task.tenant_id == tenant.id, Task.deleted_at.is_(None)).order_by(Task.id.asc()),
@@ -185,3 +256,146 @@ def export_data(
             for item in mood_history
         ],
     )
+
+
+@router.get("/export-data/stream")
+def stream_export_data(
+    child_id: Annotated[int, Query()],
+    db: DBSession,
+    tenant: Annotated[Tenant, Depends(get_current_tenant)],
+    _: Annotated[Membership, Depends(require_role(["PARENT"]))],
+    export_format: Annotated[str, Query(alias="format")] = "ndjson",
+    section: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query()] = None,
+) -> StreamingResponse:
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unsupported export format"
+        )
+    if section is not None and section not in EXPORT_SECTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unknown export section"
+        )
+    if export_format == EXPORT_FORMAT_CSV and section is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="CSV export requires a section"
+        )
+    try:
+        resume = decode_export_cursor(cursor) if cursor else None
+    except InvalidExportCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if resume is not None and section is not None and resume.section != section:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid export cursor")
+
+    _get_child_or_404(db, tenant_id=tenant.id, child_id=child_id)
+    if (
+        resume is None
+        and count_export_rows(db, tenant_id=tenant.id, child_id=child_id)
+        > settings.export_stream_max_rows
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Export too large to stream; request it through /export-data/jobs",
+        )
+
+    tenant_id = tenant.id
+    sections = [section] if section is not None else None
+    chunk_rows = settings.export_stream_chunk_rows
+
+    def _records(stream_db: Session) -> Iterator[tuple[str, dict[str, Any], ExportCursor]]:
+        return iter_export_records(
+            stream_db,
+            tenant_id=tenant_id,
+            child_id=child_id,
+            sections=sections,
+            cursor=resume,
+            yield_per=chunk_rows,
+        )
+
+    if export_format == EXPORT_FORMAT_CSV:
+        return StreamingResponse(
+            _stream_with_own_session(
+                lambda stream_db: iter_csv_chunks(
+                    _records(stream_db), section=str(section), chunk_rows=chunk_rows
+                )
+            ),
+            media_type="text/csv; charset=utf-8",
+            headers={
+                "Content-Disposition": f'attachment; filename="export_{child_id}_{section}.csv"'
+            },
+        )
+    return StreamingResponse(
+        _stream_with_own_session(
+            lambda stream_db: iter_ndjson_chunks(_records(stream_db), chunk_rows=chunk_rows)
+        ),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="export_{child_id}.ndjson"'},
+    )
+
+
+@router.post("/export-data/jobs", response_model=ExportJobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_export_job(
+    child_id: Annotated[int, Query()],
+    db: DBSession,
+    tenant: Annotated[Tenant, Depends(get_current_tenant)],
+    membership: Annotated[Membership, Depends(require_role(["PARENT"]))],
+) -> ExportJobOut:
+    _get_child_or_404(db, tenant_id=tenant.id, child_id=child_id)
+    job = DataExportJob(
+        id=str(uuid4()),
+        tenant_id=tenant.id,
+        child_id=child_id,
+        requested_by_user_id=membership.user_id,
+        status=EXPORT_JOB_PENDING,
+        row_count=0,
+    )
+    db.add(job)
+    db.commit()
+    try:
+        enqueue_data_export(job.id)
+    except (RedisError, OSError) as exc:
+        logger.warning("data_export_enqueue_failed", extra={"job_id": job.id}, exc_info=True)
+        job.status = EXPORT_JOB_FAILED
+        job.error = "enqueue_failed"
+        job.completed_at = datetime.now(UTC)
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Export queue unavailable, try again shortly",
+        ) from exc
+    return _export_job_out(job)
+
+
+@router.get("/export-data/jobs/{job_id}", response_model=ExportJobOut)
+def get_export_job(
+    job_id: str,
+    db: DBSession,
+    tenant: Annotated[Tenant, Depends(get_current_tenant)],
+    _: Annotated[Membership, Depends(require_role(["PARENT"]))],
+) -> ExportJobOut:
+    return _export_job_out(_get_export_job_or_404(db, tenant_id=tenant.id, job_id=job_id))
+
+
+@router.get("/export-data/jobs/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    db: DBSession,
+    tenant: Annotated[Tenant, Depends(get_current_tenant)],
+    _: Annotated[Membership, Depends(require_role(["PARENT"]))],
+) -> StreamingResponse:
+    job = _get_export_job_or_404(db, tenant_id=tenant.id, job_id=job_id)
+    if job.status == EXPORT_JOB_EXPIRED or (
+        job.expires_at is not None and job.expires_at <= datetime.now(UTC)
+    ):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export expired")
+    if job.status != EXPORT_JOB_DONE or not job.storage_key:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Export not ready")
+    return StreamingResponse(
+        _stream_with_own_session(lambda stream_db: iter_export_artifact(stream_db, job_id=job_id)),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="export_{job.child_id}_{job.id}.ndjson.gz"'
+            )
+        },
+    )
@@ -23,6 +23,7 @@ from app.schemas.children import (
     FamilyGuardianInviteRequest,
     FamilyGuardianInviteResponse,
 )
+from app.services.learning_settings_cache import invalidate_tenant_learning_settings
 
 router = APIRouter(prefix="/family", tags=["family"])
 
@@ -345,4 +346,5 @@ def create_family_child(
         payload={"child_id": child.id, "source": "family.children.create"},
     )
     db.commit()
+    invalidate_tenant_learning_settings(tenant.id, db=db)
     return _to_child_out(child)
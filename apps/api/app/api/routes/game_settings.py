@@ -8,6 +8,7 @@ from sqlalchemy import select
 from app.api.deps import DBSession, get_current_tenant, require_role
 from app.models import ChildProfile, GameSettings, Membership, Tenant
 from app.schemas.game_settings import GameSettingsOut, GameSettingsUpsertRequest
+from app.services.learning_settings_cache import invalidate_tenant_learning_settings
 
 router = APIRouter(prefix="/api/parent", tags=["game-settings"])
 
@@ -122,4 +123,5 @@ def upsert_game_settings(
     settings.require_approval_after_minutes = payload.require_approval_after_minutes
 
     db.commit()
+    invalidate_tenant_learning_settings(tenant.id, db=db)
     return _to_response(settings)
@@ -13,7 +13,7 @@ from app.core.config import settings
 from app.models import ChildProfile, Skill, Subject, Tenant, User, Membership
 from app.models_learning import StudentLessonProgress, StudentSkillMastery
 from app.services.axion_learning_engine import AxionLearningEngine, NextLessonRecommendation
-from app.services.curriculum_loader import CurriculumLoader
+from app.services.curriculum_loader import CurriculumLoader, get_curriculum_loader
 from app.services.learning_repository import register_lesson_completion, update_skill_mastery
 from app.services.lesson_engine import LessonEngine, StudentSkillState
 from app.services.skill_graph import SkillGraph, build_graph
@@ -93,7 +93,7 @@ class LearnSkillsResponse(LearnRecommendationResponse):
 
 
 def _loader() -> CurriculumLoader:
-    return CurriculumLoader()
+    return get_curriculum_loader()
 
 
 def _graph() -> SkillGraph:
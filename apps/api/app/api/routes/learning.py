@@ -13,6 +13,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.api.deps import DBSession, EventSvc, get_current_tenant, get_current_user, require_role
 from app.models import AxionDecision, Lesson, Membership, Question, QuestionResult, QuestionTemplate, QuestionType, Skill, Subject, Tenant, Unit, User
 from app.schemas.learning import (
+    LearningAnswerBatchRequest,
+    LearningAnswerBatchResponse,
     LearningAnswerRequest,
     LearningAnswerResponse,
     LearningDifficultyMixOut,
@@ -39,11 +41,13 @@ from app.schemas.learning import (
     LearningSessionStartResponse,
 )
 from app.services.adaptive_learning import (
+    QuestionAnswerInput,
     daily_completed_learning_lessons,
     finish_adaptive_learning_session,
     resolve_effective_learning_settings,
     start_learning_session,
     track_question_answer,
+    track_question_answers,
 )
 from app.services.aprender import (
     LessonLockedError,
@@ -553,6 +557,80 @@ def submit_learning_answer(
     )
 
 
+@router.post("/answers/batch", response_model=LearningAnswerBatchResponse)
+def submit_learning_answers_batch(
+    payload: LearningAnswerBatchRequest,
+    db: DBSession,
+    tenant: Annotated[Tenant, Depends(get_current_tenant)],
+    user: Annotated[User, Depends(get_current_user)],
+    membership: Annotated[Membership, Depends(require_role(["CHILD", "PARENT", "TEACHER"]))],
+) -> LearningAnswerBatchResponse:
+    # Batch counterpart of /answer for clients that buffer a session (or a chunk of one).
+    # Remediation text is not generated here; wrong answers only flag retryRecommended.
+    active_child = resolve_child_context(
+        db,
+        tenant_id=tenant.id,
+        user=user,
+        membership=membership,
+        requested_child_id=payload.child_id,
+    )
+    try:
+        tracked = track_question_answers(
+            db,
+            user_id=user.id,
+            answers=[
+                QuestionAnswerInput(
+                    question_id=item.question_id,
+                    template_id=item.template_id,
+                    generated_variant_id=item.generated_variant_id,
+                    variant_id=item.variant_id,
+                    result=item.result,
+                    time_ms=item.time_ms,
+                )
+                for item in payload.answers
+            ],
+            tenant_id=tenant.id,
+        )
+        subject_by_skill: dict[str, str | None] = {}
+        for item, answer in zip(payload.answers, tracked):
+            if answer.skill_id not in subject_by_skill:
+                subject_by_skill[answer.skill_id] = _resolve_subject_name_for_skill(
+                    db, skill_id=answer.skill_id
+                )
+            subject_name = subject_by_skill[answer.skill_id]
+            if subject_name:
+                _apply_subject_mastery_once_per_decision(
+                    db,
+                    tenant_id=tenant.id,
+                    user_id=user.id,
+                    child_id=int(active_child.id),
+                    subject=subject_name,
+                    outcome=_to_mastery_outcome(item.result),
+                    correlation_id=_normalize_learning_correlation_id(item.correlation_id),
+                )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    db.commit()
+    return LearningAnswerBatchResponse(
+        results=[
+            LearningAnswerResponse(
+                questionId=answer.question_id,
+                templateId=answer.template_id,
+                generatedVariantId=answer.generated_variant_id,
+                skillId=answer.skill_id,
+                mastery=answer.mastery,
+                masteryDelta=answer.mastery_delta,
+                streakCorrect=answer.streak_correct,
+                streakWrong=answer.streak_wrong,
+                nextReviewAt=answer.next_review_at,
+                retryRecommended=answer.result == QuestionResult.WRONG,
+            )
+            for answer in tracked
+        ]
+    )
+
+
 @router.post("/session/start", response_model=LearningSessionStartResponse)
 def start_session(
     payload: LearningSessionStartRequest,
@@ -741,6 +819,8 @@ def finish_session(
                 tenant_id=tenant.id,
                 actor_user_id=user.id,
                 child_id=child_id,
+                experiment_key=decision.experiment_key or decision.experiment_id,
+                variant=decision.variant,
                 payload={
                     "decision_id": payload.decision_id,
                     "child_id": child_id,
@@ -8,6 +8,7 @@ from sqlalchemy import select
 from app.api.deps import DBSession, get_current_tenant, require_role
 from app.models import ChildProfile, LearningSettings, Membership, QuestionDifficulty, Tenant
 from app.schemas.learning_settings import LearningSettingsOut, LearningSettingsUpsertRequest
+from app.services.learning_settings_cache import invalidate_tenant_learning_settings
 
 router = APIRouter(prefix="/api/parent", tags=["learning-settings"])
 
@@ -120,4 +121,5 @@ def upsert_learning_settings(
     settings.enabled_subjects = payload.enabled_subjects
 
     db.commit()
+    invalidate_tenant_learning_settings(tenant.id, db=db)
     return _to_response(settings)
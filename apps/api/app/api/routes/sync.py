@@ -4,12 +4,17 @@ from datetime import date
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-
 from app.api.deps import DBSession, EventSvc, get_current_tenant, get_current_user, require_role
-from app.models import ChildProfile, DailyMission, Membership, Task, TaskLog, TaskLogStatus, Tenant, User
+from app.models import Membership, Tenant, User
 from app.schemas.sync import SyncBatchFailedItem, SyncBatchItem, SyncBatchRequest, SyncBatchResponse
 from app.services.daily_mission_service import DailyMissionCompletionError, complete_daily_mission_by_id
+from app.services.sync_batch import (
+    PendingRoutineMark,
+    SyncBatchContext,
+    flush_sync_batch,
+    load_sync_batch_context,
+    record_processed_items,
+)
 
 router = APIRouter(prefix="/sync", tags=["sync"])
 
@@ -26,6 +31,7 @@ def _process_routine_mark(
     user: User,
     db: DBSession,
     events: EventSvc,
+    context: SyncBatchContext,
 ) -> None:
     raw_child_id = item.payload.get("child_id")
     raw_task_id = item.payload.get("task_id")
@@ -37,53 +43,17 @@ def _process_routine_mark(
     if mark_date > date.today():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Future dates are not allowed")
 
-    child = db.scalar(
-        select(ChildProfile).where(
-            ChildProfile.id == raw_child_id,
-            ChildProfile.tenant_id == tenant.id,
-            ChildProfile.deleted_at.is_(None),
-        ),
-    )
-    if child is None:
+    if raw_child_id not in context.children:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-
-    task = db.scalar(
-        select(Task).where(
-            Task.id == raw_task_id,
-            Task.tenant_id == tenant.id,
-            Task.is_active.is_(True),
-            Task.deleted_at.is_(None),
-        ),
-    )
-    if task is None:
+    if raw_task_id not in context.active_task_ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    existing = db.scalar(
-        select(TaskLog).where(
-            TaskLog.tenant_id == tenant.id,
-            TaskLog.child_id == raw_child_id,
-            TaskLog.task_id == raw_task_id,
-            TaskLog.date == mark_date,
-        ),
-    )
-    if existing is not None:
+    if context.has_mark(raw_child_id, raw_task_id, mark_date):
         return
 
-    log = TaskLog(
-        tenant_id=tenant.id,
-        child_id=raw_child_id,
-        task_id=raw_task_id,
-        date=mark_date,
-        status=TaskLogStatus.PENDING,
-    )
-    db.add(log)
-    db.flush()
-    events.emit(
-        type="routine.marked",
-        tenant_id=tenant.id,
-        actor_user_id=user.id,
-        child_id=raw_child_id,
-        payload={"log_id": log.id, "task_id": raw_task_id, "date": str(mark_date), "source": "sync.batch"},
+    context.add_mark(
+        PendingRoutineMark(
+            item_id=item.id, child_id=raw_child_id, task_id=raw_task_id, mark_date=mark_date
+        ),
     )
 
 
@@ -93,6 +63,7 @@ def _process_coach_use(
     user: User,
     db: DBSession,
     events: EventSvc,
+    context: SyncBatchContext,
 ) -> None:
     raw_child_id = item.payload.get("child_id")
     raw_mode = item.payload.get("mode")
@@ -104,22 +75,24 @@ def _process_coach_use(
     if raw_message is not None and not isinstance(raw_message, str):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid coach.use message")
 
-    child = db.scalar(
-        select(ChildProfile).where(
-            ChildProfile.id == raw_child_id,
-            ChildProfile.tenant_id == tenant.id,
-            ChildProfile.deleted_at.is_(None),
-        ),
-    )
-    if child is None:
+    if raw_child_id not in context.children:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
 
-    events.emit(
-        type="ai.coach.used",
-        tenant_id=tenant.id,
-        actor_user_id=user.id,
-        child_id=raw_child_id,
-        payload={"mode": raw_mode, "has_message": raw_message is not None, "source": "sync.batch"},
+    context.pending_events.append(
+        (
+            item.id,
+            {
+                "type": "ai.coach.used",
+                "tenant_id": tenant.id,
+                "actor_user_id": user.id,
+                "child_id": raw_child_id,
+                "payload": {
+                    "mode": raw_mode,
+                    "has_message": raw_message is not None,
+                    "source": "sync.batch",
+                },
+            },
+        ),
     )
 
 
@@ -129,33 +102,28 @@ def _process_daily_mission_complete(
     user: User,
     db: DBSession,
     events: EventSvc,
+    context: SyncBatchContext,
 ) -> None:
     raw_mission_id = item.payload.get("mission_id")
     if not isinstance(raw_mission_id, str) or not raw_mission_id.strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid daily_mission.complete payload")
 
-    mission = db.scalar(select(DailyMission).where(DailyMission.id == raw_mission_id))
+    mission = context.missions.get(raw_mission_id)
     if mission is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Daily mission not found")
-
-    child = db.scalar(
-        select(ChildProfile).where(
-            ChildProfile.id == mission.child_id,
-            ChildProfile.tenant_id == tenant.id,
-            ChildProfile.deleted_at.is_(None),
-        ),
-    )
-    if child is None:
+    if mission.child_id not in context.children:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
 
+    # Completion writes ledger rows and rewards, so it runs in its own savepoint.
     try:
-        complete_daily_mission_by_id(
-            db=db,
-            events=events,
-            tenant=tenant,
-            user=user,
-            mission_id=raw_mission_id,
-        )
+        with db.begin_nested():
+            complete_daily_mission_by_id(
+                db=db,
+                events=events,
+                tenant=tenant,
+                user=user,
+                mission_id=raw_mission_id,
+            )
     except HTTPException as exc:
         if exc.status_code == status.HTTP_409_CONFLICT:
             return
@@ -173,23 +141,33 @@ def sync_batch(
     user: Annotated[User, Depends(get_current_user)],
     _: Annotated[Membership, Depends(require_role(["PARENT", "TEACHER"]))],
 ) -> SyncBatchResponse:
+    context = load_sync_batch_context(db, tenant_id=tenant.id, user_id=user.id, items=payload.items)
     processed = 0
     failed: list[SyncBatchFailedItem] = []
+    completed_items: list[SyncBatchItem] = []
+    deferred_items: dict[str, SyncBatchItem] = {}
 
     for item in payload.items:
+        if item.id in context.processed_item_ids:
+            # Replayed by the client after an earlier successful sync.
+            processed += 1
+            continue
         try:
+            deferred_before = context.deferred_count
             if item.type == "routine.mark":
-                _process_routine_mark(item, tenant, user, db, events)
+                _process_routine_mark(item, tenant, user, db, events, context)
             elif item.type == "coach.use":
-                _process_coach_use(item, tenant, user, db, events)
+                _process_coach_use(item, tenant, user, db, events, context)
             elif item.type == "daily_mission.complete":
-                _process_daily_mission_complete(item, tenant, user, db, events)
+                _process_daily_mission_complete(item, tenant, user, db, events, context)
             else:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported type {item.type}")
-            db.commit()
+            if context.deferred_count > deferred_before:
+                deferred_items[item.id] = item
+            else:
+                completed_items.append(item)
             processed += 1
         except Exception as exc:
-            db.rollback()
             failed.append(
                 SyncBatchFailedItem(
                     id=item.id,
@@ -198,4 +176,26 @@ def sync_batch(
                 ),
             )
 
+    if deferred_items:
+        try:
+            with db.begin_nested():
+                flush_sync_batch(db, events, context, actor_user_id=user.id)
+            completed_items.extend(deferred_items.values())
+        except Exception:
+            # One bad row (e.g. a task deleted concurrently) must only fail its own item.
+            for item in deferred_items.values():
+                try:
+                    with db.begin_nested():
+                        flush_sync_batch(
+                            db, events, context.for_item(item.id), actor_user_id=user.id
+                        )
+                    completed_items.append(item)
+                except Exception as exc:
+                    processed -= 1
+                    failed.append(
+                        SyncBatchFailedItem(id=item.id, type=item.type, error=_error_message(exc))
+                    )
+
+    record_processed_items(db, tenant_id=tenant.id, user_id=user.id, items=completed_items)
+    db.commit()
     return SyncBatchResponse(processed=processed, failed=failed)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import math
-from datetime import date, timedelta
+from datetime import UTC, date, datetime, time, timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -28,7 +28,8 @@ from app.schemas.wallet import (
     WalletSummaryResponse,
 )
 from app.services.goals import sync_locked_goals_for_child
-from app.services.wallet import extract_pot_split, signed_amount_cents, split_amount_by_pots
+from app.services.wallet import ledger_balance_delta, split_amount_by_pots
+from app.services.wallet_balances import get_wallet_balance
 
 router = APIRouter(tags=["wallet"])
 
@@ -56,32 +57,14 @@ def _get_child_and_wallet(db: DBSession, tenant_id: int, child_id: int) -> tuple
     return child, wallet
 
 
-def _build_wallet_summary(db: DBSession, tenant_id: int, wallet: Wallet, child_id: int) -> WalletSummaryResponse:
-    transactions = db.scalars(
-        select(LedgerTransaction)
-        .where(
-            LedgerTransaction.tenant_id == tenant_id,
-            LedgerTransaction.wallet_id == wallet.id,
-        )
-        .order_by(LedgerTransaction.created_at.asc()),
-    ).all()
-
-    total_balance = 0
-    pot_balances = {"SPEND": 0, "SAVE": 0, "DONATE": 0}
-    for tx in transactions:
-        signed = signed_amount_cents(tx.type, tx.amount_cents)
-        total_balance += signed
-
-        split = extract_pot_split(tx.metadata_json)
-        for pot in ("SPEND", "SAVE", "DONATE"):
-            pot_balances[pot] += split.get(pot, 0) if signed >= 0 else -split.get(pot, 0)
-
+def _build_wallet_summary(db: DBSession, wallet: Wallet, child_id: int) -> WalletSummaryResponse:
+    balance = get_wallet_balance(db, wallet_id=wallet.id)
     return WalletSummaryResponse(
         child_id=child_id,
         wallet_id=wallet.id,
         currency_code=wallet.currency_code,
-        total_balance_cents=total_balance,
-        pot_balances_cents=pot_balances,
+        total_balance_cents=balance.total_cents,
+        pot_balances_cents=dict(balance.pot_balances_cents),
     )
 
 
@@ -93,7 +76,7 @@ def wallet_summary(
     _: Annotated[Membership, Depends(require_role(["PARENT", "TEACHER"]))],
 ) -> WalletSummaryResponse:
     _, wallet = _get_child_and_wallet(db, tenant.id, child_id)
-    return _build_wallet_summary(db, tenant.id, wallet, child_id)
+    return _build_wallet_summary(db, wallet, child_id)
 
 
 @router.post("/wallet/allowance/run", response_model=LedgerTransactionOut, status_code=status.HTTP_201_CREATED)
@@ -244,33 +227,25 @@ def goal_projection(
     if goal is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
 
-    transactions = db.scalars(
+    saved_total = get_wallet_balance(db, wallet_id=wallet.id).pot_balances_cents["SAVE"]
+
+    threshold = date.today() - timedelta(days=29)
+    recent_transactions = db.scalars(
         select(LedgerTransaction)
         .where(
             LedgerTransaction.tenant_id == tenant.id,
             LedgerTransaction.wallet_id == wallet.id,
+            LedgerTransaction.created_at >= datetime.combine(threshold, time.min, tzinfo=UTC),
         )
         .order_by(LedgerTransaction.created_at.asc()),
     ).all()
 
-    saved_total = 0
     recent_daily: dict[date, int] = {}
-    threshold = date.today() - timedelta(days=29)
-    for tx in transactions:
-        signed = signed_amount_cents(tx.type, tx.amount_cents)
-        split = extract_pot_split(tx.metadata_json)
-        save_amount = split.get("SAVE", 0)
-        if save_amount == 0:
+    for tx in recent_transactions:
+        save_amount = ledger_balance_delta(tx.type, tx.amount_cents, tx.metadata_json)["SAVE"]
+        if save_amount == 0 or tx.created_at.date() < threshold:
             continue
-
-        if signed >= 0:
-            saved_total += save_amount
-            if tx.created_at.date() >= threshold:
-                recent_daily[tx.created_at.date()] = recent_daily.get(tx.created_at.date(), 0) + save_amount
-        else:
-            saved_total -= save_amount
-            if tx.created_at.date() >= threshold:
-                recent_daily[tx.created_at.date()] = recent_daily.get(tx.created_at.date(), 0) - save_amount
+        recent_daily[tx.created_at.date()] = recent_daily.get(tx.created_at.date(), 0) + save_amount
 
     remaining = max(goal.target_cents - saved_total, 0)
     avg_daily = sum(recent_daily.values()) / 30.0
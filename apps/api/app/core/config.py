@@ -15,6 +15,24 @@ class Settings(BaseSettings):
     jwt_secret: str
     app_env: str = "development"
     data_retention_days: int = 30
+    event_log_partitions_ahead_months: int = 3
+    event_log_retention_months: int = 18
+    event_log_archive_schema: str = "event_log_archive"
+    export_stream_chunk_rows: int = 500
+    export_stream_max_rows: int = 50000
+    export_artifact_part_bytes: int = 1048576
+    export_job_ttl_hours: int = 72
+    games_leaderboard_enabled: bool = False
+    games_leaderboard_ttl_days: int = 21
+    aprender_structure_cache_ttl_seconds: int = 300
+    learning_missions_cache_ttl_seconds: int = 600
+    learning_settings_cache_ttl_seconds: int = 60
+    auth_context_cache_ttl_seconds: int = 30
+    password_hash_workers: int = 4
+    password_hash_queue_limit: int = 4
+    password_hash_time_cost: int = 3
+    password_hash_memory_cost_kib: int = 65536
+    password_hash_parallelism: int = 4
     queue_name: str = "axiora:jobs"
     cors_allowed_origins: str = ""
     auth_cookie_secure: bool = True
@@ -211,6 +229,20 @@ class Settings(BaseSettings):
             "AXIORA_AXION_FEATURE_DRIFT_THRESHOLDS_JSON",
         ),
     )
+    axion_retention_use_rollups: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "AXION_RETENTION_USE_ROLLUPS",
+            "AXIORA_AXION_RETENTION_USE_ROLLUPS",
+        ),
+    )
+    axion_retention_rollup_backfill_days: int = Field(
+        default=90,
+        validation_alias=AliasChoices(
+            "AXION_RETENTION_ROLLUP_BACKFILL_DAYS",
+            "AXIORA_AXION_RETENTION_ROLLUP_BACKFILL_DAYS",
+        ),
+    )
     axion_kill_switch: bool = Field(
         default=False,
         validation_alias=AliasChoices(
@@ -253,6 +285,20 @@ class Settings(BaseSettings):
             "AXIORA_AXION_CONTENT_REVIEW_COOLDOWN_HOURS",
         ),
     )
+    axion_decision_telemetry_buffer_size: int = Field(
+        default=5000,
+        validation_alias=AliasChoices(
+            "AXION_DECISION_TELEMETRY_BUFFER_SIZE",
+            "AXIORA_AXION_DECISION_TELEMETRY_BUFFER_SIZE",
+        ),
+    )
+    axion_decision_telemetry_flush_interval_seconds: float = Field(
+        default=2.0,
+        validation_alias=AliasChoices(
+            "AXION_DECISION_TELEMETRY_FLUSH_INTERVAL_SECONDS",
+            "AXIORA_AXION_DECISION_TELEMETRY_FLUSH_INTERVAL_SECONDS",
+        ),
+    )
     axion_prerequisite_mastery_threshold: float = Field(
         default=0.6,
         validation_alias=AliasChoices(
@@ -8,6 +8,8 @@ from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from app.core.security import PasswordHashingBusyError
+
 logger = logging.getLogger("axiora.api.errors")
 
 _STATUS_CODE_TO_ERROR_CODE: dict[int, str] = {
@@ -71,6 +73,14 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+async def password_hashing_busy_handler(request: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=_build_error(code="AUTH_BUSY", message="Authentication is busy, try again shortly"),
+        headers={"Retry-After": "1"},
+    )
+
+
 async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     logger.exception(
         "unhandled_exception",
@@ -85,4 +95,5 @@ async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONR
 def register_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(HTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(PasswordHashingBusyError, password_hashing_busy_handler)
     app.add_exception_handler(Exception, unhandled_exception_handler)
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+import logging
 import re
+from threading import Lock
 from typing import Any
 from secrets import token_urlsafe
 
 import jwt
 from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 
 from app.core.config import settings
+from app.observability.axion_metrics import (
+    safe_increment_password_hash_rejected_total,
+    safe_set_password_hash_in_flight,
+)
 
 JWT_ISSUER = "axiora-path"
 ACCESS_TOKEN_MINUTES = 15
@@ -17,17 +25,107 @@ REFRESH_TOKEN_DAYS = 7
 REFRESH_COOKIE_NAME = "axiora_refresh_token"
 CSRF_COOKIE_NAME = "axiora_csrf_token"
 
-_password_hasher = PasswordHasher()
+_password_hasher = PasswordHasher(
+    time_cost=settings.password_hash_time_cost,
+    memory_cost=settings.password_hash_memory_cost_kib,
+    parallelism=settings.password_hash_parallelism,
+)
+
+logger = logging.getLogger("axiora.api.security")
+
+# Callers are sync routes that park an AnyIO threadpool thread (40 by default) while they
+# wait on the executor, so running plus queued hashing never holds more than a quarter of it.
+_MAX_REQUEST_THREADS_ON_HASHING = 10
+
+_HASH_EXECUTOR_LOCK = Lock()
+_hash_executor: ThreadPoolExecutor | None = None
+_hash_in_flight = 0
+_hash_rejected_total = 0
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised instead of queueing when the password hashing executor is saturated."""
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.password_hash_workers),
+            thread_name_prefix="password-hash",
+        )
+    return _hash_executor
+
+
+def _hash_capacity() -> int:
+    configured = max(1, settings.password_hash_workers) + max(0, settings.password_hash_queue_limit)
+    return min(configured, _MAX_REQUEST_THREADS_ON_HASHING)
+
+
+def _run_password_hashing[T](fn: Callable[..., T], *args: Any) -> T:
+    """Run argon2 work on the dedicated executor, rejecting fast when its queue is full.
+
+    argon2 releases the GIL, so the bounded pool caps hashing CPU; the in-flight cap keeps a
+    login burst from parking the request threadpool on the queue.
+    """
+    global _hash_in_flight, _hash_rejected_total
+    capacity = _hash_capacity()
+    with _HASH_EXECUTOR_LOCK:
+        if _hash_in_flight >= capacity:
+            _hash_rejected_total += 1
+            safe_increment_password_hash_rejected_total()
+            logger.warning(
+                "password_hashing_rejected",
+                extra={
+                    "in_flight": _hash_in_flight,
+                    "capacity": capacity,
+                    "rejected_total": _hash_rejected_total,
+                },
+            )
+            raise PasswordHashingBusyError("Password hashing queue is full")
+        _hash_in_flight += 1
+        safe_set_password_hash_in_flight(_hash_in_flight)
+        executor = _get_hash_executor()
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        with _HASH_EXECUTOR_LOCK:
+            _hash_in_flight -= 1
+            safe_set_password_hash_in_flight(_hash_in_flight)
+
+
+def password_hashing_stats() -> dict[str, int]:
+    """Queue depth of the password hashing executor (running plus waiting) and rejections so far."""
+    with _HASH_EXECUTOR_LOCK:
+        return {
+            "workers": max(1, settings.password_hash_workers),
+            "queue_limit": max(0, settings.password_hash_queue_limit),
+            "capacity": _hash_capacity(),
+            "in_flight": _hash_in_flight,
+            "rejected_total": _hash_rejected_total,
+        }
+
+
+def _verify_password_sync(password: str, password_hash: str) -> bool:
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except VerifyMismatchError:
+        return False
 
 
 def hash_password(password: str) -> str:
-    return _password_hasher.hash(password)
+    return _run_password_hashing(_password_hasher.hash, password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
+    return _run_password_hashing(_verify_password_sync, password, password_hash)
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """True when the stored hash was made with different argon2 costs than the current ones."""
     try:
-        return _password_hasher.verify(password_hash, password)
-    except VerifyMismatchError:
+        return _password_hasher.check_needs_rehash(password_hash)
+    except InvalidHashError:
         return False
 
 
@@ -49,6 +147,7 @@ def _create_token(
         "type": token_type,
         "iat": int(now.timestamp()),
         "exp": int((now + expires_delta).timestamp()),
+        "jti": token_urlsafe(16),
     }
     if extra_claims:
         payload.update(extra_claims)
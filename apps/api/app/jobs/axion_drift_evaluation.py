@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.services.axion_drift import evaluate_drift_statuses
+
+logger = logging.getLogger("axiora.api.axion_drift")
+
+
+def run_axion_drift_evaluation_job(
+    db: Session,
+    *,
+    experiment_key: str | None = "nba_retention_v1",
+) -> dict[str, Any]:
+    """Evaluate drift for every tenant with histogram or outcome data in one batch."""
+    statuses = evaluate_drift_statuses(db, experiment_key=experiment_key)
+    warned = {tenant_id: status for tenant_id, status in statuses.items() if status.status != "OK"}
+    for tenant_id, status in warned.items():
+        logger.warning(
+            "axion_drift.detected",
+            extra={
+                "tenant_id": tenant_id,
+                "status": status.status,
+                "experiment_key": experiment_key,
+                "feature_drift_score": status.feature_drift_score,
+                "outcome_drift_pct": status.outcome_drift_pct,
+                "top_drifting_features": status.top_drifting_features,
+            },
+        )
+    return {
+        "experiment_key": experiment_key,
+        "tenants_evaluated": len(statuses),
+        "tenants_warned": len(warned),
+        "warned_tenant_ids": sorted(warned),
+    }
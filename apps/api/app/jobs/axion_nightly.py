@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy.orm import Session
 
 from app.services.axion_core_v2 import run_axion_nightly
+from app.services.axion_feature_vector import refresh_feature_store
 
 
 def run_axion_nightly_job(
@@ -11,9 +12,11 @@ def run_axion_nightly_job(
     batch_size: int = 250,
     active_window_days: int = 45,
 ) -> dict[str, int]:
-    return run_axion_nightly(
+    result = run_axion_nightly(
         db,
         batch_size=batch_size,
         active_window_days=active_window_days,
     )
-
+    # Same active window as the nightly decisions, so every user it touched has today's features.
+    result["feature_store_rows"] = refresh_feature_store(db, active_window_days=active_window_days)
+    return result
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.services.axion_retention_rollup import refresh_axion_retention_rollups
+
+
+def run_axion_retention_rollup_job(
+    db: Session,
+    *,
+    through_day: date | None = None,
+    backfill_days: int | None = None,
+) -> dict[str, int | str | None]:
+    return refresh_axion_retention_rollups(
+        db,
+        through_day=through_day,
+        backfill_days=backfill_days,
+    )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import DataExportArtifactPart, DataExportJob
+from app.services.data_export import (
+    ExportCursor,
+    iter_export_records,
+    iter_ndjson_chunks,
+    write_gzip_export,
+)
+
+EXPORT_JOB_PENDING = "PENDING"
+EXPORT_JOB_RUNNING = "RUNNING"
+EXPORT_JOB_DONE = "DONE"
+EXPORT_JOB_FAILED = "FAILED"
+EXPORT_JOB_EXPIRED = "EXPIRED"
+
+
+def export_storage_key(job: DataExportJob) -> str:
+    return f"{DataExportArtifactPart.__tablename__}/{job.id}"
+
+
+def iter_export_artifact(db: Session, *, job_id: str) -> Iterator[bytes]:
+    """Yield the stored gzip artifact one part at a time.
+
+    A large export is therefore never fully held in memory.
+    """
+    part = 0
+    while True:
+        data = db.scalar(
+            select(DataExportArtifactPart.data).where(
+                DataExportArtifactPart.job_id == job_id,
+                DataExportArtifactPart.part == part,
+            )
+        )
+        if data is None:
+            return
+        yield bytes(data)
+        part += 1
+
+
+def generate_data_export(db: Session, *, job_id: str) -> dict[str, int | str]:
+    job = db.get(DataExportJob, job_id)
+    if job is None:
+        return {"status": "missing", "rows": 0}
+    if job.status in {EXPORT_JOB_DONE, EXPORT_JOB_EXPIRED}:
+        return {"status": job.status, "rows": int(job.row_count or 0)}
+
+    job.status = EXPORT_JOB_RUNNING
+    db.commit()
+
+    row_count = 0
+    part_bytes = max(1, int(settings.export_artifact_part_bytes))
+
+    def _counted_records() -> Iterator[tuple[str, dict[str, Any], ExportCursor]]:
+        nonlocal row_count
+        for record in iter_export_records(
+            db,
+            tenant_id=job.tenant_id,
+            child_id=job.child_id,
+            yield_per=settings.export_stream_chunk_rows,
+        ):
+            row_count += 1
+            yield record
+
+    try:
+        # Spool to a local temp file first, then copy into Postgres so the API (a separate
+        # image with its own filesystem) can serve the artifact.
+        with tempfile.TemporaryFile() as handle:
+            size = write_gzip_export(
+                iter_ndjson_chunks(
+                    _counted_records(), chunk_rows=settings.export_stream_chunk_rows
+                ),
+                handle=handle,
+            )
+            handle.seek(0)
+            db.execute(
+                delete(DataExportArtifactPart).where(DataExportArtifactPart.job_id == job.id)
+            )
+            part = 0
+            while data := handle.read(part_bytes):
+                db.execute(
+                    insert(DataExportArtifactPart).values(job_id=job.id, part=part, data=data)
+                )
+                part += 1
+    except Exception as exc:
+        db.rollback()
+        job.status = EXPORT_JOB_FAILED
+        job.error = str(exc)[:2000]
+        job.completed_at = datetime.now(UTC)
+        return {"status": job.status, "rows": row_count}
+
+    completed_at = datetime.now(UTC)
+    job.status = EXPORT_JOB_DONE
+    job.row_count = row_count
+    job.storage_key = export_storage_key(job)
+    job.file_size_bytes = size
+    job.error = None
+    job.completed_at = completed_at
+    job.expires_at = completed_at + timedelta(hours=max(1, int(settings.export_job_ttl_hours)))
+    return {"status": job.status, "rows": row_count, "bytes": size}
+
+
+def purge_expired_data_exports(db: Session, *, now: datetime | None = None) -> dict[str, int]:
+    """Delete stored artifacts of finished exports past `expires_at` and mark the jobs EXPIRED."""
+    reference = now or datetime.now(UTC)
+    expired_jobs = select(DataExportJob.id).where(
+        DataExportJob.status == EXPORT_JOB_DONE,
+        DataExportJob.expires_at.is_not(None),
+        DataExportJob.expires_at <= reference,
+    )
+    parts = cast(
+        CursorResult[Any],
+        db.execute(
+            delete(DataExportArtifactPart).where(DataExportArtifactPart.job_id.in_(expired_jobs))
+        ),
+    )
+    jobs = cast(
+        CursorResult[Any],
+        db.execute(
+            update(DataExportJob)
+            .where(DataExportJob.id.in_(expired_jobs))
+            .values(status=EXPORT_JOB_EXPIRED, storage_key=None)
+            .execution_options(synchronize_session=False)
+        ),
+    )
+    return {"expired_jobs": int(jobs.rowcount or 0), "deleted_parts": int(parts.rowcount or 0)}
@@ -3,13 +3,22 @@ from __future__ import annotations
 from app.services.queue import enqueue_job
 
 
-def enqueue_weekly_summary(reference_date: str | None = None) -> str:
-    payload: dict[str, str] = {}
+def enqueue_weekly_summary(reference_date: str | None = None, tenant_id: int | None = None) -> str:
+    payload: dict[str, str | int] = {}
     if reference_date:
         payload["reference_date"] = reference_date
+    if tenant_id is not None:
+        payload["tenant_id"] = int(tenant_id)
     return enqueue_job("weekly.summary.generate", payload=payload)
 
 
+def enqueue_weekly_summary_fanout(reference_date: str | None = None) -> str:
+    payload: dict[str, str] = {}
+    if reference_date:
+        payload["reference_date"] = reference_date
+    return enqueue_job("weekly.summary.fanout", payload=payload)
+
+
 def enqueue_purge_deleted_data() -> str:
     return enqueue_job("purge.deleted_data", payload={})
 
@@ -22,3 +31,69 @@ def enqueue_axion_nightly(batch_size: int = 250, active_window_days: int = 45) -
             "active_window_days": max(1, int(active_window_days)),
         },
     )
+
+
+def enqueue_event_log_partitions(
+    months_ahead: int | None = None, retain_months: int | None = None
+) -> str:
+    payload: dict[str, int] = {}
+    if months_ahead is not None:
+        payload["months_ahead"] = max(1, int(months_ahead))
+    if retain_months is not None:
+        payload["retain_months"] = max(1, int(retain_months))
+    return enqueue_job("event_log.partitions.maintain", payload=payload)
+
+
+def enqueue_axion_retention_rollup(
+    through_day: str | None = None, backfill_days: int | None = None
+) -> str:
+    payload: dict[str, str | int] = {}
+    if through_day:
+        payload["through_day"] = through_day
+    if backfill_days is not None:
+        payload["backfill_days"] = max(1, int(backfill_days))
+    return enqueue_job("axion.retention.rollup.refresh", payload=payload)
+
+
+def enqueue_data_export(job_id: str) -> str:
+    return enqueue_job("export.data.generate", payload={"job_id": job_id})
+
+
+def enqueue_data_export_purge() -> str:
+    return enqueue_job("export.data.purge_expired", payload={})
+
+
+def enqueue_wallet_balance_verify(full_replay: bool = False, repair: bool = False) -> str:
+    return enqueue_job(
+        "wallet.balances.verify",
+        payload={"full_replay": bool(full_replay), "repair": bool(repair)},
+    )
+
+
+def enqueue_axion_drift_evaluation(experiment_key: str = "nba_retention_v1") -> str:
+    return enqueue_job("axion.drift.evaluate", payload={"experiment_key": experiment_key})
+
+
+def enqueue_game_leaderboard_rebuild(
+    weeks: int = 1, tenant_id: int | None = None, game_id: str | None = None
+) -> str:
+    payload: dict[str, str | int] = {"weeks": max(1, int(weeks))}
+    if tenant_id is not None:
+        payload["tenant_id"] = int(tenant_id)
+    if game_id:
+        payload["game_id"] = game_id
+    return enqueue_job("games.leaderboard.rebuild", payload=payload)
+
+
+def enqueue_game_league_rollover(tenant_id: int | None = None) -> str:
+    payload: dict[str, int] = {}
+    if tenant_id is not None:
+        payload["tenant_id"] = int(tenant_id)
+    return enqueue_job("games.league.rollover", payload=payload)
+
+
+def enqueue_weekly_missions_provision(weeks_ahead: int = 1, target_date: str | None = None) -> str:
+    payload: dict[str, str | int] = {"weeks_ahead": max(0, int(weeks_ahead))}
+    if target_date:
+        payload["target_date"] = target_date
+    return enqueue_job("learning.missions.provision", payload=payload)
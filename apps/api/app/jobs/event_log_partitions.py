@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+EVENT_LOG_TABLE = "event_log"
+EVENT_LOG_DEFAULT_PARTITION = "event_log_default"
+_PARTITION_NAME_RE = re.compile(r"^event_log_y(?P<year>\d{4})m(?P<month>\d{2})$")
+_SCHEMA_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name_for(month_start: date) -> str:
+    return f"{EVENT_LOG_TABLE}_y{month_start.year:04d}m{month_start.month:02d}"
+
+
+def parse_partition_month(name: str) -> date | None:
+    match = _PARTITION_NAME_RE.match(name)
+    if match is None:
+        return None
+    return date(int(match.group("year")), int(match.group("month")), 1)
+
+
+def list_event_log_partitions(db: Session) -> list[str]:
+    rows = (
+        db.execute(
+            text(
+                """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :table_name
+            ORDER BY child.relname ASC
+            """
+            ),
+            {"table_name": EVENT_LOG_TABLE},
+        )
+        .scalars()
+        .all()
+    )
+    return [str(item) for item in rows]
+
+
+def ensure_event_log_partitions(
+    db: Session,
+    *,
+    months_ahead: int | None = None,
+    reference_date: date | None = None,
+) -> list[str]:
+    """Create monthly partitions from the current month up to `months_ahead` months out."""
+    resolved_ahead = max(
+        1,
+        int(
+            months_ahead if months_ahead is not None else settings.event_log_partitions_ahead_months
+        ),
+    )
+    current_month = _month_start(reference_date or datetime.now(UTC).date())
+    existing = set(list_event_log_partitions(db))
+
+    created: list[str] = []
+    for offset in range(resolved_ahead + 1):
+        month_start = _add_months(current_month, offset)
+        name = partition_name_for(month_start)
+        if name in existing:
+            continue
+        next_month = _add_months(month_start, 1)
+        db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {EVENT_LOG_TABLE} "
+                f"FOR VALUES FROM ('{month_start.isoformat()} 00:00:00+00') "
+                f"TO ('{next_month.isoformat()} 00:00:00+00')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+def detach_expired_event_log_partitions(
+    db: Session,
+    *,
+    retain_months: int | None = None,
+    archive_schema: str | None = None,
+    reference_date: date | None = None,
+) -> list[str]:
+    """Detach partitions older than the retention window and move them to the archive schema.
+
+    Detached tables keep their rows, so ops can dump and drop them on their own schedule.
+    """
+    resolved_retain = max(
+        1, int(retain_months if retain_months is not None else settings.event_log_retention_months)
+    )
+    resolved_schema = (archive_schema or settings.event_log_archive_schema or "").strip().lower()
+    if not _SCHEMA_NAME_RE.match(resolved_schema):
+        raise ValueError(f"invalid event_log archive schema: {resolved_schema!r}")
+    cutoff = _add_months(_month_start(reference_date or datetime.now(UTC).date()), -resolved_retain)
+
+    expired = [
+        name
+        for name in list_event_log_partitions(db)
+        if (month_start := parse_partition_month(name)) is not None and month_start < cutoff
+    ]
+    if not expired:
+        return []
+
+    db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {resolved_schema}"))
+    for name in expired:
+        db.execute(text(f"ALTER TABLE {EVENT_LOG_TABLE} DETACH PARTITION {name}"))
+        db.execute(text(f"ALTER TABLE {name} SET SCHEMA {resolved_schema}"))
+    return expired
+
+
+def count_default_partition_rows(db: Session) -> int:
+    value = db.execute(
+        text(f"SELECT COUNT(*)::int FROM {EVENT_LOG_DEFAULT_PARTITION}")
+    ).scalar_one_or_none()
+    return int(value or 0)
+
+
+def maintain_event_log_partitions(
+    db: Session,
+    *,
+    months_ahead: int | None = None,
+    retain_months: int | None = None,
+    reference_date: date | None = None,
+) -> dict[str, int]:
+    created = ensure_event_log_partitions(
+        db, months_ahead=months_ahead, reference_date=reference_date
+    )
+    detached = detach_expired_event_log_partitions(
+        db,
+        retain_months=retain_months,
+        reference_date=reference_date,
+    )
+    return {
+        "created": len(created),
+        "detached": len(detached),
+        # Rows here mean inserts outside every monthly range; they block creating that
+        # month's partition.
+        "default_rows": count_default_partition_rows(db),
+    }
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.services.game_ranking import rebuild_weekly_leaderboards
+
+
+def rebuild_game_leaderboards(
+    db: Session,
+    *,
+    weeks: int = 1,
+    tenant_id: int | None = None,
+    game_id: str | None = None,
+) -> dict[str, int]:
+    return rebuild_weekly_leaderboards(db, weeks=weeks, tenant_id=tenant_id, game_id=game_id)
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.services.game_league import run_league_week_rollover
+
+
+def run_game_league_rollover(db: Session, *, tenant_id: int | None = None) -> dict[str, int]:
+    return run_league_week_rollover(db, tenant_id=tenant_id)
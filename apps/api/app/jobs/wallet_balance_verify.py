@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.services.wallet_balances import verify_wallet_balances
+
+logger = logging.getLogger("axiora.api.wallet_balances")
+
+
+def run_wallet_balance_verify_job(
+    db: Session, *, full_replay: bool = False, repair: bool = False
+) -> dict[str, Any]:
+    result = verify_wallet_balances(db, full_replay=full_replay, repair=repair)
+    if result["drifted"]:
+        logger.warning(
+            "wallet_balances.drift_detected",
+            extra={
+                "drifted": result["drifted"],
+                "drift_cents_total": result["drift_cents_total"],
+                "repaired": result["repaired"],
+                "drifts": result["drifts"],
+            },
+        )
+    return {key: value for key, value in result.items() if key != "drifts"}
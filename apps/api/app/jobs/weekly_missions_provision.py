@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.services.learning_retention import provision_weekly_missions
+
+
+def run_weekly_missions_provision(
+    db: Session,
+    *,
+    target_date: date | None = None,
+    weeks_ahead: int = 1,
+) -> dict[str, int]:
+    return provision_weekly_missions(db, target_date=target_date, weeks_ahead=weeks_ahead)
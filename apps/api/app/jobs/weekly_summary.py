@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date, timedelta
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, select
 from sqlalchemy.orm import Session
 
 from app.models import ChildProfile, EventLog, TaskLog, TaskLogStatus
 
+WEEKLY_SUMMARY_BATCH_SIZE = 500
+
 
 @dataclass(frozen=True)
 class WeeklySummary:
@@ -21,58 +25,118 @@ class WeeklySummary:
     completion_rate: float
 
 
-def generate_weekly_summaries(db: Session, *, reference_date: date | None = None) -> list[WeeklySummary]:
+def _week_window(reference_date: date | None) -> tuple[date, date]:
     today = reference_date or date.today()
     start_date = today - timedelta(days=today.weekday())
-    end_date = start_date + timedelta(days=6)
-
-    children = db.scalars(
-        select(ChildProfile).where(ChildProfile.deleted_at.is_(None)).order_by(ChildProfile.id.asc()),
-    ).all()
-    results: list[WeeklySummary] = []
-
-    for child in children:
-        logs = db.scalars(
-            select(TaskLog).where(
-                TaskLog.tenant_id == child.tenant_id,
-                TaskLog.child_id == child.id,
+    return start_date, start_date + timedelta(days=6)
+
+
+def _summary_event_row(summary: WeeklySummary) -> dict[str, Any]:
+    return {
+        "tenant_id": summary.tenant_id,
+        "actor_user_id": None,
+        "child_id": summary.child_id,
+        "type": "weekly.summary.generated",
+        "payload": {
+            "start_date": str(summary.start_date),
+            "end_date": str(summary.end_date),
+            "approved_count": summary.approved_count,
+            "pending_count": summary.pending_count,
+            "rejected_count": summary.rejected_count,
+            "completion_rate": summary.completion_rate,
+        },
+    }
+
+
+def list_weekly_summary_tenant_ids(db: Session) -> list[int]:
+    return [
+        int(tenant_id)
+        for tenant_id in db.scalars(
+            select(ChildProfile.tenant_id)
+            .where(ChildProfile.deleted_at.is_(None))
+            .group_by(ChildProfile.tenant_id)
+            .order_by(ChildProfile.tenant_id.asc()),
+        ).all()
+    ]
+
+
+def iter_weekly_summaries(
+    db: Session,
+    *,
+    reference_date: date | None = None,
+    tenant_id: int | None = None,
+    batch_size: int = WEEKLY_SUMMARY_BATCH_SIZE,
+) -> Iterator[WeeklySummary]:
+    """Stream one summary per non-deleted child from a single grouped query."""
+    start_date, end_date = _week_window(reference_date)
+    stmt = (
+        select(
+            ChildProfile.tenant_id,
+            ChildProfile.id,
+            func.count(TaskLog.id)
+            .filter(TaskLog.status == TaskLogStatus.APPROVED)
+            .label("approved_count"),
+            func.count(TaskLog.id)
+            .filter(TaskLog.status == TaskLogStatus.PENDING)
+            .label("pending_count"),
+            func.count(TaskLog.id)
+            .filter(TaskLog.status == TaskLogStatus.REJECTED)
+            .label("rejected_count"),
+            func.count(TaskLog.id).label("total_count"),
+        )
+        .select_from(ChildProfile)
+        .outerjoin(
+            TaskLog,
+            and_(
+                TaskLog.tenant_id == ChildProfile.tenant_id,
+                TaskLog.child_id == ChildProfile.id,
                 TaskLog.date >= start_date,
                 TaskLog.date <= end_date,
             ),
-        ).all()
-        approved_count = sum(1 for item in logs if item.status == TaskLogStatus.APPROVED)
-        pending_count = sum(1 for item in logs if item.status == TaskLogStatus.PENDING)
-        rejected_count = sum(1 for item in logs if item.status == TaskLogStatus.REJECTED)
-        total = len(logs)
-        completion_rate = (approved_count / total * 100) if total > 0 else 0.0
+        )
+        .where(ChildProfile.deleted_at.is_(None))
+        .group_by(ChildProfile.tenant_id, ChildProfile.id)
+        .order_by(ChildProfile.id.asc())
+        .execution_options(yield_per=max(1, batch_size))
+    )
+    if tenant_id is not None:
+        stmt = stmt.where(ChildProfile.tenant_id == tenant_id)
 
-        summary = WeeklySummary(
-            tenant_id=child.tenant_id,
-            child_id=child.id,
+    for row in db.execute(stmt):
+        total = int(row.total_count or 0)
+        approved_count = int(row.approved_count or 0)
+        completion_rate = (approved_count / total * 100) if total > 0 else 0.0
+        yield WeeklySummary(
+            tenant_id=int(row.tenant_id),
+            child_id=int(row.id),
             start_date=start_date,
             end_date=end_date,
             approved_count=approved_count,
-            pending_count=pending_count,
-            rejected_count=rejected_count,
+            pending_count=int(row.pending_count or 0),
+            rejected_count=int(row.rejected_count or 0),
             completion_rate=round(completion_rate, 2),
         )
-        results.append(summary)
-
-        db.add(
-            EventLog(
-                tenant_id=child.tenant_id,
-                actor_user_id=None,
-                child_id=child.id,
-                type="weekly.summary.generated",
-                payload={
-                    "start_date": str(start_date),
-                    "end_date": str(end_date),
-                    "approved_count": approved_count,
-                    "pending_count": pending_count,
-                    "rejected_count": rejected_count,
-                    "completion_rate": summary.completion_rate,
-                },
-            ),
-        )
 
-    return results
+
+def generate_weekly_summaries(
+    db: Session,
+    *,
+    reference_date: date | None = None,
+    tenant_id: int | None = None,
+    batch_size: int = WEEKLY_SUMMARY_BATCH_SIZE,
+) -> int:
+    """Persist `weekly.summary.generated` events in bulk batches; returns how many were written."""
+    generated = 0
+    pending_rows: list[dict[str, Any]] = []
+    for summary in iter_weekly_summaries(
+        db, reference_date=reference_date, tenant_id=tenant_id, batch_size=batch_size
+    ):
+        pending_rows.append(_summary_event_row(summary))
+        if len(pending_rows) >= batch_size:
+            db.execute(insert(EventLog), pending_rows)
+            generated += len(pending_rows)
+            pending_rows = []
+    if pending_rows:
+        db.execute(insert(EventLog), pending_rows)
+        generated += len(pending_rows)
+    return generated
@@ -51,11 +51,13 @@ from app.core.query_counter import register_query_counter_listener
 from app.core.rate_limit import RateLimitMiddleware
 from app.core.request_logging import RequestLoggingMiddleware
 from app.jobs.axion_experiment_health_runner import start_axion_experiment_health_scheduler
+from app.services.axion_decision_telemetry import decision_telemetry_sink
 from app.services.providers.config_validation import (
     validate_llm_provider_config_on_boot,
     validate_runtime_security_on_boot,
 )
 from app.services.schema_guard import enforce_schema_sync_on_startup
+from app.services.skill_graph import build_graph
 
 setup_json_logging()
 register_query_counter_listener()
@@ -66,13 +68,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     validate_llm_provider_config_on_boot()
     validate_runtime_security_on_boot()
     enforce_schema_sync_on_startup()
+    # Load the compiled curriculum and skill graph before the first request needs them.
+    build_graph()
     redis = Redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
     health_scheduler = start_axion_experiment_health_scheduler()
+    decision_telemetry_sink.start()
     app.state.redis = redis
     app.state.health_scheduler = health_scheduler
     try:
         yield
     finally:
+        decision_telemetry_sink.stop()
         scheduler = getattr(app.state, "health_scheduler", None)
         if scheduler is not None:
             try:
@@ -3,16 +3,19 @@ from __future__ import annotations
 from datetime import date, datetime
 from enum import Enum
 from typing import Any
+from uuid import UUID as UUIDValue
 
 from sqlalchemy import (
     Boolean,
     case,
+    ColumnElement,
     Date,
     DateTime,
     Enum as SqlEnum,
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -457,6 +460,7 @@ class GameSession(Base):
         Index("ix_game_sessions_user_id_created_at", "user_id", "created_at"),
         Index("ix_game_sessions_child_id_created_at", "child_id", "created_at"),
         Index("ix_game_sessions_child_game_id_created_at", "child_id", "game_id", "created_at"),
+        Index("ix_game_sessions_child_completed_created_at", "child_id", "completed", "created_at"),
     )
 
     id: Mapped[str] = mapped_column(
@@ -499,6 +503,56 @@ class GameSession(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
+class GameWeeklyLeaderboard(Base):
+    __tablename__ = "game_weekly_leaderboard"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "game_id",
+            "week_start",
+            "child_id",
+            name="uq_game_weekly_leaderboard_entry",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    game_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    week_start: Mapped[date] = mapped_column(Date, nullable=False)
+    child_id: Mapped[int] = mapped_column(ForeignKey("child_profiles.id", ondelete="CASCADE"), nullable=False)
+    best_score: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    best_duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    best_streak: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_played_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+@event.listens_for(GameSession, "after_insert")
+def _apply_game_session_to_achievement_counters(
+    _mapper: Any, connection: Any, target: GameSession
+) -> None:
+    from app.services.achievement_engine import apply_game_session_counters
+
+    apply_game_session_counters(connection, target)
+
+
+class GameChildDailyStats(Base):
+    __tablename__ = "game_child_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("child_id", "stat_date", name="uq_game_child_daily_stats_child_date"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"), nullable=True)
+    child_id: Mapped[int] = mapped_column(
+        ForeignKey("child_profiles.id", ondelete="CASCADE"), nullable=False
+    )
+    stat_date: Mapped[date] = mapped_column(Date, nullable=False)
+    sessions_completed: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    xp_earned: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
 class GameParticipant(Base):
     __tablename__ = "game_participants"
     __table_args__ = (
@@ -988,7 +1042,9 @@ class ChildGuardian(Base):
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    child_id: Mapped[int] = mapped_column(ForeignKey("child_profiles.id", ondelete="CASCADE"), nullable=False)
+    child_id: Mapped[int] = mapped_column(
+        ForeignKey("child_profiles.id", ondelete="CASCADE"), nullable=False
+    )
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     relationship: Mapped[str] = mapped_column(String(32), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1229,6 +1285,65 @@ class LedgerTransaction(Base):
     )
 
 
+class WalletBalance(Base):
+    __tablename__ = "wallet_balances"
+
+    wallet_id: Mapped[int] = mapped_column(
+        ForeignKey("wallets.id", ondelete="CASCADE"), primary_key=True
+    )
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    total_cents: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    spend_cents: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    save_cents: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    donate_cents: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_ledger_transaction_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class WalletBalanceCheckpoint(Base):
+    __tablename__ = "wallet_balance_checkpoints"
+    __table_args__ = (
+        Index(
+            "ix_wallet_balance_checkpoints_wallet_last_tx",
+            "wallet_id",
+            "last_ledger_transaction_id",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    wallet_id: Mapped[int] = mapped_column(
+        ForeignKey("wallets.id", ondelete="CASCADE"), nullable=False
+    )
+    last_ledger_transaction_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_cents: Mapped[int] = mapped_column(Integer, nullable=False)
+    spend_cents: Mapped[int] = mapped_column(Integer, nullable=False)
+    save_cents: Mapped[int] = mapped_column(Integer, nullable=False)
+    donate_cents: Mapped[int] = mapped_column(Integer, nullable=False)
+    drift_cents: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+@event.listens_for(LedgerTransaction, "after_insert")
+def _apply_ledger_transaction_to_wallet_balance(
+    _mapper: Any, connection: Any, target: LedgerTransaction
+) -> None:
+    # Imported lazily: the balance helpers depend on the enums defined in this module.
+    from app.services.wallet_balances import apply_ledger_transaction
+
+    apply_ledger_transaction(connection, target)
+
+
 class PotAllocation(Base):
     __tablename__ = "pot_allocations"
 
@@ -1263,9 +1378,33 @@ class SavingGoal(Base):
 
 
 class EventLog(Base):
+    """Append-only event stream, range-partitioned by month on `created_at`.
+
+    The physical primary key is (id, created_at); `id` alone stays unique through
+    the shared sequence, so the ORM keeps it as identity. `decision_id`,
+    `experiment_key` and `variant` are promoted from the payload on insert unless the
+    writer sets them.
+    """
+
     __tablename__ = "event_log"
     __table_args__ = (
         Index("ix_event_log_tenant_id_created_at", "tenant_id", "created_at"),
+        Index("ix_event_log_type_tenant_created_at", "type", "tenant_id", "created_at"),
+        Index(
+            "ix_event_log_type_decision_id_created_at",
+            "type",
+            "decision_id",
+            "created_at",
+            postgresql_where=text("decision_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_event_log_type_experiment_variant_created_at",
+            "type",
+            "experiment_key",
+            "variant",
+            "created_at",
+            postgresql_where=text("experiment_key IS NOT NULL"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -1274,6 +1413,9 @@ class EventLog(Base):
     child_id: Mapped[int | None] = mapped_column(ForeignKey("child_profiles.id"), nullable=True)
     type: Mapped[str] = mapped_column(String(255), nullable=False)
     payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, server_default="{}")
+    decision_id: Mapped[str | None] = mapped_column(UUID(as_uuid=False), nullable=True)
+    experiment_key: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    variant: Mapped[str | None] = mapped_column(String(80), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -1281,6 +1423,50 @@ class EventLog(Base):
     )
 
 
+EVENT_LOG_HOT_AXION_TYPES = frozenset(
+    {
+        "axion_brief_exposed",
+        "axion_cta_clicked",
+        "axion_session_started",
+        "axion_session_completed",
+        "axion_decision_latency_ms",
+    }
+)
+
+
+def _coerce_event_decision_id(value: Any) -> str | None:
+    if value is None:
+        return None
+    try:
+        return str(UUIDValue(str(value).strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _coerce_event_label(value: Any) -> str | None:
+    if value is None:
+        return None
+    normalized = str(value).strip()
+    return normalized[:80] if normalized else None
+
+
+@event.listens_for(EventLog, "before_insert")
+def _promote_event_log_hot_columns(_mapper: Any, _connection: Any, target: EventLog) -> None:
+    """Fill unset hot columns from the payload.
+
+    This runs inside flush, so it never reads `axion_decisions`; writers that hold the
+    decision pass `experiment_key`/`variant` explicitly, and bulk `insert()` rows (which
+    skip this listener) must carry the columns themselves.
+    """
+    payload = target.payload if isinstance(target.payload, dict) else {}
+    if target.decision_id is None:
+        target.decision_id = _coerce_event_decision_id(payload.get("decision_id"))
+    if target.experiment_key is None:
+        target.experiment_key = _coerce_event_label(payload.get("experiment_key"))
+    if target.variant is None:
+        target.variant = _coerce_event_label(payload.get("variant"))
+
+
 class AuditLog(Base):
     __tablename__ = "audit_log"
     __table_args__ = (
@@ -1369,6 +1555,39 @@ class UserAchievement(Base):
     unlocked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
+class SyncProcessedItem(Base):
+    __tablename__ = "sync_processed_items"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "user_id", "client_item_id", name="uq_sync_processed_items_client_item"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    client_item_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    item_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    processed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class UserAchievementCounter(Base):
+    __tablename__ = "user_achievement_counters"
+    __table_args__ = (
+        UniqueConstraint("user_id", "counter_key", name="uq_user_achievement_counters_user_key"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    counter_key: Mapped[str] = mapped_column(String(96), nullable=False)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class Streak(Base):
     __tablename__ = "streaks"
 
@@ -1512,8 +1731,9 @@ class Subject(Base):
             return 9
         return 13
 
-    @age_min.expression
-    def age_min(cls):  # type: ignore[no-untyped-def]
+    @age_min.inplace.expression
+    @classmethod
+    def _age_min_expression(cls) -> ColumnElement[int]:
         return case(
             (cls.age_group == SubjectAgeGroup.AGE_6_8, 6),
             (cls.age_group == SubjectAgeGroup.AGE_9_12, 9),
@@ -1528,8 +1748,9 @@ class Subject(Base):
             return 12
         return 15
 
-    @age_max.expression
-    def age_max(cls):  # type: ignore[no-untyped-def]
+    @age_max.inplace.expression
+    @classmethod
+    def _age_max_expression(cls) -> ColumnElement[int]:
         return case(
             (cls.age_group == SubjectAgeGroup.AGE_6_8, 8),
             (cls.age_group == SubjectAgeGroup.AGE_9_12, 12),
@@ -1612,6 +1833,61 @@ class LessonProgress(Base):
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
+@event.listens_for(LessonProgress, "after_insert")
+def _apply_inserted_lesson_progress_to_achievement_counters(
+    _mapper: Any, connection: Any, target: LessonProgress
+) -> None:
+    # Imported lazily: the achievement engine imports this module.
+    from app.services.achievement_engine import apply_lesson_progress_counters
+
+    apply_lesson_progress_counters(connection, target, inserted=True)
+
+
+@event.listens_for(LessonProgress, "after_update")
+def _apply_updated_lesson_progress_to_achievement_counters(
+    _mapper: Any, connection: Any, target: LessonProgress
+) -> None:
+    from app.services.achievement_engine import apply_lesson_progress_counters
+
+    apply_lesson_progress_counters(connection, target, inserted=False)
+
+
+@event.listens_for(LessonProgress, "after_insert")
+def _apply_inserted_lesson_progress_to_unit_progress(
+    _mapper: Any, connection: Any, target: LessonProgress
+) -> None:
+    # Imported lazily: the aprender service imports this module.
+    from app.services.aprender import apply_lesson_progress_unit_counter
+
+    apply_lesson_progress_unit_counter(connection, target, inserted=True)
+
+
+@event.listens_for(LessonProgress, "after_update")
+def _apply_updated_lesson_progress_to_unit_progress(
+    _mapper: Any, connection: Any, target: LessonProgress
+) -> None:
+    from app.services.aprender import apply_lesson_progress_unit_counter
+
+    apply_lesson_progress_unit_counter(connection, target, inserted=False)
+
+
+class UserUnitProgress(Base):
+    """Completed-lesson counter per (user, unit), maintained from LessonProgress writes."""
+
+    __tablename__ = "user_unit_progress"
+    __table_args__ = (
+        UniqueConstraint("user_id", "unit_id", name="uq_user_unit_progress_user_unit"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    unit_id: Mapped[int] = mapped_column(ForeignKey("units.id", ondelete="CASCADE"), nullable=False)
+    completed_lessons: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class Skill(Base):
     __tablename__ = "skills"
     __table_args__ = (
@@ -1870,6 +2146,24 @@ class WeeklyMission(Base):
     __table_args__ = (
         Index("ix_weekly_missions_dates", "start_date", "end_date"),
         Index("ix_weekly_missions_age_group", "age_group"),
+        Index(
+            "uq_weekly_missions_base_week_type",
+            "age_group",
+            "start_date",
+            "end_date",
+            "mission_type",
+            unique=True,
+            postgresql_where=text("is_seasonal IS FALSE"),
+        ),
+        Index(
+            "uq_weekly_missions_seasonal_week_theme",
+            "age_group",
+            "start_date",
+            "end_date",
+            "theme_key",
+            unique=True,
+            postgresql_where=text("is_seasonal IS TRUE"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(
@@ -2193,6 +2487,87 @@ class AxionExperiment(Base):
     rollout_last_scaled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    rollup_name: Mapped[str] = mapped_column(String(80), primary_key=True)
+    watermark_day: Mapped[date] = mapped_column(Date, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class DataExportJob(Base):
+    __tablename__ = "data_export_jobs"
+    __table_args__ = (
+        Index("ix_data_export_jobs_tenant_created_at", "tenant_id", "created_at"),
+        Index("ix_data_export_jobs_status_expires_at", "status", "expires_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)  # UUID v4
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    child_id: Mapped[int] = mapped_column(ForeignKey("child_profiles.id"), nullable=False)
+    requested_by_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, server_default="PENDING")
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    storage_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    file_size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class DataExportArtifactPart(Base):
+    """One slice of a finished export's gzip bytes.
+
+    The API and the worker both read the parts from Postgres.
+    """
+
+    __tablename__ = "data_export_artifact_parts"
+
+    job_id: Mapped[str] = mapped_column(
+        ForeignKey("data_export_jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    part: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class AxionRetentionDailyRollup(Base):
+    __tablename__ = "axion_retention_daily_rollup"
+    __table_args__ = (
+        Index("ix_axion_retention_daily_rollup_experiment_day", "experiment_key", "day", "variant"),
+        Index("ix_axion_retention_daily_rollup_tenant_day", "tenant_id", "day"),
+    )
+
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), primary_key=True)
+    experiment_key: Mapped[str] = mapped_column(String(80), primary_key=True, server_default="")
+    variant: Mapped[str] = mapped_column(String(80), primary_key=True, server_default="")
+    context: Mapped[str] = mapped_column(String(40), primary_key=True, server_default="")
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    child_id: Mapped[int] = mapped_column(Integer, primary_key=True, server_default="0")
+    destination: Mapped[str] = mapped_column(String(80), primary_key=True, server_default="")
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_exposed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    exposures_total: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    completed_session_ats: Mapped[list[datetime]] = mapped_column(
+        ARRAY(DateTime(timezone=True)),
+        nullable=False,
+        server_default=text("'{}'::timestamptz[]"),
+    )
+    session_started: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    cta_clicked: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    cta_started_within_24h: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default="false"
+    )
+    cta_completed_within_24h: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default="false"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class AxionFeatureRegistry(Base):
     __tablename__ = "axion_feature_registry"
     __table_args__ = (
@@ -2233,6 +2608,65 @@ class AxionFeatureSnapshot(Base):
     snapshot_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
+class AxionFeatureHistogramDaily(Base):
+    """Daily per-tenant value counts of NBA snapshot features, maintained on snapshot write."""
+
+    __tablename__ = "axion_feature_histogram_daily"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "stat_date",
+            "feature_name",
+            "feature_value",
+            name="uq_axion_feature_histogram_daily_bucket",
+        ),
+        Index("ix_axion_feature_histogram_daily_stat_date", "stat_date"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    stat_date: Mapped[date] = mapped_column(Date, nullable=False)
+    feature_name: Mapped[str] = mapped_column(String(120), nullable=False)
+    feature_value: Mapped[str] = mapped_column(Text, nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+
+class AxionUserFeatures(Base):
+    """Feature store: one typed, point-in-time feature row per user, version and day."""
+
+    __tablename__ = "axion_user_features"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "feature_version",
+            "as_of_day",
+            name="uq_axion_user_features_user_version_day",
+        ),
+        Index(
+            "ix_axion_user_features_tenant_version_day", "tenant_id", "feature_version", "as_of_day"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"), nullable=True)
+    feature_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    as_of_day: Mapped[date] = mapped_column(Date, nullable=False)
+    age_bucket: Mapped[str] = mapped_column(String(16), nullable=False)
+    plan_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    streak_length: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_session_gap: Mapped[int] = mapped_column(Integer, nullable=False, server_default="999")
+    historical_completion_rate: Mapped[float] = mapped_column(
+        Numeric(7, 6), nullable=False, server_default="0"
+    )
+    historical_retention_rate: Mapped[float] = mapped_column(
+        Numeric(7, 6), nullable=False, server_default="0"
+    )
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class AxionShadowPolicyCandidate(Base):
     __tablename__ = "axion_shadow_policy_candidate"
     __table_args__ = (
@@ -2356,6 +2790,39 @@ class ChildContentHistory(Base):
     mastery_delta: Mapped[float | None] = mapped_column(Numeric(6, 4), nullable=True)
 
 
+class ChildContentRecency(Base):
+    """Latest served row per child and content fingerprint.
+
+    Kept up to date by a trigger on `child_content_history`.
+    """
+
+    __tablename__ = "child_content_recency"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "child_id",
+            "content_fingerprint",
+            name="uq_child_content_recency_child_fingerprint",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    child_id: Mapped[int] = mapped_column(
+        ForeignKey("child_profiles.id", ondelete="CASCADE"), nullable=False
+    )
+    content_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    content_id: Mapped[int] = mapped_column(
+        ForeignKey("axion_content_catalog.content_id"), nullable=False
+    )
+    history_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    served_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    outcome: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class ContentPrerequisite(Base):
     __tablename__ = "content_prerequisites"
     __table_args__ = (
@@ -2384,7 +2851,9 @@ class ChildSubjectMastery(Base):
     child_id: Mapped[int] = mapped_column(ForeignKey("child_profiles.id"), nullable=False)
     subject: Mapped[str] = mapped_column(String(64), nullable=False)
     mastery_score: Mapped[float] = mapped_column(Numeric(5, 4), nullable=False, server_default="0")
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
 
 class AxionDecision(Base):
@@ -2756,8 +3225,12 @@ class AnonymousUsage(Base):
     free_used: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     paid_credits: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     total_generations_used: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
-    last_generation_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_generation_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
 
 class GenerationEvent(Base):
@@ -2831,7 +3304,9 @@ class TrialClaim(Base):
     scope_value: Mapped[str] = mapped_column(Text, nullable=False)
     source_kind: Mapped[str] = mapped_column(String(20), nullable=False)  # 'anonymous' | 'user'
     source_ref: Mapped[str] = mapped_column(String(255), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
 
 DEFAULT_FAMILY_TASKS: list[dict[str, str | int | TaskDifficulty]] = [
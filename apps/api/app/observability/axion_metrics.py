@@ -28,6 +28,10 @@ class _InMemoryAxionMetrics:
         self._llm_errors_total: dict[str, int] = defaultdict(int)
         self._llm_cache_hit_total: int = 0
         self._llm_kill_switch_triggered_total: int = 0
+        self._telemetry_dropped_total: int = 0
+        self._password_hash_in_flight: int = 0
+        self._password_hash_in_flight_peak: int = 0
+        self._password_hash_rejected_total: int = 0
         self._latency_bucket_counts: dict[str, int] = defaultdict(int)
         self._latency_count: int = 0
         self._latency_sum_seconds: float = 0.0
@@ -111,6 +115,20 @@ class _InMemoryAxionMetrics:
         with self._lock:
             self._llm_kill_switch_triggered_total += 1
 
+    def inc_telemetry_dropped(self, count: int) -> None:
+        with self._lock:
+            self._telemetry_dropped_total += max(0, int(count))
+
+    def set_password_hash_in_flight(self, count: int) -> None:
+        value = max(0, int(count))
+        with self._lock:
+            self._password_hash_in_flight = value
+            self._password_hash_in_flight_peak = max(self._password_hash_in_flight_peak, value)
+
+    def inc_password_hash_rejected(self) -> None:
+        with self._lock:
+            self._password_hash_rejected_total += 1
+
     def snapshot(self) -> dict[str, object]:
         with self._lock:
             decisions = dict(self._decisions_total)
@@ -128,6 +146,10 @@ class _InMemoryAxionMetrics:
             llm_errors_total = dict(self._llm_errors_total)
             llm_cache_hit_total = int(self._llm_cache_hit_total)
             llm_kill_switch_triggered_total = int(self._llm_kill_switch_triggered_total)
+            telemetry_dropped_total = int(self._telemetry_dropped_total)
+            password_hash_in_flight = int(self._password_hash_in_flight)
+            password_hash_in_flight_peak = int(self._password_hash_in_flight_peak)
+            password_hash_rejected_total = int(self._password_hash_rejected_total)
             buckets = dict(self._latency_bucket_counts)
             latency_count = int(self._latency_count)
             latency_sum_seconds = float(self._latency_sum_seconds)
@@ -150,6 +172,10 @@ class _InMemoryAxionMetrics:
             "llm_error_types": llm_errors_total,
             "llm_cache_hit_total": llm_cache_hit_total,
             "llm_kill_switch_triggered_total": llm_kill_switch_triggered_total,
+            "telemetry_dropped_total": telemetry_dropped_total,
+            "password_hash_in_flight": password_hash_in_flight,
+            "password_hash_in_flight_peak": password_hash_in_flight_peak,
+            "password_hash_rejected_total": password_hash_rejected_total,
             "decision_modes": decisions,
             "error_types": errors,
             "policy_versions": policies,
@@ -301,6 +327,36 @@ def safe_increment_llm_kill_switch_triggered() -> None:
     _safe("axion_llm_kill_switch_triggered", _run)
 
 
+def safe_increment_telemetry_dropped_total(count: int = 1) -> None:
+    def _run() -> None:
+        backend = _METRICS_BACKEND
+        if backend is None:
+            return
+        backend.inc_telemetry_dropped(count)
+
+    _safe("axion_telemetry_dropped_total", _run)
+
+
+def safe_set_password_hash_in_flight(count: int) -> None:
+    def _run() -> None:
+        backend = _METRICS_BACKEND
+        if backend is None:
+            return
+        backend.set_password_hash_in_flight(count)
+
+    _safe("password_hash_in_flight", _run)
+
+
+def safe_increment_password_hash_rejected_total() -> None:
+    def _run() -> None:
+        backend = _METRICS_BACKEND
+        if backend is None:
+            return
+        backend.inc_password_hash_rejected()
+
+    _safe("password_hash_rejected_total", _run)
+
+
 def get_axion_metrics_health() -> dict[str, object]:
     backend = _METRICS_BACKEND
     if backend is None:
@@ -322,6 +378,10 @@ def get_axion_metrics_health() -> dict[str, object]:
             "llm_error_types": {},
             "llm_cache_hit_total": 0,
             "llm_kill_switch_triggered_total": 0,
+            "telemetry_dropped_total": 0,
+            "password_hash_in_flight": 0,
+            "password_hash_in_flight_peak": 0,
+            "password_hash_rejected_total": 0,
             "decision_modes": {},
             "error_types": {},
             "policy_versions": {},
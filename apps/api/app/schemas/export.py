@@ -82,3 +82,15 @@ class ExportDataResponse(BaseModel):
     goals: list[ExportGoalOut]
     recommendations: list[ExportRecommendationOut]
     mood_history: list[ExportMoodOut]
+
+
+class ExportJobOut(BaseModel):
+    id: str
+    child_id: int
+    status: str
+    row_count: int
+    file_size_bytes: int | None
+    error: str | None
+    created_at: datetime | None
+    completed_at: datetime | None
+    expires_at: datetime | None = None
@@ -96,6 +96,31 @@ class LearningAnswerResponse(BaseModel):
     remediation_text: str | None = Field(default=None, alias="remediationText")
 
 
+class LearningAnswerBatchItem(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    question_id: str | None = Field(default=None, alias="questionId")
+    template_id: str | None = Field(default=None, alias="templateId")
+    generated_variant_id: str | None = Field(default=None, alias="generatedVariantId")
+    variant_id: str | None = Field(default=None, alias="variantId")
+    correlation_id: str | None = Field(default=None, alias="correlationId")
+    result: QuestionResult
+    time_ms: int = Field(alias="timeMs", ge=0)
+
+
+class LearningAnswerBatchRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    child_id: int | None = Field(default=None, alias="childId")
+    answers: list[LearningAnswerBatchItem] = Field(min_length=1, max_length=50)
+
+
+class LearningAnswerBatchResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    results: list[LearningAnswerResponse]
+
+
 class LearningSessionStartRequest(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
@@ -3,11 +3,11 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SyncBatchItem(BaseModel):
-    id: str
+    id: str = Field(min_length=1, max_length=128)
     type: Literal["routine.mark", "coach.use", "daily_mission.complete"]
     payload: dict[str, Any]
     createdAt: datetime
@@ -1,21 +1,21 @@
 from __future__ import annotations
 
-from datetime import UTC, timedelta
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select, text
 from sqlalchemy.orm import Session
 
 from app.models import (
     Achievement,
     GameSession,
     GameType,
-    Lesson,
     LessonProgress,
-    Subject,
-    Unit,
     UserAchievement,
+    UserAchievementCounter,
     UserGameProfile,
+    UserLearningStreak,
 )
 
 
@@ -127,9 +127,87 @@ DEFAULT_ACHIEVEMENTS: list[dict[str, Any]] = [
 ]
 
 
-def ensure_default_achievements(db: Session) -> None:
+# Per-user counters maintained by mapper listeners on LessonProgress and GameSession,
+# so evaluation never replays progress or session history.
+LESSONS_COMPLETED_COUNTER = "lessons_completed"
+TICTACTOE_WIN_STREAK_COUNTER = "tictactoe_win_streak"
+SUBJECT_XP_COUNTER_PREFIX = "subject_xp:"
+MATH_SUBJECT_NAMES = ("matematica", "mathematics")
+TICTACTOE_WIN_SCORE = 500
+
+# `reset` replaces the stored value instead of adding to it (used to break win streaks).
+_COUNTER_UPSERT_SQL = text(
+    """
+    INSERT INTO user_achievement_counters (user_id, counter_key, value, updated_at)
+    VALUES (:user_id, :counter_key, :value, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id, counter_key) DO UPDATE SET
+        value = CASE
+            WHEN :reset THEN EXCLUDED.value
+            ELSE user_achievement_counters.value + EXCLUDED.value
+        END,
+        updated_at = CURRENT_TIMESTAMP
+    """
+)
+
+_LESSON_SUBJECT_SQL = text(
+    """
+    SELECT s.name
+    FROM lessons AS l
+    JOIN units AS u ON u.id = l.unit_id
+    JOIN subjects AS s ON s.id = u.subject_id
+    WHERE l.id = :lesson_id
+    """
+)
+
+
+@dataclass(slots=True)
+class AchievementContext:
+    profile: UserGameProfile
+    counters: dict[str, int]
+    learning_streak_days: int = 0
+    game_type: GameType | None = None
+    score: int = 0
+    stars: int = 0
+
+    def counter(self, key: str) -> int:
+        return self.counters.get(key, 0)
+
+    def subject_xp(self, subject_names: tuple[str, ...]) -> int:
+        return sum(self.counter(f"{SUBJECT_XP_COUNTER_PREFIX}{name}") for name in subject_names)
+
+
+AchievementRule = Callable[[AchievementContext], bool]
+
+GAME_ACHIEVEMENT_RULES: dict[str, AchievementRule] = {
+    "first_win": lambda ctx: (
+        ctx.game_type == GameType.TICTACTOE and ctx.score >= TICTACTOE_WIN_SCORE
+    ),
+    "wins_streak_3": lambda ctx: (
+        ctx.game_type == GameType.TICTACTOE and ctx.counter(TICTACTOE_WIN_STREAK_COUNTER) >= 3
+    ),
+    "xp_100_reached": lambda ctx: ctx.profile.xp >= 100,
+    "first_finance_master": lambda ctx: ctx.game_type == GameType.FINANCE_SIM and ctx.score >= 360,
+}
+
+LEARNING_ACHIEVEMENT_RULES: dict[str, AchievementRule] = {
+    "learning_first_lesson_completed": lambda ctx: ctx.counter(LESSONS_COMPLETED_COUNTER) >= 1,
+    "learning_streak_7_days": lambda ctx: ctx.learning_streak_days >= 7,
+    "learning_math_100_xp": lambda ctx: ctx.subject_xp(MATH_SUBJECT_NAMES) >= 100,
+    "learning_perfect_score_3_stars": lambda ctx: ctx.stars >= 3,
+}
+
+
+def ensure_default_achievements(db: Session) -> dict[str, Achievement]:
+    existing_by_slug = {
+        item.slug: item
+        for item in db.scalars(
+            select(Achievement).where(
+                Achievement.slug.in_([str(item["slug"]) for item in DEFAULT_ACHIEVEMENTS])
+            ),
+        ).all()
+    }
     for item in DEFAULT_ACHIEVEMENTS:
-        existing = db.scalar(select(Achievement).where(Achievement.slug == str(item["slug"])))
+        existing = existing_by_slug.get(str(item["slug"]))
         if existing is None:
             achievement = Achievement(
                 slug=str(item["slug"]),
@@ -145,6 +223,7 @@ def ensure_default_achievements(db: Session) -> None:
                 condition_value=int(item["condition_value"]),
             )
             db.add(achievement)
+            existing_by_slug[achievement.slug] = achievement
             continue
 
         existing.title = str(item["name"])
@@ -158,34 +237,24 @@ def ensure_default_achievements(db: Session) -> None:
         existing.condition_type = str(item["condition_type"])
         existing.condition_value = int(item["condition_value"])
     db.flush()
+    return existing_by_slug
 
 
-def _has_user_achievement(db: Session, *, user_id: int, achievement_id: int) -> bool:
-    existing = db.scalar(
-        select(UserAchievement).where(
-            UserAchievement.user_id == user_id,
-            UserAchievement.achievement_id == achievement_id,
-        ),
+def _load_unlocked_achievement_ids(db: Session, *, user_id: int) -> set[int]:
+    return set(
+        db.scalars(
+            select(UserAchievement.achievement_id).where(UserAchievement.user_id == user_id)
+        ).all()
     )
-    return existing is not None
 
 
-def _current_tictactoe_win_streak(db: Session, *, user_id: int) -> int:
-    sessions = db.scalars(
-        select(GameSession)
-        .where(
-            GameSession.user_id == user_id,
-            GameSession.game_type == GameType.TICTACTOE,
-        )
-        .order_by(GameSession.created_at.desc()),
+def _load_achievement_counters(db: Session, *, user_id: int) -> dict[str, int]:
+    rows = db.execute(
+        select(UserAchievementCounter.counter_key, UserAchievementCounter.value).where(
+            UserAchievementCounter.user_id == user_id,
+        ),
     ).all()
-    streak = 0
-    for session in sessions:
-        if session.score >= 500:
-            streak += 1
-            continue
-        break
-    return streak
+    return {str(key): int(value or 0) for key, value in rows}
 
 
 def _unlock(
@@ -194,11 +263,13 @@ def _unlock(
     user_id: int,
     profile: UserGameProfile,
     achievement: Achievement,
+    unlocked_ids: set[int],
 ) -> bool:
-    if _has_user_achievement(db, user_id=user_id, achievement_id=achievement.id):
+    if achievement.id in unlocked_ids:
         return False
 
     db.add(UserAchievement(user_id=user_id, achievement_id=achievement.id))
+    unlocked_ids.add(achievement.id)
     bonus_xp = max(0, achievement.xp_reward)
     bonus_coins = max(0, achievement.coin_reward)
     if bonus_xp > 0:
@@ -209,6 +280,32 @@ def _unlock(
     return True
 
 
+def _evaluate_rules(
+    db: Session,
+    *,
+    user_id: int,
+    rules: dict[str, AchievementRule],
+    context: AchievementContext,
+) -> list[str]:
+    by_slug = ensure_default_achievements(db)
+    unlocked_ids = _load_unlocked_achievement_ids(db, user_id=user_id)
+    unlocked_slugs: list[str] = []
+    for slug, rule in rules.items():
+        achievement = by_slug.get(slug)
+        if achievement is None or achievement.id in unlocked_ids or not rule(context):
+            continue
+        if _unlock(
+            db,
+            user_id=user_id,
+            profile=context.profile,
+            achievement=achievement,
+            unlocked_ids=unlocked_ids,
+        ):
+            unlocked_slugs.append(slug)
+    db.flush()
+    return unlocked_slugs
+
+
 def _normalize_subject_name(value: str) -> str:
     return (
         value.lower()
@@ -227,78 +324,73 @@ def _normalize_subject_name(value: str) -> str:
     )
 
 
-def _completed_lessons_count(db: Session, *, user_id: int) -> int:
-    rows = db.scalars(
-        select(LessonProgress).where(
-            LessonProgress.user_id == user_id,
-            LessonProgress.completed.is_(True),
-        ),
-    ).all()
-    return len(rows)
+def _previous_attribute_value(state: Any, name: str, *, inserted: bool, default: Any) -> Any:
+    if inserted:
+        return default
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, name)
 
 
-def _learning_streak_days(db: Session, *, user_id: int) -> int:
-    rows = db.scalars(
-        select(LessonProgress).where(
-            LessonProgress.user_id == user_id,
-            LessonProgress.completed.is_(True),
-            LessonProgress.completed_at.is_not(None),
-        ),
-    ).all()
-    days = sorted(
-        {
-            item.completed_at.astimezone(UTC).date()
-            for item in rows
-            if item.completed_at is not None
-        },
-        reverse=True,
+def _bump_counter(
+    connection: Any, *, user_id: int, counter_key: str, value: int, reset: bool = False
+) -> None:
+    connection.execute(
+        _COUNTER_UPSERT_SQL,
+        {"user_id": user_id, "counter_key": counter_key, "value": value, "reset": reset},
     )
-    if not days:
-        return 0
-    streak = 1
-    for idx in range(len(days) - 1):
-        if days[idx] - days[idx + 1] == timedelta(days=1):
-            streak += 1
-            continue
-        break
-    return streak
 
 
-def _subject_xp_total(
-    db: Session,
-    *,
-    user_id: int,
-    accepted_subject_names: set[str],
-) -> int:
-    lessons = db.scalars(select(Lesson)).all()
-    units = db.scalars(select(Unit)).all()
-    subjects = db.scalars(select(Subject)).all()
-    progress = db.scalars(
-        select(LessonProgress).where(
-            LessonProgress.user_id == user_id,
-            LessonProgress.completed.is_(True),
-        ),
-    ).all()
+def apply_lesson_progress_counters(
+    connection: Any, progress: LessonProgress, *, inserted: bool
+) -> None:
+    """Apply the completed-lesson and subject XP deltas of a LessonProgress write."""
+    state = inspect(progress)
+    was_completed = bool(
+        _previous_attribute_value(state, "completed", inserted=inserted, default=False)
+    )
+    previous_xp = int(
+        _previous_attribute_value(state, "xp_granted", inserted=inserted, default=0) or 0
+    )
+    is_completed = bool(progress.completed)
+    current_xp = int(progress.xp_granted or 0)
+
+    completed_delta = int(is_completed) - int(was_completed)
+    xp_delta = (max(0, current_xp) if is_completed else 0) - (
+        max(0, previous_xp) if was_completed else 0
+    )
+    if completed_delta:
+        _bump_counter(
+            connection,
+            user_id=progress.user_id,
+            counter_key=LESSONS_COMPLETED_COUNTER,
+            value=completed_delta,
+        )
+    if xp_delta:
+        subject_name = connection.execute(
+            _LESSON_SUBJECT_SQL, {"lesson_id": progress.lesson_id}
+        ).scalar_one_or_none()
+        if subject_name is not None:
+            _bump_counter(
+                connection,
+                user_id=progress.user_id,
+                counter_key=f"{SUBJECT_XP_COUNTER_PREFIX}{_normalize_subject_name(str(subject_name))}"[:96],
+                value=xp_delta,
+            )
 
-    unit_by_id = {unit.id: unit for unit in units}
-    subject_by_id = {subject.id: subject for subject in subjects}
-    lesson_by_id = {lesson.id: lesson for lesson in lessons}
 
-    total = 0
-    for item in progress:
-        lesson = lesson_by_id.get(item.lesson_id)
-        if lesson is None:
-            continue
-        unit = unit_by_id.get(lesson.unit_id)
-        if unit is None:
-            continue
-        subject = subject_by_id.get(unit.subject_id)
-        if subject is None:
-            continue
-        normalized = _normalize_subject_name(subject.name)
-        if normalized in accepted_subject_names:
-            total += max(0, item.xp_granted)
-    return total
+def apply_game_session_counters(connection: Any, session: GameSession) -> None:
+    if session.game_type != GameType.TICTACTOE:
+        return
+    won = int(session.score or 0) >= TICTACTOE_WIN_SCORE
+    _bump_counter(
+        connection,
+        user_id=session.user_id,
+        counter_key=TICTACTOE_WIN_STREAK_COUNTER,
+        value=1 if won else 0,
+        reset=not won,
+    )
 
 
 def evaluate_achievements_after_game(
@@ -309,49 +401,14 @@ def evaluate_achievements_after_game(
     game_type: GameType,
     score: int,
 ) -> list[str]:
-    ensure_default_achievements(db)
-    unlocked_slugs: list[str] = []
-
-    achievements = db.scalars(
-        select(Achievement).where(
-            Achievement.slug.in_(
-                [
-                    "first_win",
-                    "wins_streak_3",
-                    "xp_100_reached",
-                    "first_finance_master",
-                ],
-            ),
-        ),
-    ).all()
-    by_slug = {item.slug: item for item in achievements}
-
-    first_win = by_slug.get("first_win")
-    if first_win and game_type == GameType.TICTACTOE and score >= 500:
-        if _unlock(db, user_id=user_id, profile=profile, achievement=first_win):
-            unlocked_slugs.append(first_win.slug)
-
-    streak_3 = by_slug.get("wins_streak_3")
-    if (
-        streak_3
-        and game_type == GameType.TICTACTOE
-        and _current_tictactoe_win_streak(db, user_id=user_id) >= 3
-    ):
-        if _unlock(db, user_id=user_id, profile=profile, achievement=streak_3):
-            unlocked_slugs.append(streak_3.slug)
-
-    xp_100 = by_slug.get("xp_100_reached")
-    if xp_100 and profile.xp >= 100:
-        if _unlock(db, user_id=user_id, profile=profile, achievement=xp_100):
-            unlocked_slugs.append(xp_100.slug)
-
-    finance_master = by_slug.get("first_finance_master")
-    if finance_master and game_type == GameType.FINANCE_SIM and score >= 360:
-        if _unlock(db, user_id=user_id, profile=profile, achievement=finance_master):
-            unlocked_slugs.append(finance_master.slug)
-
     db.flush()
-    return unlocked_slugs
+    context = AchievementContext(
+        profile=profile,
+        counters=_load_achievement_counters(db, user_id=user_id),
+        game_type=game_type,
+        score=score,
+    )
+    return _evaluate_rules(db, user_id=user_id, rules=GAME_ACHIEVEMENT_RULES, context=context)
 
 
 def unlock_achievement_by_slug(
@@ -361,11 +418,21 @@ def unlock_achievement_by_slug(
     profile: UserGameProfile,
     slug: str,
 ) -> bool:
-    ensure_default_achievements(db)
-    achievement = db.scalar(select(Achievement).where(Achievement.slug == slug))
+    achievement = ensure_default_achievements(db).get(slug)
+    if achievement is None:
+        achievement = db.scalar(select(Achievement).where(Achievement.slug == slug))
     if achievement is None:
         return False
-    unlocked = _unlock(db, user_id=user_id, profile=profile, achievement=achievement)
+    already_unlocked = db.scalar(
+        select(UserAchievement.id).where(
+            UserAchievement.user_id == user_id,
+            UserAchievement.achievement_id == achievement.id,
+        ),
+    )
+    unlocked_ids = {achievement.id} if already_unlocked is not None else set()
+    unlocked = _unlock(
+        db, user_id=user_id, profile=profile, achievement=achievement, unlocked_ids=unlocked_ids
+    )
     db.flush()
     return unlocked
 
@@ -377,44 +444,15 @@ def evaluate_achievements_after_learning(
     profile: UserGameProfile,
     stars: int,
 ) -> list[str]:
-    ensure_default_achievements(db)
-    unlocked_slugs: list[str] = []
-
-    achievements = db.scalars(
-        select(Achievement).where(
-            Achievement.slug.in_(
-                [
-                    "learning_first_lesson_completed",
-                    "learning_streak_7_days",
-                    "learning_math_100_xp",
-                    "learning_perfect_score_3_stars",
-                ],
-            ),
-        ),
-    ).all()
-    by_slug = {item.slug: item for item in achievements}
-
-    first_lesson = by_slug.get("learning_first_lesson_completed")
-    if first_lesson and _completed_lessons_count(db, user_id=user_id) >= 1:
-        if _unlock(db, user_id=user_id, profile=profile, achievement=first_lesson):
-            unlocked_slugs.append(first_lesson.slug)
-
-    learning_streak = by_slug.get("learning_streak_7_days")
-    if learning_streak and _learning_streak_days(db, user_id=user_id) >= 7:
-        if _unlock(db, user_id=user_id, profile=profile, achievement=learning_streak):
-            unlocked_slugs.append(learning_streak.slug)
-
-    math_100 = by_slug.get("learning_math_100_xp")
-    if math_100:
-        accepted_math = {"matematica", "mathematics"}
-        if _subject_xp_total(db, user_id=user_id, accepted_subject_names=accepted_math) >= 100:
-            if _unlock(db, user_id=user_id, profile=profile, achievement=math_100):
-                unlocked_slugs.append(math_100.slug)
-
-    perfect = by_slug.get("learning_perfect_score_3_stars")
-    if perfect and stars >= 3:
-        if _unlock(db, user_id=user_id, profile=profile, achievement=perfect):
-            unlocked_slugs.append(perfect.slug)
-
+    # Flush pending LessonProgress writes so their counter deltas are visible below.
     db.flush()
-    return unlocked_slugs
+    learning_streak_days = db.scalar(
+        select(UserLearningStreak.current_streak).where(UserLearningStreak.user_id == user_id),
+    )
+    context = AchievementContext(
+        profile=profile,
+        counters=_load_achievement_counters(db, user_id=user_id),
+        learning_streak_days=int(learning_streak_days or 0),
+        stars=stars,
+    )
+    return _evaluate_rules(db, user_id=user_id, rules=LEARNING_ACHIEVEMENT_RULES, context=context)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
 from hashlib import sha256
 import logging
 from string import Template
+from types import MappingProxyType
 from typing import Any
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, insert, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -15,7 +18,6 @@ from app.models import (
     AxionDecision,
     AxionDecisionContext,
     AxionSignalType,
-    ChildProfile,
     GeneratedVariant,
     LearningSession,
     LLMUsageStatus,
@@ -64,6 +66,10 @@ from app.services.learning_retention import (
     inject_axion_micro_mission,
     track_mission_progress,
 )
+from app.services.learning_settings_cache import (
+    cached_tenant_setting,
+    resolve_tenant_single_child_id,
+)
 from app.services.learning_streak import register_learning_lesson_completion
 
 DEFAULT_MAX_DAILY_LEARNING_XP = 200
@@ -91,7 +97,7 @@ AGE_PROMPT_LIMITS: dict[SubjectAgeGroup, int] = {
 }
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class EffectiveLearningSettings:
     max_daily_learning_xp: int
     max_lessons_per_day: int
@@ -100,7 +106,7 @@ class EffectiveLearningSettings:
     enable_coins_rewards: bool
     xp_multiplier: float
     coins_enabled: bool
-    enabled_subjects: dict[str, bool]
+    enabled_subjects: Mapping[str, bool]
 
 
 @dataclass(slots=True)
@@ -150,6 +156,32 @@ class TrackQuestionAnswerResult:
     generated_variant_id: str | None
 
 
+@dataclass(slots=True)
+class QuestionAnswerInput:
+    question_id: str | None
+    template_id: str | None
+    generated_variant_id: str | None
+    variant_id: str | None
+    result: QuestionResult
+    time_ms: int
+
+
+@dataclass(slots=True)
+class TrackedAnswer:
+    """Mastery state right after one answer of a batch was applied."""
+
+    skill_id: str
+    question_id: str | None
+    template_id: str | None
+    generated_variant_id: str | None
+    result: QuestionResult
+    mastery: float
+    mastery_delta: float
+    streak_correct: int
+    streak_wrong: int
+    next_review_at: datetime | None
+
+
 @dataclass(slots=True)
 class FinishAdaptiveSessionResult:
     session: LearningSession
@@ -288,20 +320,6 @@ def _subject_enabled(settings: EffectiveLearningSettings, subject_id: int | None
     return True
 
 
-def _resolve_tenant_single_child_id(db: Session, *, tenant_id: int) -> int | None:
-    ids = db.scalars(
-        select(ChildProfile.id)
-        .where(
-            ChildProfile.tenant_id == tenant_id,
-            ChildProfile.deleted_at.is_(None),
-        )
-        .order_by(ChildProfile.id.asc())
-    ).all()
-    if len(ids) != 1:
-        return None
-    return int(ids[0])
-
-
 def _default_settings() -> EffectiveLearningSettings:
     return EffectiveLearningSettings(
         max_daily_learning_xp=DEFAULT_MAX_DAILY_LEARNING_XP,
@@ -311,26 +329,17 @@ def _default_settings() -> EffectiveLearningSettings:
         enable_coins_rewards=True,
         xp_multiplier=DEFAULT_XP_MULTIPLIER,
         coins_enabled=True,
-        enabled_subjects={},
+        enabled_subjects=MappingProxyType({}),
     )
 
 
-def resolve_effective_learning_settings(
-    db: Session,
-    *,
-    tenant_id: int | None,
-    child_id: int | None = None,
+def _load_effective_learning_settings(
+    db: Session, *, tenant_id: int, child_id: int
 ) -> EffectiveLearningSettings:
-    if tenant_id is None:
-        return _default_settings()
-    resolved_child_id = int(child_id) if child_id is not None else _resolve_tenant_single_child_id(db, tenant_id=tenant_id)
-    if resolved_child_id is None:
-        return _default_settings()
-
     row = db.scalar(
         select(LearningSettings).where(
             LearningSettings.tenant_id == tenant_id,
-            LearningSettings.child_id == resolved_child_id,
+            LearningSettings.child_id == child_id,
         )
     )
     if row is None:
@@ -344,7 +353,34 @@ def resolve_effective_learning_settings(
         enable_coins_rewards=bool(row.enable_coins_rewards),
         xp_multiplier=max(0.0, float(row.xp_multiplier)),
         coins_enabled=bool(row.coins_enabled),
-        enabled_subjects=row.enabled_subjects or {},
+        enabled_subjects=MappingProxyType(dict(row.enabled_subjects or {})),
+    )
+
+
+def resolve_effective_learning_settings(
+    db: Session,
+    *,
+    tenant_id: int | None,
+    child_id: int | None = None,
+) -> EffectiveLearningSettings:
+    """Tenant learning settings, served from the tenant settings cache and memoized per request."""
+    if tenant_id is None:
+        return _default_settings()
+    resolved_child_id = (
+        int(child_id)
+        if child_id is not None
+        else resolve_tenant_single_child_id(db, tenant_id=tenant_id)
+    )
+    if resolved_child_id is None:
+        return _default_settings()
+    return cached_tenant_setting(
+        db,
+        kind="effective",
+        tenant_id=tenant_id,
+        child_id=resolved_child_id,
+        load=lambda: _load_effective_learning_settings(
+            db, tenant_id=tenant_id, child_id=resolved_child_id
+        ),
     )
 
 
@@ -1733,6 +1769,47 @@ def _resolve_answer_target(
     return str(template.skill_id), template.difficulty
 
 
+def _apply_answer_to_mastery(
+    mastery: UserSkillMastery,
+    *,
+    result: QuestionResult,
+    served_difficulty: QuestionDifficulty,
+    now: datetime,
+    spaced_repetition: bool,
+) -> float:
+    """Apply one answer's mastery/streak/review update in place and return the previous mastery."""
+    prev = float(mastery.mastery)
+    factor = _difficulty_factor(served_difficulty)
+    if result == QuestionResult.CORRECT:
+        mastery.mastery = _clamp_mastery(prev + (0.06 * factor))
+        mastery.streak_correct += 1
+        mastery.streak_wrong = 0
+    elif result == QuestionResult.WRONG:
+        mastery.mastery = _clamp_mastery(prev - (0.08 * factor))
+        mastery.streak_wrong += 1
+        mastery.streak_correct = 0
+    mastery.last_seen_at = now
+
+    if spaced_repetition:
+        if result == QuestionResult.CORRECT:
+            m = float(mastery.mastery)
+            days = 1 if m < 0.3 else 3 if m <= 0.6 else 7 if m <= 0.8 else 14
+            mastery.next_review_at = now + timedelta(days=days)
+        elif result == QuestionResult.WRONG:
+            mastery.next_review_at = now
+    else:
+        mastery.next_review_at = None
+    return prev
+
+
+def _consume_wrong_answers_energy(db: Session, *, user_id: int, wrong_answers: int) -> None:
+    if wrong_answers <= 0:
+        return
+    discount_multiplier = get_energy_discount_multiplier(db, user_id=user_id)
+    energy_cost = 0 if discount_multiplier <= 0.5 else 1
+    consume_wrong_answer_energy(db, user_id=user_id, cost=energy_cost * wrong_answers)
+
+
 def track_question_answer(
     db: Session,
     *,
@@ -1755,32 +1832,16 @@ def track_question_answer(
         variant_id=variant_id,
     )
     if result == QuestionResult.WRONG:
-        discount_multiplier = get_energy_discount_multiplier(db, user_id=user_id)
-        energy_cost = 0 if discount_multiplier <= 0.5 else 1
-        consume_wrong_answer_energy(db, user_id=user_id, cost=energy_cost)
+        _consume_wrong_answers_energy(db, user_id=user_id, wrong_answers=1)
 
     mastery = _get_or_create_mastery(db, user_id=user_id, skill_id=skill_id)
-    prev = float(mastery.mastery)
-    factor = _difficulty_factor(served_difficulty)
-    if result == QuestionResult.CORRECT:
-        mastery.mastery = _clamp_mastery(prev + (0.06 * factor))
-        mastery.streak_correct += 1
-        mastery.streak_wrong = 0
-    elif result == QuestionResult.WRONG:
-        mastery.mastery = _clamp_mastery(prev - (0.08 * factor))
-        mastery.streak_wrong += 1
-        mastery.streak_correct = 0
-    mastery.last_seen_at = now
-
-    if settings.enable_spaced_repetition:
-        if result == QuestionResult.CORRECT:
-            m = float(mastery.mastery)
-            days = 1 if m < 0.3 else 3 if m <= 0.6 else 7 if m <= 0.8 else 14
-            mastery.next_review_at = now + timedelta(days=days)
-        elif result == QuestionResult.WRONG:
-            mastery.next_review_at = now
-    else:
-        mastery.next_review_at = None
+    prev = _apply_answer_to_mastery(
+        mastery,
+        result=result,
+        served_difficulty=served_difficulty,
+        now=now,
+        spaced_repetition=settings.enable_spaced_repetition,
+    )
 
     history = UserQuestionHistory(
         user_id=user_id,
@@ -1804,6 +1865,174 @@ def track_question_answer(
     )
 
 
+def _resolve_answer_targets(
+    db: Session,
+    answers: list[QuestionAnswerInput],
+) -> list[tuple[str, QuestionDifficulty]]:
+    """Batch form of `_resolve_answer_target`: one read per referenced table, same validation."""
+
+    def _load(model: Any, ids: set[str]) -> dict[str, Any]:
+        if not ids:
+            return {}
+        return {
+            str(row.id): row
+            for row in db.scalars(select(model).where(model.id.in_(sorted(ids)))).all()
+        }
+
+    questions = _load(
+        Question, {str(item.question_id) for item in answers if item.question_id is not None}
+    )
+    variants = _load(
+        QuestionVariant,
+        {
+            str(item.variant_id)
+            for item in answers
+            if item.question_id is not None and item.variant_id is not None
+        },
+    )
+    templates = _load(
+        QuestionTemplate,
+        {
+            str(item.template_id)
+            for item in answers
+            if item.question_id is None and item.template_id is not None
+        },
+    )
+    generated = _load(
+        GeneratedVariant,
+        {
+            str(item.generated_variant_id)
+            for item in answers
+            if item.question_id is None and item.generated_variant_id is not None
+        },
+    )
+    skills = _load(Skill, {str(row.skill_id) for row in questions.values()})
+
+    targets: list[tuple[str, QuestionDifficulty]] = []
+    for item in answers:
+        if item.question_id is not None:
+            question = questions.get(str(item.question_id))
+            if question is None:
+                raise ValueError("Question not found")
+            skill = skills.get(str(question.skill_id))
+            skill_age_group = skill.age_group if skill is not None else None
+            if item.variant_id is not None:
+                variant = variants.get(str(item.variant_id))
+                if variant is None or str(variant.question_id) != str(question.id):
+                    raise ValueError("Variant not found for question")
+                difficulty = _effective_question_difficulty(
+                    base_difficulty=question.difficulty,
+                    variant=variant,
+                    age_group=skill_age_group,
+                )
+            else:
+                difficulty = _cap_difficulty_for_age_group(
+                    question.difficulty, age_group=skill_age_group
+                )
+            targets.append((str(question.skill_id), difficulty))
+            continue
+        if item.template_id is None or item.generated_variant_id is None:
+            raise ValueError("questionId or (templateId + generatedVariantId) is required")
+        template = templates.get(str(item.template_id))
+        if template is None:
+            raise ValueError("Question template not found")
+        generated_variant = generated.get(str(item.generated_variant_id))
+        if generated_variant is None or str(generated_variant.template_id) != str(template.id):
+            raise ValueError("Generated variant not found for template")
+        targets.append((str(template.skill_id), template.difficulty))
+    return targets
+
+
+def track_question_answers(
+    db: Session,
+    *,
+    user_id: int,
+    answers: list[QuestionAnswerInput],
+    tenant_id: int | None,
+) -> list[TrackedAnswer]:
+    """Ingest a batch of answers (a session or a chunk of one) in order.
+
+    Produces the same mastery, streak and review state as calling `track_question_answer`
+    once per answer, but targets and mastery rows are read once, the math runs in memory,
+    history goes out as one multi-row insert and each touched skill is written once.
+    An invalid answer rejects the whole batch with ValueError.
+    """
+    if not answers:
+        return []
+    now = datetime.now(UTC)
+    settings = resolve_effective_learning_settings(db, tenant_id=tenant_id)
+    targets = _resolve_answer_targets(db, answers)
+    _consume_wrong_answers_energy(
+        db,
+        user_id=user_id,
+        wrong_answers=sum(1 for item in answers if item.result == QuestionResult.WRONG),
+    )
+
+    skill_ids = sorted({skill_id for skill_id, _difficulty in targets})
+    mastery_by_skill = {
+        str(row.skill_id): row
+        for row in db.scalars(
+            select(UserSkillMastery).where(
+                UserSkillMastery.user_id == user_id,
+                UserSkillMastery.skill_id.in_(skill_ids),
+            )
+        ).all()
+    }
+    for skill_id in skill_ids:
+        if skill_id not in mastery_by_skill:
+            row = UserSkillMastery(
+                user_id=user_id, skill_id=skill_id, mastery=0, streak_correct=0, streak_wrong=0
+            )
+            db.add(row)
+            mastery_by_skill[skill_id] = row
+
+    tracked: list[TrackedAnswer] = []
+    history_rows: list[dict[str, Any]] = []
+    for item, (skill_id, served_difficulty) in zip(answers, targets):
+        mastery = mastery_by_skill[skill_id]
+        prev = _apply_answer_to_mastery(
+            mastery,
+            result=item.result,
+            served_difficulty=served_difficulty,
+            now=now,
+            spaced_repetition=settings.enable_spaced_repetition,
+        )
+        # Round like the NUMERIC(4, 3) column does between separate per-answer requests.
+        mastery.mastery = float(
+            Decimal(str(float(mastery.mastery))).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
+        )
+        tracked.append(
+            TrackedAnswer(
+                skill_id=skill_id,
+                question_id=item.question_id,
+                template_id=item.template_id,
+                generated_variant_id=item.generated_variant_id,
+                result=item.result,
+                mastery=float(mastery.mastery),
+                mastery_delta=float(mastery.mastery) - prev,
+                streak_correct=int(mastery.streak_correct),
+                streak_wrong=int(mastery.streak_wrong),
+                next_review_at=mastery.next_review_at,
+            )
+        )
+        history_rows.append(
+            {
+                "user_id": user_id,
+                "question_id": item.question_id,
+                "template_id": item.template_id,
+                "generated_variant_id": item.generated_variant_id,
+                "variant_id": item.variant_id,
+                "result": item.result,
+                "time_ms": max(0, int(item.time_ms)),
+                "difficulty_served": served_difficulty,
+            }
+        )
+
+    db.execute(insert(UserQuestionHistory), history_rows)
+    db.flush()
+    return tracked
+
+
 def _upsert_lesson_progress(
     db: Session,
     *,
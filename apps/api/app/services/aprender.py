@@ -2,15 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import UTC, date, datetime
-import json
 import logging
-import os
-from time import perf_counter
+from threading import Lock
+import time
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.orm import Session, SessionTransaction
 
+from app.core.config import settings as app_settings
 from app.models import (
     ChildProfile,
     GameSettings,
@@ -18,34 +19,25 @@ from app.models import (
     LessonContent,
     LessonDifficulty,
     LessonProgress,
+    LessonType,
     Subject,
     SubjectAgeGroup,
     Unit,
     UserLearningStatus,
+    UserUnitProgress,
 )
 from app.services.achievement_engine import evaluate_achievements_after_learning
 from app.services.child_age import get_child_age
 from app.services.gamification import addXP, get_or_create_game_profile
+from app.services.learning_settings_cache import (
+    cached_tenant_setting,
+    resolve_tenant_single_child_id,
+)
 from app.services.learning_streak import LearningStreakSnapshot, register_learning_lesson_completion
 
 logger = logging.getLogger("axiora.api.aprender")
 
 
-def _build_unit_completion_perf_logger() -> logging.Logger:
-    perf_logger = logging.getLogger("axiora.api.unit_completion_perf")
-    if perf_logger.handlers:
-        return perf_logger
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter("%(message)s"))
-    perf_logger.addHandler(handler)
-    perf_logger.setLevel(logging.INFO)
-    perf_logger.propagate = False
-    return perf_logger
-
-
-unit_completion_perf_logger = _build_unit_completion_perf_logger()
-
-
 DEFAULT_MAX_DAILY_LEARNING_XP = 200
 DEFAULT_LEARNING_COIN_MULTIPLIER = 1.0
 THREE_STAR_BONUS_COINS = 10
@@ -65,9 +57,56 @@ class LessonLockedError(PermissionError):
     pass
 
 
+@dataclass(frozen=True, slots=True)
+class PathSubject:
+    id: int
+    name: str
+    age_group: SubjectAgeGroup
+    age_min: int
+    age_max: int
+    icon: str | None
+    color: str | None
+    order: int
+
+
+@dataclass(frozen=True, slots=True)
+class PathLesson:
+    id: int
+    unit_id: int
+    title: str
+    order: int
+    xp_reward: int
+    difficulty: LessonDifficulty
+    type: LessonType
+
+
+@dataclass(frozen=True, slots=True)
+class PathUnit:
+    id: int
+    subject_id: int
+    title: str
+    description: str | None
+    order: int
+    required_level: int
+    lessons: tuple[PathLesson, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectPathStructure:
+    """Session-independent snapshot of a subject's units and lessons.
+
+    Safe to share across requests.
+    """
+
+    subject: PathSubject
+    units: tuple[PathUnit, ...]
+    # lesson_id -> (unit index, lesson index within the unit)
+    lesson_positions: dict[int, tuple[int, int]]
+
+
 @dataclass(slots=True)
 class LessonUnlockStatus:
-    lesson: Lesson
+    lesson: PathLesson
     unlocked: bool
     completed: bool
     score: int | None
@@ -76,7 +115,7 @@ class LessonUnlockStatus:
 
 @dataclass(slots=True)
 class UnitPathStatus:
-    unit: Unit
+    unit: PathUnit
     unlocked: bool
     completion_rate: float
     lessons: list[LessonUnlockStatus]
@@ -84,7 +123,7 @@ class UnitPathStatus:
 
 @dataclass(slots=True)
 class SubjectPathStatus:
-    subject: Subject
+    subject: PathSubject
     user_level: int
     units: list[UnitPathStatus]
 
@@ -153,18 +192,176 @@ def is_difficulty_allowed_for_age_group(
     return True
 
 
-def _lessons_by_unit(db: Session, unit_ids: list[int]) -> dict[int, list[Lesson]]:
+_STRUCTURE_CACHE_LOCK = Lock()
+_SUBJECT_STRUCTURE_CACHE: dict[int, tuple[float, SubjectPathStructure]] = {}
+
+_UNIT_PROGRESS_UPSERT_SQL = text(
+    """
+    INSERT INTO user_unit_progress (user_id, unit_id, completed_lessons, updated_at)
+    SELECT :user_id, l.unit_id, GREATEST(:delta, 0), CURRENT_TIMESTAMP
+    FROM lessons AS l
+    WHERE l.id = :lesson_id
+    ON CONFLICT (user_id, unit_id) DO UPDATE SET
+        completed_lessons = GREATEST(user_unit_progress.completed_lessons + :delta, 0),
+        updated_at = CURRENT_TIMESTAMP
+    """
+)
+
+def _load_subject_structure_from_db(db: Session, *, subject_id: int) -> SubjectPathStructure | None:
+    subject = db.get(Subject, subject_id)
+    if subject is None:
+        return None
+    units = db.scalars(
+        select(Unit).where(Unit.subject_id == subject_id).order_by(Unit.order.asc())
+    ).all()
+    unit_ids = [unit.id for unit in units]
+    lessons_by_unit: dict[int, list[PathLesson]] = {}
+    if unit_ids:
+        for lesson in db.scalars(
+            select(Lesson)
+            .where(Lesson.unit_id.in_(unit_ids))
+            .order_by(Lesson.unit_id.asc(), Lesson.order.asc()),
+        ).all():
+            lessons_by_unit.setdefault(lesson.unit_id, []).append(
+                PathLesson(
+                    id=lesson.id,
+                    unit_id=lesson.unit_id,
+                    title=lesson.title,
+                    order=lesson.order,
+                    xp_reward=lesson.xp_reward,
+                    difficulty=lesson.difficulty,
+                    type=lesson.type,
+                )
+            )
+    path_units = tuple(
+        PathUnit(
+            id=unit.id,
+            subject_id=unit.subject_id,
+            title=unit.title,
+            description=unit.description,
+            order=unit.order,
+            required_level=unit.required_level,
+            lessons=tuple(lessons_by_unit.get(unit.id, [])),
+        )
+        for unit in units
+    )
+    return SubjectPathStructure(
+        subject=PathSubject(
+            id=subject.id,
+            name=subject.name,
+            age_group=subject.age_group,
+            age_min=subject.age_min,
+            age_max=subject.age_max,
+            icon=subject.icon,
+            color=subject.color,
+            order=subject.order,
+        ),
+        units=path_units,
+        lesson_positions={
+            lesson.id: (unit_index, lesson_index)
+            for unit_index, unit in enumerate(path_units)
+            for lesson_index, lesson in enumerate(unit.lessons)
+        },
+    )
+
+
+def get_subject_structure(
+    db: Session,
+    *,
+    subject_id: int,
+    lesson_id: int | None = None,
+) -> SubjectPathStructure:
+    """Subject/unit/lesson layout, cached in-process for `aprender_structure_cache_ttl_seconds`.
+
+    The cache is per process, so a `lesson_id` missing from a cached layout (a lesson created
+    through another worker) forces a DB read instead of reporting the lesson as locked.
+    """
+    now = time.monotonic()
+    with _STRUCTURE_CACHE_LOCK:
+        found = _SUBJECT_STRUCTURE_CACHE.get(subject_id)
+    if found is not None and found[0] > now:
+        if lesson_id is None or lesson_id in found[1].lesson_positions:
+            return found[1]
+    structure = _load_subject_structure_from_db(db, subject_id=subject_id)
+    if structure is None:
+        raise SubjectNotFoundError("Subject not found")
+    ttl_seconds = max(0, int(app_settings.aprender_structure_cache_ttl_seconds or 0))
+    if ttl_seconds > 0:
+        with _STRUCTURE_CACHE_LOCK:
+            _SUBJECT_STRUCTURE_CACHE[subject_id] = (now + ttl_seconds, structure)
+    return structure
+
+
+def invalidate_subject_structure_cache(subject_id: int | None = None) -> None:
+    with _STRUCTURE_CACHE_LOCK:
+        if subject_id is None:
+            _SUBJECT_STRUCTURE_CACHE.clear()
+        else:
+            _SUBJECT_STRUCTURE_CACHE.pop(subject_id, None)
+
+
+_PENDING_STRUCTURE_INVALIDATION_KEY = "aprender_structure_invalidation_pending"
+
+
+def invalidate_subject_structure_cache_after_commit(db: Session) -> None:
+    """Drop cached layouts once `db` commits structure writes that are only flushed so far.
+
+    Invalidating right after the flush would let a concurrent request re-cache the
+    pre-commit layout; on rollback the cache is dropped too, since this session may have
+    cached units or lessons that no longer exist.
+    """
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        invalidate_subject_structure_cache()
+        return
+    info[_PENDING_STRUCTURE_INVALIDATION_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_structure_cache_on_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_STRUCTURE_INVALIDATION_KEY, False):
+        invalidate_subject_structure_cache()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_structure_cache_on_rollback(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    if not session.info.get(_PENDING_STRUCTURE_INVALIDATION_KEY):
+        return
+    invalidate_subject_structure_cache()
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_STRUCTURE_INVALIDATION_KEY, None)
+
+
+def apply_lesson_progress_unit_counter(
+    connection: Any, progress: LessonProgress, *, inserted: bool
+) -> None:
+    """Keep `user_unit_progress.completed_lessons` in step with a LessonProgress write."""
+    if inserted:
+        was_completed = False
+    else:
+        history = inspect(progress).attrs["completed"].history
+        was_completed = bool(history.deleted[0]) if history.deleted else bool(progress.completed)
+    delta = int(bool(progress.completed)) - int(was_completed)
+    if delta == 0:
+        return
+    connection.execute(
+        _UNIT_PROGRESS_UPSERT_SQL,
+        {"user_id": progress.user_id, "lesson_id": progress.lesson_id, "delta": delta},
+    )
+
+
+def _unit_completed_counts(db: Session, *, user_id: int, unit_ids: list[int]) -> dict[int, int]:
     if not unit_ids:
         return {}
-    rows = db.scalars(
-        select(Lesson)
-        .where(Lesson.unit_id.in_(unit_ids))
-        .order_by(Lesson.unit_id.asc(), Lesson.order.asc()),
+    rows = db.execute(
+        select(UserUnitProgress.unit_id, UserUnitProgress.completed_lessons).where(
+            UserUnitProgress.user_id == user_id,
+            UserUnitProgress.unit_id.in_(unit_ids),
+        ),
     ).all()
-    grouped: dict[int, list[Lesson]] = {}
-    for lesson in rows:
-        grouped.setdefault(lesson.unit_id, []).append(lesson)
-    return grouped
+    return {int(unit_id): int(completed or 0) for unit_id, completed in rows}
 
 
 def _progress_by_lesson(
@@ -181,45 +378,90 @@ def _progress_by_lesson(
     return {row.lesson_id: row for row in rows}
 
 
-def build_subject_path(db: Session, *, user_id: int, subject_id: int) -> SubjectPathStatus:
-    subject = db.get(Subject, subject_id)
-    if subject is None:
-        raise SubjectNotFoundError("Subject not found")
+def _unit_completion_rate(unit: PathUnit, completed_counts: dict[int, int]) -> float:
+    total_count = len(unit.lessons)
+    if total_count <= 0:
+        return 1.0
+    return min(completed_counts.get(unit.id, 0), total_count) / total_count
 
-    units = db.scalars(
-        select(Unit).where(Unit.subject_id == subject_id).order_by(Unit.order.asc())
-    ).all()
-    unit_ids = [unit.id for unit in units]
-    lessons_by_unit = _lessons_by_unit(db, unit_ids)
-    lesson_ids = [lesson.id for lessons in lessons_by_unit.values() for lesson in lessons]
+
+def _unit_unlocked(
+    structure: SubjectPathStructure,
+    *,
+    unit_index: int,
+    user_level: int,
+    completed_counts: dict[int, int],
+) -> bool:
+    unit = structure.units[unit_index]
+    if user_level < unit.required_level:
+        return False
+    if unit_index == 0:
+        return True
+    return _unit_completion_rate(structure.units[unit_index - 1], completed_counts) >= 0.8
+
+
+def _is_lesson_unlocked(
+    db: Session,
+    *,
+    user_id: int,
+    structure: SubjectPathStructure,
+    lesson_id: int,
+) -> bool:
+    """Unlock check for one lesson.
+
+    Costs one counter read and one progress read, independent of path size.
+    """
+    position = structure.lesson_positions.get(lesson_id)
+    if position is None:
+        return False
+    unit_index, lesson_index = position
+    unit = structure.units[unit_index]
+    previous_unit_ids = [structure.units[unit_index - 1].id] if unit_index > 0 else []
+    lesson_ids = [lesson_id]
+    if lesson_index > 0:
+        lesson_ids.append(unit.lessons[lesson_index - 1].id)
     progress_by_lesson = _progress_by_lesson(db, user_id=user_id, lesson_ids=lesson_ids)
+    own_progress = progress_by_lesson.get(lesson_id)
+    if own_progress is not None and own_progress.completed:
+        return True
+    user_level = get_or_create_game_profile(db, user_id=user_id).level
+    completed_counts = _unit_completed_counts(db, user_id=user_id, unit_ids=previous_unit_ids)
+    if not _unit_unlocked(
+        structure, unit_index=unit_index, user_level=user_level, completed_counts=completed_counts
+    ):
+        return False
+    if lesson_index == 0:
+        return True
+    previous_progress = progress_by_lesson.get(unit.lessons[lesson_index - 1].id)
+    return bool(previous_progress and previous_progress.completed)
+
+
+def build_subject_path(db: Session, *, user_id: int, subject_id: int) -> SubjectPathStatus:
+    structure = get_subject_structure(db, subject_id=subject_id)
+    completed_counts = _unit_completed_counts(
+        db, user_id=user_id, unit_ids=[unit.id for unit in structure.units]
+    )
+    progress_by_lesson = _progress_by_lesson(
+        db,
+        user_id=user_id,
+        lesson_ids=[lesson.id for unit in structure.units for lesson in unit.lessons],
+    )
 
     profile = get_or_create_game_profile(db, user_id=user_id)
     user_level = profile.level
 
     units_out: list[UnitPathStatus] = []
-    previous_completion = 1.0
-    for index, unit in enumerate(units):
-        unit_lessons = lessons_by_unit.get(unit.id, [])
-        completed_count = sum(
-            1
-            for lesson in unit_lessons
-            if bool(
-                progress_by_lesson.get(lesson.id, None)
-                and progress_by_lesson[lesson.id].completed
-            )
+    for index, unit in enumerate(structure.units):
+        unit_unlocked = _unit_unlocked(
+            structure,
+            unit_index=index,
+            user_level=user_level,
+            completed_counts=completed_counts,
         )
-        total_count = len(unit_lessons)
-        completion_rate = (completed_count / total_count) if total_count > 0 else 1.0
-
-        if index == 0:
-            unit_unlocked = user_level >= unit.required_level
-        else:
-            unit_unlocked = previous_completion >= 0.8 and user_level >= unit.required_level
 
         lesson_statuses: list[LessonUnlockStatus] = []
         previous_lesson_completed = False
-        for lesson_index, lesson in enumerate(unit_lessons):
+        for lesson_index, lesson in enumerate(unit.lessons):
             progress = progress_by_lesson.get(lesson.id)
             is_completed = bool(progress and progress.completed)
             if lesson_index == 0:
@@ -244,13 +486,12 @@ def build_subject_path(db: Session, *, user_id: int, subject_id: int) -> Subject
             UnitPathStatus(
                 unit=unit,
                 unlocked=unit_unlocked,
-                completion_rate=completion_rate,
+                completion_rate=_unit_completion_rate(unit, completed_counts),
                 lessons=lesson_statuses,
             )
         )
-        previous_completion = completion_rate
 
-    return SubjectPathStatus(subject=subject, user_level=user_level, units=units_out)
+    return SubjectPathStatus(subject=structure.subject, user_level=user_level, units=units_out)
 
 
 def list_lesson_contents(db: Session, *, lesson_id: int) -> list[LessonContent]:
@@ -263,28 +504,13 @@ def list_lesson_contents(db: Session, *, lesson_id: int) -> list[LessonContent]:
     )
 
 
-def _resolve_learning_settings(
-    db: Session,
-    *,
-    tenant_id: int | None,
+def _load_learning_economy_settings(
+    db: Session, *, tenant_id: int, child_id: int
 ) -> tuple[int, float]:
-    if tenant_id is None:
-        return DEFAULT_MAX_DAILY_LEARNING_XP, DEFAULT_LEARNING_COIN_MULTIPLIER
-    child_ids = db.scalars(
-        select(ChildProfile.id)
-        .where(
-            ChildProfile.tenant_id == tenant_id,
-            ChildProfile.deleted_at.is_(None),
-        )
-        .order_by(ChildProfile.id.asc())
-    ).all()
-    if len(child_ids) != 1:
-        return DEFAULT_MAX_DAILY_LEARNING_XP, DEFAULT_LEARNING_COIN_MULTIPLIER
-
     settings = db.scalar(
         select(GameSettings).where(
             GameSettings.tenant_id == tenant_id,
-            GameSettings.child_id == child_ids[0],
+            GameSettings.child_id == child_id,
         ),
     )
     if settings is None:
@@ -295,6 +521,25 @@ def _resolve_learning_settings(
     )
 
 
+def _resolve_learning_settings(
+    db: Session,
+    *,
+    tenant_id: int | None,
+) -> tuple[int, float]:
+    if tenant_id is None:
+        return DEFAULT_MAX_DAILY_LEARNING_XP, DEFAULT_LEARNING_COIN_MULTIPLIER
+    child_id = resolve_tenant_single_child_id(db, tenant_id=tenant_id)
+    if child_id is None:
+        return DEFAULT_MAX_DAILY_LEARNING_XP, DEFAULT_LEARNING_COIN_MULTIPLIER
+    return cached_tenant_setting(
+        db,
+        kind="learning_economy",
+        tenant_id=tenant_id,
+        child_id=child_id,
+        load=lambda: _load_learning_economy_settings(db, tenant_id=tenant_id, child_id=child_id),
+    )
+
+
 def _get_or_create_learning_status(db: Session, *, user_id: int) -> UserLearningStatus:
     status = db.scalar(select(UserLearningStatus).where(UserLearningStatus.user_id == user_id))
     if status is not None:
@@ -311,37 +556,8 @@ def _get_or_create_learning_status(db: Session, *, user_id: int) -> UserLearning
     return status
 
 
-def _is_unit_completed(db: Session, *, unit_id: int, user_id: int) -> bool:
-    perf_enabled = os.getenv("PERF_MONITOR", "false").strip().lower() == "true"
-    started = perf_counter() if perf_enabled else None
-    try:
-        total_lessons = db.scalar(select(func.count(Lesson.id)).where(Lesson.unit_id == unit_id)) or 0
-        if total_lessons <= 0:
-            return False
-        completed_lessons = (
-            db.scalar(
-                select(func.count(LessonProgress.id))
-                .join(Lesson, Lesson.id == LessonProgress.lesson_id)
-                .where(
-                    Lesson.unit_id == unit_id,
-                    LessonProgress.user_id == user_id,
-                    LessonProgress.completed.is_(True),
-                ),
-            )
-            or 0
-        )
-        return int(completed_lessons) >= int(total_lessons)
-    finally:
-        if perf_enabled and started is not None:
-            unit_completion_perf_logger.info(
-                json.dumps(
-                    {
-                        "type": "unit_completion_check",
-                        "duration_ms": round((perf_counter() - started) * 1000, 1),
-                    },
-                    ensure_ascii=True,
-                )
-            )
+def _unit_completed_lessons(db: Session, *, unit_id: int, user_id: int) -> int:
+    return _unit_completed_counts(db, user_id=user_id, unit_ids=[unit_id]).get(unit_id, 0)
 
 
 def complete_lesson(
@@ -361,13 +577,8 @@ def complete_lesson(
     if unit is None:
         raise LessonNotFoundError("Lesson unit not found")
 
-    path = build_subject_path(db, user_id=user_id, subject_id=unit.subject_id)
-    unlock_map = {
-        status.lesson.id: status.unlocked
-        for unit_status in path.units
-        for status in unit_status.lessons
-    }
-    if not unlock_map.get(lesson_id, False):
+    structure = get_subject_structure(db, subject_id=unit.subject_id, lesson_id=lesson_id)
+    if not _is_lesson_unlocked(db, user_id=user_id, structure=structure, lesson_id=lesson_id):
         raise LessonLockedError("Lesson is locked")
 
     progress = db.scalar(
@@ -381,7 +592,9 @@ def complete_lesson(
     pass_threshold = 60
     repeat_required = score_value < pass_threshold
     stars = 3 if score_value >= 90 else 2 if score_value >= 60 else 1
-    unit_completed_before = _is_unit_completed(db, unit_id=unit.id, user_id=user_id)
+    unit_lessons_total = len(structure.units[structure.lesson_positions[lesson_id][0]].lessons)
+    unit_completed_lessons = _unit_completed_lessons(db, unit_id=unit.id, user_id=user_id)
+    unit_completed_before = unit_lessons_total > 0 and unit_completed_lessons >= unit_lessons_total
     if progress is None:
         progress = LessonProgress(
             user_id=user_id,
@@ -470,7 +683,14 @@ def complete_lesson(
     coins_granted = max(0, profile.axion_coins - before_coins)
 
     unit_boost_activated = False
-    if progress.completed and not unit_completed_before and _is_unit_completed(db, unit_id=unit.id, user_id=user_id):
+    # The counter row is bumped by the LessonProgress flush listener; derive the new value locally.
+    if progress.completed and not was_completed:
+        unit_completed_lessons += 1
+    if (
+        progress.completed
+        and not unit_completed_before
+        and unit_completed_lessons >= unit_lessons_total
+    ):
         learning_status.unit_boost_multiplier = UNIT_COMPLETION_BOOST_MULTIPLIER
         learning_status.unit_boost_remaining_lessons = UNIT_COMPLETION_BOOST_LESSONS
         unit_boost_activated = True
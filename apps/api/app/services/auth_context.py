@@ -0,0 +1,193 @@
+"""Request-scoped identity context: user, tenant, membership and default child.
+
+The API dependencies resolve all four in a single joined query and keep the result in
+`Session.info` for the rest of the request, so services that need the caller's tenant
+or primary child read it from there instead of querying again. The ids behind a
+context are also cached per access-token `jti` for `auth_context_cache_ttl_seconds`;
+later requests with the same token reload the rows by primary key and skip the
+default-child lookup. Role, tenant and membership rows are always re-read, so a
+revoked membership or deleted tenant is never served from the cache.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings as app_settings
+from app.models import ChildProfile, Membership, Tenant, User
+
+_REQUEST_CONTEXT_KEY = "auth_context"
+_CACHE_LOCK = Lock()
+_AUTH_CONTEXT_CACHE: dict[tuple[str, str | None], tuple[float, AuthContextIds]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class AuthContextIds:
+    user_id: int
+    tenant_id: int
+    default_child_id: int | None
+
+
+@dataclass(slots=True)
+class AuthContext:
+    user: User | None
+    tenant: Tenant | None
+    membership: Membership | None
+    default_child: ChildProfile | None
+    tenant_slug: str | None
+    token_key: str
+
+    @property
+    def tenant_id(self) -> int | None:
+        return self.tenant.id if self.tenant is not None else None
+
+    @property
+    def default_child_id(self) -> int | None:
+        return self.default_child.id if self.default_child is not None else None
+
+
+def _token_key(*, user_id: int, jti: str | None) -> str:
+    return f"jti:{jti}" if jti else f"sub:{user_id}"
+
+
+def _cached_ids(jti: str | None, tenant_slug: str | None) -> AuthContextIds | None:
+    if not jti:
+        return None
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        found = _AUTH_CONTEXT_CACHE.get((jti, tenant_slug))
+    if found is None or found[0] <= now:
+        return None
+    return found[1]
+
+
+def _store_ids(jti: str | None, tenant_slug: str | None, ids: AuthContextIds) -> None:
+    ttl_seconds = max(0, int(app_settings.auth_context_cache_ttl_seconds or 0))
+    if not jti or ttl_seconds <= 0:
+        return
+    with _CACHE_LOCK:
+        now = time.monotonic()
+        if len(_AUTH_CONTEXT_CACHE) >= 10_000:
+            expired = [
+                key for key, (expires_at, _ids) in _AUTH_CONTEXT_CACHE.items() if expires_at <= now
+            ]
+            for key in expired:
+                _AUTH_CONTEXT_CACHE.pop(key, None)
+        _AUTH_CONTEXT_CACHE[(jti, tenant_slug)] = (now + ttl_seconds, ids)
+
+
+def invalidate_auth_context_cache(jti: str | None = None) -> None:
+    with _CACHE_LOCK:
+        if jti is None:
+            _AUTH_CONTEXT_CACHE.clear()
+            return
+        for key in [key for key in _AUTH_CONTEXT_CACHE if key[0] == jti]:
+            _AUTH_CONTEXT_CACHE.pop(key, None)
+
+
+def _context_statement(
+    *, user_id: int, tenant_slug: str, cached: AuthContextIds | None
+) -> Select[tuple[User, Tenant, Membership, ChildProfile]]:
+    tenant_conditions = [Tenant.slug == tenant_slug, Tenant.deleted_at.is_(None)]
+    if cached is not None:
+        tenant_conditions.append(Tenant.id == cached.tenant_id)
+        child_condition = ChildProfile.id == cached.default_child_id
+    else:
+        first_child = aliased(ChildProfile)
+        child_condition = ChildProfile.id == (
+            select(first_child.id)
+            .where(first_child.tenant_id == Tenant.id, first_child.deleted_at.is_(None))
+            .order_by(first_child.id.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+    return (
+        select(User, Tenant, Membership, ChildProfile)
+        .select_from(User)
+        .outerjoin(Tenant, and_(*tenant_conditions))
+        .outerjoin(
+            Membership, and_(Membership.user_id == User.id, Membership.tenant_id == Tenant.id)
+        )
+        .outerjoin(
+            ChildProfile,
+            and_(
+                child_condition,
+                Membership.id.is_not(None),
+                ChildProfile.tenant_id == Tenant.id,
+                ChildProfile.deleted_at.is_(None),
+            ),
+        )
+        .where(User.id == user_id)
+        .order_by(Membership.id.asc())
+        .limit(1)
+    )
+
+
+def load_auth_context(
+    db: Session, *, user_id: int, tenant_slug: str | None, jti: str | None
+) -> AuthContext:
+    """Resolve (and memoize on the session) the caller's identity context for this request."""
+    token_key = _token_key(user_id=user_id, jti=jti)
+    existing = _session_context(db)
+    if (
+        existing is not None
+        and existing.token_key == token_key
+        and existing.tenant_slug == tenant_slug
+    ):
+        return existing
+
+    if tenant_slug:
+        cached = _cached_ids(jti, tenant_slug)
+        statement = _context_statement(user_id=user_id, tenant_slug=tenant_slug, cached=cached)
+        row = db.execute(statement).first()
+        user, tenant, membership, child = row if row is not None else (None, None, None, None)
+    else:
+        user, tenant, membership, child = db.get(User, user_id), None, None, None
+
+    context = AuthContext(
+        user=user,
+        tenant=tenant,
+        membership=membership,
+        default_child=child,
+        tenant_slug=tenant_slug,
+        token_key=token_key,
+    )
+    if user is not None and tenant is not None and membership is not None:
+        _store_ids(
+            jti,
+            tenant_slug,
+            AuthContextIds(
+                user_id=user.id, tenant_id=tenant.id, default_child_id=context.default_child_id
+            ),
+        )
+    info = getattr(db, "info", None)
+    if isinstance(info, dict):
+        info[_REQUEST_CONTEXT_KEY] = context
+    return context
+
+
+def _session_context(db: Session) -> AuthContext | None:
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return None
+    context = info.get(_REQUEST_CONTEXT_KEY)
+    return context if isinstance(context, AuthContext) else None
+
+
+def get_request_auth_context(db: Session, *, user_id: int | None = None) -> AuthContext | None:
+    """The context resolved by the API dependencies for this session, if any (and for `user_id`).
+
+    Only contexts backed by a membership are handed out: the tenant named by the
+    `X-Tenant-Slug` header is not trusted until the caller is known to belong to it.
+    """
+    context = _session_context(db)
+    if context is None or context.user is None or context.membership is None:
+        return None
+    if user_id is not None and context.user.id != int(user_id):
+        return None
+    return context
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import UTC, datetime
 
 from sqlalchemy import select
@@ -31,10 +32,20 @@ def filter_candidate_content_ids_by_age(
     *,
     candidate_content_ids: list[int],
     child_age: int,
+    catalog_rows: Mapping[int, AxionContentCatalog] | None = None,
 ) -> list[int]:
     ids = [int(item) for item in candidate_content_ids if item is not None]
     if len(ids) == 0:
         return []
+    if catalog_rows is not None:
+        return [
+            content_id
+            for content_id in ids
+            if content_id in catalog_rows
+            and int(catalog_rows[content_id].age_min)
+            <= int(child_age)
+            <= int(catalog_rows[content_id].age_max)
+        ]
     if not hasattr(db, "scalars"):
         return ids
     eligible = db.scalars(
@@ -129,7 +129,7 @@ def _load_operational_metrics(
                 SELECT COUNT(*)::int AS exposures_total
                 FROM event_log e
                 JOIN axion_decisions d
-                  ON d.id = (e.payload->>'decision_id')::uuid
+                  ON d.id = e.decision_id
                 WHERE e.type = 'axion_brief_exposed'
                   AND d.experiment_key = :experiment_key
                   AND (:tenant_id::int IS NULL OR d.tenant_id = :tenant_id)
@@ -139,7 +139,7 @@ def _load_operational_metrics(
                 SELECT COUNT(*)::int AS error_total
                 FROM event_log e
                 JOIN axion_decisions d
-                  ON d.id = (e.payload->>'decision_id')::uuid
+                  ON d.id = e.decision_id
                 WHERE e.type = ANY(:error_types)
                   AND d.experiment_key = :experiment_key
                   AND (:tenant_id::int IS NULL OR d.tenant_id = :tenant_id)
@@ -153,7 +153,7 @@ def _load_operational_metrics(
                     )::float AS p95_latency_ms
                 FROM event_log e
                 JOIN axion_decisions d
-                  ON d.id = (e.payload->>'decision_id')::uuid
+                  ON d.id = e.decision_id
                 WHERE e.type = 'axion_decision_latency_ms'
                   AND d.experiment_key = :experiment_key
                   AND (:tenant_id::int IS NULL OR d.tenant_id = :tenant_id)
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import AxionChildProfile, ChildProfile, Membership, UserLearningStreak
+from app.services.auth_context import get_request_auth_context
 
 FEATURE_SET_VERSION = 1
 
@@ -20,6 +21,13 @@ def _ema(current: float, observed: float, *, alpha: float = 0.22) -> float:
 
 
 def resolve_child_for_user(db: Session, *, user_id: int, tenant_id: int | None = None) -> int | None:
+    context = get_request_auth_context(db, user_id=user_id)
+    if (
+        context is not None
+        and context.default_child_id is not None
+        and tenant_id in (None, context.tenant_id)
+    ):
+        return context.default_child_id
     if tenant_id is not None:
         child_id = db.scalar(
             select(ChildProfile.id)
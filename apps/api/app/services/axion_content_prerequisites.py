@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import Mapping
+
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -101,6 +103,73 @@ def can_serve_content(
     return True
 
 
+def _load_prerequisite_edges(db: Session, *, content_ids: list[int]) -> dict[int, list[int]]:
+    edges: dict[int, list[int]] = {}
+    rows = db.execute(
+        select(ContentPrerequisite.content_id, ContentPrerequisite.prerequisite_content_id).where(
+            ContentPrerequisite.content_id.in_(content_ids)
+        )
+    ).all()
+    for content_id, prerequisite_content_id in rows:
+        edges.setdefault(int(content_id), []).append(int(prerequisite_content_id))
+    return edges
+
+
+def _load_served_content_ids(
+    db: Session,
+    *,
+    tenant_id: int,
+    child_id: int,
+    content_ids: list[int],
+) -> set[int]:
+    rows = db.scalars(
+        select(ChildContentHistory.content_id)
+        .where(
+            ChildContentHistory.tenant_id == int(tenant_id),
+            ChildContentHistory.child_id == int(child_id),
+            ChildContentHistory.content_id.in_(content_ids),
+        )
+        .distinct()
+    ).all()
+    return {int(item) for item in rows}
+
+
+def _load_subject_mastery_by_content(
+    db: Session,
+    *,
+    tenant_id: int,
+    child_id: int,
+    content_ids: list[int],
+) -> dict[int, float]:
+    subject_by_content: dict[int, str] = {}
+    for content_id, subject in db.execute(
+        select(AxionContentCatalog.content_id, AxionContentCatalog.subject).where(
+            AxionContentCatalog.content_id.in_(content_ids)
+        )
+    ).all():
+        normalized_subject = str(subject or "").strip().lower()
+        if normalized_subject:
+            subject_by_content[int(content_id)] = normalized_subject
+    if not subject_by_content:
+        return {}
+    score_by_subject = {
+        str(subject): float(score)
+        for subject, score in db.execute(
+            select(ChildSubjectMastery.subject, ChildSubjectMastery.mastery_score).where(
+                ChildSubjectMastery.tenant_id == int(tenant_id),
+                ChildSubjectMastery.child_id == int(child_id),
+                ChildSubjectMastery.subject.in_(sorted(set(subject_by_content.values()))),
+            )
+        ).all()
+        if score is not None
+    }
+    return {
+        content_id: score_by_subject[subject]
+        for content_id, subject in subject_by_content.items()
+        if subject in score_by_subject
+    }
+
+
 def filter_candidates_by_prerequisites(
     db: Session,
     *,
@@ -108,49 +177,61 @@ def filter_candidates_by_prerequisites(
     child_id: int,
     candidate_content_ids: list[int],
     mastery_threshold: float | None = None,
+    prerequisite_edges: Mapping[int, list[int]] | None = None,
 ) -> list[int]:
-    allowed: list[int] = []
-    for content_id in candidate_content_ids:
-        cid = int(content_id)
-        eligible = can_serve_content(
-            db,
-            tenant_id=tenant_id,
-            child_id=child_id,
-            content_id=cid,
-            mastery_threshold=mastery_threshold,
+    """Set-based prerequisite gate: a fixed number of reads for any candidate count.
+
+    `prerequisite_edges` lets the guardrails pipeline pass edges it already loaded.
+    Eligibility state events are only written for candidates whose eligibility changed
+    since the last recorded state, in a single bulk insert.
+    """
+    candidates = [int(content_id) for content_id in candidate_content_ids]
+    if not candidates or not hasattr(db, "execute"):
+        return candidates
+    threshold = float(
+        settings.axion_prerequisite_mastery_threshold
+        if mastery_threshold is None
+        else mastery_threshold
+    )
+    unique_candidates = list(dict.fromkeys(candidates))
+
+    if prerequisite_edges is None:
+        edges = _load_prerequisite_edges(db, content_ids=unique_candidates)
+    else:
+        edges = {
+            content_id: list(prerequisite_edges.get(content_id, []))
+            for content_id in unique_candidates
+        }
+    prerequisite_ids = sorted({item for values in edges.values() for item in values})
+    served: set[int] = set()
+    mastery: dict[int, float] = {}
+    if prerequisite_ids:
+        served = _load_served_content_ids(
+            db, tenant_id=tenant_id, child_id=child_id, content_ids=prerequisite_ids
         )
-        _track_prereq_unlock_transition(
+        mastery = _load_subject_mastery_by_content(
             db,
             tenant_id=tenant_id,
             child_id=child_id,
-            content_id=cid,
-            eligible=eligible,
+            content_ids=prerequisite_ids,
         )
-        if eligible:
-            allowed.append(cid)
-    return allowed
 
-
-def _latest_prereq_eligibility_state(
-    db: Session,
-    *,
-    tenant_id: int,
-    child_id: int,
-    content_id: int,
-) -> bool | None:
-    if not hasattr(db, "scalar"):
-        return None
-    value = db.scalar(
-        select(EventLog.payload["eligible"].astext)
-        .where(
-            EventLog.tenant_id == int(tenant_id),
-            EventLog.child_id == int(child_id),
-            EventLog.type == "axion_prereq_eligibility_state",
-            EventLog.payload["content_id"].astext == str(int(content_id)),
+    eligibility = {
+        content_id: all(
+            prerequisite in served
+            and prerequisite in mastery
+            and mastery[prerequisite] >= threshold
+            for prerequisite in edges.get(content_id, [])
         )
-        .order_by(EventLog.created_at.desc(), EventLog.id.desc())
-        .limit(1)
+        for content_id in unique_candidates
+    }
+    _track_prereq_unlock_transitions(
+        db, tenant_id=tenant_id, child_id=child_id, eligibility=eligibility
     )
+    return [content_id for content_id in candidates if eligibility[content_id]]
+
+
+def _parse_eligible_state(value: object) -> bool | None:
     if value is None:
         return None
     text = str(value).strip().lower()
@@ -161,76 +242,69 @@ def _latest_prereq_eligibility_state(
     return None
 
 
-def _record_prereq_eligibility_state(
-    db: Session,
-    *,
-    tenant_id: int,
-    child_id: int,
-    content_id: int,
-    eligible: bool,
-) -> None:
-    if not hasattr(db, "add"):
-        return
-    db.add(
-        EventLog(
-            tenant_id=int(tenant_id),
-            actor_user_id=None,
-            child_id=int(child_id),
-            type="axion_prereq_eligibility_state",
-            payload={
-                "content_id": int(content_id),
-                "eligible": bool(eligible),
-            },
-        )
-    )
-
-
-def _record_prereq_unlocked(
+def _load_latest_prereq_eligibility_states(
     db: Session,
     *,
     tenant_id: int,
     child_id: int,
-    content_id: int,
-) -> None:
-    if not hasattr(db, "add"):
-        return
-    db.add(
-        EventLog(
-            tenant_id=int(tenant_id),
-            actor_user_id=None,
-            child_id=int(child_id),
-            type="axion_prereq_unlocked",
-            payload={"content_id": int(content_id)},
+    content_ids: list[int],
+) -> dict[int, bool | None]:
+    content_key = EventLog.payload["content_id"].astext
+    rows = db.execute(
+        select(content_key, EventLog.payload["eligible"].astext)
+        .where(
+            EventLog.tenant_id == int(tenant_id),
+            EventLog.child_id == int(child_id),
+            EventLog.type == "axion_prereq_eligibility_state",
+            content_key.in_([str(int(content_id)) for content_id in content_ids]),
         )
-    )
+        .distinct(content_key)
+        .order_by(content_key, EventLog.created_at.desc(), EventLog.id.desc())
+    ).all()
+    return {
+        int(raw_content_id): _parse_eligible_state(raw_eligible)
+        for raw_content_id, raw_eligible in rows
+    }
 
 
-def _track_prereq_unlock_transition(
+def _track_prereq_unlock_transitions(
     db: Session,
     *,
     tenant_id: int,
     child_id: int,
-    content_id: int,
-    eligible: bool,
+    eligibility: dict[int, bool],
 ) -> None:
-    previous = _latest_prereq_eligibility_state(
+    previous_states = _load_latest_prereq_eligibility_states(
         db,
         tenant_id=tenant_id,
         child_id=child_id,
-        content_id=content_id,
+        content_ids=list(eligibility),
     )
-    if previous is False and bool(eligible):
-        safe_increment_prereq_unlock_total()
-        _record_prereq_unlocked(
-            db,
-            tenant_id=tenant_id,
-            child_id=child_id,
-            content_id=content_id,
+    rows: list[dict[str, object]] = []
+    for content_id, eligible in eligibility.items():
+        previous = previous_states.get(content_id)
+        if previous is not None and previous == eligible:
+            continue
+        if previous is False and eligible:
+            safe_increment_prereq_unlock_total()
+            rows.append(
+                {
+                    "tenant_id": int(tenant_id),
+                    "actor_user_id": None,
+                    "child_id": int(child_id),
+                    "type": "axion_prereq_unlocked",
+                    "payload": {"content_id": int(content_id)},
+                }
+            )
+        rows.append(
+            {
+                "tenant_id": int(tenant_id),
+                "actor_user_id": None,
+                "child_id": int(child_id),
+                "type": "axion_prereq_eligibility_state",
+                "payload": {"content_id": int(content_id), "eligible": bool(eligible)},
+            }
         )
-    _record_prereq_eligibility_state(
-        db,
-        tenant_id=tenant_id,
-        child_id=child_id,
-        content_id=content_id,
-        eligible=eligible,
-    )
+    if rows:
+        db.execute(insert(EventLog), rows)
+
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import UTC, datetime, timedelta
 import hashlib
 import re
@@ -8,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models import AxionContentCatalog, ChildContentHistory
+from app.models import AxionContentCatalog, ChildContentRecency
 
 _OUTCOME_INCORRECT = "incorrect"
 
@@ -28,6 +29,7 @@ def filter_repeated_candidates(
     mode: str | None = None,
     window_days: int | None = None,
     review_cooldown_hours: int | None = None,
+    fingerprint_by_content_id: Mapping[int, str] | None = None,
 ) -> list[int]:
     ids = [int(item) for item in candidate_content_ids if item is not None]
     if len(ids) == 0:
@@ -42,34 +44,36 @@ def filter_repeated_candidates(
     review_cutoff = now - timedelta(hours=review_cooldown)
     review_mode = str(mode or "").strip().lower() == "review"
 
-    catalog_rows = db.scalars(
-        select(AxionContentCatalog).where(
-            AxionContentCatalog.content_id.in_(ids),
-            AxionContentCatalog.is_active.is_(True),
-        )
-    ).all()
-    if len(catalog_rows) == 0:
-        return []
-    fingerprint_by_content_id = {int(item.content_id): str(item.content_fingerprint) for item in catalog_rows}
-    fingerprints = list({value for value in fingerprint_by_content_id.values() if value})
+    if fingerprint_by_content_id is None:
+        catalog_rows = db.scalars(
+            select(AxionContentCatalog).where(
+                AxionContentCatalog.content_id.in_(ids),
+                AxionContentCatalog.is_active.is_(True),
+            )
+        ).all()
+        if len(catalog_rows) == 0:
+            return []
+        fingerprint_by_content_id = {
+            int(item.content_id): str(item.content_fingerprint) for item in catalog_rows
+        }
+    fingerprints = list(
+        {fingerprint_by_content_id[item] for item in ids if fingerprint_by_content_id.get(item)}
+    )
     if len(fingerprints) == 0:
         return []
 
-    history_rows = db.scalars(
-        select(ChildContentHistory)
-        .where(
-            ChildContentHistory.tenant_id == tenant_id,
-            ChildContentHistory.child_id == child_id,
-            ChildContentHistory.content_fingerprint.in_(fingerprints),
-            ChildContentHistory.served_at >= window_start,
+    # One keyed lookup on the recency index, independent of how long the history is.
+    recency_rows = db.scalars(
+        select(ChildContentRecency).where(
+            ChildContentRecency.tenant_id == tenant_id,
+            ChildContentRecency.child_id == child_id,
+            ChildContentRecency.content_fingerprint.in_(fingerprints),
+            ChildContentRecency.served_at >= window_start,
         )
-        .order_by(ChildContentHistory.served_at.desc())
     ).all()
-    latest_by_fingerprint: dict[str, ChildContentHistory] = {}
-    for row in history_rows:
-        key = str(row.content_fingerprint or "")
-        if key and key not in latest_by_fingerprint:
-            latest_by_fingerprint[key] = row
+    latest_by_fingerprint: dict[str, ChildContentRecency] = {
+        str(row.content_fingerprint): row for row in recency_rows if row.content_fingerprint
+    }
 
     eligible: list[int] = []
     for content_id in ids:
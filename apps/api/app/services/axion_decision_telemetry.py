@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable
+from threading import Event, Lock, Thread
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import AxionFeatureSnapshot, EventLog
+from app.observability.axion_metrics import safe_increment_telemetry_dropped_total
+from app.services.axion_drift import record_feature_histograms
+
+logger = logging.getLogger(__name__)
+
+
+class DecisionTelemetrySink:
+    """Bounded in-process buffer for NBA feature snapshots and latency events.
+
+    `resolve_nba_mode` only appends row dicts here; a background writer flushes them with
+    multi-row inserts outside the request transaction. When the buffer is full new rows are
+    dropped and counted in `telemetry_dropped_total` instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_buffered: int,
+        flush_interval_seconds: float,
+        session_factory: Callable[[], Session] | None = None,
+    ) -> None:
+        self._max_buffered = max(1, int(max_buffered))
+        self._flush_interval_seconds = max(0.05, float(flush_interval_seconds))
+        self._session_factory = session_factory
+        self._lock = Lock()
+        self._feature_snapshots: deque[dict[str, Any]] = deque()
+        self._events: deque[dict[str, Any]] = deque()
+        self._wake = Event()
+        self._stopping = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def buffered(self) -> int:
+        with self._lock:
+            return len(self._feature_snapshots) + len(self._events)
+
+    def submit_feature_snapshot(self, row: dict[str, Any]) -> bool:
+        return self._submit(self._feature_snapshots, row)
+
+    def submit_event(self, row: dict[str, Any]) -> bool:
+        return self._submit(self._events, row)
+
+    def _submit(self, buffer: deque[dict[str, Any]], row: dict[str, Any]) -> bool:
+        with self._lock:
+            buffered = len(self._feature_snapshots) + len(self._events)
+            if buffered >= self._max_buffered:
+                accepted = False
+            else:
+                buffer.append(row)
+                accepted = True
+                buffered += 1
+        if not accepted:
+            safe_increment_telemetry_dropped_total()
+            return False
+        if buffered * 2 >= self._max_buffered:
+            self._wake.set()
+        return True
+
+    def drain(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        with self._lock:
+            feature_snapshots = list(self._feature_snapshots)
+            events = list(self._events)
+            self._feature_snapshots.clear()
+            self._events.clear()
+        return feature_snapshots, events
+
+    def flush(self) -> int:
+        feature_snapshots, events = self.drain()
+        if not feature_snapshots and not events:
+            return 0
+        if self._session_factory is None:
+            safe_increment_telemetry_dropped_total(len(feature_snapshots) + len(events))
+            return 0
+        db = self._session_factory()
+        try:
+            if feature_snapshots:
+                db.execute(insert(AxionFeatureSnapshot), feature_snapshots)
+                record_feature_histograms(db, feature_snapshots)
+            if events:
+                db.execute(insert(EventLog), events)
+            db.commit()
+        except Exception:
+            db.rollback()
+            safe_increment_telemetry_dropped_total(len(feature_snapshots) + len(events))
+            logger.exception("axion_decision_telemetry_flush_failed")
+            return 0
+        finally:
+            db.close()
+        return len(feature_snapshots) + len(events)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="axion-decision-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self, *, timeout_seconds: float = 5.0) -> None:
+        self._stopping.set()
+        self._wake.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None:
+            thread.join(timeout=timeout_seconds)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self._flush_interval_seconds)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+
+def _default_session_factory() -> Session:
+    from app.db.session import SessionLocal
+
+    return SessionLocal()
+
+
+decision_telemetry_sink = DecisionTelemetrySink(
+    max_buffered=settings.axion_decision_telemetry_buffer_size,
+    flush_interval_seconds=settings.axion_decision_telemetry_flush_interval_seconds,
+    session_factory=_default_session_factory,
+)
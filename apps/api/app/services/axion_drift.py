@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, time, timedelta
+import hashlib
 import json
+from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.models import AxionFeatureHistogramDaily
 
 
 @dataclass(slots=True)
@@ -24,92 +29,136 @@ class AxionDriftStatus:
     top_drifting_features: list[dict[str, object]]
 
 
-def _distribution_distance(baseline: list[str], recent: list[str]) -> float:
-    if not baseline or not recent:
+FEATURE_SIGNATURE_KEY = "__signature__"
+RECENT_WINDOW_DAYS = 2
+BASELINE_WINDOW_DAYS = 7
+
+FeatureHistograms = dict[str, Counter[str]]
+
+
+def _histogram_distance(baseline: Counter[str], recent: Counter[str]) -> float:
+    """Total variation distance between two categorical histograms."""
+    base_total = float(sum(baseline.values()))
+    recent_total = float(sum(recent.values()))
+    if base_total <= 0 or recent_total <= 0:
         return 0.0
-    base_counts = Counter(baseline)
-    recent_counts = Counter(recent)
-    base_total = float(sum(base_counts.values()))
-    recent_total = float(sum(recent_counts.values()))
-    keys = set(base_counts) | set(recent_counts)
     l1 = 0.0
-    for key in keys:
-        p = float(base_counts.get(key, 0)) / base_total
-        q = float(recent_counts.get(key, 0)) / recent_total
+    for key in set(baseline) | set(recent):
+        p = float(baseline.get(key, 0)) / base_total
+        q = float(recent.get(key, 0)) / recent_total
         l1 += abs(p - q)
     return max(0.0, min(1.0, 0.5 * l1))
 
 
-def _load_feature_signatures(
-    db: Session,
-    *,
-    tenant_id: int,
-    time_from: datetime,
-    time_to: datetime,
-    limit: int = 5000,
-) -> list[str]:
-    rows = db.execute(
-        text(
-            """
-            SELECT features_json
-            FROM axion_feature_snapshot
-            WHERE tenant_id = :tenant_id
-              AND snapshot_at >= :time_from
-              AND snapshot_at < :time_to
-            ORDER BY snapshot_at DESC
-            LIMIT :limit
-            """
-        ),
+def _distribution_distance(baseline: list[str], recent: list[str]) -> float:
+    return _histogram_distance(Counter(baseline), Counter(recent))
+
+
+def _normalize_feature_value(value: object) -> str:
+    # Matches Postgres `jsonb::text` for scalars so the SQL backfill and live rollups agree.
+    return json.dumps(
+        value, ensure_ascii=False, separators=(", ", ": "), sort_keys=True, default=str
+    )
+
+
+def feature_signature(payload: Mapping[str, object]) -> str:
+    """Compact whole-snapshot signature; migration 0128 reproduces it in SQL for the backfill."""
+    canonical = "|".join(
+        f"{key}={_normalize_feature_value(payload[key])}" for key in sorted(str(k) for k in payload)
+    )
+    return hashlib.md5(canonical.encode("utf-8")).hexdigest()
+
+
+def build_feature_histogram_rows(snapshots: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """Per-(tenant, UTC day, feature, value) counts for a batch of feature snapshot rows."""
+    counts: Counter[tuple[int, date, str, str]] = Counter()
+    for snapshot in snapshots:
+        payload = snapshot.get("features_json")
+        if not isinstance(payload, Mapping):
+            continue
+        snapshot_at = snapshot.get("snapshot_at")
+        stat_date = (
+            snapshot_at.astimezone(UTC).date()
+            if isinstance(snapshot_at, datetime)
+            else datetime.now(UTC).date()
+        )
+        tenant_id = int(snapshot["tenant_id"])
+        counts[(tenant_id, stat_date, FEATURE_SIGNATURE_KEY, feature_signature(payload))] += 1
+        for feature_name, value in payload.items():
+            counts[(tenant_id, stat_date, str(feature_name), _normalize_feature_value(value))] += 1
+    # Sorted so concurrent flushers lock rollup rows in the same order.
+    return [
         {
             "tenant_id": tenant_id,
-            "time_from": time_from,
-            "time_to": time_to,
-            "limit": int(limit),
-        },
-    ).mappings().all()
-    signatures: list[str] = []
-    for row in rows:
-        payload = row.get("features_json")
-        if isinstance(payload, dict):
-            signatures.append(json.dumps(payload, sort_keys=True, separators=(",", ":")))
-        else:
-            signatures.append(str(payload or ""))
-    return signatures
+            "stat_date": stat_date,
+            "feature_name": feature_name,
+            "feature_value": feature_value,
+            "sample_count": count,
+        }
+        for (tenant_id, stat_date, feature_name, feature_value), count in sorted(counts.items())
+    ]
+
+
+def record_feature_histograms(db: Session, snapshots: Iterable[Mapping[str, Any]]) -> int:
+    rows = build_feature_histogram_rows(snapshots)
+    if not rows:
+        return 0
+    stmt = pg_insert(AxionFeatureHistogramDaily).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                AxionFeatureHistogramDaily.tenant_id,
+                AxionFeatureHistogramDaily.stat_date,
+                AxionFeatureHistogramDaily.feature_name,
+                AxionFeatureHistogramDaily.feature_value,
+            ],
+            set_={
+                "sample_count": AxionFeatureHistogramDaily.sample_count + stmt.excluded.sample_count
+            },
+        )
+    )
+    return len(rows)
 
 
-def _load_feature_payloads(
+def _load_feature_histograms(
     db: Session,
     *,
-    tenant_id: int,
-    time_from: datetime,
-    time_to: datetime,
-    limit: int = 5000,
-) -> list[dict[str, object]]:
-    rows = db.execute(
-        text(
-            """
-            SELECT features_json
-            FROM axion_feature_snapshot
-            WHERE tenant_id = :tenant_id
-              AND snapshot_at >= :time_from
-              AND snapshot_at < :time_to
-            ORDER BY snapshot_at DESC
-            LIMIT :limit
-            """
-        ),
-        {
-            "tenant_id": tenant_id,
-            "time_from": time_from,
-            "time_to": time_to,
-            "limit": int(limit),
-        },
-    ).mappings().all()
-    payloads: list[dict[str, object]] = []
-    for row in rows:
-        payload = row.get("features_json")
-        if isinstance(payload, dict):
-            payloads.append(dict(payload))
-    return payloads
+    tenant_ids: list[int] | None,
+    baseline_from: date,
+    recent_from: date,
+    recent_to: date,
+) -> dict[int, tuple[FeatureHistograms, FeatureHistograms]]:
+    """(baseline, recent) histograms per tenant from the daily rollups, in one grouped read."""
+    is_recent = (AxionFeatureHistogramDaily.stat_date >= recent_from).label("is_recent")
+    stmt = (
+        select(
+            AxionFeatureHistogramDaily.tenant_id,
+            is_recent,
+            AxionFeatureHistogramDaily.feature_name,
+            AxionFeatureHistogramDaily.feature_value,
+            func.sum(AxionFeatureHistogramDaily.sample_count),
+        )
+        .where(
+            AxionFeatureHistogramDaily.stat_date >= baseline_from,
+            AxionFeatureHistogramDaily.stat_date <= recent_to,
+        )
+        .group_by(
+            AxionFeatureHistogramDaily.tenant_id,
+            is_recent,
+            AxionFeatureHistogramDaily.feature_name,
+            AxionFeatureHistogramDaily.feature_value,
+        )
+    )
+    if tenant_ids is not None:
+        stmt = stmt.where(AxionFeatureHistogramDaily.tenant_id.in_(sorted(set(tenant_ids))))
+    histograms: dict[int, tuple[FeatureHistograms, FeatureHistograms]] = {}
+    for tenant_id, in_recent, feature_name, feature_value, sample_count in db.execute(stmt).all():
+        baseline, recent = histograms.setdefault(int(tenant_id), ({}, {}))
+        target = recent if in_recent else baseline
+        target.setdefault(str(feature_name), Counter())[str(feature_value)] += int(
+            sample_count or 0
+        )
+    return histograms
 
 
 def _resolve_feature_thresholds() -> dict[str, float]:
@@ -131,29 +180,32 @@ def _resolve_feature_thresholds() -> dict[str, float]:
     return output
 
 
-def _normalize_feature_value(value: object) -> str:
-    if isinstance(value, (str, int, float, bool)) or value is None:
-        return json.dumps(value, separators=(",", ":"), sort_keys=True)
-    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+def _with_missing_as_null(histogram: Counter[str], total_samples: int) -> Counter[str]:
+    # Snapshots without the feature count as `null`, as the payload scan used to do.
+    missing = total_samples - sum(histogram.values())
+    if missing <= 0:
+        return histogram
+    output = Counter(histogram)
+    output[_normalize_feature_value(None)] += missing
+    return output
 
 
 def _compute_per_feature_drift(
-    baseline_payloads: list[dict[str, object]],
-    recent_payloads: list[dict[str, object]],
+    baseline: FeatureHistograms,
+    recent: FeatureHistograms,
     *,
     default_threshold: float,
     threshold_by_feature: dict[str, float],
 ) -> tuple[list[dict[str, object]], list[dict[str, object]], float]:
-    keys: set[str] = set()
-    for row in baseline_payloads:
-        keys.update(str(k) for k in row.keys())
-    for row in recent_payloads:
-        keys.update(str(k) for k in row.keys())
+    baseline_total = sum(baseline.get(FEATURE_SIGNATURE_KEY, Counter()).values())
+    recent_total = sum(recent.get(FEATURE_SIGNATURE_KEY, Counter()).values())
+    keys = (set(baseline) | set(recent)) - {FEATURE_SIGNATURE_KEY}
     per_feature: list[dict[str, object]] = []
     for feature_name in sorted(keys):
-        baseline_values = [_normalize_feature_value(item.get(feature_name)) for item in baseline_payloads]
-        recent_values = [_normalize_feature_value(item.get(feature_name)) for item in recent_payloads]
-        drift_score = _distribution_distance(baseline_values, recent_values)
+        drift_score = _histogram_distance(
+            _with_missing_as_null(baseline.get(feature_name, Counter()), baseline_total),
+            _with_missing_as_null(recent.get(feature_name, Counter()), recent_total),
+        )
         threshold = float(threshold_by_feature.get(feature_name, default_threshold))
         status = "OK"
         if drift_score > (2.0 * threshold):
@@ -176,111 +228,76 @@ def _compute_per_feature_drift(
 def _load_outcome_means(
     db: Session,
     *,
-    tenant_id: int,
+    tenant_ids: list[int] | None,
     experiment_key: str | None,
     baseline_from: datetime,
     baseline_to: datetime,
     recent_from: datetime,
     recent_to: datetime,
-) -> tuple[float, float]:
-    params = {
-        "tenant_id": tenant_id,
+) -> dict[int, tuple[float, float]]:
+    """(baseline, recent) shadow reward means per tenant in a single event_log scan."""
+    params: dict[str, object] = {
         "baseline_from": baseline_from,
         "baseline_to": baseline_to,
         "recent_from": recent_from,
         "recent_to": recent_to,
         "experiment_key": (experiment_key or ""),
     }
-    baseline = db.execute(
+    tenant_filter = ""
+    if tenant_ids is not None:
+        tenant_filter = "AND e.tenant_id = ANY(:tenant_ids)"
+        params["tenant_ids"] = sorted(set(tenant_ids))
+    rows = db.execute(
         text(
-            """
-            SELECT ROUND(AVG((e.payload->>'shadow_reward_score')::numeric), 6)::float AS avg_score
+            f"""
+            SELECT
+              e.tenant_id,
+              ROUND(AVG((e.payload->>'shadow_reward_score')::numeric)
+                FILTER (WHERE e.created_at < :baseline_to), 6)::float AS baseline_avg,
+              ROUND(AVG((e.payload->>'shadow_reward_score')::numeric)
+                FILTER (WHERE e.created_at >= :recent_from), 6)::float AS recent_avg
             FROM event_log e
-            WHERE e.tenant_id = :tenant_id
-              AND e.type = 'experiment_shadow_reward_computed'
+            WHERE e.type = 'experiment_shadow_reward_computed'
               AND e.created_at >= :baseline_from
-              AND e.created_at < :baseline_to
-              AND (:experiment_key = '' OR COALESCE(e.payload->>'experiment_key', '') = :experiment_key)
-              AND (e.payload->>'shadow_reward_score') ~ '^[0-9]+(\\.[0-9]+)?$'
-            """
-        ),
-        params,
-    ).mappings().first()
-    recent = db.execute(
-        text(
-            """
-            SELECT ROUND(AVG((e.payload->>'shadow_reward_score')::numeric), 6)::float AS avg_score
-            FROM event_log e
-            WHERE e.tenant_id = :tenant_id
-              AND e.type = 'experiment_shadow_reward_computed'
-              AND e.created_at >= :recent_from
               AND e.created_at < :recent_to
-              AND (:experiment_key = '' OR COALESCE(e.payload->>'experiment_key', '') = :experiment_key)
+              {tenant_filter}
+              AND (:experiment_key = '' OR COALESCE(e.experiment_key, '') = :experiment_key)
               AND (e.payload->>'shadow_reward_score') ~ '^[0-9]+(\\.[0-9]+)?$'
+            GROUP BY e.tenant_id
             """
         ),
         params,
-    ).mappings().first()
-    return (float((baseline or {}).get("avg_score") or 0.0), float((recent or {}).get("avg_score") or 0.0))
+    ).mappings().all()
+    return {
+        int(row["tenant_id"]): (
+            float(row.get("baseline_avg") or 0.0),
+            float(row.get("recent_avg") or 0.0),
+        )
+        for row in rows
+    }
 
 
-def evaluate_drift_status(
-    db: Session,
+def _drift_status_from_aggregates(
     *,
-    tenant_id: int,
-    experiment_key: str | None = "nba_retention_v1",
+    baseline: FeatureHistograms,
+    recent: FeatureHistograms,
+    baseline_reward_avg: float,
+    recent_reward_avg: float,
+    feature_threshold: float,
+    outcome_threshold: float,
+    thresholds_by_feature: dict[str, float],
 ) -> AxionDriftStatus:
-    now = datetime.now(UTC)
-    recent_from = now - timedelta(days=1)
-    baseline_from = now - timedelta(days=8)
-    baseline_to = recent_from
-
-    baseline_signatures = _load_feature_signatures(
-        db,
-        tenant_id=tenant_id,
-        time_from=baseline_from,
-        time_to=baseline_to,
-    )
-    recent_signatures = _load_feature_signatures(
-        db,
-        tenant_id=tenant_id,
-        time_from=recent_from,
-        time_to=now,
-    )
-    feature_drift_score = _distribution_distance(baseline_signatures, recent_signatures)
-    baseline_payloads = _load_feature_payloads(
-        db,
-        tenant_id=tenant_id,
-        time_from=baseline_from,
-        time_to=baseline_to,
-    )
-    recent_payloads = _load_feature_payloads(
-        db,
-        tenant_id=tenant_id,
-        time_from=recent_from,
-        time_to=now,
-    )
-
-    baseline_reward_avg, recent_reward_avg = _load_outcome_means(
-        db,
-        tenant_id=tenant_id,
-        experiment_key=experiment_key,
-        baseline_from=baseline_from,
-        baseline_to=baseline_to,
-        recent_from=recent_from,
-        recent_to=now,
-    )
+    baseline_signatures = baseline.get(FEATURE_SIGNATURE_KEY, Counter())
+    recent_signatures = recent.get(FEATURE_SIGNATURE_KEY, Counter())
+    feature_drift_score = _histogram_distance(baseline_signatures, recent_signatures)
     if baseline_reward_avg <= 0:
         outcome_drift_pct = 0.0
     else:
         outcome_drift_pct = abs((recent_reward_avg - baseline_reward_avg) / baseline_reward_avg) * 100.0
 
-    feature_threshold = max(0.0, float(settings.axion_feature_drift_warn_threshold))
-    outcome_threshold = max(0.0, float(settings.axion_outcome_drift_warn_pct))
-    thresholds_by_feature = _resolve_feature_thresholds()
     per_feature_drift, top_drifting_features, max_per_feature_drift = _compute_per_feature_drift(
-        baseline_payloads,
-        recent_payloads,
+        baseline,
+        recent,
         default_threshold=feature_threshold,
         threshold_by_feature=thresholds_by_feature,
     )
@@ -296,10 +313,77 @@ def evaluate_drift_status(
         status=status_label,
         feature_drift_score=round(overall_feature_drift, 6),
         outcome_drift_pct=round(outcome_drift_pct, 6),
-        baseline_feature_samples=len(baseline_signatures),
-        recent_feature_samples=len(recent_signatures),
+        baseline_feature_samples=int(sum(baseline_signatures.values())),
+        recent_feature_samples=int(sum(recent_signatures.values())),
         baseline_reward_avg=round(baseline_reward_avg, 6),
         recent_reward_avg=round(recent_reward_avg, 6),
         per_feature_drift=per_feature_drift,
         top_drifting_features=top_drifting_features,
     )
+
+
+def evaluate_drift_statuses(
+    db: Session,
+    *,
+    experiment_key: str | None = "nba_retention_v1",
+    tenant_ids: list[int] | None = None,
+) -> dict[int, AxionDriftStatus]:
+    """Drift status for many tenants (all with data when `tenant_ids` is None) in two reads.
+
+    Feature drift is computed from the daily histogram rollups, so the cost depends on the
+    number of distinct feature values rather than on snapshot volume. Recent covers
+    yesterday and today (UTC); baseline covers the seven days before that.
+    """
+    now = datetime.now(UTC)
+    today = now.date()
+    recent_from_day = today - timedelta(days=RECENT_WINDOW_DAYS - 1)
+    baseline_from_day = recent_from_day - timedelta(days=BASELINE_WINDOW_DAYS)
+    recent_from = datetime.combine(recent_from_day, time.min, tzinfo=UTC)
+    baseline_from = datetime.combine(baseline_from_day, time.min, tzinfo=UTC)
+
+    histograms = _load_feature_histograms(
+        db,
+        tenant_ids=tenant_ids,
+        baseline_from=baseline_from_day,
+        recent_from=recent_from_day,
+        recent_to=today,
+    )
+    outcome_means = _load_outcome_means(
+        db,
+        tenant_ids=tenant_ids,
+        experiment_key=experiment_key,
+        baseline_from=baseline_from,
+        baseline_to=recent_from,
+        recent_from=recent_from,
+        recent_to=now,
+    )
+
+    feature_threshold = max(0.0, float(settings.axion_feature_drift_warn_threshold))
+    outcome_threshold = max(0.0, float(settings.axion_outcome_drift_warn_pct))
+    thresholds_by_feature = _resolve_feature_thresholds()
+    targets = set(tenant_ids) if tenant_ids is not None else set(histograms) | set(outcome_means)
+    output: dict[int, AxionDriftStatus] = {}
+    for tenant_id in sorted(int(item) for item in targets):
+        baseline, recent = histograms.get(tenant_id, ({}, {}))
+        baseline_reward_avg, recent_reward_avg = outcome_means.get(tenant_id, (0.0, 0.0))
+        output[tenant_id] = _drift_status_from_aggregates(
+            baseline=baseline,
+            recent=recent,
+            baseline_reward_avg=baseline_reward_avg,
+            recent_reward_avg=recent_reward_avg,
+            feature_threshold=feature_threshold,
+            outcome_threshold=outcome_threshold,
+            thresholds_by_feature=thresholds_by_feature,
+        )
+    return output
+
+
+def evaluate_drift_status(
+    db: Session,
+    *,
+    tenant_id: int,
+    experiment_key: str | None = "nba_retention_v1",
+) -> AxionDriftStatus:
+    return evaluate_drift_statuses(db, experiment_key=experiment_key, tenant_ids=[int(tenant_id)])[
+        int(tenant_id)
+    ]
@@ -9,9 +9,14 @@ from sqlalchemy import func, select, text, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models import AuditLog, AxionDecision, AxionExperiment, EventLog, Membership
+from app.models import AuditLog, AxionExperiment, EventLog, Membership
 from app.services.axion_alerting import send_axion_operational_alert
-from app.services.axion_retention import AxionRetentionFilters, get_axion_retention_metrics
+from app.services.axion_retention import (
+    AxionRetentionFilters,
+    build_retention_metrics,
+    get_axion_retention_counts_by_variant,
+    get_axion_retention_metrics,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +65,34 @@ class ExperimentRolloutStatus:
     reason: str
 
 
+@dataclass(slots=True)
+class ExperimentVariantStats:
+    experiment_key: str
+    retention: dict[str, dict[str, float | int]]
+    error_counts: dict[str, int]
+    crash_counts: dict[str, int]
+    invalid_decision_counts: dict[str, int]
+
+    def variant_metrics(self, variant: str) -> dict[str, float | int]:
+        return self.retention.get(variant.strip().lower()) or build_retention_metrics(None)
+
+    @property
+    def exposures_total(self) -> int:
+        return sum(int(item.get("exposures_total", 0) or 0) for item in self.retention.values())
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.error_counts.values())
+
+    @property
+    def crash_count(self) -> int:
+        return sum(self.crash_counts.values())
+
+    @property
+    def invalid_decisions(self) -> int:
+        return sum(self.invalid_decision_counts.values())
+
+
 ROLLOUT_STEPS = (5, 10, 25, 50, 75, 100)
 
 
@@ -88,40 +121,141 @@ def lock_experiment_for_update(db: Session, *, experiment_key: str, skip_locked:
     return len(rows) > 0
 
 
-def _count_experiment_events(db: Session, *, experiment_key: str, event_types: tuple[str, ...]) -> int:
-    row = db.execute(
+def load_experiment_variant_stats(
+    db: Session,
+    *,
+    experiment_keys: list[str],
+    tenant_id: int | None = None,
+    destination: str | None = None,
+    lookback_days: int = 30,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict[str, ExperimentVariantStats]:
+    """Per-variant conversion, error, crash and invalid-decision counts for many experiments.
+
+    Two grouped statements cover every key, so the runner no longer pays one full
+    retention scan per variant per experiment.
+    """
+    keys = list(dict.fromkeys(item for item in experiment_keys if item))
+    stats = {
+        key: ExperimentVariantStats(
+            experiment_key=key,
+            retention={},
+            error_counts={},
+            crash_counts={},
+            invalid_decision_counts={},
+        )
+        for key in keys
+    }
+    if not keys:
+        return stats
+
+    stats_by_lower_key = {key.lower(): stats[key] for key in keys}
+    retention_rows = get_axion_retention_counts_by_variant(
+        db,
+        experiment_keys=keys,
+        filters=AxionRetentionFilters(
+            tenant_id=tenant_id,
+            action_type=None,
+            context=None,
+            persona=None,
+            experiment_key=None,
+            variant=None,
+            nba_reason=None,
+            destination=destination,
+            dedupe_exposure_per_day=True,
+            lookback_days=lookback_days,
+            date_from=date_from,
+            date_to=date_to,
+        ),
+    )
+    for row in retention_rows:
+        target = stats_by_lower_key.get(str(row["experiment_key"]))
+        if target is not None:
+            target.retention[str(row["variant"])] = build_retention_metrics(row)
+
+    health_rows = db.execute(
         text(
             """
-            SELECT COUNT(e.id)::int
-            FROM event_log e
-            JOIN axion_decisions d
-              ON d.id = (e.payload->>'decision_id')::uuid
-            WHERE d.experiment_key = :experiment_key
-              AND e.type = ANY(:event_types)
+            WITH decision_events AS (
+                SELECT
+                    d.experiment_key AS experiment_key,
+                    LOWER(COALESCE(d.variant, '')) AS variant,
+                    COUNT(e.id) FILTER (WHERE e.type = ANY(:error_types))::int AS error_count,
+                    COUNT(e.id) FILTER (WHERE e.type = ANY(:crash_types))::int AS crash_count
+                FROM event_log e
+                JOIN axion_decisions d
+                  ON d.id = e.decision_id
+                WHERE d.experiment_key = ANY(:experiment_keys)
+                  AND e.type = ANY(:event_types)
+                GROUP BY d.experiment_key, LOWER(COALESCE(d.variant, ''))
+            ),
+            invalid_decisions AS (
+                SELECT
+                    experiment_key,
+                    LOWER(variant) AS variant,
+                    COUNT(*)::int AS invalid_decisions
+                FROM axion_decisions
+                WHERE experiment_key = ANY(:experiment_keys)
+                  AND variant IS NOT NULL
+                  AND variant <> 'CONTROL'
+                  AND (
+                      action_type IS NULL
+                      OR LOWER(action_type) = 'control'
+                      OR tenant_id IS NULL
+                      OR child_id IS NULL
+                  )
+                GROUP BY experiment_key, LOWER(variant)
+            )
+            SELECT
+                COALESCE(de.experiment_key, inv.experiment_key) AS experiment_key,
+                COALESCE(de.variant, inv.variant) AS variant,
+                COALESCE(de.error_count, 0) AS error_count,
+                COALESCE(de.crash_count, 0) AS crash_count,
+                COALESCE(inv.invalid_decisions, 0) AS invalid_decisions
+            FROM decision_events de
+            FULL OUTER JOIN invalid_decisions inv
+              ON inv.experiment_key = de.experiment_key
+             AND inv.variant = de.variant
             """
         ),
-        {"experiment_key": experiment_key, "event_types": list(event_types)},
-    ).scalar_one_or_none()
-    return int(row or 0)
+        {
+            "experiment_keys": keys,
+            "error_types": list(ERROR_EVENT_TYPES),
+            "crash_types": list(CRASH_EVENT_TYPES),
+            "event_types": [*ERROR_EVENT_TYPES, *CRASH_EVENT_TYPES],
+        },
+    ).mappings().all()
+    for health_row in health_rows:
+        target = stats.get(str(health_row["experiment_key"]))
+        if target is None:
+            continue
+        variant = str(health_row["variant"])
+        target.error_counts[variant] = int(health_row["error_count"] or 0)
+        target.crash_counts[variant] = int(health_row["crash_count"] or 0)
+        target.invalid_decision_counts[variant] = int(health_row["invalid_decisions"] or 0)
+    return stats
 
 
-def _count_invalid_decisions(db: Session, *, experiment_key: str) -> int:
-    return int(
-        db.scalar(
-            select(func.count(AxionDecision.id)).where(
-                AxionDecision.experiment_key == experiment_key,
-                AxionDecision.variant.is_not(None),
-                AxionDecision.variant != "CONTROL",
-                (
-                    (AxionDecision.action_type.is_(None))
-                    | (func.lower(AxionDecision.action_type) == "control")
-                    | (AxionDecision.tenant_id.is_(None))
-                    | (AxionDecision.child_id.is_(None))
-                ),
-            )
-        )
-        or 0
-    )
+def _load_single_experiment_stats(
+    db: Session,
+    *,
+    experiment_key: str,
+    tenant_id: int | None,
+    destination: str | None,
+    lookback_days: int = 30,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> ExperimentVariantStats:
+    return load_experiment_variant_stats(
+        db,
+        experiment_keys=[experiment_key],
+        tenant_id=tenant_id,
+        destination=destination,
+        lookback_days=lookback_days,
+        date_from=date_from,
+        date_to=date_to,
+    )[experiment_key]
 
 
 def _resolve_audit_context(db: Session, *, tenant_id: int | None, actor_user_id: int | None) -> tuple[int | None, int | None]:
@@ -442,26 +576,19 @@ def _evaluate_canary_negative_guardrail(
     experiment_key: str,
     tenant_id: int | None,
     destination: str | None,
+    variant_stats: ExperimentVariantStats | None = None,
 ) -> dict[str, float | int] | None:
     variants = _get_active_variants(db, experiment_key=experiment_key)
     non_control = [item for item in variants if item != "CONTROL"]
     if not non_control:
         return None
-    control = get_axion_retention_metrics(
+    stats = variant_stats or _load_single_experiment_stats(
         db,
-        filters=AxionRetentionFilters(
-            tenant_id=tenant_id,
-            action_type=None,
-            context=None,
-            persona=None,
-            experiment_key=experiment_key,
-            variant="CONTROL",
-            nba_reason=None,
-            destination=destination,
-            dedupe_exposure_per_day=True,
-            lookback_days=30,
-        ),
+        experiment_key=experiment_key,
+        tenant_id=tenant_id,
+        destination=destination,
     )
+    control = stats.variant_metrics("CONTROL")
     control_clicks = int(control.get("cta_click_users", 0) or 0)
     control_started = int(control.get("cta_session_started_converted_users", 0) or 0)
     if control_clicks <= 0:
@@ -470,21 +597,7 @@ def _evaluate_canary_negative_guardrail(
     canary_clicks = 0
     canary_started = 0
     for variant in non_control:
-        metrics = get_axion_retention_metrics(
-            db,
-            filters=AxionRetentionFilters(
-                tenant_id=tenant_id,
-                action_type=None,
-                context=None,
-                persona=None,
-                experiment_key=experiment_key,
-                variant=variant,
-                nba_reason=None,
-                destination=destination,
-                dedupe_exposure_per_day=True,
-                lookback_days=30,
-            ),
-        )
+        metrics = stats.variant_metrics(variant)
         canary_clicks += int(metrics.get("cta_click_users", 0) or 0)
         canary_started += int(metrics.get("cta_session_started_converted_users", 0) or 0)
     if canary_clicks <= 0:
@@ -522,6 +635,7 @@ def evaluate_rollout_progression(
     min_interval_hours: int | None = None,
     lock_experiment: bool = True,
     auto_commit: bool = True,
+    variant_stats: ExperimentVariantStats | None = None,
 ) -> ExperimentRolloutScaleResult:
     resolved_min_sample, resolved_min_days = _resolve_rollout_policy(
         min_sample=min_sample,
@@ -571,21 +685,13 @@ def evaluate_rollout_progression(
             metrics={},
         )
 
-    control = get_axion_retention_metrics(
+    stats = variant_stats or _load_single_experiment_stats(
         db,
-        filters=AxionRetentionFilters(
-            tenant_id=tenant_id,
-            action_type=None,
-            context=None,
-            persona=None,
-            experiment_key=experiment_key,
-            variant="CONTROL",
-            nba_reason=None,
-            destination=destination,
-            dedupe_exposure_per_day=True,
-            lookback_days=30,
-        ),
+        experiment_key=experiment_key,
+        tenant_id=tenant_id,
+        destination=destination,
     )
+    control = stats.variant_metrics("CONTROL")
     control_clicks = int(control.get("cta_click_users", 0) or 0)
     control_started = int(control.get("cta_session_started_converted_users", 0) or 0)
     if control_clicks < int(resolved_min_sample):
@@ -609,21 +715,7 @@ def evaluate_rollout_progression(
     for variant in variants:
         if variant == "CONTROL":
             continue
-        metrics = get_axion_retention_metrics(
-            db,
-            filters=AxionRetentionFilters(
-                tenant_id=tenant_id,
-                action_type=None,
-                context=None,
-                persona=None,
-                experiment_key=experiment_key,
-                variant=variant,
-                nba_reason=None,
-                destination=destination,
-                dedupe_exposure_per_day=True,
-                lookback_days=30,
-            ),
-        )
+        metrics = stats.variant_metrics(variant)
         variant_clicks = int(metrics.get("cta_click_users", 0) or 0)
         variant_started = int(metrics.get("cta_session_started_converted_users", 0) or 0)
         if variant_clicks < int(resolved_min_sample):
@@ -799,21 +891,13 @@ def get_rollout_status(
             reason="missing_control",
         )
 
-    control = get_axion_retention_metrics(
+    stats = _load_single_experiment_stats(
         db,
-        filters=AxionRetentionFilters(
-            tenant_id=tenant_id,
-            action_type=None,
-            context=None,
-            persona=None,
-            experiment_key=experiment_key,
-            variant="CONTROL",
-            nba_reason=None,
-            destination=destination,
-            dedupe_exposure_per_day=True,
-            lookback_days=30,
-        ),
+        experiment_key=experiment_key,
+        tenant_id=tenant_id,
+        destination=destination,
     )
+    control = stats.variant_metrics("CONTROL")
     control_clicks = int(control.get("cta_click_users", 0) or 0)
     control_started = int(control.get("cta_session_started_converted_users", 0) or 0)
     if control_clicks < resolved_min_sample:
@@ -831,21 +915,7 @@ def get_rollout_status(
     for variant in variants:
         if variant == "CONTROL":
             continue
-        metrics = get_axion_retention_metrics(
-            db,
-            filters=AxionRetentionFilters(
-                tenant_id=tenant_id,
-                action_type=None,
-                context=None,
-                persona=None,
-                experiment_key=experiment_key,
-                variant=variant,
-                nba_reason=None,
-                destination=destination,
-                dedupe_exposure_per_day=True,
-                lookback_days=30,
-            ),
-        )
+        metrics = stats.variant_metrics(variant)
         variant_clicks = int(metrics.get("cta_click_users", 0) or 0)
         variant_started = int(metrics.get("cta_session_started_converted_users", 0) or 0)
         if variant_clicks < resolved_min_sample:
@@ -918,6 +988,7 @@ def evaluate_experiment_health(
     error_rate_threshold_pct: float = 5.0,
     lock_experiment: bool = True,
     auto_commit: bool = True,
+    variant_stats: ExperimentVariantStats | None = None,
 ) -> ExperimentHealthResult:
     if lock_experiment and not lock_experiment_for_update(db, experiment_key=experiment_key, skip_locked=False):
         return ExperimentHealthResult(experiment_key=experiment_key, paused=False, reasons=["lock_unavailable"], metrics={})
@@ -925,23 +996,20 @@ def evaluate_experiment_health(
     if not variants:
         return ExperimentHealthResult(experiment_key=experiment_key, paused=False, reasons=[], metrics={})
 
-    control_metrics = get_axion_retention_metrics(
-        db,
-        filters=AxionRetentionFilters(
-            tenant_id=tenant_id,
-            action_type=None,
-            context=None,
-            persona=None,
+    # Caller-provided stats cover the default 30-day window; an explicit date range needs its
+    # own scan.
+    uses_default_window = date_from is None and date_to is None
+    stats = variant_stats if variant_stats is not None and uses_default_window else None
+    if stats is None:
+        stats = _load_single_experiment_stats(
+            db,
             experiment_key=experiment_key,
-            variant="CONTROL",
-            nba_reason=None,
+            tenant_id=tenant_id,
             destination=destination,
-            dedupe_exposure_per_day=True,
-            lookback_days=30,
             date_from=date_from,
             date_to=date_to,
-        ),
-    )
+        )
+    control_metrics = stats.variant_metrics("CONTROL")
     control_started_pct = float(control_metrics.get("cta_to_session_started_conversion", 0.0) or 0.0)
 
     reasons: list[str] = []
@@ -950,50 +1018,17 @@ def evaluate_experiment_health(
         for variant in variants:
             if variant == "CONTROL":
                 continue
-            variant_metrics = get_axion_retention_metrics(
-                db,
-                filters=AxionRetentionFilters(
-                    tenant_id=tenant_id,
-                    action_type=None,
-                    context=None,
-                    persona=None,
-                    experiment_key=experiment_key,
-                    variant=variant,
-                    nba_reason=None,
-                    destination=destination,
-                    dedupe_exposure_per_day=True,
-                    lookback_days=30,
-                    date_from=date_from,
-                    date_to=date_to,
-                ),
-            )
+            variant_metrics = stats.variant_metrics(variant)
             variant_started_pct = float(variant_metrics.get("cta_to_session_started_conversion", 0.0) or 0.0)
             drop_pct = ((control_started_pct - variant_started_pct) / control_started_pct) * 100.0
             variant_deltas[variant] = round(drop_pct, 2)
             if drop_pct > session_started_drop_threshold_pct:
                 reasons.append(f"session_started_drop_gt_{session_started_drop_threshold_pct:.0f}_pct:{variant}")
 
-    overall = get_axion_retention_metrics(
-        db,
-        filters=AxionRetentionFilters(
-            tenant_id=tenant_id,
-            action_type=None,
-            context=None,
-            persona=None,
-            experiment_key=experiment_key,
-            variant=None,
-            nba_reason=None,
-            destination=destination,
-            dedupe_exposure_per_day=True,
-            lookback_days=30,
-            date_from=date_from,
-            date_to=date_to,
-        ),
-    )
-    exposures_total = int(overall.get("exposures_total", 0) or 0)
-    error_count = _count_experiment_events(db, experiment_key=experiment_key, event_types=ERROR_EVENT_TYPES)
-    crash_count = _count_experiment_events(db, experiment_key=experiment_key, event_types=CRASH_EVENT_TYPES)
-    invalid_decisions = _count_invalid_decisions(db, experiment_key=experiment_key)
+    exposures_total = stats.exposures_total
+    error_count = stats.error_count
+    crash_count = stats.crash_count
+    invalid_decisions = stats.invalid_decisions
 
     error_rate_pct = (float(error_count) / float(exposures_total) * 100.0) if exposures_total > 0 else 0.0
     if error_rate_pct > error_rate_threshold_pct:
@@ -1019,6 +1054,7 @@ def evaluate_experiment_health(
         experiment_key=experiment_key,
         tenant_id=tenant_id,
         destination=destination,
+        variant_stats=stats if uses_default_window else None,
     )
     if canary_guardrail_metrics is not None:
         resolved_tenant_id, resolved_actor_user_id = _resolve_audit_context(
@@ -1131,21 +1167,14 @@ def evaluate_experiment_winner(
             metrics={"days_running": days_running, "min_days": int(min_days)},
         )
 
-    control_metrics = get_axion_retention_metrics(
+    stats = _load_single_experiment_stats(
         db,
-        filters=AxionRetentionFilters(
-            tenant_id=tenant_id,
-            action_type=None,
-            context=None,
-            persona=None,
-            experiment_key=experiment_key,
-            variant="CONTROL",
-            nba_reason=None,
-            destination=destination,
-            dedupe_exposure_per_day=True,
-            lookback_days=max(30, int(min_days)),
-        ),
+        experiment_key=experiment_key,
+        tenant_id=tenant_id,
+        destination=destination,
+        lookback_days=max(30, int(min_days)),
     )
+    control_metrics = stats.variant_metrics("CONTROL")
     control_clicks = int(control_metrics.get("cta_click_users", 0) or 0)
     control_started = int(control_metrics.get("cta_session_started_converted_users", 0) or 0)
     control_d7 = float(control_metrics.get("d7_rate", 0.0) or 0.0)
@@ -1173,21 +1202,7 @@ def evaluate_experiment_winner(
     for variant in variants:
         if variant == "CONTROL":
             continue
-        variant_metrics = get_axion_retention_metrics(
-            db,
-            filters=AxionRetentionFilters(
-                tenant_id=tenant_id,
-                action_type=None,
-                context=None,
-                persona=None,
-                experiment_key=experiment_key,
-                variant=variant,
-                nba_reason=None,
-                destination=destination,
-                dedupe_exposure_per_day=True,
-                lookback_days=max(30, int(min_days)),
-            ),
-        )
+        variant_metrics = stats.variant_metrics(variant)
         variant_clicks = int(variant_metrics.get("cta_click_users", 0) or 0)
         variant_started = int(variant_metrics.get("cta_session_started_converted_users", 0) or 0)
         variant_d7 = float(variant_metrics.get("d7_rate", 0.0) or 0.0)
@@ -11,7 +11,13 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models import AxionExperiment
 from app.services.axion_auto_rollback import evaluate_auto_rollback
-from app.services.axion_experiment_health import evaluate_experiment_health, evaluate_rollout_progression, lock_experiment_for_update
+from app.services.axion_experiment_health import (
+    ExperimentVariantStats,
+    evaluate_experiment_health,
+    evaluate_rollout_progression,
+    load_experiment_variant_stats,
+    lock_experiment_for_update,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +71,24 @@ class AxionExperimentHealthRunner:
             stmt = stmt.where(AxionExperiment.active.is_(True))
         return [str(item) for item in self.db.scalars(stmt).all()]
 
-    def _run_experiment(self, experiment_key: str) -> ExperimentRunItem:
+    def _load_variant_stats(self, experiment_keys: list[str]) -> dict[str, ExperimentVariantStats]:
+        if not experiment_keys:
+            return {}
+        try:
+            return load_experiment_variant_stats(self.db, experiment_keys=experiment_keys)
+        except Exception:
+            # Each experiment falls back to its own grouped query; one bad batch must not stall
+            # the run.
+            self.db.rollback()
+            logger.exception(
+                "health_runner_variant_stats_failed",
+                extra={"experiments_total": len(experiment_keys)},
+            )
+            return {}
+
+    def _run_experiment(
+        self, experiment_key: str, variant_stats: ExperimentVariantStats | None = None
+    ) -> ExperimentRunItem:
         run_id = str(uuid4())
         try:
             if not lock_experiment_for_update(self.db, experiment_key=experiment_key, skip_locked=True):
@@ -96,6 +119,7 @@ class AxionExperimentHealthRunner:
                 experiment_key=experiment_key,
                 lock_experiment=False,
                 auto_commit=False,
+                variant_stats=variant_stats,
             )
             if health.paused:
                 self._mark_health_run(experiment_key=experiment_key, run_id=run_id, reason="paused")
@@ -113,6 +137,7 @@ class AxionExperimentHealthRunner:
                 experiment_key=experiment_key,
                 lock_experiment=False,
                 auto_commit=False,
+                variant_stats=variant_stats,
             )
             self._mark_health_run(experiment_key=experiment_key, run_id=run_id, reason=scale.reason)
             self.db.commit()
@@ -205,7 +230,8 @@ class AxionExperimentHealthRunner:
                 results=[],
             )
 
-        results = [self._run_experiment(key) for key in experiment_keys]
+        variant_stats = self._load_variant_stats(experiment_keys)
+        results = [self._run_experiment(key, variant_stats.get(key)) for key in experiment_keys]
         skipped_locked = sum(1 for item in results if item.scale_reason == "locked_skip")
         processed = max(0, len(experiment_keys) - skipped_locked)
         paused_count = sum(1 for item in results if item.paused)
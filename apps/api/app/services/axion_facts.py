@@ -9,7 +9,6 @@ from sqlalchemy.orm import Session
 
 from app.models import (
     ChildProfile,
-    LedgerTransaction,
     Membership,
     PotType,
     Skill,
@@ -19,8 +18,9 @@ from app.models import (
     UserSkillMastery,
     Wallet,
 )
+from app.services.auth_context import get_request_auth_context
 from app.services.learning_energy import get_energy_snapshot
-from app.services.wallet import extract_pot_split, signed_amount_cents
+from app.services.wallet_balances import get_wallet_balance
 
 
 @dataclass(slots=True)
@@ -120,6 +120,9 @@ AxionFactsSnapshot = AxionFacts
 
 
 def _resolve_primary_child(db: Session, *, user_id: int) -> ChildProfile | None:
+    context = get_request_auth_context(db, user_id=user_id)
+    if context is not None and context.default_child is not None:
+        return context.default_child
     tenant_ids = db.scalars(select(Membership.tenant_id).where(Membership.user_id == user_id)).all()
     if not tenant_ids:
         return None
@@ -264,24 +267,10 @@ def _wallet_facts(db: Session, *, user_id: int) -> WalletFacts:
     )
     if wallet is None:
         return WalletFacts(total=0, spend=0, save=0, donate=0)
-    txs = db.scalars(
-        select(LedgerTransaction)
-        .where(
-            LedgerTransaction.tenant_id == child.tenant_id,
-            LedgerTransaction.wallet_id == wallet.id,
-        )
-        .order_by(LedgerTransaction.created_at.asc(), LedgerTransaction.id.asc())
-    ).all()
-    pots = {"SPEND": 0, "SAVE": 0, "DONATE": 0}
-    for tx in txs:
-        signed = signed_amount_cents(tx.type, tx.amount_cents)
-        split = extract_pot_split(tx.metadata_json)
-        if split:
-            for key in ("SPEND", "SAVE", "DONATE"):
-                amount = int(split.get(key, 0))
-                pots[key] += amount if signed >= 0 else -amount
-            continue
-        pots["SPEND"] += signed
+    balance = get_wallet_balance(db, wallet_id=wallet.id)
+    pots = dict(balance.pot_balances_cents)
+    # Ledger rows without a pot split count as spendable money here.
+    pots["SPEND"] += balance.unallocated_cents
     total = int(pots["SPEND"] + pots["SAVE"] + pots["DONATE"])
     return WalletFacts(
         total=total,
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any, cast
 
-from sqlalchemy import func, select
+from sqlalchemy import CursorResult, func, select, text
 from sqlalchemy.orm import Session
 
-from app.models import AxionDecision, AxionFeatureRegistry, ChildProfile, GameSession, LearningSession, Membership, Tenant, UserLearningStreak
+from app.models import (
+    AxionDecision,
+    AxionFeatureRegistry,
+    AxionUserFeatures,
+    ChildProfile,
+    GameSession,
+    LearningSession,
+    Membership,
+    Tenant,
+    UserLearningStreak,
+)
+from app.services.auth_context import get_request_auth_context
 from app.services.child_age import get_child_age
 
 FEATURE_VECTOR_ORDER_V1: tuple[str, ...] = (
@@ -18,6 +31,102 @@ FEATURE_VECTOR_ORDER_V1: tuple[str, ...] = (
 )
 
 
+HISTORICAL_LOOKBACK_DAYS = 30
+
+# Point-in-time recompute of every v1 feature for the users active in the window, as of the end
+# of `as_of_day`. Mirrors the per-user resolvers below; ages use the decision's latest child.
+_REFRESH_FEATURE_STORE_SQL = text(
+    """
+    WITH active_users AS (
+        SELECT user_id FROM learning_sessions
+        WHERE started_at >= :active_from AND started_at < :as_of_end
+        UNION
+        SELECT user_id FROM game_sessions
+        WHERE created_at >= :active_from AND created_at < :as_of_end
+    ),
+    learning AS (
+        SELECT
+            ls.user_id,
+            COUNT(*) AS started_count,
+            COUNT(*) FILTER (WHERE ls.ended_at IS NOT NULL) AS completed_count,
+            COUNT(DISTINCT ls.started_at::date) AS active_days
+        FROM learning_sessions ls
+        JOIN active_users a ON a.user_id = ls.user_id
+        WHERE ls.started_at >= :history_from AND ls.started_at < :as_of_end
+        GROUP BY ls.user_id
+    ),
+    last_seen AS (
+        SELECT
+            a.user_id,
+            GREATEST(
+                (SELECT MAX(ls.started_at) FROM learning_sessions ls
+                 WHERE ls.user_id = a.user_id AND ls.started_at < :as_of_end),
+                (SELECT MAX(gs.created_at) FROM game_sessions gs
+                 WHERE gs.user_id = a.user_id AND gs.created_at < :as_of_end)
+            ) AS last_seen_at
+        FROM active_users a
+    ),
+    first_membership AS (
+        SELECT DISTINCT ON (m.user_id) m.user_id, m.tenant_id
+        FROM memberships m
+        JOIN active_users a ON a.user_id = m.user_id
+        ORDER BY m.user_id, m.id
+    ),
+    latest_child AS (
+        SELECT DISTINCT ON (d.user_id) d.user_id, d.child_id
+        FROM axion_decisions d
+        JOIN active_users a ON a.user_id = d.user_id
+        WHERE d.child_id IS NOT NULL AND d.created_at < :as_of_end
+        ORDER BY d.user_id, d.created_at DESC
+    )
+    INSERT INTO axion_user_features (
+        user_id, tenant_id, feature_version, as_of_day, age_bucket, plan_type, streak_length,
+        last_session_gap, historical_completion_rate, historical_retention_rate, computed_at
+    )
+    SELECT
+        a.user_id,
+        fm.tenant_id,
+        :feature_version,
+        :as_of_day,
+        CASE
+            WHEN cp.date_of_birth IS NULL THEN 'unknown'
+            WHEN date_part('year', age(:as_of_day, cp.date_of_birth)) <= 8 THEN '6_8'
+            WHEN date_part('year', age(:as_of_day, cp.date_of_birth)) <= 12 THEN '9_12'
+            ELSE '13_plus'
+        END,
+        CASE WHEN fm.tenant_id IS NULL THEN 'UNKNOWN' ELSE UPPER(COALESCE(t.plan_name, 'FREE')) END,
+        GREATEST(COALESCE(s.current_streak, 0), 0),
+        CASE
+            WHEN ls.last_seen_at IS NULL THEN 999
+            ELSE GREATEST(FLOOR(EXTRACT(EPOCH FROM (:as_of_end - ls.last_seen_at)) / 86400), 0)::int
+        END,
+        CASE
+            WHEN COALESCE(l.started_count, 0) = 0 THEN 0
+            ELSE ROUND(l.completed_count::numeric / l.started_count, 6)
+        END,
+        ROUND(LEAST(COALESCE(l.active_days, 0)::numeric / :history_days, 1), 6),
+        CURRENT_TIMESTAMP
+    FROM active_users a
+    LEFT JOIN first_membership fm ON fm.user_id = a.user_id
+    LEFT JOIN tenants t ON t.id = fm.tenant_id
+    LEFT JOIN latest_child lc ON lc.user_id = a.user_id
+    LEFT JOIN child_profiles cp ON cp.id = lc.child_id
+    LEFT JOIN user_learning_streak s ON s.user_id = a.user_id
+    LEFT JOIN last_seen ls ON ls.user_id = a.user_id
+    LEFT JOIN learning l ON l.user_id = a.user_id
+    ON CONFLICT (user_id, feature_version, as_of_day) DO UPDATE SET
+        tenant_id = EXCLUDED.tenant_id,
+        age_bucket = EXCLUDED.age_bucket,
+        plan_type = EXCLUDED.plan_type,
+        streak_length = EXCLUDED.streak_length,
+        last_session_gap = EXCLUDED.last_session_gap,
+        historical_completion_rate = EXCLUDED.historical_completion_rate,
+        historical_retention_rate = EXCLUDED.historical_retention_rate,
+        computed_at = CURRENT_TIMESTAMP
+    """
+)
+
+
 def _resolve_feature_version(db: Session) -> int:
     version = db.scalar(
         select(AxionFeatureRegistry.version)
@@ -31,6 +140,9 @@ def _resolve_feature_version(db: Session) -> int:
 
 
 def _resolve_tenant_id(db: Session, *, user_id: int) -> int | None:
+    context = get_request_auth_context(db, user_id=user_id)
+    if context is not None and context.tenant_id is not None:
+        return context.tenant_id
     tenant_id = db.scalar(
         select(Membership.tenant_id)
         .where(Membership.user_id == user_id)
@@ -78,9 +190,23 @@ def _resolve_streak_length(db: Session, *, user_id: int) -> int:
     return max(0, int(value or 0))
 
 
-def _resolve_last_session_gap_days(db: Session, *, user_id: int) -> int:
-    last_learning = db.scalar(select(func.max(LearningSession.started_at)).where(LearningSession.user_id == user_id))
-    last_game = db.scalar(select(func.max(GameSession.created_at)).where(GameSession.user_id == user_id))
+def _last_learning_at(user_id: int) -> Any:
+    return (
+        select(func.max(LearningSession.started_at))
+        .where(LearningSession.user_id == user_id)
+        .scalar_subquery()
+    )
+
+
+def _last_game_at(user_id: int) -> Any:
+    return (
+        select(func.max(GameSession.created_at))
+        .where(GameSession.user_id == user_id)
+        .scalar_subquery()
+    )
+
+
+def _session_gap_days(last_learning: object, last_game: object) -> int:
     last_seen: datetime | None = None
     if isinstance(last_learning, datetime):
         last_seen = last_learning
@@ -91,6 +217,11 @@ def _resolve_last_session_gap_days(db: Session, *, user_id: int) -> int:
     return max(0, int((datetime.now(UTC) - last_seen).total_seconds() // 86400))
 
 
+def _resolve_last_session_gap_days(db: Session, *, user_id: int) -> int:
+    row = db.execute(select(_last_learning_at(user_id), _last_game_at(user_id))).one()
+    return _session_gap_days(row[0], row[1])
+
+
 def _resolve_historical_completion_rate(db: Session, *, user_id: int, lookback_days: int = 30) -> float:
     started_after = datetime.now(UTC) - timedelta(days=max(1, int(lookback_days)))
     started_count = int(
@@ -131,22 +262,119 @@ def _resolve_historical_retention_rate(db: Session, *, user_id: int, lookback_da
     return max(0.0, min(1.0, float(active_days) / float(max(1, int(lookback_days)))))
 
 
+def refresh_feature_store(
+    db: Session,
+    *,
+    as_of_day: date | None = None,
+    feature_version: int | None = None,
+    active_window_days: int = 45,
+) -> int:
+    """Upsert the day's feature rows for every user active in the window; returns rows written.
+
+    Defaults to yesterday: the nightly job runs before today is over, so today is not a
+    complete snapshot yet.
+    """
+    day = as_of_day or (datetime.now(UTC).date() - timedelta(days=1))
+    as_of_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=UTC)
+    result = cast(
+        CursorResult[Any],
+        db.execute(
+            _REFRESH_FEATURE_STORE_SQL,
+            {
+                "feature_version": int(feature_version or _resolve_feature_version(db)),
+                "as_of_day": day,
+                "as_of_end": as_of_end,
+                "active_from": as_of_end - timedelta(days=max(1, int(active_window_days))),
+                "history_from": as_of_end - timedelta(days=HISTORICAL_LOOKBACK_DAYS),
+                "history_days": HISTORICAL_LOOKBACK_DAYS,
+            },
+        ),
+    )
+    return max(0, int(result.rowcount or 0))
+
+
+def _stored_features(row: AxionUserFeatures, *, last_session_gap: int) -> dict[str, object]:
+    # The snapshot is as of the end of `as_of_day`; the session gap comes from the live
+    # last-seen timestamps so activity since then is not ignored.
+    return {
+        "age_bucket": str(row.age_bucket),
+        "plan_type": str(row.plan_type),
+        "streak_length": int(row.streak_length),
+        "last_session_gap": last_session_gap,
+        "historical_completion_rate": round(float(row.historical_completion_rate), 6),
+        "historical_retention_rate": round(float(row.historical_retention_rate), 6),
+    }
+
+
+def _load_stored_feature_row(db: Session, *, user_id: int) -> tuple[AxionUserFeatures, int] | None:
+    """The latest feature-store row and the live session gap, in one statement."""
+    if not hasattr(db, "execute"):
+        return None
+    active_version = (
+        select(func.max(AxionFeatureRegistry.version))
+        .where(AxionFeatureRegistry.active.is_(True))
+        .scalar_subquery()
+    )
+    row = db.execute(
+        select(AxionUserFeatures, _last_learning_at(int(user_id)), _last_game_at(int(user_id)))
+        .where(
+            AxionUserFeatures.user_id == int(user_id),
+            AxionUserFeatures.feature_version == func.coalesce(active_version, 1),
+            AxionUserFeatures.as_of_day <= datetime.now(UTC).date(),
+        )
+        .order_by(AxionUserFeatures.as_of_day.desc())
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    return row[0], _session_gap_days(row[1], row[2])
+
+
+def iter_feature_store_rows(
+    db: Session,
+    *,
+    as_of_day: date,
+    feature_version: int,
+    tenant_id: int | None = None,
+    batch_size: int = 2000,
+) -> Iterator[AxionUserFeatures]:
+    """Stream one day's typed feature rows for offline jobs, without touching `features_json`."""
+    stmt = select(AxionUserFeatures).where(
+        AxionUserFeatures.as_of_day == as_of_day,
+        AxionUserFeatures.feature_version == int(feature_version),
+    )
+    if tenant_id is not None:
+        stmt = stmt.where(AxionUserFeatures.tenant_id == int(tenant_id))
+    yield from db.scalars(
+        stmt.order_by(AxionUserFeatures.user_id.asc()).execution_options(
+            yield_per=max(1, int(batch_size))
+        )
+    )
+
+
 def build_feature_vector(
     db: Session,
     user_id: int,
     experiment_key: str | None,
 ) -> dict[str, object]:
-    feature_version = _resolve_feature_version(db)
-    tenant_id = _resolve_tenant_id(db, user_id=user_id)
-
-    features: dict[str, object] = {
-        "age_bucket": _resolve_age_bucket(db, user_id=user_id, experiment_key=experiment_key),
-        "plan_type": _resolve_plan_type(db, tenant_id=tenant_id),
-        "streak_length": _resolve_streak_length(db, user_id=user_id),
-        "last_session_gap": _resolve_last_session_gap_days(db, user_id=user_id),
-        "historical_completion_rate": round(_resolve_historical_completion_rate(db, user_id=user_id), 6),
-        "historical_retention_rate": round(_resolve_historical_retention_rate(db, user_id=user_id), 6),
-    }
+    """Online read: one feature-store row fetch, live per-feature resolution only on a miss."""
+    stored = _load_stored_feature_row(db, user_id=user_id)
+    if stored is not None:
+        stored_row, last_session_gap = stored
+        feature_version = int(stored_row.feature_version)
+        tenant_id = int(stored_row.tenant_id) if stored_row.tenant_id is not None else None
+        features = _stored_features(stored_row, last_session_gap=last_session_gap)
+    else:
+        feature_version = _resolve_feature_version(db)
+        tenant_id = _resolve_tenant_id(db, user_id=user_id)
+        features = {
+            "age_bucket": _resolve_age_bucket(db, user_id=user_id, experiment_key=experiment_key),
+            "plan_type": _resolve_plan_type(db, tenant_id=tenant_id),
+            "streak_length": _resolve_streak_length(db, user_id=user_id),
+            "last_session_gap": _resolve_last_session_gap_days(db, user_id=user_id),
+            "historical_completion_rate": round(_resolve_historical_completion_rate(db, user_id=user_id), 6),
+            "historical_retention_rate": round(_resolve_historical_retention_rate(db, user_id=user_id), 6),
+        }
     ordered_values = [features[name] for name in FEATURE_VECTOR_ORDER_V1]
     return {
         "feature_version": feature_version,
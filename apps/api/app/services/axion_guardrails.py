@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import AxionContentCatalog, ContentPrerequisite
+
+
+@dataclass(slots=True)
+class GuardrailsCandidateContext:
+    """Catalog rows and prerequisite edges for one guardrails evaluation.
+
+    `catalog_rows` only holds active catalog entries, so a candidate missing from it is
+    blocked by every stage, exactly like the per-stage queries did.
+    """
+
+    catalog_rows: dict[int, AxionContentCatalog] = field(default_factory=dict)
+    prerequisite_edges: dict[int, list[int]] = field(default_factory=dict)
+
+    @property
+    def fingerprint_by_content_id(self) -> dict[int, str]:
+        return {
+            content_id: str(row.content_fingerprint)
+            for content_id, row in self.catalog_rows.items()
+            if row.content_fingerprint
+        }
+
+
+def load_guardrails_candidate_context(
+    db: Session,
+    *,
+    candidate_content_ids: list[int],
+) -> GuardrailsCandidateContext | None:
+    """Load every catalog field the guardrails read in a single round-trip.
+
+    Returns None when the session cannot run statements, letting each stage fall back
+    to its own lookup.
+    """
+    if not hasattr(db, "execute"):
+        return None
+    ids = sorted({int(item) for item in candidate_content_ids if item is not None})
+    context = GuardrailsCandidateContext()
+    if len(ids) == 0:
+        return context
+    prerequisite_ids = func.array_remove(
+        func.array_agg(ContentPrerequisite.prerequisite_content_id), None
+    )
+    rows = db.execute(
+        select(AxionContentCatalog, prerequisite_ids)
+        .outerjoin(
+            ContentPrerequisite, ContentPrerequisite.content_id == AxionContentCatalog.content_id
+        )
+        .where(
+            AxionContentCatalog.content_id.in_(ids),
+            AxionContentCatalog.is_active.is_(True),
+        )
+        .group_by(AxionContentCatalog.content_id)
+    ).all()
+    for row, edges in rows:
+        content_id = int(row.content_id)
+        context.catalog_rows[content_id] = row
+        context.prerequisite_edges[content_id] = sorted(int(item) for item in (edges or []))
+    return context
@@ -6,11 +6,20 @@ import hashlib
 from time import perf_counter
 from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import case, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models import AxionContentCatalog, AxionDecision, AxionExperiment, AxionFeatureRegistry, AxionFeatureSnapshot, AxionShadowPolicyCandidate, EventLog, Plan, Tenant
+from app.models import (
+    AxionContentCatalog,
+    AxionDecision,
+    AxionExperiment,
+    AxionFeatureRegistry,
+    AxionShadowPolicyCandidate,
+    EventLog,
+    Plan,
+    Tenant,
+)
 from app.observability.axion_metrics import (
     safe_increment_decisions_total,
     safe_increment_errors_total,
@@ -23,6 +32,8 @@ from app.services.axion_content_prerequisites import filter_candidates_by_prereq
 from app.services.axion_content_repetition import filter_repeated_candidates
 from app.services.axion_age_gating import filter_candidate_content_ids_by_age, resolve_child_age
 from app.services.axion_safety_gating import filter_candidates_by_safety_tags
+from app.services.axion_guardrails import load_guardrails_candidate_context
+from app.services.axion_decision_telemetry import decision_telemetry_sink
 from app.services.axion_kill_switch import is_axion_kill_switch_enabled
 from app.services.axion_policy_governance import (
     POLICY_STATE_ACTIVE,
@@ -335,37 +346,39 @@ def _guard_selection_uses_filtered_candidates(
 
 
 def _record_decision_latency_metric(
-    db: Session,
     *,
     tenant_id: int,
     user_id: int,
     child_id: int | None,
+    decision_id: str | None,
     experiment_key: str | None,
+    variant: str | None,
     start_time: datetime,
     end_time: datetime,
 ) -> None:
-    if not hasattr(db, "add"):
-        return
     duration_ms = max(0, int((end_time - start_time).total_seconds() * 1000))
-    db.add(
-        EventLog(
-            tenant_id=tenant_id,
-            actor_user_id=user_id,
-            child_id=child_id,
-            type="axion_decision_latency_ms",
-            payload={
+    # Bulk inserts skip the EventLog before_insert listener, so the hot columns are set here.
+    decision_telemetry_sink.submit_event(
+        {
+            "tenant_id": tenant_id,
+            "actor_user_id": user_id,
+            "child_id": child_id,
+            "type": "axion_decision_latency_ms",
+            "decision_id": decision_id,
+            "experiment_key": str(experiment_key or "").strip()[:80] or None,
+            "variant": str(variant or "").strip()[:80] or None,
+            "payload": {
                 "start_time": start_time.isoformat(),
                 "end_time": end_time.isoformat(),
                 "duration_ms": duration_ms,
                 "environment": (settings.app_env or "").strip().lower() or "unknown",
                 "experiment_key": experiment_key,
             },
-        )
+        }
     )
 
 
 def _record_feature_snapshot(
-    db: Session,
     *,
     tenant_id: int,
     user_id: int,
@@ -374,16 +387,14 @@ def _record_feature_snapshot(
     mode: NbaModeResolution,
     feature_version: int,
 ) -> None:
-    if not hasattr(db, "add"):
-        return
-    db.add(
-        AxionFeatureSnapshot(
-            user_id=user_id,
-            tenant_id=tenant_id,
-            experiment_key=mode.experiment_key,
-            variant=mode.variant,
-            feature_version=feature_version,
-            features_json={
+    decision_telemetry_sink.submit_feature_snapshot(
+        {
+            "user_id": user_id,
+            "tenant_id": tenant_id,
+            "experiment_key": mode.experiment_key,
+            "variant": mode.variant,
+            "feature_version": feature_version,
+            "features_json": {
                 "context": context,
                 "child_id": child_id,
                 "nba_enabled_final": bool(mode.enabled),
@@ -395,8 +406,8 @@ def _record_feature_snapshot(
                 "policy_serving_reason": mode.policy_serving_reason,
                 "environment": (settings.app_env or "").strip().lower() or "unknown",
             },
-            snapshot_at=datetime.now(UTC),
-        )
+            "snapshot_at": datetime.now(UTC),
+        }
     )
 
 
@@ -526,37 +537,34 @@ def _safe_default_candidates(
     if not hasattr(db, "scalars"):
         return (_safe_noop_candidate(child_age), "noop")
 
-    # Layer A: neutral/general for the age bucket.
-    neutral_rows = db.scalars(
-        select(AxionContentCatalog.content_id).where(
+    # Single read: neutral/general rows sort first, so the head of the list answers layer A
+    # and, when there is none, the same rows are layer B's first 100 age-eligible entries.
+    neutral_subject = AxionContentCatalog.subject.in_(["neutral", "general"])
+    rows = db.scalars(
+        select(AxionContentCatalog)
+        .where(
             AxionContentCatalog.is_active.is_(True),
-            AxionContentCatalog.subject.in_(["neutral", "general"]),
             AxionContentCatalog.age_min <= int(child_age),
             AxionContentCatalog.age_max >= int(child_age),
         )
-        .order_by(AxionContentCatalog.content_id.asc())
-        .limit(5)
+        .order_by(case((neutral_subject, 0), else_=1), AxionContentCatalog.content_id.asc())
+        .limit(100)
     ).all()
-    neutral_ids = [int(item) for item in neutral_rows]
+
+    # Layer A: neutral/general for the age bucket.
+    neutral_ids = [
+        int(row.content_id) for row in rows if str(row.subject) in {"neutral", "general"}
+    ]
     if len(neutral_ids) > 0:
-        return (neutral_ids, "neutral_general")
+        return (neutral_ids[:5], "neutral_general")
 
     # Layer B: any age-eligible content that is safe for age policy.
-    age_rows = db.scalars(
-        select(AxionContentCatalog.content_id).where(
-            AxionContentCatalog.is_active.is_(True),
-            AxionContentCatalog.age_min <= int(child_age),
-            AxionContentCatalog.age_max >= int(child_age),
-        )
-        .order_by(AxionContentCatalog.content_id.asc())
-        .limit(100)
-    ).all()
-    age_ids = [int(item) for item in age_rows]
-    if len(age_ids) > 0:
+    if len(rows) > 0:
         safe_ids = filter_candidates_by_safety_tags(
             db,
-            candidate_content_ids=age_ids,
+            candidate_content_ids=[int(row.content_id) for row in rows],
             child_age=int(child_age),
+            catalog_rows={int(row.content_id): row for row in rows},
         )
         if len(safe_ids) > 0:
             return (safe_ids[:5], "age_safe")
@@ -565,6 +573,52 @@ def _safe_default_candidates(
     return (_safe_noop_candidate(child_age), "noop")
 
 
+def _apply_guardrails_fallback(
+    db: Session,
+    *,
+    tenant_id: int,
+    child_id: int | None,
+    user_id: int,
+    context: str,
+    correlation_id: str,
+    child_age: int,
+    blocked_reason: str,
+) -> GuardrailsPipelineResult:
+    safe_increment_guardrails_block_total(blocked_reason)
+    fallback, fallback_source = _safe_default_candidates(db, child_age=child_age)
+    if len(fallback) == 0:
+        return GuardrailsPipelineResult(
+            candidate_ids=[], fallback_applied=False, blocked_reason=blocked_reason
+        )
+    safe_increment_guardrails_fallback_total()
+    _record_guardrails_fallback_event(
+        db,
+        tenant_id=tenant_id,
+        user_id=user_id,
+        child_id=child_id,
+        context=context,
+        correlation_id=correlation_id,
+        child_age=child_age,
+        blocked_reason=blocked_reason,
+        fallback_candidate_ids=fallback,
+        fallback_source=fallback_source,
+    )
+    if fallback_source == "noop":
+        _record_guardrails_fallback_critical_event(
+            db,
+            tenant_id=tenant_id,
+            user_id=user_id,
+            child_id=child_id,
+            context=context,
+            correlation_id=correlation_id,
+            child_age=child_age,
+            blocked_reason=blocked_reason,
+        )
+    return GuardrailsPipelineResult(
+        candidate_ids=fallback, fallback_applied=True, blocked_reason=blocked_reason
+    )
+
+
 def _apply_guardrails_pipeline(
     db: Session,
     *,
@@ -585,146 +639,57 @@ def _apply_guardrails_pipeline(
         safe_increment_guardrails_block_total(NBA_REASON_AGE_GATING_BLOCKED)
         return GuardrailsPipelineResult(candidate_ids=[], fallback_applied=False, blocked_reason=NBA_REASON_AGE_GATING_BLOCKED)
 
-    # Guardrail order is strict: age -> safety -> prerequisites -> anti-dup.
-    age_eligible_ids = filter_candidate_content_ids_by_age(
-        db,
-        candidate_content_ids=candidate_content_ids,
-        child_age=resolved_age,
-    )
-    if len(age_eligible_ids) == 0:
-        safe_increment_guardrails_block_total(NBA_REASON_AGE_GATING_BLOCKED)
-        fallback, fallback_source = _safe_default_candidates(db, child_age=resolved_age)
-        if len(fallback) == 0:
-            return GuardrailsPipelineResult(candidate_ids=[], fallback_applied=False, blocked_reason=NBA_REASON_AGE_GATING_BLOCKED)
-        safe_increment_guardrails_fallback_total()
-        _record_guardrails_fallback_event(
+    def _fallback(blocked_reason: str) -> GuardrailsPipelineResult:
+        return _apply_guardrails_fallback(
             db,
             tenant_id=tenant_id,
-            user_id=user_id,
             child_id=child_id,
+            user_id=user_id,
             context=context,
             correlation_id=correlation_id,
             child_age=resolved_age,
-            blocked_reason=NBA_REASON_AGE_GATING_BLOCKED,
-            fallback_candidate_ids=fallback,
-            fallback_source=fallback_source,
+            blocked_reason=blocked_reason,
         )
-        if fallback_source == "noop":
-            _record_guardrails_fallback_critical_event(
-                db,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                child_id=child_id,
-                context=context,
-                correlation_id=correlation_id,
-                child_age=resolved_age,
-                blocked_reason=NBA_REASON_AGE_GATING_BLOCKED,
-            )
-        return GuardrailsPipelineResult(candidate_ids=fallback, fallback_applied=True, blocked_reason=NBA_REASON_AGE_GATING_BLOCKED)
+
+    # One round-trip for catalog rows and prerequisite edges; the stages below filter in memory.
+    candidate_context = load_guardrails_candidate_context(
+        db, candidate_content_ids=candidate_content_ids
+    )
+    catalog_rows = candidate_context.catalog_rows if candidate_context is not None else None
+
+    # Guardrail order is strict: age -> safety -> prerequisites -> anti-dup.
+    age_eligible_ids = filter_candidate_content_ids_by_age(
+        db,
+        candidate_content_ids=candidate_content_ids,
+        child_age=resolved_age,
+        catalog_rows=catalog_rows,
+    )
+    if len(age_eligible_ids) == 0:
+        return _fallback(NBA_REASON_AGE_GATING_BLOCKED)
 
     safety_eligible_ids = filter_candidates_by_safety_tags(
         db,
         candidate_content_ids=age_eligible_ids,
         child_age=resolved_age,
+        catalog_rows=catalog_rows,
     )
     if len(safety_eligible_ids) == 0:
-        safe_increment_guardrails_block_total(NBA_REASON_SAFETY_TAGS_BLOCKED)
-        fallback, fallback_source = _safe_default_candidates(db, child_age=resolved_age)
-        if len(fallback) == 0:
-            return GuardrailsPipelineResult(candidate_ids=[], fallback_applied=False, blocked_reason=NBA_REASON_SAFETY_TAGS_BLOCKED)
-        safe_increment_guardrails_fallback_total()
-        _record_guardrails_fallback_event(
-            db,
-            tenant_id=tenant_id,
-            user_id=user_id,
-            child_id=child_id,
-            context=context,
-            correlation_id=correlation_id,
-            child_age=resolved_age,
-            blocked_reason=NBA_REASON_SAFETY_TAGS_BLOCKED,
-            fallback_candidate_ids=fallback,
-            fallback_source=fallback_source,
-        )
-        if fallback_source == "noop":
-            _record_guardrails_fallback_critical_event(
-                db,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                child_id=child_id,
-                context=context,
-                correlation_id=correlation_id,
-                child_age=resolved_age,
-                blocked_reason=NBA_REASON_SAFETY_TAGS_BLOCKED,
-            )
-        return GuardrailsPipelineResult(candidate_ids=fallback, fallback_applied=True, blocked_reason=NBA_REASON_SAFETY_TAGS_BLOCKED)
+        return _fallback(NBA_REASON_SAFETY_TAGS_BLOCKED)
 
     if child_id is None:
-        safe_increment_guardrails_block_total(NBA_REASON_PREREQUISITE_BLOCKED)
-        fallback, fallback_source = _safe_default_candidates(db, child_age=resolved_age)
-        if len(fallback) == 0:
-            return GuardrailsPipelineResult(candidate_ids=[], fallback_applied=False, blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED)
-        safe_increment_guardrails_fallback_total()
-        _record_guardrails_fallback_event(
-            db,
-            tenant_id=tenant_id,
-            user_id=user_id,
-            child_id=child_id,
-            context=context,
-            correlation_id=correlation_id,
-            child_age=resolved_age,
-            blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED,
-            fallback_candidate_ids=fallback,
-            fallback_source=fallback_source,
-        )
-        if fallback_source == "noop":
-            _record_guardrails_fallback_critical_event(
-                db,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                child_id=child_id,
-                context=context,
-                correlation_id=correlation_id,
-                child_age=resolved_age,
-                blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED,
-            )
-        return GuardrailsPipelineResult(candidate_ids=fallback, fallback_applied=True, blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED)
+        return _fallback(NBA_REASON_PREREQUISITE_BLOCKED)
 
     prereq_eligible_ids = filter_candidates_by_prerequisites(
         db,
         tenant_id=tenant_id,
         child_id=int(child_id),
         candidate_content_ids=safety_eligible_ids,
+        prerequisite_edges=candidate_context.prerequisite_edges
+        if candidate_context is not None
+        else None,
     )
     if len(prereq_eligible_ids) == 0:
-        safe_increment_guardrails_block_total(NBA_REASON_PREREQUISITE_BLOCKED)
-        fallback, fallback_source = _safe_default_candidates(db, child_age=resolved_age)
-        if len(fallback) == 0:
-            return GuardrailsPipelineResult(candidate_ids=[], fallback_applied=False, blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED)
-        safe_increment_guardrails_fallback_total()
-        _record_guardrails_fallback_event(
-            db,
-            tenant_id=tenant_id,
-            user_id=user_id,
-            child_id=child_id,
-            context=context,
-            correlation_id=correlation_id,
-            child_age=resolved_age,
-            blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED,
-            fallback_candidate_ids=fallback,
-            fallback_source=fallback_source,
-        )
-        if fallback_source == "noop":
-            _record_guardrails_fallback_critical_event(
-                db,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                child_id=child_id,
-                context=context,
-                correlation_id=correlation_id,
-                child_age=resolved_age,
-                blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED,
-            )
-        return GuardrailsPipelineResult(candidate_ids=fallback, fallback_applied=True, blocked_reason=NBA_REASON_PREREQUISITE_BLOCKED)
+        return _fallback(NBA_REASON_PREREQUISITE_BLOCKED)
 
     non_repeated_ids = filter_repeated_candidates(
         db,
@@ -732,37 +697,12 @@ def _apply_guardrails_pipeline(
         child_id=int(child_id),
         candidate_content_ids=prereq_eligible_ids,
         mode=content_mode,
+        fingerprint_by_content_id=candidate_context.fingerprint_by_content_id
+        if candidate_context is not None
+        else None,
     )
     if len(non_repeated_ids) == 0:
-        safe_increment_guardrails_block_total(NBA_REASON_CONTENT_REPEAT_BLOCKED)
-        fallback, fallback_source = _safe_default_candidates(db, child_age=resolved_age)
-        if len(fallback) == 0:
-            return GuardrailsPipelineResult(candidate_ids=[], fallback_applied=False, blocked_reason=NBA_REASON_CONTENT_REPEAT_BLOCKED)
-        safe_increment_guardrails_fallback_total()
-        _record_guardrails_fallback_event(
-            db,
-            tenant_id=tenant_id,
-            user_id=user_id,
-            child_id=child_id,
-            context=context,
-            correlation_id=correlation_id,
-            child_age=resolved_age,
-            blocked_reason=NBA_REASON_CONTENT_REPEAT_BLOCKED,
-            fallback_candidate_ids=fallback,
-            fallback_source=fallback_source,
-        )
-        if fallback_source == "noop":
-            _record_guardrails_fallback_critical_event(
-                db,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                child_id=child_id,
-                context=context,
-                correlation_id=correlation_id,
-                child_age=resolved_age,
-                blocked_reason=NBA_REASON_CONTENT_REPEAT_BLOCKED,
-            )
-        return GuardrailsPipelineResult(candidate_ids=fallback, fallback_applied=True, blocked_reason=NBA_REASON_CONTENT_REPEAT_BLOCKED)
+        return _fallback(NBA_REASON_CONTENT_REPEAT_BLOCKED)
 
     return GuardrailsPipelineResult(candidate_ids=non_repeated_ids, fallback_applied=False, blocked_reason=None)
 
@@ -903,6 +843,9 @@ def resolve_nba_mode(
         feature_version = _resolve_active_feature_version(db)
 
         def _finish(mode: NbaModeResolution) -> NbaModeResolution:
+            # Measured before any write: the decision row is the only synchronous insert,
+            # snapshots and latency events go through the buffered telemetry sink.
+            end_time = datetime.now(UTC)
             if not mode.correlation_id:
                 mode.correlation_id = request_correlation_id
             _persist_mode_decision(
@@ -914,7 +857,6 @@ def resolve_nba_mode(
                 mode=mode,
             )
             _record_feature_snapshot(
-                db,
                 tenant_id=tenant_id,
                 user_id=user_id,
                 child_id=child_id,
@@ -923,13 +865,14 @@ def resolve_nba_mode(
                 feature_version=feature_version,
             )
             _record_decision_latency_metric(
-                db,
                 tenant_id=tenant_id,
                 user_id=user_id,
                 child_id=child_id,
+                decision_id=mode.decision_id,
                 experiment_key=mode.experiment_key,
+                variant=mode.selected_variant,
                 start_time=start_time,
-                end_time=datetime.now(UTC),
+                end_time=end_time,
             )
             safe_increment_decisions_total(str(mode.policy_state or "SHADOW"))
             if mode.policy_applied:
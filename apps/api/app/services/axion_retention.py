@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import csv
+from collections.abc import Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, time, timedelta
 from io import StringIO
-from typing import Iterator
+from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import RowMapping, text
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models import EventLog
 
 
@@ -28,7 +30,117 @@ class AxionRetentionFilters:
     date_to: date | None = None
 
 
-def get_axion_retention_metrics(db: Session, *, filters: AxionRetentionFilters) -> dict[str, float | int]:
+RETENTION_COUNT_KEYS: tuple[str, ...] = (
+    "exposures_total",
+    "unique_exposures_per_day",
+    "cohort_users",
+    "retained_d1_users",
+    "retained_d7_users",
+    "retained_d30_users",
+    "total_sessions_30d",
+    "cta_click_users",
+    "session_started_users",
+    "cta_session_started_converted_users",
+    "cta_session_converted_users",
+)
+
+
+def get_axion_retention_metrics(
+    db: Session,
+    *,
+    filters: AxionRetentionFilters,
+    use_rollups: bool | None = None,
+) -> dict[str, float | int]:
+    resolved_use_rollups = (
+        settings.axion_retention_use_rollups if use_rollups is None else bool(use_rollups)
+    )
+    if resolved_use_rollups:
+        from app.services.axion_retention_rollup import (
+            get_axion_retention_metrics_from_rollups,
+            rollups_support_filters,
+        )
+
+        if rollups_support_filters(filters):
+            return get_axion_retention_metrics_from_rollups(db, filters=filters)
+    return build_retention_metrics(query_axion_retention_counts(db, filters=filters))
+
+
+def retention_counts_rows(rows: Sequence[RowMapping]) -> list[Mapping[str, Any]]:
+    """Plain string-keyed copies of retention count rows, as returned by the read helpers."""
+    return [{str(key): value for key, value in row.items()} for row in rows]
+
+
+def query_axion_retention_counts(
+    db: Session, *, filters: AxionRetentionFilters
+) -> Mapping[str, Any] | None:
+    """Run the raw multi-CTE retention query and return its count row."""
+    row = db.execute(
+        text(_retention_counts_sql(dedupe=filters.dedupe_exposure_per_day, grouped=False)),
+        _retention_params(filters, include_experiment=True),
+    ).mappings().first()
+    return retention_counts_rows([row])[0] if row is not None else None
+
+
+def query_axion_retention_counts_by_variant(
+    db: Session,
+    *,
+    experiment_keys: list[str],
+    filters: AxionRetentionFilters,
+) -> list[Mapping[str, Any]]:
+    """Retention counts for several experiments in one scan, one row per (experiment_key, variant).
+
+    Keys and variants come back lower-cased, matching the case-insensitive filters of the
+    single-variant query; `filters.experiment_key`/`filters.variant` are ignored.
+    """
+    normalized_keys = normalize_experiment_keys(experiment_keys)
+    if not normalized_keys:
+        return []
+    params = _retention_params(filters, include_experiment=False)
+    params["experiment_keys"] = normalized_keys
+    return retention_counts_rows(
+        db.execute(
+            text(_retention_counts_sql(dedupe=filters.dedupe_exposure_per_day, grouped=True)),
+            params,
+        )
+        .mappings()
+        .all()
+    )
+
+
+def get_axion_retention_counts_by_variant(
+    db: Session,
+    *,
+    experiment_keys: list[str],
+    filters: AxionRetentionFilters,
+    use_rollups: bool | None = None,
+) -> list[Mapping[str, Any]]:
+    """Grouped counterpart of `get_axion_retention_metrics`.
+
+    Returns raw counts per (experiment_key, variant).
+    """
+    resolved_use_rollups = (
+        settings.axion_retention_use_rollups if use_rollups is None else bool(use_rollups)
+    )
+    if resolved_use_rollups:
+        from app.services.axion_retention_rollup import (
+            get_axion_retention_counts_by_variant_from_rollups,
+            rollups_support_filters,
+        )
+
+        if rollups_support_filters(filters):
+            return get_axion_retention_counts_by_variant_from_rollups(
+                db, experiment_keys=experiment_keys, filters=filters
+            )
+    return query_axion_retention_counts_by_variant(
+        db, experiment_keys=experiment_keys, filters=filters
+    )
+
+
+def normalize_experiment_keys(experiment_keys: list[str]) -> list[str]:
+    return sorted({item.strip().lower() for item in experiment_keys if item and item.strip()})
+
+
+def _retention_window(filters: AxionRetentionFilters) -> tuple[datetime, datetime | None]:
     if filters.date_from is not None:
         window_start = datetime.combine(filters.date_from, time.min, tzinfo=UTC)
     else:
@@ -38,28 +150,74 @@ def get_axion_retention_metrics(db: Session, *, filters: AxionRetentionFilters)
         if filters.date_to is not None
         else None
     )
-    uuid_pattern = r"^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
+    return window_start, window_end
+
+
+def _retention_params(
+    filters: AxionRetentionFilters, *, include_experiment: bool
+) -> dict[str, object]:
+    window_start, window_end = _retention_window(filters)
+    params: dict[str, object] = {
+        "window_start": window_start,
+        "window_end": window_end,
+        "tenant_id": filters.tenant_id,
+        "action_type": (filters.action_type or "").strip() or None,
+        "context": (filters.context or "").strip() or None,
+        "persona": (filters.persona or "").strip() or None,
+        "nba_reason": (filters.nba_reason or "").strip() or None,
+        "destination": (filters.destination or "").strip() or None,
+    }
+    if include_experiment:
+        params["experiment_key"] = (filters.experiment_key or "").strip() or None
+        params["variant"] = (filters.variant or "").strip() or None
+    return params
+
+
+def _retention_counts_sql(*, dedupe: bool, grouped: bool) -> str:
+    """The retention CTE shared by the single-row and per-variant reads.
+
+    Every CTE carries (experiment_key, variant); the single-row read pins both to ''
+    and filters by the optional experiment/variant params instead of grouping.
+    """
+    if grouped:
+        key_columns = """
+                LOWER(COALESCE(d.experiment_key, d.experiment_id, '')) AS experiment_key,
+                LOWER(COALESCE(d.variant, '')) AS variant,"""
+        experiment_filter = """
+              AND LOWER(COALESCE(d.experiment_key, d.experiment_id, '')) = ANY(:experiment_keys)"""
+    else:
+        key_columns = """
+                CAST('' AS text) AS experiment_key,
+                CAST('' AS text) AS variant,"""
+        experiment_filter = """
+              AND (CAST(:experiment_key AS text) IS NULL OR LOWER(COALESCE(d.experiment_key, d.experiment_id, '')) = LOWER(CAST(:experiment_key AS text)))
+              AND (
+                  CAST(:variant AS text) IS NULL
+                  OR LOWER(COALESCE(d.variant, '')) = LOWER(CAST(:variant AS text))
+              )"""
     exposure_events_cte = (
         """
         exposure_events AS (
-            SELECT DISTINCT ON (child_id, exposed_day)
+            SELECT DISTINCT ON (experiment_key, variant, child_id, exposed_day)
+                experiment_key,
+                variant,
                 user_id,
                 child_id,
-                tenant_id,
                 decision_id,
                 exposed_at,
                 exposed_day
             FROM exposure_base
-            ORDER BY child_id, exposed_day, exposed_at ASC
+            ORDER BY experiment_key, variant, child_id, exposed_day, exposed_at ASC
         ),
         """
-        if filters.dedupe_exposure_per_day
+        if dedupe
         else """
         exposure_events AS (
             SELECT
+                experiment_key,
+                variant,
                 user_id,
                 child_id,
-                tenant_id,
                 decision_id,
                 exposed_at,
                 exposed_day
@@ -67,201 +225,200 @@ def get_axion_retention_metrics(db: Session, *, filters: AxionRetentionFilters)
         ),
         """
     )
-    stmt = text(
+    return (
         """
         WITH exposure_base AS (
-            SELECT
+            SELECT"""
+        + key_columns
+        + """
                 d.user_id AS user_id,
                 d.child_id AS child_id,
-                e.tenant_id AS tenant_id,
-                (e.payload->>'decision_id') AS decision_id,
+                e.decision_id AS decision_id,
                 e.created_at AS exposed_at,
                 date_trunc('day', e.created_at) AS exposed_day
             FROM event_log e
             JOIN axion_decisions d
-              ON d.id = (e.payload->>'decision_id')::uuid
+              ON d.id = e.decision_id
             LEFT JOIN user_persona_state ups
               ON ups.user_id = d.user_id
             LEFT JOIN axion_personas ap
               ON ap.id = ups.active_persona_id
             WHERE e.type = 'axion_brief_exposed'
-              AND (e.payload->>'decision_id') ~* :uuid_pattern
               AND e.created_at >= :window_start
-              AND (:window_end IS NULL OR e.created_at < :window_end)
+              AND (:window_end IS NULL OR e.created_at < :window_end)"""
+        + experiment_filter
+        + """
               AND (:tenant_id IS NULL OR e.tenant_id = :tenant_id)
               AND (CAST(:action_type AS text) IS NULL OR UPPER(COALESCE(d.action_type, e.payload->>'actionType')) = UPPER(CAST(:action_type AS text)))
               AND (CAST(:context AS text) IS NULL OR LOWER(COALESCE(d.context::text, e.payload->>'context')) = LOWER(CAST(:context AS text)))
               AND (CAST(:persona AS text) IS NULL OR LOWER(ap.name) = LOWER(CAST(:persona AS text)))
-              AND (CAST(:experiment_key AS text) IS NULL OR LOWER(COALESCE(d.experiment_key, d.experiment_id, '')) = LOWER(CAST(:experiment_key AS text)))
-              AND (CAST(:variant AS text) IS NULL OR LOWER(COALESCE(d.variant, '')) = LOWER(CAST(:variant AS text)))
               AND (CAST(:nba_reason AS text) IS NULL OR LOWER(COALESCE(d.nba_reason, '')) = LOWER(CAST(:nba_reason AS text)))
         ),
         """
         + exposure_events_cte
         + """
         cohort_users AS (
-            SELECT user_id, MIN(exposed_at) AS first_exposed_at
+            SELECT experiment_key, variant, user_id, MIN(exposed_at) AS first_exposed_at
             FROM exposure_events
-            GROUP BY user_id
-        ),
-        session_completed_events AS (
-            SELECT
-                ee.user_id AS user_id,
-                s.created_at AS session_at
-            FROM event_log s
-            JOIN exposure_events ee
-              ON ee.decision_id = s.payload->>'decision_id'
-            WHERE s.type = 'axion_session_completed'
-              AND (CAST(:destination AS text) IS NULL OR LOWER(COALESCE(s.payload->>'destination', '')) = LOWER(CAST(:destination AS text)))
+            GROUP BY experiment_key, variant, user_id
         ),
-        session_started_events AS (
+        session_events AS (
             SELECT
+                ee.experiment_key AS experiment_key,
+                ee.variant AS variant,
                 ee.user_id AS user_id,
+                s.type AS session_type,
                 s.created_at AS session_at
             FROM event_log s
             JOIN exposure_events ee
-              ON ee.decision_id = s.payload->>'decision_id'
-            WHERE s.type = 'axion_session_started'
+              ON ee.decision_id = s.decision_id
+            WHERE s.type IN ('axion_session_started', 'axion_session_completed')
+              AND s.created_at >= :window_start
               AND (CAST(:destination AS text) IS NULL OR LOWER(COALESCE(s.payload->>'destination', '')) = LOWER(CAST(:destination AS text)))
         ),
         session_by_user AS (
             SELECT
+                cu.experiment_key AS experiment_key,
+                cu.variant AS variant,
                 cu.user_id AS user_id,
-                COUNT(*) FILTER (
-                    WHERE sce.session_at >= cu.first_exposed_at
-                      AND sce.session_at < cu.first_exposed_at + INTERVAL '30 days'
+                COUNT(se.session_at) FILTER (
+                    WHERE se.session_type = 'axion_session_completed'
+                      AND se.session_at >= cu.first_exposed_at
+                      AND se.session_at < cu.first_exposed_at + INTERVAL '30 days'
                 ) AS sessions_30d,
                 BOOL_OR(
-                    sce.session_at >= cu.first_exposed_at
-                    AND sce.session_at < cu.first_exposed_at + INTERVAL '1 day'
+                    se.session_type = 'axion_session_completed'
+                    AND se.session_at >= cu.first_exposed_at
+                    AND se.session_at < cu.first_exposed_at + INTERVAL '1 day'
                 ) AS retained_d1,
                 BOOL_OR(
-                    sce.session_at >= cu.first_exposed_at
-                    AND sce.session_at < cu.first_exposed_at + INTERVAL '7 days'
+                    se.session_type = 'axion_session_completed'
+                    AND se.session_at >= cu.first_exposed_at
+                    AND se.session_at < cu.first_exposed_at + INTERVAL '7 days'
                 ) AS retained_d7,
                 BOOL_OR(
-                    sce.session_at >= cu.first_exposed_at
-                    AND sce.session_at < cu.first_exposed_at + INTERVAL '30 days'
+                    se.session_type = 'axion_session_completed'
+                    AND se.session_at >= cu.first_exposed_at
+                    AND se.session_at < cu.first_exposed_at + INTERVAL '30 days'
                 ) AS retained_d30
             FROM cohort_users cu
-            LEFT JOIN session_completed_events sce
-              ON sce.user_id = cu.user_id
-            GROUP BY cu.user_id
-        ),
-        cta_click_users AS (
-            SELECT DISTINCT cce.user_id AS user_id
-            FROM (
-                SELECT
-                    ee.user_id AS user_id,
-                    c.created_at AS click_at,
-                    c.payload->>'decision_id' AS decision_id
-                FROM event_log c
-                JOIN exposure_events ee
-                  ON ee.decision_id = c.payload->>'decision_id'
-                WHERE c.type = 'axion_cta_clicked'
-            ) cce
+            LEFT JOIN session_events se
+              ON se.experiment_key = cu.experiment_key
+             AND se.variant = cu.variant
+             AND se.user_id = cu.user_id
+            GROUP BY cu.experiment_key, cu.variant, cu.user_id
         ),
         cta_click_events AS (
             SELECT
+                ee.experiment_key AS experiment_key,
+                ee.variant AS variant,
                 ee.user_id AS user_id,
                 c.created_at AS click_at,
-                c.payload->>'decision_id' AS decision_id
+                c.decision_id AS decision_id
             FROM event_log c
             JOIN exposure_events ee
-              ON ee.decision_id = c.payload->>'decision_id'
+              ON ee.decision_id = c.decision_id
             WHERE c.type = 'axion_cta_clicked'
+              AND c.created_at >= :window_start
         ),
         cta_session_windows AS (
             SELECT
+                cce.experiment_key AS experiment_key,
+                cce.variant AS variant,
                 cce.user_id AS user_id,
-                BOOL_OR(s_start.id IS NOT NULL) AS started_within_24h,
-                BOOL_OR(s_done.id IS NOT NULL) AS completed_within_24h
+                BOOL_OR(s.type = 'axion_session_started') AS started_within_24h,
+                BOOL_OR(s.type = 'axion_session_completed') AS completed_within_24h
             FROM cta_click_events cce
-            LEFT JOIN event_log s_start
-              ON s_start.type = 'axion_session_started'
-             AND s_start.payload->>'decision_id' = cce.decision_id
-             AND s_start.created_at >= cce.click_at
-             AND s_start.created_at < cce.click_at + INTERVAL '24 hours'
-             AND (CAST(:destination AS text) IS NULL OR LOWER(COALESCE(s_start.payload->>'destination', '')) = LOWER(CAST(:destination AS text)))
-            LEFT JOIN event_log s_done
-              ON s_done.type = 'axion_session_completed'
-             AND s_done.payload->>'decision_id' = cce.decision_id
-             AND s_done.created_at >= cce.click_at
-             AND s_done.created_at < cce.click_at + INTERVAL '24 hours'
-             AND (CAST(:destination AS text) IS NULL OR LOWER(COALESCE(s_done.payload->>'destination', '')) = LOWER(CAST(:destination AS text)))
-            GROUP BY cce.user_id
-        ),
-        cta_session_converted_users AS (
-            SELECT csw.user_id
-            FROM cta_session_windows csw
-            WHERE COALESCE(csw.completed_within_24h, FALSE)
-        ),
-        cta_session_started_converted_users AS (
-            SELECT csw.user_id
-            FROM cta_session_windows csw
-            WHERE COALESCE(csw.started_within_24h, FALSE)
+            LEFT JOIN event_log s
+              ON s.type IN ('axion_session_started', 'axion_session_completed')
+             AND s.decision_id = cce.decision_id
+             AND s.created_at >= cce.click_at
+             AND s.created_at < cce.click_at + INTERVAL '24 hours'
+             AND (CAST(:destination AS text) IS NULL OR LOWER(COALESCE(s.payload->>'destination', '')) = LOWER(CAST(:destination AS text)))
+            GROUP BY cce.experiment_key, cce.variant, cce.user_id
         )
         SELECT
-            (SELECT COUNT(*)::int FROM exposure_base) AS exposures_total,
-            (SELECT COUNT(DISTINCT (child_id::text || ':' || exposed_day::text))::int FROM exposure_base WHERE child_id IS NOT NULL) AS unique_exposures_per_day,
-            (SELECT COUNT(*)::int FROM cohort_users) AS cohort_users,
-            (SELECT COUNT(*)::int FROM session_by_user WHERE COALESCE(retained_d1, FALSE)) AS retained_d1_users,
-            (SELECT COUNT(*)::int FROM session_by_user WHERE COALESCE(retained_d7, FALSE)) AS retained_d7_users,
-            (SELECT COUNT(*)::int FROM session_by_user WHERE COALESCE(retained_d30, FALSE)) AS retained_d30_users,
-            (SELECT COALESCE(SUM(sessions_30d), 0)::float FROM session_by_user) AS total_sessions_30d,
-            (SELECT COUNT(*)::int FROM cta_click_users) AS cta_click_users,
-            (SELECT COUNT(DISTINCT user_id)::int FROM session_started_events) AS session_started_users,
-            (SELECT COUNT(*)::int FROM cta_session_started_converted_users) AS cta_session_started_converted_users,
-            (SELECT COUNT(*)::int FROM cta_session_converted_users) AS cta_session_converted_users
+            eb.experiment_key AS experiment_key,
+            eb.variant AS variant,
+            eb.exposures_total AS exposures_total,
+            eb.unique_exposures_per_day AS unique_exposures_per_day,
+            COALESCE(sbu.cohort_users, 0) AS cohort_users,
+            COALESCE(sbu.retained_d1_users, 0) AS retained_d1_users,
+            COALESCE(sbu.retained_d7_users, 0) AS retained_d7_users,
+            COALESCE(sbu.retained_d30_users, 0) AS retained_d30_users,
+            COALESCE(sbu.total_sessions_30d, 0.0) AS total_sessions_30d,
+            COALESCE(cta.cta_click_users, 0) AS cta_click_users,
+            COALESCE(ss.session_started_users, 0) AS session_started_users,
+            COALESCE(csw.cta_session_started_converted_users, 0)
+                AS cta_session_started_converted_users,
+            COALESCE(csw.cta_session_converted_users, 0) AS cta_session_converted_users
+        FROM (
+            SELECT
+                experiment_key,
+                variant,
+                COUNT(*)::int AS exposures_total,
+                COUNT(DISTINCT (child_id::text || ':' || exposed_day::text))
+                    FILTER (WHERE child_id IS NOT NULL)::int AS unique_exposures_per_day
+            FROM exposure_base
+            GROUP BY experiment_key, variant
+        ) eb
+        LEFT JOIN (
+            SELECT
+                experiment_key,
+                variant,
+                COUNT(*)::int AS cohort_users,
+                COUNT(*) FILTER (WHERE COALESCE(retained_d1, FALSE))::int AS retained_d1_users,
+                COUNT(*) FILTER (WHERE COALESCE(retained_d7, FALSE))::int AS retained_d7_users,
+                COUNT(*) FILTER (WHERE COALESCE(retained_d30, FALSE))::int AS retained_d30_users,
+                COALESCE(SUM(sessions_30d), 0)::float AS total_sessions_30d
+            FROM session_by_user
+            GROUP BY experiment_key, variant
+        ) sbu
+          USING (experiment_key, variant)
+        LEFT JOIN (
+            SELECT experiment_key, variant, COUNT(DISTINCT user_id)::int AS cta_click_users
+            FROM cta_click_events
+            GROUP BY experiment_key, variant
+        ) cta
+          USING (experiment_key, variant)
+        LEFT JOIN (
+            SELECT experiment_key, variant, COUNT(DISTINCT user_id)::int AS session_started_users
+            FROM session_events
+            WHERE session_type = 'axion_session_started'
+            GROUP BY experiment_key, variant
+        ) ss
+          USING (experiment_key, variant)
+        LEFT JOIN (
+            SELECT
+                experiment_key,
+                variant,
+                COUNT(*) FILTER (WHERE COALESCE(started_within_24h, FALSE))::int
+                    AS cta_session_started_converted_users,
+                COUNT(*) FILTER (WHERE COALESCE(completed_within_24h, FALSE))::int
+                    AS cta_session_converted_users
+            FROM cta_session_windows
+            GROUP BY experiment_key, variant
+        ) csw
+          USING (experiment_key, variant)
+        ORDER BY eb.experiment_key, eb.variant
         """
     )
-    row = db.execute(
-        stmt,
-        {
-            "window_start": window_start,
-            "window_end": window_end,
-            "uuid_pattern": uuid_pattern,
-            "tenant_id": filters.tenant_id,
-            "action_type": (filters.action_type or "").strip() or None,
-            "context": (filters.context or "").strip() or None,
-            "persona": (filters.persona or "").strip() or None,
-            "experiment_key": (filters.experiment_key or "").strip() or None,
-            "variant": (filters.variant or "").strip() or None,
-            "nba_reason": (filters.nba_reason or "").strip() or None,
-            "destination": (filters.destination or "").strip() or None,
-        },
-    ).mappings().first()
-    if row is None:
-        return {
-            "exposures_total": 0,
-            "unique_exposures_per_day": 0,
-            "cohort_users": 0,
-            "retained_d1_users": 0,
-            "retained_d7_users": 0,
-            "retained_d30_users": 0,
-            "d1_rate": 0.0,
-            "d7_rate": 0.0,
-            "d30_rate": 0.0,
-            "session_frequency": 0.0,
-            "cta_click_users": 0,
-            "session_started_users": 0,
-            "cta_session_started_converted_users": 0,
-            "cta_to_session_started_conversion": 0.0,
-            "cta_session_converted_users": 0,
-            "cta_to_session_conversion": 0.0,
-        }
-
-    exposures_total = int(row["exposures_total"] or 0)
-    unique_exposures_per_day = int(row["unique_exposures_per_day"] or 0)
-    cohort_users = int(row["cohort_users"] or 0)
-    retained_d1_users = int(row["retained_d1_users"] or 0)
-    retained_d7_users = int(row["retained_d7_users"] or 0)
-    retained_d30_users = int(row["retained_d30_users"] or 0)
-    total_sessions_30d = float(row["total_sessions_30d"] or 0.0)
-    cta_click_users = int(row["cta_click_users"] or 0)
-    session_started_users = int(row["session_started_users"] or 0)
-    cta_session_started_converted_users = int(row["cta_session_started_converted_users"] or 0)
-    cta_session_converted_users = int(row["cta_session_converted_users"] or 0)
+
+
+def build_retention_metrics(counts: Mapping[str, Any] | None) -> dict[str, float | int]:
+    """Turn raw retention counts (from SQL or rollups) into the public metrics payload."""
+    row = counts or {}
+    exposures_total = int(row.get("exposures_total") or 0)
+    unique_exposures_per_day = int(row.get("unique_exposures_per_day") or 0)
+    cohort_users = int(row.get("cohort_users") or 0)
+    retained_d1_users = int(row.get("retained_d1_users") or 0)
+    retained_d7_users = int(row.get("retained_d7_users") or 0)
+    retained_d30_users = int(row.get("retained_d30_users") or 0)
+    total_sessions_30d = float(row.get("total_sessions_30d") or 0.0)
+    cta_click_users = int(row.get("cta_click_users") or 0)
+    session_started_users = int(row.get("session_started_users") or 0)
+    cta_session_started_converted_users = int(row.get("cta_session_started_converted_users") or 0)
+    cta_session_converted_users = int(row.get("cta_session_converted_users") or 0)
 
     cohort_den = float(cohort_users) if cohort_users > 0 else 0.0
     click_den = float(cta_click_users) if cta_click_users > 0 else 0.0
@@ -294,6 +451,7 @@ def stream_nba_retention_export_csv(
     tenant_id: int,
     date_from: date | None = None,
     date_to: date | None = None,
+    chunk_rows: int = 500,
 ) -> Iterator[str]:
     if date_from is not None:
         window_start = datetime.combine(date_from, time.min, tzinfo=UTC)
@@ -304,7 +462,6 @@ def stream_nba_retention_export_csv(
         if date_to is not None
         else None
     )
-    uuid_pattern = r"^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
 
     stmt = text(
         """
@@ -316,9 +473,8 @@ def stream_nba_retention_export_csv(
                 e.created_at AS exposed_at
             FROM event_log e
             JOIN axion_decisions d
-              ON d.id = (e.payload->>'decision_id')::uuid
+              ON d.id = e.decision_id
             WHERE e.type = 'axion_brief_exposed'
-              AND (e.payload->>'decision_id') ~* :uuid_pattern
               AND e.tenant_id = :tenant_id
               AND COALESCE(d.experiment_key, d.experiment_id) = 'nba_retention_v1'
               AND e.created_at >= :window_start
@@ -338,7 +494,7 @@ def stream_nba_retention_export_csv(
                 d.user_id AS user_id,
                 d.child_id AS child_id,
                 COALESCE(d.variant, 'UNKNOWN') AS variant,
-                d.id::text AS decision_id
+                d.id AS decision_id
             FROM axion_decisions d
             JOIN cohort c
               ON c.user_id = d.user_id
@@ -356,7 +512,7 @@ def stream_nba_retention_export_csv(
                 s.created_at AS created_at
             FROM decision_scope ds
             JOIN event_log s
-              ON s.payload->>'decision_id' = ds.decision_id
+              ON s.decision_id = ds.decision_id
             WHERE s.type IN ('axion_session_started', 'axion_session_completed')
         )
         SELECT
@@ -399,14 +555,14 @@ def stream_nba_retention_export_csv(
         """
     )
 
-    conn = db.connection().execution_options(stream_results=True)
+    chunk_rows = max(1, int(chunk_rows))
+    conn = db.connection().execution_options(stream_results=True, yield_per=chunk_rows)
     result = conn.execute(
         stmt,
         {
             "tenant_id": tenant_id,
             "window_start": window_start,
             "window_end": window_end,
-            "uuid_pattern": uuid_pattern,
         },
     ).mappings()
 
@@ -429,6 +585,7 @@ def stream_nba_retention_export_csv(
     out.seek(0)
     out.truncate(0)
 
+    buffered = 0
     for row in result:
         first_exposure = row["first_exposure_at"]
         first_exposure_text = first_exposure.isoformat() if isinstance(first_exposure, datetime) else ""
@@ -445,9 +602,14 @@ def stream_nba_retention_export_csv(
                 int(row["sessions_30d"] or 0),
             ]
         )
+        buffered += 1
+        if buffered >= chunk_rows:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate(0)
+            buffered = 0
+    if buffered:
         yield out.getvalue()
-        out.seek(0)
-        out.truncate(0)
 
 
 def compute_retention_metrics(
@@ -492,7 +654,6 @@ def compute_retention_metrics(
         if date_to is not None
         else None
     )
-    uuid_pattern = r"^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
 
     metrics_stmt = text(
         """
@@ -500,13 +661,12 @@ def compute_retention_metrics(
             SELECT
                 d.user_id AS user_id,
                 COALESCE(d.variant, 'UNKNOWN') AS variant,
-                (e.payload->>'decision_id') AS decision_id,
+                e.decision_id AS decision_id,
                 e.created_at AS exposed_at
             FROM event_log e
             JOIN axion_decisions d
-              ON d.id = (e.payload->>'decision_id')::uuid
+              ON d.id = e.decision_id
             WHERE e.type = 'axion_brief_exposed'
-              AND (e.payload->>'decision_id') ~* :uuid_pattern
               AND COALESCE(d.experiment_key, d.experiment_id) = :experiment_key
               AND e.created_at >= :window_start
               AND (:window_end IS NULL OR e.created_at < :window_end)
@@ -581,7 +741,6 @@ def compute_retention_metrics(
             "tenant_id": tenant_id,
             "window_start": window_start,
             "window_end": window_end,
-            "uuid_pattern": uuid_pattern,
         },
     ).mappings().all()
 
@@ -593,9 +752,8 @@ def compute_retention_metrics(
                 COALESCE(d.variant, 'UNKNOWN') AS variant
             FROM event_log e
             JOIN axion_decisions d
-              ON d.id = (e.payload->>'decision_id')::uuid
+              ON d.id = e.decision_id
             WHERE e.type = 'axion_brief_exposed'
-              AND (e.payload->>'decision_id') ~* :uuid_pattern
               AND COALESCE(d.experiment_key, d.experiment_id) = :experiment_key
               AND e.created_at >= :window_start
               AND (:window_end IS NULL OR e.created_at < :window_end)
@@ -618,8 +776,7 @@ def compute_retention_metrics(
                 "tenant_id": tenant_id,
                 "window_start": window_start,
                 "window_end": window_end,
-                "uuid_pattern": uuid_pattern,
-            },
+                },
         ).scalar_one_or_none()
         or 0
     )
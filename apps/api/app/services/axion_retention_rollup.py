@@ -0,0 +1,557 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import RollupWatermark
+from app.services.axion_retention import (
+    AxionRetentionFilters,
+    build_retention_metrics,
+    normalize_experiment_keys,
+    query_axion_retention_counts,
+    query_axion_retention_counts_by_variant,
+    retention_counts_rows,
+)
+
+AXION_RETENTION_ROLLUP_NAME = "axion_retention_daily"
+# D30 retention and sessions_30d for a cohort day only settle 30 days later, so every
+# refresh re-materializes that trailing window on top of whatever is new since the watermark.
+AXION_RETENTION_MATURATION_DAYS = 31
+
+_ROW_KEY = ("tenant_id", "experiment_key", "variant", "context", "day", "child_id")
+_ROW_COLUMNS = """
+            tenant_id, experiment_key, variant, context, day, child_id, destination,
+            user_id, first_exposed_at, exposures_total, completed_session_ats, session_started,
+            cta_clicked, cta_started_within_24h, cta_completed_within_24h"""
+
+
+def _same_row(left: str, right: str) -> str:
+    return "\n             AND ".join(f"{left}.{column} = {right}.{column}" for column in _ROW_KEY)
+
+
+# Rollup rows are per (tenant, experiment, variant, context, day, child) first exposure, one
+# per destination ('' = any). They keep the child's user and the completed-session timestamps
+# instead of per-day user counts, so reads can still dedupe users across the whole window and
+# measure D1/D7/D30 from each user's first exposure in it. Persona is joined at read time.
+_FRESH_ROWS_CTES = (
+    """
+    exposures AS (
+        SELECT
+            e.tenant_id AS tenant_id,
+            LEFT(COALESCE(d.experiment_key, d.experiment_id, ''), 80) AS experiment_key,
+            LEFT(COALESCE(d.variant, ''), 80) AS variant,
+            LEFT(LOWER(COALESCE(d.context::text, e.payload->>'context', '')), 40) AS context,
+            (e.created_at AT TIME ZONE 'UTC')::date AS day,
+            COALESCE(d.child_id, 0) AS child_id,
+            d.user_id AS user_id,
+            e.decision_id AS decision_id,
+            e.created_at AS exposed_at
+        FROM event_log e
+        JOIN axion_decisions d
+          ON d.id = e.decision_id
+        WHERE e.type = 'axion_brief_exposed'
+          AND e.created_at >= :window_start
+          AND e.created_at < :window_end
+          AND (CAST(:tenant_id AS integer) IS NULL OR e.tenant_id = :tenant_id)
+    ),
+    exposure_rows AS (
+        SELECT DISTINCT ON (tenant_id, experiment_key, variant, context, day, child_id)
+            tenant_id, experiment_key, variant, context, day, child_id, user_id, decision_id,
+            exposed_at AS first_exposed_at,
+            (
+                COUNT(*) OVER (
+                    PARTITION BY tenant_id, experiment_key, variant, context, day, child_id
+                )
+            )::int
+                AS exposures_total
+        FROM exposures
+        ORDER BY tenant_id, experiment_key, variant, context, day, child_id, exposed_at ASC
+    ),
+    sessions AS (
+        SELECT
+            er.tenant_id, er.experiment_key, er.variant, er.context, er.day, er.child_id,
+            s.type AS session_type,
+            s.created_at AS session_at,
+            LEFT(LOWER(COALESCE(s.payload->>'destination', '')), 80) AS destination
+        FROM exposure_rows er
+        JOIN event_log s
+          ON s.decision_id = er.decision_id
+        WHERE s.type IN ('axion_session_started', 'axion_session_completed')
+          AND s.created_at >= :window_start
+          AND s.created_at < :sessions_end
+    ),
+    clicks AS (
+        SELECT
+            er.tenant_id, er.experiment_key, er.variant, er.context, er.day, er.child_id,
+            c.created_at AS click_at
+        FROM exposure_rows er
+        JOIN event_log c
+          ON c.decision_id = er.decision_id
+        WHERE c.type = 'axion_cta_clicked'
+          AND c.created_at >= :window_start
+          AND c.created_at < :sessions_end
+    ),
+    destinations AS (
+        SELECT DISTINCT tenant_id, experiment_key, variant, context, day, child_id, destination
+        FROM sessions
+        WHERE destination <> ''
+        UNION
+        SELECT tenant_id, experiment_key, variant, context, day, child_id, '' AS destination
+        FROM exposure_rows
+    ),
+    session_facts AS (
+        SELECT
+            dst.tenant_id, dst.experiment_key, dst.variant, dst.context, dst.day, dst.child_id,
+            dst.destination,
+            COALESCE(
+                ARRAY_AGG(s.session_at ORDER BY s.session_at)
+                    FILTER (WHERE s.session_type = 'axion_session_completed'),
+                CAST(ARRAY[] AS timestamptz[])
+            ) AS completed_session_ats,
+            COALESCE(BOOL_OR(s.session_type = 'axion_session_started'), FALSE) AS session_started
+        FROM destinations dst
+        LEFT JOIN sessions s
+          ON """
+    + _same_row("s", "dst")
+    + """
+         AND (dst.destination = '' OR s.destination = dst.destination)
+        GROUP BY
+            dst.tenant_id, dst.experiment_key, dst.variant, dst.context, dst.day, dst.child_id,
+            dst.destination
+    ),
+    click_facts AS (
+        SELECT
+            dst.tenant_id, dst.experiment_key, dst.variant, dst.context, dst.day, dst.child_id,
+            dst.destination,
+            COALESCE(BOOL_OR(
+                s.session_type = 'axion_session_started'
+                AND s.session_at >= cl.click_at
+                AND s.session_at < cl.click_at + INTERVAL '24 hours'
+            ), FALSE) AS cta_started_within_24h,
+            COALESCE(BOOL_OR(
+                s.session_type = 'axion_session_completed'
+                AND s.session_at >= cl.click_at
+                AND s.session_at < cl.click_at + INTERVAL '24 hours'
+            ), FALSE) AS cta_completed_within_24h
+        FROM destinations dst
+        JOIN clicks cl
+          ON """
+    + _same_row("cl", "dst")
+    + """
+        LEFT JOIN sessions s
+          ON """
+    + _same_row("s", "dst")
+    + """
+         AND (dst.destination = '' OR s.destination = dst.destination)
+        GROUP BY
+            dst.tenant_id, dst.experiment_key, dst.variant, dst.context, dst.day, dst.child_id,
+            dst.destination
+    ),
+    fresh_rows AS (
+        SELECT
+            dst.tenant_id, dst.experiment_key, dst.variant, dst.context, dst.day, dst.child_id,
+            dst.destination,
+            er.user_id,
+            er.first_exposed_at,
+            er.exposures_total,
+            sf.completed_session_ats,
+            sf.session_started,
+            cf.tenant_id IS NOT NULL AS cta_clicked,
+            COALESCE(cf.cta_started_within_24h, FALSE) AS cta_started_within_24h,
+            COALESCE(cf.cta_completed_within_24h, FALSE) AS cta_completed_within_24h
+        FROM destinations dst
+        JOIN exposure_rows er
+          ON """
+    + _same_row("er", "dst")
+    + """
+        JOIN session_facts sf
+          ON """
+    + _same_row("sf", "dst")
+    + """
+         AND sf.destination = dst.destination
+        LEFT JOIN click_facts cf
+          ON """
+    + _same_row("cf", "dst")
+    + """
+         AND cf.destination = dst.destination
+    )"""
+)
+
+_REFRESH_SQL = (
+    """
+    INSERT INTO axion_retention_daily_rollup ("""
+    + _ROW_COLUMNS
+    + """,
+            updated_at
+    )
+    WITH"""
+    + _FRESH_ROWS_CTES
+    + """
+    SELECT"""
+    + _ROW_COLUMNS
+    + """,
+            now()
+    FROM fresh_rows
+"""
+)
+
+
+def _rollup_read_sql(*, grouped: bool) -> str:
+    """Stored rows up to the watermark plus fresh rows past it, deduped per user across the window.
+
+    Mirrors the raw read with dedupe_exposure_per_day: the first exposure per child and day
+    (over every matching context) feeds the user cohort, and each user's D1/D7/D30 windows
+    start at their first exposure in the whole range.
+    """
+    if grouped:
+        key_columns = """
+                LOWER(base.experiment_key) AS experiment_key,
+                LOWER(base.variant) AS variant,"""
+        experiment_filter = """
+              AND LOWER(base.experiment_key) = ANY(:experiment_keys)"""
+    else:
+        key_columns = """
+                CAST('' AS text) AS experiment_key,
+                CAST('' AS text) AS variant,"""
+        experiment_filter = """
+              AND (
+                  CAST(:experiment_key AS text) IS NULL
+                  OR LOWER(base.experiment_key) = LOWER(CAST(:experiment_key AS text))
+              )
+              AND (
+                  CAST(:variant AS text) IS NULL
+                  OR LOWER(base.variant) = LOWER(CAST(:variant AS text))
+              )"""
+    return (
+        """
+        WITH"""
+        + _FRESH_ROWS_CTES
+        + """,
+        stored_rows AS (
+            SELECT"""
+        + _ROW_COLUMNS
+        + """
+            FROM axion_retention_daily_rollup
+            WHERE day >= :day_from
+              AND day <= :day_to
+              AND (CAST(:tenant_id AS integer) IS NULL OR tenant_id = :tenant_id)
+        ),
+        all_rows AS (
+            SELECT"""
+        + _ROW_COLUMNS
+        + """
+            FROM stored_rows
+            UNION ALL
+            SELECT"""
+        + _ROW_COLUMNS
+        + """
+            FROM fresh_rows
+        ),
+        scoped_rows AS (
+            SELECT"""
+        + key_columns
+        + """
+                base.day,
+                base.child_id,
+                base.user_id,
+                base.first_exposed_at,
+                base.exposures_total,
+                base.cta_clicked,
+                COALESCE(scoped.completed_session_ats, CAST(ARRAY[] AS timestamptz[]))
+                    AS completed_session_ats,
+                COALESCE(scoped.session_started, FALSE) AS session_started,
+                COALESCE(scoped.cta_started_within_24h, FALSE) AS cta_started_within_24h,
+                COALESCE(scoped.cta_completed_within_24h, FALSE) AS cta_completed_within_24h
+            FROM all_rows base
+            LEFT JOIN all_rows scoped
+              ON """
+        + _same_row("scoped", "base")
+        + """
+             AND scoped.destination = COALESCE(LOWER(CAST(:destination AS text)), '')
+            LEFT JOIN user_persona_state ups
+              ON ups.user_id = base.user_id
+            LEFT JOIN axion_personas ap
+              ON ap.id = ups.active_persona_id
+            WHERE base.destination = ''
+              AND (CAST(:context AS text) IS NULL OR base.context = LOWER(CAST(:context AS text)))
+              AND (
+                  CAST(:persona AS text) IS NULL
+                  OR LOWER(ap.name) = LOWER(CAST(:persona AS text))
+              )"""
+        + experiment_filter
+        + """
+        ),
+        first_rows AS (
+            SELECT DISTINCT ON (experiment_key, variant, child_id, day) *
+            FROM scoped_rows
+            ORDER BY experiment_key, variant, child_id, day, first_exposed_at ASC
+        ),
+        cohort_users AS (
+            SELECT experiment_key, variant, user_id, MIN(first_exposed_at) AS first_exposed_at
+            FROM first_rows
+            GROUP BY experiment_key, variant, user_id
+        ),
+        user_stats AS (
+            SELECT
+                cu.experiment_key,
+                cu.variant,
+                cu.user_id,
+                COUNT(s.session_at) FILTER (
+                    WHERE s.session_at >= cu.first_exposed_at
+                      AND s.session_at < cu.first_exposed_at + INTERVAL '30 days'
+                ) AS sessions_30d,
+                COALESCE(BOOL_OR(
+                    s.session_at >= cu.first_exposed_at
+                    AND s.session_at < cu.first_exposed_at + INTERVAL '1 day'
+                ), FALSE) AS retained_d1,
+                COALESCE(BOOL_OR(
+                    s.session_at >= cu.first_exposed_at
+                    AND s.session_at < cu.first_exposed_at + INTERVAL '7 days'
+                ), FALSE) AS retained_d7,
+                COALESCE(BOOL_OR(
+                    s.session_at >= cu.first_exposed_at
+                    AND s.session_at < cu.first_exposed_at + INTERVAL '30 days'
+                ), FALSE) AS retained_d30,
+                BOOL_OR(fr.session_started) AS session_started,
+                BOOL_OR(fr.cta_clicked) AS cta_clicked,
+                BOOL_OR(fr.cta_started_within_24h) AS cta_started_within_24h,
+                BOOL_OR(fr.cta_completed_within_24h) AS cta_completed_within_24h
+            FROM cohort_users cu
+            JOIN first_rows fr
+              ON fr.experiment_key = cu.experiment_key
+             AND fr.variant = cu.variant
+             AND fr.user_id = cu.user_id
+            LEFT JOIN LATERAL unnest(fr.completed_session_ats) AS s(session_at) ON TRUE
+            GROUP BY cu.experiment_key, cu.variant, cu.user_id
+        )
+        SELECT
+            eb.experiment_key AS experiment_key,
+            eb.variant AS variant,
+            eb.exposures_total AS exposures_total,
+            eb.unique_exposures_per_day AS unique_exposures_per_day,
+            COALESCE(us.cohort_users, 0) AS cohort_users,
+            COALESCE(us.retained_d1_users, 0) AS retained_d1_users,
+            COALESCE(us.retained_d7_users, 0) AS retained_d7_users,
+            COALESCE(us.retained_d30_users, 0) AS retained_d30_users,
+            COALESCE(us.total_sessions_30d, 0.0) AS total_sessions_30d,
+            COALESCE(us.cta_click_users, 0) AS cta_click_users,
+            COALESCE(us.session_started_users, 0) AS session_started_users,
+            COALESCE(us.cta_session_started_converted_users, 0)
+                AS cta_session_started_converted_users,
+            COALESCE(us.cta_session_converted_users, 0) AS cta_session_converted_users
+        FROM (
+            SELECT
+                experiment_key,
+                variant,
+                COALESCE(SUM(exposures_total), 0)::int AS exposures_total,
+                COUNT(DISTINCT (child_id::text || ':' || day::text))
+                    FILTER (WHERE child_id <> 0)::int AS unique_exposures_per_day
+            FROM scoped_rows
+            GROUP BY experiment_key, variant
+        ) eb
+        LEFT JOIN (
+            SELECT
+                experiment_key,
+                variant,
+                COUNT(*)::int AS cohort_users,
+                COUNT(*) FILTER (WHERE retained_d1)::int AS retained_d1_users,
+                COUNT(*) FILTER (WHERE retained_d7)::int AS retained_d7_users,
+                COUNT(*) FILTER (WHERE retained_d30)::int AS retained_d30_users,
+                COALESCE(SUM(sessions_30d), 0)::float AS total_sessions_30d,
+                COUNT(*) FILTER (WHERE cta_clicked)::int AS cta_click_users,
+                COUNT(*) FILTER (WHERE session_started)::int AS session_started_users,
+                COUNT(*) FILTER (WHERE cta_started_within_24h)::int
+                    AS cta_session_started_converted_users,
+                COUNT(*) FILTER (WHERE cta_completed_within_24h)::int AS cta_session_converted_users
+            FROM user_stats
+            GROUP BY experiment_key, variant
+        ) us
+          USING (experiment_key, variant)
+        ORDER BY eb.experiment_key, eb.variant
+        """
+    )
+
+
+def rollups_support_filters(filters: AxionRetentionFilters) -> bool:
+    """Rollups mirror the deduped-per-day read and are keyed without action_type/nba_reason."""
+    if not filters.dedupe_exposure_per_day:
+        return False
+    return not (filters.action_type or "").strip() and not (filters.nba_reason or "").strip()
+
+
+def get_rollup_watermark(db: Session, *, rollup_name: str) -> date | None:
+    row = db.get(RollupWatermark, rollup_name)
+    if row is None:
+        return None
+    return row.watermark_day
+
+
+def set_rollup_watermark(db: Session, *, rollup_name: str, watermark_day: date) -> None:
+    stmt = pg_insert(RollupWatermark).values(
+        rollup_name=rollup_name,
+        watermark_day=watermark_day,
+        updated_at=datetime.now(UTC),
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RollupWatermark.rollup_name],
+            set_={
+                "watermark_day": stmt.excluded.watermark_day,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def resolve_refresh_window(
+    *,
+    watermark: date | None,
+    through_day: date,
+    backfill_days: int,
+    maturation_days: int = AXION_RETENTION_MATURATION_DAYS,
+) -> tuple[date, date] | None:
+    if watermark is None:
+        start_day = through_day - timedelta(days=max(1, int(backfill_days)) - 1)
+    else:
+        start_day = min(
+            watermark + timedelta(days=1),
+            through_day - timedelta(days=max(0, int(maturation_days) - 1)),
+        )
+    if start_day > through_day:
+        return None
+    return (start_day, through_day)
+
+
+def refresh_axion_retention_rollups(
+    db: Session,
+    *,
+    through_day: date | None = None,
+    backfill_days: int | None = None,
+) -> dict[str, int | str | None]:
+    """Re-materialize rollup days from the watermark through yesterday.
+
+    Days still inside the maturation window are re-materialized as well.
+    """
+    resolved_through = through_day or (datetime.now(UTC).date() - timedelta(days=1))
+    watermark = get_rollup_watermark(db, rollup_name=AXION_RETENTION_ROLLUP_NAME)
+    window = resolve_refresh_window(
+        watermark=watermark,
+        through_day=resolved_through,
+        backfill_days=int(
+            backfill_days
+            if backfill_days is not None
+            else settings.axion_retention_rollup_backfill_days
+        ),
+    )
+    if window is None:
+        return {"days": 0, "rows": 0, "watermark": watermark.isoformat() if watermark else None}
+
+    start_day, end_day = window
+    window_start = datetime.combine(start_day, time.min, tzinfo=UTC)
+    window_end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=UTC)
+    sessions_end = min(
+        window_end + timedelta(days=AXION_RETENTION_MATURATION_DAYS), datetime.now(UTC)
+    )
+    db.execute(
+        text(
+            "DELETE FROM axion_retention_daily_rollup WHERE day >= :start_day AND day <= :end_day"
+        ),
+        {"start_day": start_day, "end_day": end_day},
+    )
+    result = db.execute(
+        text(_REFRESH_SQL),
+        {
+            "window_start": window_start,
+            "window_end": window_end,
+            "sessions_end": max(window_end, sessions_end),
+            "tenant_id": None,
+        },
+    )
+    set_rollup_watermark(db, rollup_name=AXION_RETENTION_ROLLUP_NAME, watermark_day=end_day)
+    return {
+        "days": (end_day - start_day).days + 1,
+        "rows": int(getattr(result, "rowcount", 0) or 0),
+        "watermark": end_day.isoformat(),
+    }
+
+
+def _rollup_read_params(db: Session, filters: AxionRetentionFilters) -> dict[str, object] | None:
+    """Read window for the rollups, or None when the watermark does not reach `day_from` yet.
+
+    Days up to the watermark come from stored rows; later days are rebuilt from raw events in
+    the same statement, so with a current watermark (yesterday) only today's partial day is scanned.
+    """
+    now = datetime.now(UTC)
+    day_from = filters.date_from or (
+        now.date() - timedelta(days=max(1, int(filters.lookback_days)))
+    )
+    day_to = filters.date_to or now.date()
+    watermark = get_rollup_watermark(db, rollup_name=AXION_RETENTION_ROLLUP_NAME)
+    if watermark is None or watermark < day_from:
+        return None
+    rollup_to = min(day_to, watermark)
+    fresh_start = datetime.combine(rollup_to + timedelta(days=1), time.min, tzinfo=UTC)
+    fresh_end = (
+        datetime.combine(day_to + timedelta(days=1), time.min, tzinfo=UTC)
+        if day_to > rollup_to
+        else fresh_start
+    )
+    return {
+        "day_from": day_from,
+        "day_to": rollup_to,
+        "window_start": fresh_start,
+        "window_end": fresh_end,
+        "sessions_end": max(fresh_end, now),
+        "tenant_id": filters.tenant_id,
+        "context": (filters.context or "").strip() or None,
+        "persona": (filters.persona or "").strip() or None,
+        "destination": (filters.destination or "").strip() or None,
+    }
+
+
+def get_axion_retention_metrics_from_rollups(
+    db: Session,
+    *,
+    filters: AxionRetentionFilters,
+) -> dict[str, float | int]:
+    """Answer retention metrics from the rollup rows.
+
+    Days before the watermark fall back to the raw events.
+    """
+    params = _rollup_read_params(db, filters)
+    if params is None:
+        return build_retention_metrics(query_axion_retention_counts(db, filters=filters))
+    params["experiment_key"] = (filters.experiment_key or "").strip() or None
+    params["variant"] = (filters.variant or "").strip() or None
+    row = db.execute(text(_rollup_read_sql(grouped=False)), params).mappings().first()
+    return build_retention_metrics(retention_counts_rows([row])[0] if row is not None else None)
+
+
+def get_axion_retention_counts_by_variant_from_rollups(
+    db: Session,
+    *,
+    experiment_keys: list[str],
+    filters: AxionRetentionFilters,
+) -> list[Mapping[str, Any]]:
+    """Per-(experiment_key, variant) counts from the rollup rows.
+
+    Users are deduped the same way as in the raw read.
+    """
+    normalized_keys = normalize_experiment_keys(experiment_keys)
+    if not normalized_keys:
+        return []
+    params = _rollup_read_params(db, filters)
+    if params is None:
+        return query_axion_retention_counts_by_variant(
+            db, experiment_keys=normalized_keys, filters=filters
+        )
+    params["experiment_keys"] = normalized_keys
+    return retention_counts_rows(
+        db.execute(text(_rollup_read_sql(grouped=True)), params).mappings().all()
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -41,22 +42,28 @@ def filter_candidates_by_safety_tags(
     *,
     candidate_content_ids: list[int],
     child_age: int,
+    catalog_rows: Mapping[int, AxionContentCatalog] | None = None,
 ) -> list[int]:
     ids = [int(item) for item in candidate_content_ids if item is not None]
     if len(ids) == 0:
         return []
-    if not hasattr(db, "scalars"):
+    if catalog_rows is None and not hasattr(db, "scalars"):
         return ids
 
     allowed_tags = _parse_csv_tags(settings.axion_safety_allowed_tags_csv)
     blocked_for_age = _resolve_blocked_tags_for_age(int(child_age))
 
-    rows = db.scalars(
-        select(AxionContentCatalog).where(
-            AxionContentCatalog.content_id.in_(ids),
-            AxionContentCatalog.is_active.is_(True),
+    if catalog_rows is not None:
+        rows = [catalog_rows[content_id] for content_id in ids if content_id in catalog_rows]
+    else:
+        rows = list(
+            db.scalars(
+                select(AxionContentCatalog).where(
+                    AxionContentCatalog.content_id.in_(ids),
+                    AxionContentCatalog.is_active.is_(True),
+                )
+            ).all()
         )
-    ).all()
     if len(rows) == 0:
         return []
 
@@ -57,7 +57,7 @@ def _load_latest_shadow_reward(db: Session, *, tenant_id: int, experiment_key: s
             FROM event_log
             WHERE tenant_id = :tenant_id
               AND type = 'experiment_shadow_reward_computed'
-              AND COALESCE(payload->>'experiment_key', '') = :experiment_key
+              AND COALESCE(experiment_key, '') = :experiment_key
             ORDER BY created_at DESC
             LIMIT 1
             """
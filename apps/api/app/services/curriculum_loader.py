@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+logger = logging.getLogger("axiora.api.curriculum")
+
+DEFAULT_CURRICULUM_DIR = Path(__file__).resolve().parents[1] / "curriculum" / "subjects"
+DEFAULT_CURRICULUM_ARTIFACT_PATH = (
+    Path(__file__).resolve().parents[1] / "curriculum" / "compiled" / "curriculum.json"
+)
+CURRICULUM_ARTIFACT_FORMAT_VERSION = 1
+_YAML_FALLBACK_ENVS = {"development", "dev", "local", "test"}
+
 
 class CurriculumValidationError(ValueError):
     pass
@@ -31,12 +44,64 @@ class CurriculumLoader:
     _ALLOWED_AGE_GROUPS = {"6_8", "9_11", "12_14"}
     _ALLOWED_DIFFICULTIES = {"easy", "medium", "hard"}
 
-    def __init__(self, curriculum_dir: Path | None = None) -> None:
-        base_dir = curriculum_dir or Path(__file__).resolve().parents[1] / "curriculum" / "subjects"
+    def __init__(
+        self,
+        curriculum_dir: Path | None = None,
+        *,
+        subjects: dict[str, SubjectDefinition] | None = None,
+    ) -> None:
+        base_dir = curriculum_dir or DEFAULT_CURRICULUM_DIR
         self._curriculum_dir = base_dir
-        self._subjects = self._load_curriculum()
+        self._subjects = subjects if subjects is not None else self._load_curriculum()
         self._skills_index = self._build_skills_index(self._subjects)
 
+    @classmethod
+    def from_artifact(cls, artifact: dict[str, Any]) -> CurriculumLoader:
+        """Rebuild a loader from a compiled artifact without touching YAML."""
+        if artifact.get("format_version") != CURRICULUM_ARTIFACT_FORMAT_VERSION:
+            raise CurriculumValidationError("Unsupported curriculum artifact format")
+        subjects: dict[str, SubjectDefinition] = {}
+        for raw_subject in artifact.get("subjects", []):
+            subjects[raw_subject["subject"]] = SubjectDefinition(
+                subject=raw_subject["subject"],
+                age_groups=tuple(raw_subject["age_groups"]),
+                skills={
+                    raw_skill["name"]: SkillDefinition(
+                        subskills=tuple(raw_skill["subskills"]),
+                        lessons=tuple(raw_skill["lessons"]),
+                        difficulty_progression=tuple(raw_skill["difficulty_progression"]),
+                    )
+                    for raw_skill in raw_subject["skills"]
+                },
+                lesson_order=tuple(raw_subject["lesson_order"]),
+            )
+        if not subjects:
+            raise CurriculumValidationError("Curriculum artifact has no subjects")
+        return cls(subjects=subjects)
+
+    def to_artifact(self, *, content_hash: str) -> dict[str, Any]:
+        return {
+            "format_version": CURRICULUM_ARTIFACT_FORMAT_VERSION,
+            "content_hash": content_hash,
+            "subjects": [
+                {
+                    "subject": subject.subject,
+                    "age_groups": list(subject.age_groups),
+                    "skills": [
+                        {
+                            "name": skill_name,
+                            "subskills": list(skill.subskills),
+                            "lessons": list(skill.lessons),
+                            "difficulty_progression": list(skill.difficulty_progression),
+                        }
+                        for skill_name, skill in subject.skills.items()
+                    ],
+                    "lesson_order": list(subject.lesson_order),
+                }
+                for subject in self._subjects.values()
+            ],
+        }
+
     def get_subjects(self) -> list[str]:
         return list(self._subjects.keys())
 
@@ -201,3 +266,67 @@ class CurriculumLoader:
         for item in value:
             normalized.append(cls._require_string(item, path, field_name))
         return normalized
+
+
+def curriculum_content_hash(curriculum_dir: Path | None = None) -> str:
+    """SHA-256 over the YAML sources (names and bytes) in load order; no parsing."""
+    base_dir = curriculum_dir or DEFAULT_CURRICULUM_DIR
+    digest = hashlib.sha256()
+    for path in sorted(base_dir.glob("*.yaml")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def compile_curriculum_artifact(
+    curriculum_dir: Path | None = None,
+    artifact_path: Path | None = None,
+) -> dict[str, Any]:
+    """Validate the YAML curriculum and write the compiled JSON artifact."""
+    loader = CurriculumLoader(curriculum_dir)
+    artifact = loader.to_artifact(content_hash=curriculum_content_hash(curriculum_dir))
+    target = artifact_path or DEFAULT_CURRICULUM_ARTIFACT_PATH
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(
+        json.dumps(artifact, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8"
+    )
+    return artifact
+
+
+def _allows_yaml_fallback() -> bool:
+    from app.core.config import settings
+
+    return (settings.app_env or "development").strip().lower() in _YAML_FALLBACK_ENVS
+
+
+def load_curriculum_loader(
+    *,
+    artifact_path: Path | None = None,
+    curriculum_dir: Path | None = None,
+    allow_yaml_fallback: bool | None = None,
+) -> CurriculumLoader:
+    """Load the compiled artifact.
+
+    YAML is only parsed in development, when the artifact is missing or stale.
+    """
+    fallback = _allows_yaml_fallback() if allow_yaml_fallback is None else allow_yaml_fallback
+    target = artifact_path or DEFAULT_CURRICULUM_ARTIFACT_PATH
+    try:
+        artifact = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        if not fallback:
+            raise CurriculumValidationError(f"Curriculum artifact unavailable: {target}") from exc
+        logger.warning("curriculum_artifact_unavailable", extra={"path": str(target)})
+        return CurriculumLoader(curriculum_dir)
+
+    if fallback and artifact.get("content_hash") != curriculum_content_hash(curriculum_dir):
+        logger.warning("curriculum_artifact_stale", extra={"path": str(target)})
+        return CurriculumLoader(curriculum_dir)
+    return CurriculumLoader.from_artifact(artifact)
+
+
+@lru_cache(maxsize=1)
+def get_curriculum_loader() -> CurriculumLoader:
+    return load_curriculum_loader()
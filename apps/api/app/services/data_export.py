@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import base64
+import csv
+import gzip
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from io import StringIO
+from typing import Any, BinaryIO
+
+from pydantic import BaseModel
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import (
+    DailyMood,
+    LedgerTransaction,
+    Recommendation,
+    SavingGoal,
+    Streak,
+    Task,
+    TaskLog,
+    Wallet,
+)
+from app.schemas.export import (
+    ExportGoalOut,
+    ExportLedgerTransactionOut,
+    ExportMoodOut,
+    ExportRecommendationOut,
+    ExportStreakOut,
+    ExportTaskLogOut,
+    ExportTaskOut,
+)
+
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = (EXPORT_FORMAT_NDJSON, EXPORT_FORMAT_CSV)
+DEFAULT_YIELD_PER = 500
+
+
+class InvalidExportCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ExportCursor:
+    """Keyset position: the last emitted row of `section`, as JSON-safe key values."""
+
+    section: str
+    after: tuple[Any, ...]
+
+
+def encode_export_cursor(cursor: ExportCursor) -> str:
+    raw = json.dumps({"s": cursor.section, "a": list(cursor.after)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_export_cursor(token: str) -> ExportCursor:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        section = str(data["s"])
+        after = tuple(data["a"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidExportCursorError("Invalid export cursor") from exc
+    if section not in EXPORT_SECTIONS:
+        raise InvalidExportCursorError("Invalid export cursor")
+    try:
+        _SECTION_SPECS[section].parse_after(after)
+    except (ValueError, IndexError, TypeError) as exc:
+        raise InvalidExportCursorError("Invalid export cursor") from exc
+    return ExportCursor(section=section, after=after)
+
+
+@dataclass(frozen=True, slots=True)
+class _SectionSpec:
+    schema: type[BaseModel]
+    # Builds the ordered statement for the section; `after` holds parsed keyset values or None.
+    build: Callable[[int, int, tuple[Any, ...] | None], Select[Any] | None]
+    key: Callable[[Any], tuple[Any, ...]]
+    parse_after: Callable[[tuple[Any, ...]], tuple[Any, ...]]
+    to_record: Callable[[Any], BaseModel]
+
+
+def _parse_datetime(value: Any) -> datetime:
+    return datetime.fromisoformat(str(value))
+
+
+def _parse_date(value: Any) -> date:
+    return date.fromisoformat(str(value))
+
+
+def _tasks_stmt(tenant_id: int, _child_id: int, after: tuple[Any, ...] | None) -> Select[Any]:
+    stmt = select(Task).where(Task.tenant_id == tenant_id, Task.deleted_at.is_(None))
+    if after is not None:
+        stmt = stmt.where(Task.id > after[0])
+    return stmt.order_by(Task.id.asc())
+
+
+def _logs_stmt(tenant_id: int, child_id: int, after: tuple[Any, ...] | None) -> Select[Any]:
+    stmt = select(TaskLog).where(TaskLog.tenant_id == tenant_id, TaskLog.child_id == child_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(TaskLog.date, TaskLog.id) > tuple_(after[0], after[1]))
+    return stmt.order_by(TaskLog.date.asc(), TaskLog.id.asc())
+
+
+def _wallet_transactions_stmt(
+    tenant_id: int, child_id: int, after: tuple[Any, ...] | None
+) -> Select[Any]:
+    wallet_ids = select(Wallet.id).where(Wallet.tenant_id == tenant_id, Wallet.child_id == child_id)
+    stmt = select(LedgerTransaction).where(
+        LedgerTransaction.tenant_id == tenant_id,
+        LedgerTransaction.wallet_id.in_(wallet_ids.scalar_subquery()),
+    )
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(LedgerTransaction.created_at, LedgerTransaction.id) > tuple_(after[0], after[1])
+        )
+    return stmt.order_by(LedgerTransaction.created_at.asc(), LedgerTransaction.id.asc())
+
+
+def _streak_stmt(
+    _tenant_id: int, child_id: int, after: tuple[Any, ...] | None
+) -> Select[Any] | None:
+    if after is not None:
+        return None
+    return select(Streak).where(Streak.child_id == child_id)
+
+
+def _goals_stmt(tenant_id: int, child_id: int, after: tuple[Any, ...] | None) -> Select[Any]:
+    stmt = select(SavingGoal).where(
+        SavingGoal.tenant_id == tenant_id, SavingGoal.child_id == child_id
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(SavingGoal.created_at, SavingGoal.id) > tuple_(after[0], after[1]))
+    return stmt.order_by(SavingGoal.created_at.asc(), SavingGoal.id.asc())
+
+
+def _recommendations_stmt(
+    _tenant_id: int, child_id: int, after: tuple[Any, ...] | None
+) -> Select[Any]:
+    stmt = select(Recommendation).where(Recommendation.child_id == child_id)
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(Recommendation.created_at, Recommendation.id) > tuple_(after[0], after[1])
+        )
+    return stmt.order_by(Recommendation.created_at.asc(), Recommendation.id.asc())
+
+
+def _moods_stmt(_tenant_id: int, child_id: int, after: tuple[Any, ...] | None) -> Select[Any]:
+    stmt = select(DailyMood).where(DailyMood.child_id == child_id)
+    if after is not None:
+        stmt = stmt.where(DailyMood.date > after[0])
+    return stmt.order_by(DailyMood.date.asc())
+
+
+_SECTION_SPECS: dict[str, _SectionSpec] = {
+    "tasks": _SectionSpec(
+        schema=ExportTaskOut,
+        build=_tasks_stmt,
+        key=lambda item: (item.id,),
+        parse_after=lambda after: (int(after[0]),),
+        to_record=lambda item: ExportTaskOut(
+            id=item.id,
+            tenant_id=item.tenant_id,
+            title=item.title,
+            description=item.description,
+            difficulty=item.difficulty.value,
+            weight=item.weight,
+            is_active=item.is_active,
+        ),
+    ),
+    "logs": _SectionSpec(
+        schema=ExportTaskLogOut,
+        build=_logs_stmt,
+        key=lambda item: (item.date.isoformat(), item.id),
+        parse_after=lambda after: (_parse_date(after[0]), int(after[1])),
+        to_record=lambda item: ExportTaskLogOut(
+            id=item.id,
+            tenant_id=item.tenant_id,
+            child_id=item.child_id,
+            task_id=item.task_id,
+            date=item.date,
+            status=item.status.value,
+            created_at=item.created_at,
+            decided_at=item.decided_at,
+            decided_by_user_id=item.decided_by_user_id,
+            parent_comment=item.parent_comment,
+        ),
+    ),
+    "wallet_transactions": _SectionSpec(
+        schema=ExportLedgerTransactionOut,
+        build=_wallet_transactions_stmt,
+        key=lambda item: (item.created_at.isoformat(), item.id),
+        parse_after=lambda after: (_parse_datetime(after[0]), int(after[1])),
+        to_record=lambda item: ExportLedgerTransactionOut(
+            id=item.id,
+            tenant_id=item.tenant_id,
+            wallet_id=item.wallet_id,
+            type=item.type.value,
+            amount_cents=item.amount_cents,
+            metadata=item.metadata_json,
+            created_at=item.created_at,
+        ),
+    ),
+    "streak": _SectionSpec(
+        schema=ExportStreakOut,
+        build=_streak_stmt,
+        key=lambda item: (item.child_id,),
+        parse_after=lambda after: (int(after[0]),),
+        to_record=lambda item: ExportStreakOut(
+            child_id=item.child_id,
+            current=item.current,
+            last_date=item.last_date,
+            freeze_used_today=item.freeze_used_today,
+            freeze_tokens=item.freeze_tokens,
+        ),
+    ),
+    "goals": _SectionSpec(
+        schema=ExportGoalOut,
+        build=_goals_stmt,
+        key=lambda item: (item.created_at.isoformat(), item.id),
+        parse_after=lambda after: (_parse_datetime(after[0]), int(after[1])),
+        to_record=lambda item: ExportGoalOut(
+            id=item.id,
+            tenant_id=item.tenant_id,
+            child_id=item.child_id,
+            title=item.title,
+            target_cents=item.target_cents,
+            image_url=item.image_url,
+            is_locked=item.is_locked,
+            created_at=item.created_at,
+        ),
+    ),
+    "recommendations": _SectionSpec(
+        schema=ExportRecommendationOut,
+        build=_recommendations_stmt,
+        key=lambda item: (item.created_at.isoformat(), item.id),
+        parse_after=lambda after: (_parse_datetime(after[0]), int(after[1])),
+        to_record=lambda item: ExportRecommendationOut(
+            id=item.id,
+            child_id=item.child_id,
+            type=item.type,
+            title=item.title,
+            body=item.body,
+            severity=item.severity,
+            created_at=item.created_at,
+            dismissed_at=item.dismissed_at,
+        ),
+    ),
+    "mood_history": _SectionSpec(
+        schema=ExportMoodOut,
+        build=_moods_stmt,
+        key=lambda item: (item.date.isoformat(),),
+        parse_after=lambda after: (_parse_date(after[0]),),
+        to_record=lambda item: ExportMoodOut(
+            child_id=item.child_id,
+            date=item.date,
+            mood=item.mood.value,
+        ),
+    ),
+}
+
+EXPORT_SECTIONS: tuple[str, ...] = tuple(_SECTION_SPECS)
+
+
+def export_section_fields(section: str) -> list[str]:
+    return list(_SECTION_SPECS[section].schema.model_fields)
+
+
+def count_export_rows(db: Session, *, tenant_id: int, child_id: int) -> int:
+    """Upper bound of rows a full export would stream, used to route big exports to the worker."""
+    total = 0
+    for spec in _SECTION_SPECS.values():
+        stmt = spec.build(tenant_id, child_id, None)
+        if stmt is None:
+            continue
+        total += int(
+            db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+        )
+    return total
+
+
+def iter_export_records(
+    db: Session,
+    *,
+    tenant_id: int,
+    child_id: int,
+    sections: Iterable[str] | None = None,
+    cursor: ExportCursor | None = None,
+    yield_per: int = DEFAULT_YIELD_PER,
+) -> Iterator[tuple[str, dict[str, Any], ExportCursor]]:
+    """Yield (section, record, cursor) one row at a time over server-side cursors.
+
+    `cursor` resumes strictly after the given row; earlier sections are skipped.
+    """
+    selected = [item for item in EXPORT_SECTIONS if sections is None or item in set(sections)]
+    resume_index = (
+        selected.index(cursor.section)
+        if cursor is not None and cursor.section in selected
+        else None
+    )
+    for index, section in enumerate(selected):
+        if resume_index is not None and index < resume_index:
+            continue
+        spec = _SECTION_SPECS[section]
+        after: tuple[Any, ...] | None = None
+        if cursor is not None and index == resume_index:
+            try:
+                after = spec.parse_after(cursor.after)
+            except (ValueError, IndexError, TypeError) as exc:
+                raise InvalidExportCursorError("Invalid export cursor") from exc
+        stmt = spec.build(tenant_id, child_id, after)
+        if stmt is None:
+            continue
+        rows = db.execute(stmt.execution_options(yield_per=max(1, int(yield_per)))).scalars()
+        for item in rows:
+            record = spec.to_record(item).model_dump(mode="json")
+            yield section, record, ExportCursor(section=section, after=spec.key(item))
+
+
+def iter_ndjson_chunks(
+    records: Iterable[tuple[str, dict[str, Any], ExportCursor]],
+    *,
+    chunk_rows: int = DEFAULT_YIELD_PER,
+) -> Iterator[str]:
+    """Group NDJSON lines into chunks; each line carries the cursor to resume after it."""
+    buffer: list[str] = []
+    for section, record, cursor in records:
+        buffer.append(
+            json.dumps(
+                {"section": section, "cursor": encode_export_cursor(cursor), "data": record},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        )
+        if len(buffer) >= chunk_rows:
+            yield "\n".join(buffer) + "\n"
+            buffer.clear()
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
+
+
+def iter_csv_chunks(
+    records: Iterable[tuple[str, dict[str, Any], ExportCursor]],
+    *,
+    section: str,
+    chunk_rows: int = DEFAULT_YIELD_PER,
+) -> Iterator[str]:
+    """CSV for a single section; the trailing `cursor` column resumes after that row."""
+    fields = export_section_fields(section)
+    out = StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow([*fields, "cursor"])
+    pending = 1
+    for _section, record, cursor in records:
+        writer.writerow(
+            [*(_csv_value(record.get(field)) for field in fields), encode_export_cursor(cursor)]
+        )
+        pending += 1
+        if pending >= chunk_rows:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate(0)
+            pending = 0
+    if pending:
+        yield out.getvalue()
+
+
+def write_gzip_export(chunks: Iterable[str], *, handle: BinaryIO) -> int:
+    """Gzip text chunks into a binary file object and return the compressed size in bytes."""
+    start = handle.tell()
+    with gzip.GzipFile(fileobj=handle, mode="wb", compresslevel=6) as compressed:
+        for chunk in chunks:
+            compressed.write(chunk.encode("utf-8"))
+    return int(handle.tell() - start)
@@ -12,7 +12,6 @@ from app.models import (
     ChildAchievement,
     ChildProfile,
     EventLog,
-    LedgerTransaction,
     Recommendation,
     SavingGoal,
     Streak,
@@ -20,7 +19,7 @@ from app.models import (
     TaskLogStatus,
     Wallet,
 )
-from app.services.wallet import extract_pot_split, signed_amount_cents
+from app.services.wallet_balances import get_wallet_balance
 
 
 class EventService:
@@ -34,6 +33,8 @@ class EventService:
         actor_user_id: int | None = None,
         child_id: int | None = None,
         payload: dict[str, Any] | None = None,
+        experiment_key: str | None = None,
+        variant: str | None = None,
     ) -> EventLog:
         event = EventLog(
             tenant_id=tenant_id,
@@ -41,6 +42,8 @@ class EventService:
             child_id=child_id,
             type=type,
             payload=payload or {},
+            experiment_key=experiment_key,
+            variant=variant,
         )
         self.db.add(event)
         self.db.flush()
@@ -51,6 +54,55 @@ class EventService:
         self.achievement_handler(event)
         return event
 
+    def emit_many(self, items: list[dict[str, Any]]) -> list[EventLog]:
+        """Emit several events with one flush; child-level handlers run once per child.
+
+        Each item takes the keyword arguments of `emit`. Streaks are still advanced per
+        event, in order, but adaptive rules and achievements only see the final state.
+        """
+        if not items:
+            return []
+        events = [
+            EventLog(
+                tenant_id=item["tenant_id"],
+                actor_user_id=item.get("actor_user_id"),
+                child_id=item.get("child_id"),
+                type=item["type"],
+                payload=item.get("payload") or {},
+            )
+            for item in items
+        ]
+        self.db.add_all(events)
+        self.db.flush()
+
+        child_ids = {event.child_id for event in events if event.child_id is not None}
+        streak_child_ids = {
+            streak.child_id
+            for streak in self.db.scalars(
+                select(Streak).where(Streak.child_id.in_(sorted(child_ids)))
+            ).all()
+        }
+        for event in events:
+            self._emit_audit_from_event(event)
+            self.streak_handler(event)
+            if (
+                event.child_id is not None
+                and event.child_id not in streak_child_ids
+                and event.type == "routine.marked"
+            ):
+                # A newly added streak row must be flushed before the next get() for the same child.
+                self.db.flush()
+                streak_child_ids.add(event.child_id)
+
+        handled: set[tuple[int, int]] = set()
+        for event in events:
+            if event.child_id is None or (event.tenant_id, event.child_id) in handled:
+                continue
+            handled.add((event.tenant_id, event.child_id))
+            self.adaptive_rules_handler(event)
+            self.achievement_handler(event)
+        return events
+
     def _persist_audit(
         self,
         *,
@@ -312,24 +364,7 @@ class EventService:
         if wallet is None:
             return False
 
-        transactions = self.db.scalars(
-            select(LedgerTransaction)
-            .where(
-                LedgerTransaction.tenant_id == tenant_id,
-                LedgerTransaction.wallet_id == wallet.id,
-            )
-            .order_by(LedgerTransaction.created_at.asc(), LedgerTransaction.id.asc()),
-        ).all()
-
-        saved_total = 0
-        for tx in transactions:
-            signed = signed_amount_cents(tx.type, tx.amount_cents)
-            split = extract_pot_split(tx.metadata_json)
-            save_amount = split.get("SAVE", 0)
-            if save_amount == 0:
-                continue
-            saved_total += save_amount if signed >= 0 else -save_amount
-
+        saved_total = get_wallet_balance(self.db, wallet_id=wallet.id).pot_balances_cents["SAVE"]
         return saved_total >= first_goal.target_cents
 
     def _create_recommendation_if_missing(
@@ -7,6 +7,7 @@ from typing import Literal
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy import Date, and_, desc, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models import ChildProfile, GameLeagueProfile, GameLeagueRewardClaim, GameSession
@@ -274,6 +275,201 @@ def _build_group_standings(
     return standings, int(group_id.split("g")[-1])
 
 
+def _previous_cycle_window(
+    current_week_start_date: date,
+    timezone_name: str | None,
+) -> tuple[date, date, datetime, datetime]:
+    previous_week_start_date = current_week_start_date - timedelta(days=7)
+    previous_week_end_date = previous_week_start_date + timedelta(days=6)
+    previous_start_at, previous_end_exclusive, _, _ = _week_window(
+        timezone_name,
+        now_utc=datetime.combine(previous_week_end_date, datetime.min.time(), tzinfo=UTC) + timedelta(hours=12),
+    )
+    return (
+        previous_week_start_date,
+        previous_week_end_date,
+        previous_start_at,
+        previous_end_exclusive,
+    )
+
+
+def run_league_week_rollover(
+    db: Session,
+    *,
+    tenant_id: int | None = None,
+    child_id: int | None = None,
+    timezone_name: str | None = None,
+    now_utc: datetime | None = None,
+) -> dict[str, int]:
+    """Close the previous league week for every pending profile in one pass.
+
+    With `child_id`, standings are still computed from the child's whole group, but only that
+    child's claim and profile are written; the lazy request path uses this.
+
+    Standings are computed once per (tenant, tier) group from a single grouped scoreboard
+    query, then tier transitions and reward claims are written in bulk. Groups are formed
+    from the tier each profile held during the closed week, so the result does not depend
+    on which members rolled over first.
+    """
+    _, _, current_week_start_date, _ = _week_window(timezone_name, now_utc=now_utc)
+    (
+        previous_week_start_date,
+        previous_week_end_date,
+        previous_start_at,
+        previous_end_exclusive,
+    ) = _previous_cycle_window(current_week_start_date, timezone_name)
+
+    pending_filter = and_(
+        GameLeagueProfile.last_cycle_applied_week_start.is_not(None),
+        GameLeagueProfile.last_cycle_applied_week_start < current_week_start_date,
+    )
+    tenant_stmt = select(GameLeagueProfile.tenant_id).where(pending_filter).distinct()
+    if tenant_id is not None:
+        tenant_stmt = tenant_stmt.where(GameLeagueProfile.tenant_id == tenant_id)
+    tenant_ids = [int(item) for item in db.scalars(tenant_stmt).all()]
+    if not tenant_ids:
+        return {"tenants": 0, "groups": 0, "profiles_rolled": 0, "claims_created": 0}
+
+    # Profiles that joined after the closed week never played in it.
+    profiles = db.scalars(
+        select(GameLeagueProfile).where(
+            GameLeagueProfile.tenant_id.in_(tenant_ids),
+            GameLeagueProfile.created_at < previous_end_exclusive,
+        )
+    ).all()
+    existing_claims = {
+        int(claim.child_id): claim
+        for claim in db.scalars(
+            select(GameLeagueRewardClaim).where(
+                GameLeagueRewardClaim.tenant_id.in_(tenant_ids),
+                GameLeagueRewardClaim.cycle_week_start == previous_week_start_date,
+            )
+        ).all()
+    }
+    scoreboard = {
+        (int(row.tenant_id), int(row.child_id)): (int(row.score_week or 0), row.last_played_at)
+        for row in db.execute(
+            select(
+                GameSession.tenant_id,
+                GameSession.child_id,
+                func.coalesce(func.sum(GameSession.xp_earned), 0).label("score_week"),
+                func.max(GameSession.created_at).label("last_played_at"),
+            )
+            .where(
+                GameSession.tenant_id.in_(tenant_ids),
+                GameSession.child_id.is_not(None),
+                GameSession.completed.is_(True),
+                GameSession.created_at >= previous_start_at,
+                GameSession.created_at < previous_end_exclusive,
+            )
+            .group_by(GameSession.tenant_id, GameSession.child_id)
+        ).all()
+    }
+
+    members_by_group: dict[tuple[int, LeagueTier], list[int]] = {}
+    pending_profiles: dict[int, GameLeagueProfile] = {}
+    for profile in profiles:
+        child_key = int(profile.child_id)
+        last_applied = profile.last_cycle_applied_week_start
+        if last_applied is not None and last_applied < current_week_start_date:
+            if child_id is None or child_key == child_id:
+                pending_profiles[child_key] = profile
+            tier_in_cycle = _normalize_tier(profile.current_tier)
+        else:
+            applied_claim = existing_claims.get(child_key)
+            tier_in_cycle = _normalize_tier(
+                applied_claim.tier_from if applied_claim is not None else profile.current_tier
+            )
+        members_by_group.setdefault((int(profile.tenant_id), tier_in_cycle), []).append(child_key)
+
+    outcomes: dict[int, tuple[LeagueTier, int | None, int]] = {}
+    groups = 0
+    for (group_tenant_id, tier), child_ids in members_by_group.items():
+        ordered_ids = sorted(child_ids)
+        for offset in range(0, len(ordered_ids), LEAGUE_GROUP_SIZE):
+            group_slice = ordered_ids[offset : offset + LEAGUE_GROUP_SIZE]
+            groups += 1
+            standings = sorted(
+                (
+                    (cid, *scoreboard.get((group_tenant_id, cid), (0, None)))
+                    for cid in group_slice
+                ),
+                key=lambda item: (-item[1], -(item[2].timestamp() if item[2] else 0), item[0]),
+            )
+            for position, (cid, _score, _last_played_at) in enumerate(standings, start=1):
+                outcomes[cid] = (tier, position, len(standings))
+
+    claim_rows: list[dict[str, object]] = []
+    claimed_ids: list[int] = []
+    for child_key, profile in pending_profiles.items():
+        existing_claim = existing_claims.get(child_key)
+        if existing_claim is not None:
+            profile.current_tier = _normalize_tier(existing_claim.tier_to)
+            profile.last_cycle_applied_week_start = current_week_start_date
+            continue
+        tier_before, claim_position, group_size = outcomes.get(
+            child_key,
+            (_normalize_tier(profile.current_tier), None, 0),
+        )
+        status, _, _ = _classify_position(
+            tier=tier_before, group_size=group_size, position=claim_position
+        )
+        status_for_reward: LeagueResultStatus = status or "safe"
+        tier_after = _next_tier(tier_before, status)
+        reward_xp, reward_coins = _reward_for_status(status_for_reward)
+        claim_rows.append(
+            {
+                "tenant_id": int(profile.tenant_id),
+                "child_id": child_key,
+                "user_id": int(profile.user_id),
+                "cycle_week_start": previous_week_start_date,
+                "cycle_week_end": previous_week_end_date,
+                "tier_from": tier_before,
+                "tier_to": tier_after,
+                "result_status": status_for_reward,
+                "position": claim_position or group_size,
+                "group_size": max(group_size, 1),
+                "reward_xp": reward_xp,
+                "reward_coins": reward_coins,
+            }
+        )
+        claimed_ids.append(child_key)
+        profile.current_tier = tier_after
+        profile.last_cycle_applied_week_start = current_week_start_date
+
+    claims_created = 0
+    if claim_rows:
+        inserted_ids = {
+            int(row.child_id)
+            for row in db.execute(
+                pg_insert(GameLeagueRewardClaim)
+                .values(claim_rows)
+                .on_conflict_do_nothing(constraint="uq_game_league_reward_claims_child_cycle")
+                .returning(GameLeagueRewardClaim.child_id)
+            ).all()
+        }
+        claims_created = len(inserted_ids)
+        # A concurrent rollover stored its claim first: the profile follows the stored claim.
+        conflicted_ids = [cid for cid in claimed_ids if cid not in inserted_ids]
+        if conflicted_ids:
+            for stored_claim in db.scalars(
+                select(GameLeagueRewardClaim).where(
+                    GameLeagueRewardClaim.tenant_id.in_(tenant_ids),
+                    GameLeagueRewardClaim.child_id.in_(conflicted_ids),
+                    GameLeagueRewardClaim.cycle_week_start == previous_week_start_date,
+                )
+            ).all():
+                stored_tier = _normalize_tier(stored_claim.tier_to)
+                pending_profiles[int(stored_claim.child_id)].current_tier = stored_tier
+    db.flush()
+    return {
+        "tenants": len(tenant_ids),
+        "groups": groups,
+        "profiles_rolled": len(pending_profiles),
+        "claims_created": claims_created,
+    }
+
+
 def _apply_week_rollover(
     db: Session,
     *,
@@ -292,57 +488,28 @@ def _apply_week_rollover(
         return
 
     previous_week_start_date = current_week_start_date - timedelta(days=7)
-    previous_week_end_date = previous_week_start_date + timedelta(days=6)
-    previous_start_at, previous_end_exclusive, _, _ = _week_window(
-        timezone_name,
-        now_utc=datetime.combine(previous_week_end_date, datetime.min.time(), tzinfo=UTC) + timedelta(hours=12),
-    )
-    tier_before = _normalize_tier(profile.current_tier)
-    standings, _ = _build_group_standings(
-        db,
-        tenant_id=tenant_id,
-        tier=tier_before,
-        child_id=child_id,
-        week_start_at=previous_start_at,
-        week_end_exclusive=previous_end_exclusive,
-        week_start_date=previous_week_start_date,
-    )
-    position: int | None = None
-    for index, row in enumerate(standings, start=1):
-        if int(row[0]) == child_id:
-            position = index
-            break
-    group_size = len(standings)
-    status, _, _ = _classify_position(tier=tier_before, group_size=group_size, position=position)
-    status_for_reward: LeagueResultStatus = status or "safe"
-    tier_after = _next_tier(tier_before, status)
-    reward_xp, reward_coins = _reward_for_status(status_for_reward)
-
-    existing_reward = db.scalar(
+    claim = db.scalar(
         select(GameLeagueRewardClaim).where(
             GameLeagueRewardClaim.child_id == child_id,
             GameLeagueRewardClaim.cycle_week_start == previous_week_start_date,
         )
     )
-    if existing_reward is None:
-        db.add(
-            GameLeagueRewardClaim(
-                tenant_id=tenant_id,
-                child_id=child_id,
-                user_id=user_id,
-                cycle_week_start=previous_week_start_date,
-                cycle_week_end=previous_week_end_date,
-                tier_from=tier_before,
-                tier_to=tier_after,
-                result_status=status_for_reward,
-                position=position or group_size,
-                group_size=max(group_size, 1),
-                reward_xp=reward_xp,
-                reward_coins=reward_coins,
+    if claim is None:
+        # The scheduled rollover has not reached this tenant yet: close the week for this child
+        # only, ranked within its group; the other members are left to the scheduled job.
+        run_league_week_rollover(
+            db, tenant_id=tenant_id, child_id=child_id, timezone_name=timezone_name
+        )
+        if profile.last_cycle_applied_week_start == current_week_start_date:
+            return
+        claim = db.scalar(
+            select(GameLeagueRewardClaim).where(
+                GameLeagueRewardClaim.child_id == child_id,
+                GameLeagueRewardClaim.cycle_week_start == previous_week_start_date,
             )
         )
-
-    profile.current_tier = tier_after
+    if claim is not None:
+        profile.current_tier = _normalize_tier(claim.tier_to)
     profile.last_cycle_applied_week_start = current_week_start_date
     db.flush()
 
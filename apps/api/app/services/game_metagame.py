@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import UTC, date, datetime, timedelta
+from datetime import UTC, date, datetime, time, timedelta
 from typing import Literal
 
-from sqlalchemy import Date, desc, func, select
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.models import GameMetagameMissionClaim, GamePersonalBest, GameSession
+from app.models import GameChildDailyStats, GameMetagameMissionClaim, GamePersonalBest, GameSession
 from app.services.game_economy import EconomyReward, award_economy_event, get_economy_reward
 
 MissionScope = Literal["daily", "weekly"]
@@ -269,110 +270,106 @@ def _build_motivation(stats: GameMetagameStats, daily_mission: GameMetagameMissi
     return "Continue jogando para fortalecer seu progresso semanal."
 
 
-def build_games_metagame_summary(
+def _utc_day_start(target_date: date) -> datetime:
+    return datetime.combine(target_date, time.min, tzinfo=UTC)
+
+
+def record_child_daily_stats(
     db: Session,
     *,
     child_id: int,
-) -> GameMetagameSummary:
-    today = date.today()
-    week_start, week_end = _week_bounds(today)
-
-    session_filter = [GameSession.child_id == child_id, GameSession.completed.is_(True)]
-    total_sessions = int(db.scalar(select(func.count()).select_from(GameSession).where(*session_filter)) or 0)
-    daily_sessions = int(
-        db.scalar(
-            select(func.count())
-            .select_from(GameSession)
-            .where(*session_filter, func.cast(GameSession.created_at, Date) == today)
-        )
-        or 0
-    )
-    weekly_sessions = int(
-        db.scalar(
-            select(func.count())
-            .select_from(GameSession)
-            .where(
-                *session_filter,
-                func.cast(GameSession.created_at, Date) >= week_start,
-                func.cast(GameSession.created_at, Date) <= week_end,
-            )
-        )
-        or 0
-    )
-    xp_today = int(
-        db.scalar(
-            select(func.coalesce(func.sum(GameSession.xp_earned), 0))
-            .where(*session_filter, func.cast(GameSession.created_at, Date) == today)
-        )
-        or 0
+    tenant_id: int | None,
+    xp_earned: int,
+    played_at: datetime | None = None,
+) -> None:
+    """Add one completed session to the child's UTC day row (upsert, same transaction)."""
+    stat_date = (played_at or datetime.now(UTC)).astimezone(UTC).date()
+    stmt = pg_insert(GameChildDailyStats).values(
+        tenant_id=tenant_id,
+        child_id=child_id,
+        stat_date=stat_date,
+        sessions_completed=1,
+        xp_earned=max(0, int(xp_earned)),
     )
-    xp_week = int(
-        db.scalar(
-            select(func.coalesce(func.sum(GameSession.xp_earned), 0))
-            .where(
-                *session_filter,
-                func.cast(GameSession.created_at, Date) >= week_start,
-                func.cast(GameSession.created_at, Date) <= week_end,
-            )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[GameChildDailyStats.child_id, GameChildDailyStats.stat_date],
+            set_={
+                "sessions_completed": GameChildDailyStats.sessions_completed
+                + stmt.excluded.sessions_completed,
+                "xp_earned": GameChildDailyStats.xp_earned + stmt.excluded.xp_earned,
+                "updated_at": func.now(),
+            },
         )
-        or 0
     )
 
-    records_filter = [GamePersonalBest.child_id == child_id]
-    records_total = int(db.scalar(select(func.count()).select_from(GamePersonalBest).where(*records_filter)) or 0)
-    records_today = int(
-        db.scalar(
-            select(func.count())
-            .select_from(GamePersonalBest)
-            .where(
-                *records_filter,
-                GamePersonalBest.last_surpassed_at.is_not(None),
-                func.cast(GamePersonalBest.last_surpassed_at, Date) == today,
-            )
-        )
-        or 0
-    )
-    records_week = int(
-        db.scalar(
-            select(func.count())
-            .select_from(GamePersonalBest)
-            .where(
-                *records_filter,
-                GamePersonalBest.last_surpassed_at.is_not(None),
-                func.cast(GamePersonalBest.last_surpassed_at, Date) >= week_start,
-                func.cast(GamePersonalBest.last_surpassed_at, Date) <= week_end,
-            )
-        )
-        or 0
-    )
 
-    favorite_row = db.execute(
+def build_games_metagame_summary(
+    db: Session,
+    *,
+    child_id: int,
+) -> GameMetagameSummary:
+    today = datetime.now(UTC).date()
+    week_start, week_end = _week_bounds(today)
+    # Half-open UTC ranges keep the timestamp predicates sargable (no cast on the column).
+    day_start_at = _utc_day_start(today)
+    day_end_at = _utc_day_start(today + timedelta(days=1))
+    week_start_at = _utc_day_start(week_start)
+    week_end_at = _utc_day_start(week_end + timedelta(days=1))
+
+    daily_rows = db.execute(
+        select(
+            GameChildDailyStats.stat_date,
+            GameChildDailyStats.sessions_completed,
+            GameChildDailyStats.xp_earned,
+        )
+        .where(GameChildDailyStats.child_id == child_id)
+        .order_by(GameChildDailyStats.stat_date.asc())
+    ).all()
+    total_sessions = daily_sessions = weekly_sessions = xp_today = xp_week = 0
+    activity_days: list[date] = []
+    for stat_date, sessions, xp in daily_rows:
+        sessions = int(sessions or 0)
+        xp = int(xp or 0)
+        total_sessions += sessions
+        if sessions > 0:
+            activity_days.append(stat_date)
+        if week_start <= stat_date <= week_end:
+            weekly_sessions += sessions
+            xp_week += xp
+        if stat_date == today:
+            daily_sessions = sessions
+            xp_today = xp
+
+    surpassed_at = GamePersonalBest.last_surpassed_at
+    records_row = db.execute(
+        select(
+            func.count(),
+            func.count().filter(surpassed_at >= day_start_at, surpassed_at < day_end_at),
+            func.count().filter(surpassed_at >= week_start_at, surpassed_at < week_end_at),
+        ).where(GamePersonalBest.child_id == child_id)
+    ).one()
+    records_total, records_today, records_week = (int(value or 0) for value in records_row)
+
+    # Per-game plays in one grouped scan of (child_id, completed, ...) gives both favorite and
+    # distinct count.
+    game_rows = db.execute(
         select(
             GameSession.game_id,
             func.count(GameSession.id).label("plays"),
             func.max(GameSession.created_at).label("last_played"),
         )
-        .where(*session_filter, GameSession.game_id.is_not(None))
+        .where(
+            GameSession.child_id == child_id,
+            GameSession.completed.is_(True),
+            GameSession.game_id.is_not(None),
+        )
         .group_by(GameSession.game_id)
         .order_by(desc("plays"), desc("last_played"))
-        .limit(1)
-    ).first()
-    favorite_game_id = str(favorite_row[0]) if favorite_row and favorite_row[0] is not None else None
-
-    distinct_games_played = int(
-        db.scalar(
-            select(func.count(func.distinct(GameSession.game_id)))
-            .where(*session_filter, GameSession.game_id.is_not(None))
-        )
-        or 0
-    )
-
-    activity_days = db.scalars(
-        select(func.cast(GameSession.created_at, Date))
-        .where(*session_filter)
-        .group_by(func.cast(GameSession.created_at, Date))
-        .order_by(func.cast(GameSession.created_at, Date).asc())
     ).all()
+    favorite_game_id = str(game_rows[0][0]) if game_rows else None
+    distinct_games_played = len(game_rows)
+
     current_streak, best_streak = _compute_streaks(activity_days, today=today)
 
     stats = GameMetagameStats(
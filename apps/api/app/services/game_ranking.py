@@ -1,15 +1,38 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
+import logging
 import os
 from typing import Literal
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import Float, and_, asc, cast, desc, func, or_, select
-from sqlalchemy.orm import Session
-
-from app.models import ChildProfile, GamePersonalBest, GameSession
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import (
+    Date,
+    Float,
+    and_,
+    asc,
+    cast,
+    delete,
+    desc,
+    event,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql.selectable import Subquery
+
+from app.core.config import settings
+from app.models import ChildProfile, GamePersonalBest, GameSession, GameWeeklyLeaderboard
+
+logger = logging.getLogger(__name__)
 
 RankingDirection = Literal["asc", "desc"]
 
@@ -136,13 +159,43 @@ def _metric_expression(base_subquery, metric: RankingMetric):
     return cast(func.coalesce(base_subquery.c.best_score, 0), Float)
 
 
+def _week_start_for(played_at: datetime, timezone_name: str | None = None) -> date:
+    local = played_at.astimezone(_resolve_timezone(timezone_name))
+    return local.date() - timedelta(days=local.weekday())
+
+
+def _uses_leaderboard_week(timezone_name: str | None) -> bool:
+    # Leaderboards are bucketed by the default ranking timezone; other timezones re-aggregate.
+    return _resolve_timezone(timezone_name).key == _resolve_timezone(None).key
+
+
+def _ranking_rows_from_aggregate(
+    aggregated: Subquery, *, tenant_id: int, metric: RankingMetric
+) -> Subquery:
+    metric_expr = _metric_expression(aggregated, metric)
+    return (
+        select(
+            aggregated.c.child_id,
+            ChildProfile.display_name,
+            ChildProfile.avatar_key,
+            metric_expr.label("metric_score"),
+            aggregated.c.last_played_at,
+        )
+        .join(ChildProfile, ChildProfile.id == aggregated.c.child_id)
+        .where(
+            ChildProfile.tenant_id == tenant_id,
+            ChildProfile.deleted_at.is_(None),
+        )
+    ).subquery("weekly_game_ranking_rows")
+
+
 def _ranking_rows(
     *,
     tenant_id: int,
     game_id: str,
     week_start_at: datetime,
     week_end_exclusive: datetime,
-):
+) -> tuple[Subquery, RankingMetric]:
     normalized_game_id = normalize_game_id(game_id)
     aggregated = (
         select(
@@ -164,40 +217,407 @@ def _ranking_rows(
     ).subquery("weekly_game_scores")
 
     metric = metric_for_game(normalized_game_id)
-    metric_expr = _metric_expression(aggregated, metric)
-    ranking_rows = (
+    return _ranking_rows_from_aggregate(aggregated, tenant_id=tenant_id, metric=metric), metric
+
+
+def _leaderboard_ranking_rows(
+    *, tenant_id: int, game_id: str, week_start: date
+) -> tuple[Subquery, RankingMetric]:
+    normalized_game_id = normalize_game_id(game_id)
+    aggregated = (
         select(
-            aggregated.c.child_id,
-            ChildProfile.display_name,
-            ChildProfile.avatar_key,
-            metric_expr.label("metric_score"),
-            aggregated.c.last_played_at,
+            GameWeeklyLeaderboard.child_id.label("child_id"),
+            GameWeeklyLeaderboard.best_score.label("best_score"),
+            GameWeeklyLeaderboard.best_duration_seconds.label("best_duration"),
+            GameWeeklyLeaderboard.best_streak.label("best_streak"),
+            GameWeeklyLeaderboard.last_played_at.label("last_played_at"),
+        ).where(
+            GameWeeklyLeaderboard.tenant_id == tenant_id,
+            GameWeeklyLeaderboard.game_id == normalized_game_id,
+            GameWeeklyLeaderboard.week_start == week_start,
         )
-        .join(ChildProfile, ChildProfile.id == aggregated.c.child_id)
-        .where(
-            ChildProfile.tenant_id == tenant_id,
-            ChildProfile.deleted_at.is_(None),
+    ).subquery("weekly_game_scores")
+
+    metric = metric_for_game(normalized_game_id)
+    return _ranking_rows_from_aggregate(aggregated, tenant_id=tenant_id, metric=metric), metric
+
+
+def _metric_value(
+    metric: RankingMetric,
+    *,
+    best_score: int | None,
+    best_duration: int | None,
+    best_streak: int | None,
+) -> float:
+    """Python mirror of `_metric_expression`, used for the sorted-set scores."""
+    if metric.key == "best_duration":
+        return float(best_duration if best_duration is not None else 999999999)
+    if metric.key == "best_streak":
+        return float(best_streak or 0)
+    return float(best_score or 0)
+
+
+# Sorted sets order by score, then member bytes. Scores carry the metric (negated for
+# "desc" games) and members encode the tie-breaks: most recent play first, then child_id.
+_LEADERBOARD_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_LEADERBOARD_RECENCY_MAX = 10**16 - 1
+
+# Replaces the child's previous member; stale writes (older last_played_at) are ignored.
+_LEADERBOARD_UPSERT_LUA = """
+local old = redis.call('HGET', KEYS[2], ARGV[1])
+if old and old < ARGV[3] then
+    return 0
+end
+if old then
+    redis.call('ZREM', KEYS[1], old)
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+# Drops a child's member from a week's sorted set (and its member index).
+_LEADERBOARD_REMOVE_LUA = """
+local old = redis.call('HGET', KEYS[2], ARGV[1])
+if not old then
+    return 0
+end
+redis.call('ZREM', KEYS[1], old)
+redis.call('HDEL', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Bulk form of the upsert for cold keys: ARGV[1] is the TTL, then (child_id, score, member)
+# triples. Never deletes, so members written concurrently after commit survive hydration.
+_LEADERBOARD_HYDRATE_LUA = """
+for i = 2, #ARGV, 3 do
+    local old = redis.call('HGET', KEYS[2], ARGV[i])
+    if not (old and old < ARGV[i + 2]) then
+        if old then
+            redis.call('ZREM', KEYS[1], old)
+        end
+        redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i + 2])
+        redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 2])
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+_PENDING_LEADERBOARD_WRITES_KEY = "games_leaderboard_pending_writes"
+
+
+def _after_commit(db: Session, write: Callable[[], None]) -> None:
+    """Run `write` once the session's current transaction commits.
+
+    The write is dropped if that transaction rolls back.
+    """
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        write()
+        return
+    transaction = db.get_nested_transaction() or db.get_transaction()
+    info.setdefault(_PENDING_LEADERBOARD_WRITES_KEY, []).append((transaction, write))
+
+
+def _within(transaction: SessionTransaction | None, ancestor: SessionTransaction) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending_leaderboard_writes(session: Session) -> None:
+    for _transaction, write in session.info.pop(_PENDING_LEADERBOARD_WRITES_KEY, []):
+        write()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back_leaderboard_writes(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    pending = session.info.get(_PENDING_LEADERBOARD_WRITES_KEY)
+    if pending:
+        pending[:] = [entry for entry in pending if not _within(entry[0], previous_transaction)]
+
+
+def _leaderboard_key(*, tenant_id: int, game_id: str, week_start: date) -> str:
+    return f"games:leaderboard:{tenant_id}:{normalize_game_id(game_id)}:{week_start.isoformat()}"
+
+
+def _leaderboard_score(metric: RankingMetric, value: float) -> float:
+    return value if metric.direction == "asc" else -value
+
+
+def _leaderboard_member(*, last_played_at: datetime, child_id: int) -> str:
+    micros = (last_played_at.astimezone(UTC) - _LEADERBOARD_EPOCH) // timedelta(microseconds=1)
+    return f"{_LEADERBOARD_RECENCY_MAX - micros:016d}:{child_id:012d}"
+
+
+def _member_child_id(member: str) -> int:
+    return int(member.rsplit(":", 1)[1])
+
+
+def _leaderboard_redis() -> Redis:
+    return Redis.from_url(settings.redis_url, decode_responses=True, encoding="utf-8")
+
+
+def _leaderboard_ttl_seconds() -> int:
+    return max(1, int(settings.games_leaderboard_ttl_days)) * 86400
+
+
+def record_weekly_leaderboard_session(
+    db: Session,
+    *,
+    tenant_id: int,
+    child_id: int,
+    game_id: str,
+    score: int,
+    duration_seconds: int | None,
+    streak: int | None,
+) -> None:
+    """Fold one completed session into this week's leaderboard row and sorted set.
+
+    The row upsert shares the session's transaction (`now()` equals its `created_at`);
+    the sorted set is a best-effort index that `rebuild_weekly_leaderboards` can restore,
+    written only after that transaction commits so a rolled-back request leaves no score.
+    """
+    normalized_game_id = normalize_game_id(game_id)
+    week_start = _week_start_for(datetime.now(UTC))
+    stmt = pg_insert(GameWeeklyLeaderboard).values(
+        tenant_id=tenant_id,
+        game_id=normalized_game_id,
+        week_start=week_start,
+        child_id=child_id,
+        best_score=max(0, int(score)),
+        best_duration_seconds=duration_seconds,
+        best_streak=max(0, int(streak or 0)),
+        last_played_at=func.now(),
+        updated_at=func.now(),
+    )
+    table = GameWeeklyLeaderboard.__table__
+    row = db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_game_weekly_leaderboard_entry",
+            set_={
+                "best_score": func.greatest(table.c.best_score, stmt.excluded.best_score),
+                "best_duration_seconds": func.least(
+                    table.c.best_duration_seconds, stmt.excluded.best_duration_seconds
+                ),
+                "best_streak": func.greatest(table.c.best_streak, stmt.excluded.best_streak),
+                "last_played_at": func.greatest(
+                    table.c.last_played_at, stmt.excluded.last_played_at
+                ),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(
+            table.c.best_score,
+            table.c.best_duration_seconds,
+            table.c.best_streak,
+            table.c.last_played_at,
         )
-    ).subquery("weekly_game_ranking_rows")
-    return ranking_rows, metric
+    ).one()
 
+    metric = metric_for_game(normalized_game_id)
+    value = _metric_value(
+        metric,
+        best_score=row.best_score,
+        best_duration=row.best_duration_seconds,
+        best_streak=row.best_streak,
+    )
+    key = _leaderboard_key(tenant_id=tenant_id, game_id=normalized_game_id, week_start=week_start)
+    score_value = _leaderboard_score(metric, value)
+    member = _leaderboard_member(last_played_at=row.last_played_at, child_id=child_id)
+
+    def _write() -> None:
+        try:
+            client = _leaderboard_redis()
+            try:
+                client.eval(
+                    _LEADERBOARD_UPSERT_LUA,
+                    2,
+                    key,
+                    f"{key}:members",
+                    str(child_id),
+                    score_value,
+                    member,
+                    _leaderboard_ttl_seconds(),
+                )
+            finally:
+                client.close()
+        except (RedisError, OSError):
+            logger.warning(
+                "games_leaderboard_redis_write_failed",
+                extra={"leaderboard_key": key},
+                exc_info=True,
+            )
 
-def get_weekly_ranking_snapshot(
+    _after_commit(db, _write)
+
+
+def remove_child_from_weekly_leaderboards(db: Session, *, tenant_id: int, child_id: int) -> None:
+    """Drop a soft-deleted child from the live sorted sets so Redis positions match the SQL ranking.
+
+    Call after the deletion commits; the leaderboard rows stay and are filtered by `deleted_at`.
+    """
+    oldest_week = _week_start_for(datetime.now(UTC)) - timedelta(
+        days=max(1, int(settings.games_leaderboard_ttl_days))
+    )
+    entries = db.execute(
+        select(GameWeeklyLeaderboard.game_id, GameWeeklyLeaderboard.week_start).where(
+            GameWeeklyLeaderboard.tenant_id == tenant_id,
+            GameWeeklyLeaderboard.child_id == child_id,
+            GameWeeklyLeaderboard.week_start >= oldest_week,
+        )
+    ).all()
+    if not entries:
+        return
+    try:
+        client = _leaderboard_redis()
+        try:
+            pipe = client.pipeline(transaction=False)
+            for entry in entries:
+                key = _leaderboard_key(
+                    tenant_id=tenant_id, game_id=str(entry.game_id), week_start=entry.week_start
+                )
+                pipe.eval(_LEADERBOARD_REMOVE_LUA, 2, key, f"{key}:members", str(child_id))
+            pipe.execute()
+        finally:
+            client.close()
+    except (RedisError, OSError):
+        logger.warning(
+            "games_leaderboard_redis_remove_failed",
+            extra={"tenant_id": tenant_id, "child_id": child_id},
+            exc_info=True,
+        )
+
+
+def _signed_rows(ranking_rows: Subquery, metric: RankingMetric) -> Subquery:
+    signed_score = (
+        ranking_rows.c.metric_score if metric.direction == "asc" else -ranking_rows.c.metric_score
+    )
+    return select(
+        ranking_rows.c.child_id,
+        signed_score.label("metric_score"),
+        ranking_rows.c.last_played_at,
+    ).subquery("weekly_game_leaderboard_scores")
+
+
+def _hydrate_leaderboard(db: Session, client: Redis, *, key: str, scored_rows: Subquery) -> None:
+    """Load a cold sorted set from the leaderboard rows.
+
+    `scored_rows` carry direction-signed scores. Rows are merged with the upsert rules instead
+    of replacing the set, so a post-commit write that lands between the SQL read and this call
+    keeps its newer member.
+    """
+    rows = db.execute(select(scored_rows)).all()
+    if not rows:
+        return
+    args: list[str | float] = [_leaderboard_ttl_seconds()]
+    for row in rows:
+        child_id = int(row.child_id)
+        member = _leaderboard_member(last_played_at=row.last_played_at, child_id=child_id)
+        args.extend((str(child_id), float(row.metric_score), member))
+    client.eval(_LEADERBOARD_HYDRATE_LUA, 2, key, f"{key}:members", *args)
+
+
+def _snapshot_from_sorted_set(
     db: Session,
     *,
     tenant_id: int,
     child_id: int,
     game_id: str,
-    limit: int = 10,
-    timezone_name: str | None = None,
-) -> WeeklyRankingSnapshot:
-    week_start_at, week_end_exclusive, week_start, week_end = _week_window(timezone_name)
-    ranking_rows, metric = _ranking_rows(
+    limit: int,
+    week_start: date,
+    week_end: date,
+) -> WeeklyRankingSnapshot | None:
+    normalized_game_id = normalize_game_id(game_id)
+    ranking_rows, metric = _leaderboard_ranking_rows(
         tenant_id=tenant_id,
-        game_id=game_id,
-        week_start_at=week_start_at,
-        week_end_exclusive=week_end_exclusive,
+        game_id=normalized_game_id,
+        week_start=week_start,
+    )
+    key = _leaderboard_key(tenant_id=tenant_id, game_id=normalized_game_id, week_start=week_start)
+    safe_limit = min(max(int(limit), 1), 50)
+    try:
+        client = _leaderboard_redis()
+        try:
+            if not client.exists(key):
+                _hydrate_leaderboard(
+                    db, client, key=key, scored_rows=_signed_rows(ranking_rows, metric)
+                )
+            pipe = client.pipeline(transaction=False)
+            pipe.zcard(key)
+            pipe.zrange(key, 0, safe_limit - 1)
+            pipe.hget(f"{key}:members", str(child_id))
+            total_players, top_members, me_member = pipe.execute()
+            me_rank = client.zrank(key, me_member) if me_member else None
+            me_raw_score = client.zscore(key, me_member) if me_member else None
+        finally:
+            client.close()
+    except (RedisError, OSError):
+        logger.warning(
+            "games_leaderboard_redis_read_failed", extra={"leaderboard_key": key}, exc_info=True
+        )
+        return None
+
+    top_ids = [_member_child_id(member) for member in top_members]
+    rows_by_child = {
+        int(row.child_id): row
+        for row in (
+            db.execute(select(ranking_rows).where(ranking_rows.c.child_id.in_(top_ids))).all()
+            if top_ids
+            else []
+        )
+    }
+    top: list[WeeklyRankingEntry] = []
+    for child_key in top_ids:
+        row = rows_by_child.get(child_key)
+        if row is None:
+            continue
+        top.append(
+            WeeklyRankingEntry(
+                position=len(top) + 1,
+                player=_mask_name(str(row.display_name)),
+                avatar_key=row.avatar_key,
+                score=float(row.metric_score),
+                last_played_at=row.last_played_at or datetime.now(UTC),
+            )
+        )
+
+    me_position = me_rank + 1 if isinstance(me_rank, int) else None
+    me_score = _leaderboard_score(metric, float(me_raw_score)) if me_raw_score is not None else None
+    return WeeklyRankingSnapshot(
+        game_id=normalized_game_id,
+        metric=metric,
+        week_start=week_start,
+        week_end=week_end,
+        top=top,
+        me=WeeklyRankingMe(
+            position=me_position,
+            score=me_score,
+            in_top=bool(me_position is not None and me_position <= safe_limit),
+            total_players=int(total_players or 0),
+        ),
     )
+
+
+def _snapshot_from_ranking_rows(
+    db: Session,
+    *,
+    ranking_rows: Subquery,
+    metric: RankingMetric,
+    child_id: int,
+    game_id: str,
+    limit: int,
+    week_start: date,
+    week_end: date,
+) -> WeeklyRankingSnapshot:
     metric_expr = ranking_rows.c.metric_score
     order_metric = asc(metric_expr) if metric.direction == "asc" else desc(metric_expr)
 
@@ -266,6 +686,158 @@ def get_weekly_ranking_snapshot(
     )
 
 
+def get_weekly_ranking_snapshot(
+    db: Session,
+    *,
+    tenant_id: int,
+    child_id: int,
+    game_id: str,
+    limit: int = 10,
+    timezone_name: str | None = None,
+) -> WeeklyRankingSnapshot:
+    week_start_at, week_end_exclusive, week_start, week_end = _week_window(timezone_name)
+    if settings.games_leaderboard_enabled and _uses_leaderboard_week(timezone_name):
+        snapshot = _snapshot_from_sorted_set(
+            db,
+            tenant_id=tenant_id,
+            child_id=child_id,
+            game_id=game_id,
+            limit=limit,
+            week_start=week_start,
+            week_end=week_end,
+        )
+        if snapshot is not None:
+            return snapshot
+        # Redis unavailable: rank over the maintained rows instead of re-aggregating sessions.
+        ranking_rows, metric = _leaderboard_ranking_rows(
+            tenant_id=tenant_id, game_id=game_id, week_start=week_start
+        )
+    else:
+        ranking_rows, metric = _ranking_rows(
+            tenant_id=tenant_id,
+            game_id=game_id,
+            week_start_at=week_start_at,
+            week_end_exclusive=week_end_exclusive,
+        )
+    return _snapshot_from_ranking_rows(
+        db,
+        ranking_rows=ranking_rows,
+        metric=metric,
+        child_id=child_id,
+        game_id=game_id,
+        limit=limit,
+        week_start=week_start,
+        week_end=week_end,
+    )
+
+
+def rebuild_weekly_leaderboards(
+    db: Session,
+    *,
+    weeks: int = 1,
+    tenant_id: int | None = None,
+    game_id: str | None = None,
+) -> dict[str, int]:
+    """Backfill leaderboard rows from `game_sessions` for the last `weeks` weeks.
+
+    Sorted sets for the rebuilt weeks are dropped and re-hydrated lazily on the next read.
+    """
+    _, _, current_week_start, _ = _week_window()
+    timezone = _resolve_timezone(None)
+    rows_written = 0
+    keys: set[str] = set()
+    for offset in range(max(1, int(weeks))):
+        week_start = current_week_start - timedelta(days=7 * offset)
+        window_start = datetime.combine(
+            week_start, datetime.min.time(), tzinfo=timezone
+        ).astimezone(UTC)
+        window_end = datetime.combine(
+            week_start + timedelta(days=7), datetime.min.time(), tzinfo=timezone
+        ).astimezone(UTC)
+
+        delete_stmt = delete(GameWeeklyLeaderboard).where(
+            GameWeeklyLeaderboard.week_start == week_start
+        )
+        session_filters = [
+            GameSession.tenant_id.is_not(None),
+            GameSession.game_id.is_not(None),
+            GameSession.child_id.is_not(None),
+            GameSession.completed.is_(True),
+            GameSession.created_at >= window_start,
+            GameSession.created_at < window_end,
+        ]
+        if tenant_id is not None:
+            delete_stmt = delete_stmt.where(GameWeeklyLeaderboard.tenant_id == tenant_id)
+            session_filters.append(GameSession.tenant_id == tenant_id)
+        if game_id is not None:
+            delete_stmt = delete_stmt.where(
+                GameWeeklyLeaderboard.game_id == normalize_game_id(game_id)
+            )
+            session_filters.append(GameSession.game_id == normalize_game_id(game_id))
+        db.execute(delete_stmt)
+
+        aggregated = (
+            select(
+                GameSession.tenant_id,
+                GameSession.game_id,
+                literal(week_start, Date),
+                GameSession.child_id,
+                func.coalesce(func.max(GameSession.score), 0),
+                func.min(GameSession.duration_seconds),
+                func.coalesce(
+                    func.max(func.coalesce(GameSession.max_streak, GameSession.streak, 0)), 0
+                ),
+                func.max(GameSession.created_at),
+                func.now(),
+            )
+            .where(*session_filters)
+            .group_by(GameSession.tenant_id, GameSession.game_id, GameSession.child_id)
+        )
+        result = db.execute(
+            insert(GameWeeklyLeaderboard)
+            .from_select(
+                [
+                    "tenant_id",
+                    "game_id",
+                    "week_start",
+                    "child_id",
+                    "best_score",
+                    "best_duration_seconds",
+                    "best_streak",
+                    "last_played_at",
+                    "updated_at",
+                ],
+                aggregated,
+            )
+            .returning(GameWeeklyLeaderboard.tenant_id, GameWeeklyLeaderboard.game_id)
+        ).all()
+        rows_written += len(result)
+        keys.update(
+            _leaderboard_key(
+                tenant_id=int(row.tenant_id), game_id=str(row.game_id), week_start=week_start
+            )
+            for row in result
+        )
+
+    keys_dropped = 0
+    if keys:
+        try:
+            client = _leaderboard_redis()
+            try:
+                keys_dropped = int(client.delete(*keys, *(f"{key}:members" for key in keys)) or 0)
+            finally:
+                client.close()
+        except (RedisError, OSError):
+            logger.warning(
+                "games_leaderboard_redis_reset_failed", extra={"keys": len(keys)}, exc_info=True
+            )
+    return {
+        "weeks": max(1, int(weeks)),
+        "rows_written": rows_written,
+        "redis_keys_dropped": keys_dropped,
+    }
+
+
 def get_personal_ranking_snapshot(
     db: Session,
     *,
@@ -13,6 +13,8 @@ from app.schemas.games import GameResultPayload
 from app.services.achievement_engine import evaluate_achievements_after_game
 from app.services.axion_intelligence_v2 import apply_axion_decisions, compute_behavior_metrics
 from app.services.game_economy import EconomyReward, award_economy_event, get_economy_reward
+from app.services.game_metagame import record_child_daily_stats
+from app.services.game_ranking import record_weekly_leaderboard_session
 
 XP_PER_LEVEL = 100
 MAX_XP_PER_DAY = 200
@@ -296,6 +298,18 @@ def registerGameSession(
     )
     db.add(game_session)
     db.flush()
+    if completed and child_id is not None:
+        record_child_daily_stats(db, child_id=child_id, tenant_id=tenant_id, xp_earned=granted_xp)
+    if completed and tenant_id is not None and child_id is not None:
+        record_weekly_leaderboard_session(
+            db,
+            tenant_id=tenant_id,
+            child_id=child_id,
+            game_id=normalized_game_id,
+            score=safe_score,
+            duration_seconds=duration_seconds,
+            streak=max_streak if max_streak is not None else streak,
+        )
 
     unlocked_achievements = evaluate_achievements_after_game(
         db,
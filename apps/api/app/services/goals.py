@@ -3,8 +3,8 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.models import LedgerTransaction, SavingGoal, Wallet
-from app.services.wallet import extract_pot_split, signed_amount_cents
+from app.models import SavingGoal, Wallet
+from app.services.wallet_balances import get_wallet_balance
 
 
 def calculate_saved_total_for_child(db: Session, *, tenant_id: int, child_id: int) -> int:
@@ -17,23 +17,7 @@ def calculate_saved_total_for_child(db: Session, *, tenant_id: int, child_id: in
     if wallet is None:
         return 0
 
-    transactions = db.scalars(
-        select(LedgerTransaction)
-        .where(
-            LedgerTransaction.tenant_id == tenant_id,
-            LedgerTransaction.wallet_id == wallet.id,
-        )
-        .order_by(LedgerTransaction.created_at.asc(), LedgerTransaction.id.asc()),
-    ).all()
-
-    saved_total = 0
-    for tx in transactions:
-        signed = signed_amount_cents(tx.type, tx.amount_cents)
-        save_amount = extract_pot_split(tx.metadata_json).get("SAVE", 0)
-        if save_amount == 0:
-            continue
-        saved_total += save_amount if signed >= 0 else -save_amount
-    return saved_total
+    return get_wallet_balance(db, wallet_id=wallet.id).pot_balances_cents["SAVE"]
 
 
 def sync_locked_goals_for_child(db: Session, *, tenant_id: int, child_id: int) -> list[int]:
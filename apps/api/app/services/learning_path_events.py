@@ -29,6 +29,7 @@ from app.models import (
     UserSkillMastery,
 )
 from app.services.adaptive_learning import resolve_effective_learning_settings
+from app.services.aprender import invalidate_subject_structure_cache_after_commit
 from app.services.gamification import addXP, get_or_create_game_profile
 from app.services.learning_retention import MissionDelta, get_active_season_bonus, track_mission_progress
 
@@ -321,6 +322,7 @@ def _bootstrap_minimum_learning_path(db: Session) -> None:
     if created_units:
         db.add_all(created_units)
         db.flush()
+        invalidate_subject_structure_cache_after_commit(db)
         for unit in created_units:
             units_by_subject_order[(unit.subject_id, unit.order)] = unit
 
@@ -363,6 +365,7 @@ def _bootstrap_minimum_learning_path(db: Session) -> None:
     if lessons:
         db.add_all(lessons)
         db.flush()
+        invalidate_subject_structure_cache_after_commit(db)
 
 
 def _resolve_subject(db: Session, *, subject_id: int | None, child_age: int | None = None) -> Subject:
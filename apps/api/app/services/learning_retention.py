@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
+from threading import Lock
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import ColumnElement, and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models import (
     ChildProfile,
     SeasonEvent,
@@ -23,6 +27,9 @@ from app.models import (
 from app.services.aprender import age_group_from_date_of_birth
 from app.services.gamification import addCoins, addXP
 
+_MISSION_CACHE_LOCK = Lock()
+_MISSION_SET_CACHE: dict[tuple[SubjectAgeGroup, date], tuple[float, tuple[str, ...]]] = {}
+
 
 @dataclass(slots=True)
 class MissionDelta:
@@ -210,118 +217,227 @@ def get_active_season_bonus(db: Session, *, target_date: date | None = None) ->
 
 
 def _ensure_progress_rows(db: Session, *, user_id: int, missions: list[WeeklyMission]) -> None:
-    for mission in missions:
-        row = db.scalar(
-            select(UserMissionProgress).where(
-                UserMissionProgress.user_id == user_id,
-                UserMissionProgress.mission_id == mission.id,
-            )
+    if not missions:
+        return
+    stmt = pg_insert(UserMissionProgress).values(
+        [
+            {
+                "user_id": user_id,
+                "mission_id": str(mission.id),
+                "current_value": 0,
+                "completed": False,
+                "reward_granted": False,
+            }
+            for mission in missions
+        ]
+    )
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["user_id", "mission_id"]))
+
+
+def _seasonal_target_value(age_group: SubjectAgeGroup) -> int:
+    return (
+        150
+        if age_group == SubjectAgeGroup.AGE_6_8
+        else 250
+        if age_group == SubjectAgeGroup.AGE_9_12
+        else 400
+    )
+
+
+def _week_mission_rows(
+    *,
+    age_group: SubjectAgeGroup,
+    subject_id: int | None,
+    start_date: date,
+    end_date: date,
+    season_events: list[SeasonEvent],
+) -> list[dict[str, object]]:
+    rows: list[dict[str, object]] = []
+    for blueprint in _base_mission_blueprints(age_group, subject_id):
+        blueprint_subject_id = blueprint.get("subject_id", subject_id)
+        rows.append(
+            {
+                "title": str(blueprint["title"]),
+                "description": str(blueprint["description"]),
+                "age_group": age_group,
+                "subject_id": int(blueprint_subject_id)
+                if blueprint_subject_id is not None
+                else None,
+                "mission_type": blueprint["mission_type"],
+                "target_value": int(blueprint["target"]),
+                "xp_reward": int(blueprint["xp"]),
+                "coin_reward": int(blueprint["coins"]),
+                "start_date": start_date,
+                "end_date": end_date,
+                "is_seasonal": False,
+                "theme_key": None,
+            }
         )
-        if row is None:
-            db.add(
-                UserMissionProgress(
-                    user_id=user_id,
-                    mission_id=mission.id,
-                    current_value=0,
-                    completed=False,
-                    reward_granted=False,
-                )
-            )
-    db.flush()
+    for event in season_events:
+        rows.append(
+            {
+                "title": f"Missão da Temporada: {event.name}",
+                "description": "Participe da temporada e ganhe XP extra em atividades da semana.",
+                "age_group": age_group,
+                "subject_id": subject_id,
+                "mission_type": WeeklyMissionType.XP_GAINED,
+                "target_value": _seasonal_target_value(age_group),
+                "xp_reward": 80,
+                "coin_reward": 30,
+                "start_date": start_date,
+                "end_date": end_date,
+                "is_seasonal": True,
+                "theme_key": event.theme_key,
+            }
+        )
+    return rows
 
 
-def ensure_weekly_missions_for_user(
+def _insert_missing_missions(db: Session, rows: list[dict[str, object]]) -> None:
+    # The partial unique indexes on weekly_missions turn concurrent creators into no-ops.
+    if rows:
+        db.execute(pg_insert(WeeklyMission).values(rows).on_conflict_do_nothing())
+
+
+def provision_weekly_missions(
     db: Session,
     *,
-    user_id: int,
-    tenant_id: int | None,
     target_date: date | None = None,
-) -> list[WeeklyMission]:
-    today = target_date or date.today()
-    start_date, end_date = _week_bounds(today)
-    age_group = _resolve_user_age_group(db, user_id=user_id, tenant_id=tenant_id)
-    subject_id = _pick_subject_for_age_group(db, age_group=age_group)
-
-    current = db.scalars(
-        select(WeeklyMission).where(
-            WeeklyMission.age_group == age_group,
-            WeeklyMission.start_date == start_date,
-            WeeklyMission.end_date == end_date,
-            WeeklyMission.is_seasonal.is_(False),
-        )
-    ).all()
-
-    if len(current) < 3:
-        existing_types = {mission.mission_type for mission in current}
-        for blueprint in _base_mission_blueprints(age_group, subject_id):
-            mission_type = blueprint["mission_type"]
-            if mission_type in existing_types:
-                continue
-            db.add(
-                WeeklyMission(
-                    title=str(blueprint["title"]),
-                    description=str(blueprint["description"]),
+    weeks_ahead: int = 1,
+) -> dict[str, int]:
+    """Create base and seasonal missions for every age group, for this week and `weeks_ahead` more.
+
+    Idempotent: existing missions are left untouched, so it is safe to run on a schedule and
+    alongside request-path fallbacks.
+    """
+    first_day = target_date or date.today()
+    weeks = 0
+    rows_submitted = 0
+    subject_by_age_group = {
+        age_group: _pick_subject_for_age_group(db, age_group=age_group)
+        for age_group in SubjectAgeGroup
+    }
+    for offset in range(max(0, int(weeks_ahead)) + 1):
+        start_date, end_date = _week_bounds(first_day + timedelta(days=7 * offset))
+        season_events = db.scalars(
+            select(SeasonEvent)
+            .where(SeasonEvent.start_date <= end_date, SeasonEvent.end_date >= start_date)
+            .order_by(SeasonEvent.start_date.asc())
+        ).all()
+        rows: list[dict[str, object]] = []
+        for age_group in SubjectAgeGroup:
+            rows.extend(
+                _week_mission_rows(
                     age_group=age_group,
-                    subject_id=int(blueprint.get("subject_id", subject_id)) if blueprint.get("subject_id", subject_id) is not None else None,
-                    mission_type=mission_type,
-                    target_value=int(blueprint["target"]),
-                    xp_reward=int(blueprint["xp"]),
-                    coin_reward=int(blueprint["coins"]),
+                    subject_id=subject_by_age_group[age_group],
                     start_date=start_date,
                     end_date=end_date,
-                    is_seasonal=False,
-                    theme_key=None,
+                    season_events=list(season_events),
                 )
             )
-            existing_types.add(mission_type)
-        db.flush()
-        current = db.scalars(
+        _insert_missing_missions(db, rows)
+        invalidate_weekly_mission_cache()
+        weeks += 1
+        rows_submitted += len(rows)
+    return {"weeks": weeks, "missions_submitted": rows_submitted}
+
+
+def invalidate_weekly_mission_cache() -> None:
+    with _MISSION_CACHE_LOCK:
+        _MISSION_SET_CACHE.clear()
+
+
+def _load_week_missions(
+    db: Session,
+    *,
+    age_group: SubjectAgeGroup,
+    start_date: date,
+    end_date: date,
+    season_theme_key: str | None,
+) -> list[WeeklyMission]:
+    conditions: list[ColumnElement[bool]] = [WeeklyMission.is_seasonal.is_(False)]
+    if season_theme_key is not None:
+        conditions.append(
+            and_(WeeklyMission.is_seasonal.is_(True), WeeklyMission.theme_key == season_theme_key)
+        )
+    return list(
+        db.scalars(
             select(WeeklyMission).where(
                 WeeklyMission.age_group == age_group,
                 WeeklyMission.start_date == start_date,
                 WeeklyMission.end_date == end_date,
-                WeeklyMission.is_seasonal.is_(False),
+                or_(*conditions),
             )
         ).all()
+    )
 
+
+def _resolve_week_mission_ids(
+    db: Session, *, age_group: SubjectAgeGroup, today: date
+) -> tuple[str, ...]:
+    """Mission ids for (age group, day), from the in-process cache or the provisioned rows."""
+    cache_key = (age_group, today)
+    now = time.monotonic()
+    with _MISSION_CACHE_LOCK:
+        cached = _MISSION_SET_CACHE.get(cache_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    start_date, end_date = _week_bounds(today)
     active_events = get_active_season_events(db, target_date=today)
-    if active_events:
-        event = active_events[0]
-        seasonal = db.scalar(
-            select(WeeklyMission).where(
-                WeeklyMission.age_group == age_group,
-                WeeklyMission.start_date == start_date,
-                WeeklyMission.end_date == end_date,
-                WeeklyMission.is_seasonal.is_(True),
-                WeeklyMission.theme_key == event.theme_key,
-            )
+    season_theme_key = active_events[0].theme_key if active_events else None
+    missions = _load_week_missions(
+        db,
+        age_group=age_group,
+        start_date=start_date,
+        end_date=end_date,
+        season_theme_key=season_theme_key,
+    )
+    base_count = sum(1 for mission in missions if not mission.is_seasonal)
+    has_seasonal = season_theme_key is None or any(mission.is_seasonal for mission in missions)
+    if base_count < 3 or not has_seasonal:
+        # Provisioning job has not covered this week yet; create the missing rows inline.
+        _insert_missing_missions(
+            db,
+            _week_mission_rows(
+                age_group=age_group,
+                subject_id=_pick_subject_for_age_group(db, age_group=age_group),
+                start_date=start_date,
+                end_date=end_date,
+                season_events=active_events[:1],
+            ),
         )
-        if seasonal is None:
-            db.add(
-                WeeklyMission(
-                    title=f"Missão da Temporada: {event.name}",
-                    description="Participe da temporada e ganhe XP extra em atividades da semana.",
-                    age_group=age_group,
-                    subject_id=subject_id,
-                    mission_type=WeeklyMissionType.XP_GAINED,
-                    target_value=150 if age_group == SubjectAgeGroup.AGE_6_8 else 250 if age_group == SubjectAgeGroup.AGE_9_12 else 400,
-                    xp_reward=80,
-                    coin_reward=30,
-                    start_date=start_date,
-                    end_date=end_date,
-                    is_seasonal=True,
-                    theme_key=event.theme_key,
-                )
-            )
-            db.flush()
-            current = db.scalars(
-                select(WeeklyMission).where(
-                    WeeklyMission.age_group == age_group,
-                    WeeklyMission.start_date == start_date,
-                    WeeklyMission.end_date == end_date,
-                )
-            ).all()
+        missions = _load_week_missions(
+            db,
+            age_group=age_group,
+            start_date=start_date,
+            end_date=end_date,
+            season_theme_key=season_theme_key,
+        )
+        # Rows created inline are not visible to other sessions until commit; skip the cache.
+        return tuple(str(mission.id) for mission in missions)
+
+    mission_ids = tuple(str(mission.id) for mission in missions)
+    ttl_seconds = max(0, int(settings.learning_missions_cache_ttl_seconds or 0))
+    if ttl_seconds > 0:
+        with _MISSION_CACHE_LOCK:
+            _MISSION_SET_CACHE[cache_key] = (now + ttl_seconds, mission_ids)
+    return mission_ids
+
 
+def ensure_weekly_missions_for_user(
+    db: Session,
+    *,
+    user_id: int,
+    tenant_id: int | None,
+    target_date: date | None = None,
+) -> list[WeeklyMission]:
+    today = target_date or date.today()
+    age_group = _resolve_user_age_group(db, user_id=user_id, tenant_id=tenant_id)
+    mission_ids = _resolve_week_mission_ids(db, age_group=age_group, today=today)
+    if not mission_ids:
+        return []
+    current = list(db.scalars(select(WeeklyMission).where(WeeklyMission.id.in_(mission_ids))).all())
     _ensure_progress_rows(db, user_id=user_id, missions=current)
     return current
 
@@ -418,35 +534,41 @@ def inject_axion_micro_mission(
         payload["description"] = description
     theme_key = f"axion_micro_{user_id}_{today.strftime('%Y%m%d')}_{kind.lower()}"
 
-    existing = db.scalar(
-        select(WeeklyMission).where(
-            WeeklyMission.age_group == age_group,
-            WeeklyMission.start_date == start_date,
-            WeeklyMission.end_date == end_date,
-            WeeklyMission.theme_key == theme_key,
-            WeeklyMission.is_seasonal.is_(True),
-        )
+    existing_query = select(WeeklyMission).where(
+        WeeklyMission.age_group == age_group,
+        WeeklyMission.start_date == start_date,
+        WeeklyMission.end_date == end_date,
+        WeeklyMission.theme_key == theme_key,
+        WeeklyMission.is_seasonal.is_(True),
     )
+    existing = db.scalar(existing_query)
     if existing is not None:
         _ensure_progress_rows(db, user_id=user_id, missions=[existing])
         return existing
 
-    mission = WeeklyMission(
-        title=str(payload["title"]),
-        description=str(payload["description"]),
-        age_group=age_group,
-        subject_id=subject_id,
-        mission_type=payload["mission_type"],
-        target_value=int(payload["target_value"]),
-        xp_reward=int(payload["xp_reward"]),
-        coin_reward=int(payload["coin_reward"]),
-        start_date=start_date,
-        end_date=end_date,
-        is_seasonal=True,
-        theme_key=theme_key,
+    _insert_missing_missions(
+        db,
+        [
+            {
+                "title": str(payload["title"]),
+                "description": str(payload["description"]),
+                "age_group": age_group,
+                "subject_id": subject_id,
+                "mission_type": payload["mission_type"],
+                "target_value": int(payload["target_value"]),
+                "xp_reward": int(payload["xp_reward"]),
+                "coin_reward": int(payload["coin_reward"]),
+                "start_date": start_date,
+                "end_date": end_date,
+                "is_seasonal": True,
+                "theme_key": theme_key,
+            }
+        ],
     )
-    db.add(mission)
-    db.flush()
+    mission = db.scalar(existing_query)
+    if mission is None:
+        # The insert skips only on a conflicting row, so the mission must be readable here.
+        raise RuntimeError("Axion micro mission was not persisted")
     _ensure_progress_rows(db, user_id=user_id, missions=[mission])
     return mission
 
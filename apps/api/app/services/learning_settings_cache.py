@@ -0,0 +1,123 @@
+"""Per-tenant learning configuration cache.
+
+Resolved values are immutable snapshots shared across requests for
+`learning_settings_cache_ttl_seconds`. Within one request (one Session) each key is
+resolved at most once through a memo kept in `Session.info`, so a request never
+re-reads the same tenant configuration even when the shared cache is disabled.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from threading import Lock
+from typing import Any, cast
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings as app_settings
+from app.models import ChildProfile
+
+CacheKey = tuple[str, int, int | None]
+
+_REQUEST_MEMO_KEY = "learning_settings_memo"
+_CACHE_LOCK = Lock()
+_MAX_CACHE_ENTRIES = 10_000
+_TENANT_SETTINGS_CACHE: dict[CacheKey, tuple[float, Any]] = {}
+
+
+def _request_memo(db: Session) -> dict[CacheKey, Any] | None:
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return None
+    return cast(dict[CacheKey, Any], info.setdefault(_REQUEST_MEMO_KEY, {}))
+
+
+def cached_tenant_setting[T](
+    db: Session,
+    *,
+    kind: str,
+    tenant_id: int,
+    child_id: int | None,
+    load: Callable[[], T],
+) -> T:
+    """Return the cached value for (kind, tenant, child), calling `load` on a miss.
+
+    `load` must return an immutable value: the same object is handed to every caller.
+    """
+    key: CacheKey = (kind, int(tenant_id), int(child_id) if child_id is not None else None)
+    memo = _request_memo(db)
+    if memo is not None and key in memo:
+        return cast(T, memo[key])
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        found = _TENANT_SETTINGS_CACHE.get(key)
+    value: T
+    if found is not None and found[0] > now:
+        value = cast(T, found[1])
+    else:
+        value = load()
+        ttl_seconds = max(0, int(app_settings.learning_settings_cache_ttl_seconds or 0))
+        if ttl_seconds > 0:
+            with _CACHE_LOCK:
+                if len(_TENANT_SETTINGS_CACHE) >= _MAX_CACHE_ENTRIES:
+                    expired = [
+                        entry
+                        for entry, (expires_at, _value) in _TENANT_SETTINGS_CACHE.items()
+                        if expires_at <= now
+                    ]
+                    for entry in expired:
+                        _TENANT_SETTINGS_CACHE.pop(entry, None)
+                    if len(_TENANT_SETTINGS_CACHE) >= _MAX_CACHE_ENTRIES:
+                        _TENANT_SETTINGS_CACHE.pop(next(iter(_TENANT_SETTINGS_CACHE)), None)
+                _TENANT_SETTINGS_CACHE[key] = (now + ttl_seconds, value)
+    if memo is not None:
+        memo[key] = value
+    return value
+
+
+def _drop_tenant_keys(entries: dict[CacheKey, Any], tenant_id: int | None) -> None:
+    if tenant_id is None:
+        entries.clear()
+        return
+    for key in [key for key in entries if key[1] == tenant_id]:
+        entries.pop(key, None)
+
+
+def invalidate_tenant_learning_settings(
+    tenant_id: int | None = None, *, db: Session | None = None
+) -> None:
+    """Drop cached settings for one tenant (or all); pass `db` to also reset that request's memo."""
+    with _CACHE_LOCK:
+        _drop_tenant_keys(_TENANT_SETTINGS_CACHE, tenant_id)
+    if db is not None:
+        memo = _request_memo(db)
+        if memo:
+            _drop_tenant_keys(memo, tenant_id)
+
+
+def _load_tenant_single_child_id(db: Session, *, tenant_id: int) -> int | None:
+    ids = db.scalars(
+        select(ChildProfile.id)
+        .where(
+            ChildProfile.tenant_id == tenant_id,
+            ChildProfile.deleted_at.is_(None),
+        )
+        .order_by(ChildProfile.id.asc())
+        .limit(2)
+    ).all()
+    if len(ids) != 1:
+        return None
+    return int(ids[0])
+
+
+def resolve_tenant_single_child_id(db: Session, *, tenant_id: int) -> int | None:
+    """The tenant's only active child, or None when it has zero or several."""
+    return cached_tenant_setting(
+        db,
+        kind="single_child",
+        tenant_id=tenant_id,
+        child_id=None,
+        load=lambda: _load_tenant_single_child_id(db, tenant_id=tenant_id),
+    )
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+from collections import deque
+from collections.abc import Mapping
 from dataclasses import dataclass
 from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 from app.core.config import settings
-from app.services.curriculum_loader import CurriculumLoader, SkillDefinition, SubjectDefinition
+from app.services.curriculum_loader import (
+    CurriculumLoader,
+    SubjectDefinition,
+    get_curriculum_loader,
+)
 
 
 _AGE_GROUP_ALIASES = {
@@ -51,12 +58,40 @@ class StudentState:
 
 
 class SkillGraph:
+    """Skill graph compiled once into lookup indexes.
+
+    Nodes are bucketed by (subject, age_group) and by age_group, and every node keeps its
+    transitive prerequisites as a bitset over the topological order, so recommendations
+    only touch the candidate bucket and prerequisite queries never walk the graph.
+    """
+
     def __init__(self, nodes: dict[str, SkillNode]) -> None:
-        self._nodes = nodes
+        self._nodes = dict(nodes)
+        self._nodes_view: Mapping[str, SkillNode] = MappingProxyType(self._nodes)
+        self._topological_order = _topological_order(self._nodes)
+        self._position = {skill_id: index for index, skill_id in enumerate(self._topological_order)}
+        self._prerequisite_closure = self._compile_prerequisite_closure()
+        self._lessons_by_skill = {
+            skill_id: list(node.lessons) for skill_id, node in self._nodes.items()
+        }
+
+        by_subject_age: dict[tuple[str, str], list[SkillNode]] = {}
+        by_age: dict[str, list[SkillNode]] = {}
+        for skill_id in self._topological_order:
+            node = self._nodes[skill_id]
+            for age_group in node.age_groups:
+                by_subject_age.setdefault((node.subject, age_group), []).append(node)
+                by_age.setdefault(age_group, []).append(node)
+        self._nodes_by_subject_age = {key: tuple(value) for key, value in by_subject_age.items()}
+        self._nodes_by_age = {key: tuple(value) for key, value in by_age.items()}
+
+    @property
+    def nodes(self) -> Mapping[str, SkillNode]:
+        return self._nodes_view
 
     @property
-    def nodes(self) -> dict[str, SkillNode]:
-        return dict(self._nodes)
+    def topological_order(self) -> tuple[str, ...]:
+        return self._topological_order
 
     def get_node(self, skill: str) -> SkillNode:
         normalized_skill = _normalize_token(skill)
@@ -67,23 +102,21 @@ class SkillGraph:
 
     def get_prerequisite_skills(self, skill: str) -> list[str]:
         node = self.get_node(skill)
+        closure = self._prerequisite_closure[node.id]
         ordered: list[str] = []
-        seen: set[str] = set()
-
-        def _visit(skill_id: str) -> None:
-            if skill_id in seen:
-                return
-            seen.add(skill_id)
-            for prerequisite in self._nodes[skill_id].prerequisites:
-                _visit(prerequisite)
-                if prerequisite not in ordered:
-                    ordered.append(prerequisite)
-
-        _visit(node.id)
+        while closure:
+            lowest_bit = closure & -closure
+            ordered.append(self._topological_order[lowest_bit.bit_length() - 1])
+            closure ^= lowest_bit
         return ordered
 
+    def has_prerequisite(self, skill: str, prerequisite: str) -> bool:
+        node = self.get_node(skill)
+        prerequisite_node = self.get_node(prerequisite)
+        return bool(self._prerequisite_closure[node.id] >> self._position[prerequisite_node.id] & 1)
+
     def get_lessons_for_skill(self, skill: str) -> list[str]:
-        return list(self.get_node(skill).lessons)
+        return list(self._lessons_by_skill[self.get_node(skill).id])
 
     def get_next_skill(self, student_state: StudentState | dict[str, Any]) -> SkillNode | None:
         state = _coerce_student_state(student_state)
@@ -94,22 +127,24 @@ class SkillGraph:
             for skill, score in state.mastery.items()
         }
         threshold = float(settings.axion_prerequisite_mastery_threshold)
+        if state.subject is None:
+            pool = self._nodes_by_age.get(target_age_group, ())
+        else:
+            pool = self._nodes_by_subject_age.get(
+                (_normalize_token(state.subject), target_age_group), ()
+            )
 
-        candidates: list[tuple[float, int, str, SkillNode]] = []
-        for node in self._nodes.values():
-            if state.subject is not None and node.subject != _normalize_token(state.subject):
-                continue
-            if target_age_group not in node.age_groups:
-                continue
-
+        best: tuple[float, int, str] | None = None
+        best_node: SkillNode | None = None
+        for node in pool:
             node_mastery = mastery_map.get(node.id, 0.0)
+            if node_mastery >= 0.999:
+                continue
             prerequisites_met = all(
                 mastery_map.get(prerequisite, 0.0) >= threshold for prerequisite in node.prerequisites
             )
             if not prerequisites_met:
                 continue
-            if node_mastery >= 0.999:
-                continue
 
             progression_target = _recommended_difficulty(node, node_mastery)
             difficulty_gap = abs(
@@ -119,13 +154,45 @@ class SkillGraph:
             remediation_bonus = (1.0 - node_mastery) if node_mastery < threshold else 0.0
             advancement_bonus = node_mastery if node_mastery >= threshold else 0.0
             score = remediation_bonus + novelty_bonus + advancement_bonus - (difficulty_gap * 0.2)
-            candidates.append((score, node.lesson_order_index, node.id, node))
-
-        if not candidates:
-            return None
-
-        candidates.sort(key=lambda item: (-item[0], item[1], item[2]))
-        return candidates[0][3]
+            key = (-score, node.lesson_order_index, node.id)
+            if best is None or key < best:
+                best = key
+                best_node = node
+        return best_node
+
+    def _compile_prerequisite_closure(self) -> dict[str, int]:
+        closure: dict[str, int] = {}
+        for skill_id in self._topological_order:
+            bits = 0
+            for prerequisite in self._nodes[skill_id].prerequisites:
+                bits |= closure[prerequisite] | (1 << self._position[prerequisite])
+            closure[skill_id] = bits
+        return closure
+
+
+def _topological_order(nodes: dict[str, SkillNode]) -> tuple[str, ...]:
+    """Kahn's algorithm, stable in node insertion order."""
+    pending = {skill_id: 0 for skill_id in nodes}
+    dependents: dict[str, list[str]] = {skill_id: [] for skill_id in nodes}
+    for skill_id, node in nodes.items():
+        for prerequisite in node.prerequisites:
+            if prerequisite not in nodes:
+                raise ValueError(f"Unknown prerequisite {prerequisite} for skill {skill_id}")
+            pending[skill_id] += 1
+            dependents[prerequisite].append(skill_id)
+
+    ready = deque(skill_id for skill_id, count in pending.items() if count == 0)
+    order: list[str] = []
+    while ready:
+        skill_id = ready.popleft()
+        order.append(skill_id)
+        for dependent in dependents[skill_id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+    if len(order) != len(nodes):
+        raise ValueError("Skill prerequisites contain a cycle")
+    return tuple(order)
 
 
 def build_graph(loader: CurriculumLoader | None = None) -> SkillGraph:
@@ -146,7 +213,7 @@ def get_lessons_for_skill(skill: str) -> list[str]:
 
 @lru_cache(maxsize=1)
 def _build_graph_cached() -> SkillGraph:
-    return _build_graph(CurriculumLoader())
+    return _build_graph(get_curriculum_loader())
 
 
 def _build_graph(loader: CurriculumLoader) -> SkillGraph:
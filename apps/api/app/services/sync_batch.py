@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import ChildProfile, DailyMission, SyncProcessedItem, Task, TaskLog, TaskLogStatus
+from app.schemas.sync import SyncBatchItem
+from app.services.events import EventService
+
+
+@dataclass(frozen=True, slots=True)
+class PendingRoutineMark:
+    item_id: str
+    child_id: int
+    task_id: int
+    mark_date: date
+
+
+@dataclass(slots=True)
+class SyncBatchContext:
+    """Rows referenced by a sync batch, resolved up front with one query per kind."""
+
+    tenant_id: int
+    processed_item_ids: set[str]
+    children: dict[int, ChildProfile]
+    active_task_ids: set[int]
+    missions: dict[str, DailyMission]
+    existing_marks: set[tuple[int, int, date]]
+    pending_marks: list[PendingRoutineMark] = field(default_factory=list)
+    pending_events: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+
+    def has_mark(self, child_id: int, task_id: int, mark_date: date) -> bool:
+        return (child_id, task_id, mark_date) in self.existing_marks
+
+    def add_mark(self, mark: PendingRoutineMark) -> None:
+        self.existing_marks.add((mark.child_id, mark.task_id, mark.mark_date))
+        self.pending_marks.append(mark)
+
+    @property
+    def deferred_count(self) -> int:
+        return len(self.pending_marks) + len(self.pending_events)
+
+    def for_item(self, item_id: str) -> SyncBatchContext:
+        """A view holding only the deferred marks and events queued for one batch item."""
+        return replace(
+            self,
+            pending_marks=[mark for mark in self.pending_marks if mark.item_id == item_id],
+            pending_events=[entry for entry in self.pending_events if entry[0] == item_id],
+        )
+
+
+def _payload_int(item: SyncBatchItem, key: str) -> int | None:
+    value = item.payload.get(key)
+    return value if isinstance(value, int) else None
+
+
+def _payload_date(item: SyncBatchItem) -> date | None:
+    raw_date = item.payload.get("date")
+    if not isinstance(raw_date, str):
+        return None
+    try:
+        return date.fromisoformat(raw_date)
+    except ValueError:
+        return None
+
+
+def load_sync_batch_context(
+    db: Session,
+    *,
+    tenant_id: int,
+    user_id: int,
+    items: list[SyncBatchItem],
+) -> SyncBatchContext:
+    item_ids = [item.id for item in items]
+    processed_item_ids = (
+        set(
+            db.scalars(
+                select(SyncProcessedItem.client_item_id).where(
+                    SyncProcessedItem.tenant_id == tenant_id,
+                    SyncProcessedItem.user_id == user_id,
+                    SyncProcessedItem.client_item_id.in_(item_ids),
+                ),
+            ).all()
+        )
+        if item_ids
+        else set()
+    )
+    pending = [item for item in items if item.id not in processed_item_ids]
+
+    mission_ids = sorted(
+        {
+            str(item.payload["mission_id"])
+            for item in pending
+            if item.type == "daily_mission.complete"
+            and isinstance(item.payload.get("mission_id"), str)
+        }
+    )
+    missions = (
+        {
+            mission.id: mission
+            for mission in db.scalars(
+                select(DailyMission).where(DailyMission.id.in_(mission_ids))
+            ).all()
+        }
+        if mission_ids
+        else {}
+    )
+
+    child_ids = {
+        child_id for item in pending if (child_id := _payload_int(item, "child_id")) is not None
+    }
+    child_ids.update(mission.child_id for mission in missions.values())
+    children = (
+        {
+            child.id: child
+            for child in db.scalars(
+                select(ChildProfile).where(
+                    ChildProfile.id.in_(sorted(child_ids)),
+                    ChildProfile.tenant_id == tenant_id,
+                    ChildProfile.deleted_at.is_(None),
+                ),
+            ).all()
+        }
+        if child_ids
+        else {}
+    )
+
+    marks = [item for item in pending if item.type == "routine.mark"]
+    task_ids = {task_id for item in marks if (task_id := _payload_int(item, "task_id")) is not None}
+    active_task_ids = (
+        set(
+            db.scalars(
+                select(Task.id).where(
+                    Task.id.in_(sorted(task_ids)),
+                    Task.tenant_id == tenant_id,
+                    Task.is_active.is_(True),
+                    Task.deleted_at.is_(None),
+                ),
+            ).all()
+        )
+        if task_ids
+        else set()
+    )
+
+    mark_dates = {mark_date for item in marks if (mark_date := _payload_date(item)) is not None}
+    existing_marks: set[tuple[int, int, date]] = set()
+    if children and active_task_ids and mark_dates:
+        existing_marks = {
+            (int(child_id), int(task_id), mark_date)
+            for child_id, task_id, mark_date in db.execute(
+                select(TaskLog.child_id, TaskLog.task_id, TaskLog.date).where(
+                    TaskLog.tenant_id == tenant_id,
+                    TaskLog.child_id.in_(sorted(children)),
+                    TaskLog.task_id.in_(sorted(active_task_ids)),
+                    TaskLog.date.in_(sorted(mark_dates)),
+                ),
+            ).all()
+        }
+
+    return SyncBatchContext(
+        tenant_id=tenant_id,
+        processed_item_ids=processed_item_ids,
+        children=children,
+        active_task_ids=active_task_ids,
+        missions=missions,
+        existing_marks=existing_marks,
+    )
+
+
+def flush_sync_batch(
+    db: Session,
+    events: EventService,
+    context: SyncBatchContext,
+    *,
+    actor_user_id: int,
+) -> None:
+    """Insert the deferred routine marks and emit all deferred events in bulk."""
+    mark_events: list[dict[str, Any]] = []
+    if context.pending_marks:
+        # Marks inserted concurrently by another request are skipped, as the per-item path did.
+        inserted = db.execute(
+            pg_insert(TaskLog)
+            .values(
+                [
+                    {
+                        "tenant_id": context.tenant_id,
+                        "child_id": mark.child_id,
+                        "task_id": mark.task_id,
+                        "date": mark.mark_date,
+                        "status": TaskLogStatus.PENDING,
+                    }
+                    for mark in context.pending_marks
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_task_logs_child_id_task_id_date")
+            .returning(TaskLog.id, TaskLog.child_id, TaskLog.task_id, TaskLog.date),
+        ).all()
+        by_key = {(int(row.child_id), int(row.task_id), row.date): int(row.id) for row in inserted}
+        for mark in context.pending_marks:
+            log_id = by_key.get((mark.child_id, mark.task_id, mark.mark_date))
+            if log_id is None:
+                continue
+            mark_events.append(
+                {
+                    "type": "routine.marked",
+                    "tenant_id": context.tenant_id,
+                    "actor_user_id": actor_user_id,
+                    "child_id": mark.child_id,
+                    "payload": {
+                        "log_id": log_id,
+                        "task_id": mark.task_id,
+                        "date": str(mark.mark_date),
+                        "source": "sync.batch",
+                    },
+                }
+            )
+    events.emit_many(mark_events + [event for _item_id, event in context.pending_events])
+
+
+def record_processed_items(
+    db: Session,
+    *,
+    tenant_id: int,
+    user_id: int,
+    items: list[SyncBatchItem],
+) -> None:
+    if not items:
+        return
+    db.execute(
+        pg_insert(SyncProcessedItem)
+        .values(
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "user_id": user_id,
+                    "client_item_id": item.id,
+                    "item_type": item.type,
+                }
+                for item in items
+            ]
+        )
+        .on_conflict_do_nothing(constraint="uq_sync_processed_items_client_item"),
+    )
@@ -45,3 +45,15 @@ def extract_pot_split(metadata: dict[str, Any]) -> dict[str, int]:
         result[key] = raw if isinstance(raw, int) else 0
     return result
 
+
+def ledger_balance_delta(
+    tx_type: LedgerTransactionType, amount_cents: int, metadata: dict[str, Any]
+) -> dict[str, int]:
+    """Change a single ledger row applies to the wallet total and to each pot."""
+    signed = signed_amount_cents(tx_type, amount_cents)
+    split = extract_pot_split(metadata)
+    delta = {"total": signed}
+    for pot in ("SPEND", "SAVE", "DONATE"):
+        amount = split.get(pot, 0)
+        delta[pot] = amount if signed >= 0 else -amount
+    return delta
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import LedgerTransaction, WalletBalance, WalletBalanceCheckpoint
+from app.services.wallet import ledger_balance_delta
+
+WALLET_POTS = ("SPEND", "SAVE", "DONATE")
+
+# Runs in the same transaction as the ledger insert (mapper after_insert), so the balance row
+# never diverges from committed ledger rows; ON CONFLICT row-locks it, serializing inserts per
+# wallet.
+_APPLY_SQL = text(
+    """
+    INSERT INTO wallet_balances (
+        wallet_id, tenant_id, total_cents, spend_cents, save_cents, donate_cents,
+        last_ledger_transaction_id, updated_at
+    )
+    VALUES (
+        :wallet_id, :tenant_id, :total_cents, :spend_cents, :save_cents, :donate_cents,
+        :ledger_transaction_id, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT (wallet_id) DO UPDATE SET
+        total_cents = wallet_balances.total_cents + EXCLUDED.total_cents,
+        spend_cents = wallet_balances.spend_cents + EXCLUDED.spend_cents,
+        save_cents = wallet_balances.save_cents + EXCLUDED.save_cents,
+        donate_cents = wallet_balances.donate_cents + EXCLUDED.donate_cents,
+        last_ledger_transaction_id = CASE
+            WHEN EXCLUDED.last_ledger_transaction_id > wallet_balances.last_ledger_transaction_id
+            THEN EXCLUDED.last_ledger_transaction_id
+            ELSE wallet_balances.last_ledger_transaction_id
+        END,
+        updated_at = CURRENT_TIMESTAMP
+    """
+)
+
+
+def _pot_split_sql(pot: str) -> str:
+    # Mirrors extract_pot_split on the jsonb the driver hands back: integral numbers count,
+    # booleans are ints (true = 1), anything else (fractions, strings, null) is 0.
+    value = f"lt.metadata->'pot_split'->'{pot}'"
+    return f"""CASE jsonb_typeof({value})
+            WHEN 'number' THEN
+                CASE WHEN ({value})::text ~ '^-?[0-9]+$' THEN ({value})::text::bigint ELSE 0 END
+            WHEN 'boolean' THEN CASE WHEN ({value})::boolean THEN 1 ELSE 0 END
+            ELSE 0
+        END"""
+
+
+# Ledger replay in SQL, mirroring signed_amount_cents/extract_pot_split: SPEND rows are negative.
+_LEDGER_DELTAS_SQL = f"""
+    SELECT
+        lt.wallet_id AS wallet_id,
+        lt.id AS id,
+        CASE WHEN lt.type = 'SPEND' THEN -lt.amount_cents ELSE lt.amount_cents END AS signed,
+        {_pot_split_sql("SPEND")} AS spend,
+        {_pot_split_sql("SAVE")} AS save,
+        {_pot_split_sql("DONATE")} AS donate
+    FROM ledger_transactions lt
+"""
+
+# One statement (one snapshot) so balances updated by concurrent inserts are never half-seen.
+# Incremental runs replay only the ledger rows after each wallet's latest checkpoint.
+_VERIFY_SQL = text(
+    f"""
+    WITH last_checkpoint AS (
+        SELECT DISTINCT ON (wallet_id)
+            wallet_id, last_ledger_transaction_id, total_cents, spend_cents, save_cents,
+            donate_cents
+        FROM wallet_balance_checkpoints
+        WHERE NOT :full_replay
+        ORDER BY wallet_id, last_ledger_transaction_id DESC, id DESC
+    ),
+    ledger AS (
+        SELECT
+            x.wallet_id AS wallet_id,
+            MAX(x.id) AS last_id,
+            SUM(x.signed) AS total_cents,
+            SUM(CASE WHEN x.signed >= 0 THEN x.spend ELSE -x.spend END) AS spend_cents,
+            SUM(CASE WHEN x.signed >= 0 THEN x.save ELSE -x.save END) AS save_cents,
+            SUM(CASE WHEN x.signed >= 0 THEN x.donate ELSE -x.donate END) AS donate_cents
+        FROM ({_LEDGER_DELTAS_SQL}) x
+        LEFT JOIN last_checkpoint cp
+          ON cp.wallet_id = x.wallet_id
+        WHERE cp.wallet_id IS NULL OR x.id > cp.last_ledger_transaction_id
+        GROUP BY x.wallet_id
+    )
+    SELECT
+        w.id AS wallet_id,
+        w.tenant_id AS tenant_id,
+        GREATEST(COALESCE(cp.last_ledger_transaction_id, 0), COALESCE(l.last_id, 0))
+            AS last_ledger_transaction_id,
+        COALESCE(cp.last_ledger_transaction_id, 0) AS checkpoint_ledger_transaction_id,
+        COALESCE(cp.total_cents, 0) + COALESCE(l.total_cents, 0) AS expected_total_cents,
+        COALESCE(cp.spend_cents, 0) + COALESCE(l.spend_cents, 0) AS expected_spend_cents,
+        COALESCE(cp.save_cents, 0) + COALESCE(l.save_cents, 0) AS expected_save_cents,
+        COALESCE(cp.donate_cents, 0) + COALESCE(l.donate_cents, 0) AS expected_donate_cents,
+        COALESCE(wb.total_cents, 0) AS total_cents,
+        COALESCE(wb.spend_cents, 0) AS spend_cents,
+        COALESCE(wb.save_cents, 0) AS save_cents,
+        COALESCE(wb.donate_cents, 0) AS donate_cents
+    FROM wallets w
+    LEFT JOIN last_checkpoint cp
+      ON cp.wallet_id = w.id
+    LEFT JOIN ledger l
+      ON l.wallet_id = w.id
+    LEFT JOIN wallet_balances wb
+      ON wb.wallet_id = w.id
+    ORDER BY w.id ASC
+    """
+)
+
+_BALANCE_COLUMNS = ("total_cents", "spend_cents", "save_cents", "donate_cents")
+MAX_REPORTED_DRIFTS = 50
+
+
+@dataclass(slots=True)
+class WalletBalanceSnapshot:
+    wallet_id: int
+    total_cents: int
+    pot_balances_cents: dict[str, int]
+    last_ledger_transaction_id: int
+
+    @property
+    def unallocated_cents(self) -> int:
+        """Part of the total that came from ledger rows without a pot split."""
+        return self.total_cents - sum(self.pot_balances_cents.values())
+
+
+def apply_ledger_transaction(connection: Any, tx: LedgerTransaction) -> None:
+    delta = ledger_balance_delta(tx.type, int(tx.amount_cents), tx.metadata_json or {})
+    connection.execute(
+        _APPLY_SQL,
+        {
+            "wallet_id": tx.wallet_id,
+            "tenant_id": tx.tenant_id,
+            "total_cents": delta["total"],
+            "spend_cents": delta["SPEND"],
+            "save_cents": delta["SAVE"],
+            "donate_cents": delta["DONATE"],
+            "ledger_transaction_id": int(tx.id or 0),
+        },
+    )
+
+
+def get_wallet_balance(db: Session, *, wallet_id: int) -> WalletBalanceSnapshot:
+    # The after_insert listener updates wallet_balances on the connection, behind the ORM, so
+    # a WalletBalance already in the identity map is refreshed instead of returned as loaded.
+    balance = db.scalar(
+        select(WalletBalance)
+        .where(WalletBalance.wallet_id == wallet_id)
+        .execution_options(populate_existing=True)
+    )
+    if balance is None:
+        # Wallets only get a balance row with their first ledger insert.
+        return WalletBalanceSnapshot(
+            wallet_id=wallet_id,
+            total_cents=0,
+            pot_balances_cents={pot: 0 for pot in WALLET_POTS},
+            last_ledger_transaction_id=0,
+        )
+    return WalletBalanceSnapshot(
+        wallet_id=wallet_id,
+        total_cents=int(balance.total_cents),
+        pot_balances_cents={
+            "SPEND": int(balance.spend_cents),
+            "SAVE": int(balance.save_cents),
+            "DONATE": int(balance.donate_cents),
+        },
+        last_ledger_transaction_id=int(balance.last_ledger_transaction_id),
+    )
+
+
+def _drift_cents(row: Any) -> int:
+    return sum(
+        abs(int(row[f"expected_{column}"]) - int(row[column])) for column in _BALANCE_COLUMNS
+    )
+
+
+def verify_wallet_balances(
+    db: Session, *, full_replay: bool = False, repair: bool = False
+) -> dict[str, Any]:
+    """Recompute balances from the ledger, report drift and write checkpoints.
+
+    Checkpoints always store the ledger-derived values, so a drifted balance row never
+    leaks into the next incremental run. With `repair`, drifted balance rows are overwritten.
+    """
+    rows = db.execute(_VERIFY_SQL, {"full_replay": full_replay}).mappings().all()
+
+    checkpoints: list[dict[str, Any]] = []
+    drifts: list[dict[str, Any]] = []
+    for row in rows:
+        drift = _drift_cents(row)
+        if drift:
+            drifts.append(
+                {
+                    "wallet_id": int(row["wallet_id"]),
+                    "drift_cents": drift,
+                    **{
+                        f"expected_{column}": int(row[f"expected_{column}"])
+                        for column in _BALANCE_COLUMNS
+                    },
+                    **{column: int(row[column]) for column in _BALANCE_COLUMNS},
+                }
+            )
+        if int(row["last_ledger_transaction_id"]) > int(row["checkpoint_ledger_transaction_id"]):
+            checkpoints.append(
+                {
+                    "tenant_id": int(row["tenant_id"]),
+                    "wallet_id": int(row["wallet_id"]),
+                    "last_ledger_transaction_id": int(row["last_ledger_transaction_id"]),
+                    **{column: int(row[f"expected_{column}"]) for column in _BALANCE_COLUMNS},
+                    "drift_cents": drift,
+                }
+            )
+
+    if checkpoints:
+        db.execute(insert(WalletBalanceCheckpoint), checkpoints)
+
+    repaired = 0
+    if repair and drifts:
+        by_wallet = {int(row["wallet_id"]): row for row in rows}
+        for item in drifts:
+            row = by_wallet[item["wallet_id"]]
+            values = {column: int(row[f"expected_{column}"]) for column in _BALANCE_COLUMNS}
+            stmt = pg_insert(WalletBalance).values(
+                wallet_id=int(row["wallet_id"]),
+                tenant_id=int(row["tenant_id"]),
+                last_ledger_transaction_id=int(row["last_ledger_transaction_id"]),
+                **values,
+            )
+            db.execute(
+                stmt.on_conflict_do_update(index_elements=[WalletBalance.wallet_id], set_=values)
+            )
+            repaired += 1
+
+    return {
+        "wallets_checked": len(rows),
+        "drifted": len(drifts),
+        "drift_cents_total": sum(item["drift_cents"] for item in drifts),
+        "checkpoints_written": len(checkpoints),
+        "repaired": repaired,
+        "drifts": drifts[:MAX_REPORTED_DRIFTS],
+    }
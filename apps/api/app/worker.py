@@ -8,9 +8,18 @@ from typing import Any
 from app.core.logging import setup_json_logging
 from app.jobs.axion_nightly import run_axion_nightly_job
 from app.jobs.axion_daily_refresh import refresh_axion_profiles_daily
+from app.jobs.axion_drift_evaluation import run_axion_drift_evaluation_job
+from app.jobs.axion_retention_rollup import run_axion_retention_rollup_job
 from app.db.session import SessionLocal
+from app.jobs.data_export import generate_data_export, purge_expired_data_exports
+from app.jobs.enqueue import enqueue_weekly_summary
+from app.jobs.event_log_partitions import maintain_event_log_partitions
+from app.jobs.game_leaderboard import rebuild_game_leaderboards
+from app.jobs.game_league_rollover import run_game_league_rollover
 from app.jobs.purge_deleted_data import purge_deleted_data
-from app.jobs.weekly_summary import generate_weekly_summaries
+from app.jobs.wallet_balance_verify import run_wallet_balance_verify_job
+from app.jobs.weekly_missions_provision import run_weekly_missions_provision
+from app.jobs.weekly_summary import generate_weekly_summaries, list_weekly_summary_tenant_ids
 from app.services.queue import JobEnvelope, dequeue_job
 
 setup_json_logging()
@@ -23,15 +32,39 @@ def _handle_weekly_summary(payload: dict[str, Any]) -> dict[str, Any]:
     if isinstance(raw_reference_date, str):
         reference_date = date.fromisoformat(raw_reference_date)
 
+    tenant_id = payload.get("tenant_id")
+
     db = SessionLocal()
     try:
-        summaries = generate_weekly_summaries(db, reference_date=reference_date)
+        generated = generate_weekly_summaries(
+            db,
+            reference_date=reference_date,
+            tenant_id=int(tenant_id) if tenant_id is not None else None,
+        )
         db.commit()
-        return {"generated": len(summaries)}
+        return {"generated": generated, "tenant_id": tenant_id}
     finally:
         db.close()
 
 
+def _handle_weekly_summary_fanout(payload: dict[str, Any]) -> dict[str, Any]:
+    # Resolved once here so every tenant job summarizes the same week, even around midnight.
+    raw_reference_date = payload.get("reference_date")
+    if isinstance(raw_reference_date, str):
+        reference_date = date.fromisoformat(raw_reference_date).isoformat()
+    else:
+        reference_date = date.today().isoformat()
+
+    db = SessionLocal()
+    try:
+        tenant_ids = list_weekly_summary_tenant_ids(db)
+    finally:
+        db.close()
+    for tenant_id in tenant_ids:
+        enqueue_weekly_summary(reference_date=reference_date, tenant_id=tenant_id)
+    return {"enqueued_tenants": len(tenant_ids), "reference_date": reference_date}
+
+
 def _handle_purge_deleted_data(_payload: dict[str, Any]) -> dict[str, Any]:
     db = SessionLocal()
     try:
@@ -68,11 +101,152 @@ def _handle_axion_nightly(payload: dict[str, Any]) -> dict[str, Any]:
         db.close()
 
 
+def _handle_event_log_partitions(payload: dict[str, Any]) -> dict[str, Any]:
+    months_ahead = payload.get("months_ahead")
+    retain_months = payload.get("retain_months")
+    db = SessionLocal()
+    try:
+        result = maintain_event_log_partitions(
+            db,
+            months_ahead=int(months_ahead) if months_ahead is not None else None,
+            retain_months=int(retain_months) if retain_months is not None else None,
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_axion_retention_rollup(payload: dict[str, Any]) -> dict[str, Any]:
+    through_day: date | None = None
+    raw_through_day = payload.get("through_day")
+    if isinstance(raw_through_day, str):
+        through_day = date.fromisoformat(raw_through_day)
+    backfill_days = payload.get("backfill_days")
+    db = SessionLocal()
+    try:
+        result = run_axion_retention_rollup_job(
+            db,
+            through_day=through_day,
+            backfill_days=int(backfill_days) if backfill_days is not None else None,
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_data_export(payload: dict[str, Any]) -> dict[str, Any]:
+    db = SessionLocal()
+    try:
+        result = generate_data_export(db, job_id=str(payload.get("job_id") or ""))
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_data_export_purge(_payload: dict[str, Any]) -> dict[str, Any]:
+    db = SessionLocal()
+    try:
+        result = purge_expired_data_exports(db)
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_wallet_balance_verify(payload: dict[str, Any]) -> dict[str, Any]:
+    db = SessionLocal()
+    try:
+        result = run_wallet_balance_verify_job(
+            db,
+            full_replay=bool(payload.get("full_replay", False)),
+            repair=bool(payload.get("repair", False)),
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_axion_drift_evaluation(payload: dict[str, Any]) -> dict[str, Any]:
+    experiment_key = payload.get("experiment_key")
+    db = SessionLocal()
+    try:
+        result = run_axion_drift_evaluation_job(
+            db,
+            experiment_key=str(experiment_key) if experiment_key else "nba_retention_v1",
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_game_leaderboard_rebuild(payload: dict[str, Any]) -> dict[str, Any]:
+    tenant_id = payload.get("tenant_id")
+    game_id = payload.get("game_id")
+    db = SessionLocal()
+    try:
+        result = rebuild_game_leaderboards(
+            db,
+            weeks=max(1, int(payload.get("weeks", 1) or 1)),
+            tenant_id=int(tenant_id) if tenant_id is not None else None,
+            game_id=str(game_id) if game_id else None,
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_game_league_rollover(payload: dict[str, Any]) -> dict[str, Any]:
+    tenant_id = payload.get("tenant_id")
+    db = SessionLocal()
+    try:
+        result = run_game_league_rollover(
+            db, tenant_id=int(tenant_id) if tenant_id is not None else None
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def _handle_weekly_missions_provision(payload: dict[str, Any]) -> dict[str, Any]:
+    target_date: date | None = None
+    raw_target_date = payload.get("target_date")
+    if isinstance(raw_target_date, str):
+        target_date = date.fromisoformat(raw_target_date)
+    db = SessionLocal()
+    try:
+        result = run_weekly_missions_provision(
+            db,
+            target_date=target_date,
+            weeks_ahead=max(0, int(payload.get("weeks_ahead", 1) or 0)),
+        )
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
 JOB_HANDLERS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
     "weekly.summary.generate": _handle_weekly_summary,
+    "weekly.summary.fanout": _handle_weekly_summary_fanout,
     "purge.deleted_data": _handle_purge_deleted_data,
     "axion.mood.refresh.daily": _handle_axion_daily_refresh,
     "axion.nightly.run": _handle_axion_nightly,
+    "event_log.partitions.maintain": _handle_event_log_partitions,
+    "axion.retention.rollup.refresh": _handle_axion_retention_rollup,
+    "export.data.generate": _handle_data_export,
+    "export.data.purge_expired": _handle_data_export_purge,
+    "wallet.balances.verify": _handle_wallet_balance_verify,
+    "axion.drift.evaluate": _handle_axion_drift_evaluation,
+    "games.leaderboard.rebuild": _handle_game_leaderboard_rebuild,
+    "games.league.rollover": _handle_game_league_rollover,
+    "learning.missions.provision": _handle_weekly_missions_provision,
 }
 
 
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+
+from app.services.curriculum_loader import CurriculumLoader, SkillDefinition, SubjectDefinition
+from app.services.skill_graph import SkillGraph, SkillNode, StudentState, _build_subject_nodes
+
+AGE_GROUPS = ("6_8", "9_11", "12_14")
+
+
+def _replicated_subject(subject: SubjectDefinition, copy_index: int) -> SubjectDefinition:
+    suffix = f"_{copy_index}"
+    skills = {
+        f"{skill_name}{suffix}": SkillDefinition(
+            subskills=definition.subskills,
+            lessons=tuple(f"{lesson}{suffix}" for lesson in definition.lessons),
+            difficulty_progression=definition.difficulty_progression,
+        )
+        for skill_name, definition in subject.skills.items()
+    }
+    return SubjectDefinition(
+        subject=f"{subject.subject}{suffix}",
+        age_groups=subject.age_groups,
+        skills=skills,
+        lesson_order=tuple(f"{lesson}{suffix}" for lesson in subject.lesson_order),
+    )
+
+
+def build_synthetic_nodes(scale: int) -> dict[str, SkillNode]:
+    """Replicate the YAML curriculum `scale` times with suffixed subject, skill and lesson ids."""
+    nodes: dict[str, SkillNode] = {}
+    for subject in CurriculumLoader().get_curriculum().values():
+        for copy_index in range(scale):
+            replica = _replicated_subject(subject, copy_index)
+            nodes.update(_build_subject_nodes(replica.subject, replica))
+    return nodes
+
+
+def _timed(
+    label: str, iterations: int, fn: Callable[[int], object]
+) -> dict[str, float | str | int]:
+    started = time.perf_counter()
+    for index in range(iterations):
+        fn(index)
+    elapsed = time.perf_counter() - started
+    return {
+        "operation": label,
+        "iterations": iterations,
+        "total_ms": round(elapsed * 1000, 2),
+        "per_call_us": round(elapsed / iterations * 1e6, 2),
+    }
+
+
+def run_benchmark(*, scale: int, iterations: int, seed: int) -> dict[str, object]:
+    rng = random.Random(seed)
+    nodes = build_synthetic_nodes(scale)
+    subjects = sorted({node.subject for node in nodes.values()})
+    skill_ids = list(nodes)
+
+    started = time.perf_counter()
+    graph = SkillGraph(nodes)
+    compile_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    states = [
+        StudentState(
+            age_group=rng.choice(AGE_GROUPS),
+            difficulty=rng.choice(("easy", "medium", "hard")),
+            subject=rng.choice(subjects),
+            mastery={skill: rng.random() for skill in rng.sample(skill_ids, 20)},
+        )
+        for _ in range(iterations)
+    ]
+    unscoped_states = [
+        StudentState(age_group=state.age_group, difficulty=state.difficulty, mastery=state.mastery)
+        for state in states
+    ]
+    probes = [rng.choice(skill_ids) for _ in range(iterations)]
+
+    return {
+        "scale": scale,
+        "subjects": len(subjects),
+        "skills": len(nodes),
+        "compile_ms": compile_ms,
+        "results": [
+            _timed(
+                "get_next_skill(subject)",
+                iterations,
+                lambda index: graph.get_next_skill(states[index]),
+            ),
+            _timed(
+                "get_next_skill(all subjects)",
+                max(1, iterations // 10),
+                lambda index: graph.get_next_skill(unscoped_states[index]),
+            ),
+            _timed(
+                "get_prerequisite_skills",
+                iterations,
+                lambda index: graph.get_prerequisite_skills(probes[index]),
+            ),
+            _timed(
+                "get_lessons_for_skill",
+                iterations,
+                lambda index: graph.get_lessons_for_skill(probes[index]),
+            ),
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Mede o SkillGraph compilado sobre um curriculo sintetico ampliado."
+    )
+    parser.add_argument(
+        "--scale", type=int, default=100, help="Quantas copias do curriculo YAML gerar."
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    report = run_benchmark(
+        scale=max(1, args.scale), iterations=max(1, args.iterations), seed=args.seed
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from app.services.curriculum_loader import (
+    DEFAULT_CURRICULUM_ARTIFACT_PATH,
+    compile_curriculum_artifact,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Valida o curriculo YAML e gera o artefato compilado em JSON."
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_CURRICULUM_ARTIFACT_PATH)
+    args = parser.parse_args()
+    artifact = compile_curriculum_artifact(artifact_path=args.output)
+    print(
+        json.dumps(
+            {
+                "output": str(args.output),
+                "content_hash": artifact["content_hash"],
+                "subjects": len(artifact["subjects"]),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from sqlalchemy.exc import OperationalError
 from app.models import (
     ChildProfile,
     DailyMission,
+    LedgerTransaction,
+    LedgerTransactionType,
     Membership,
     MembershipRole,
     PotAllocation,
@@ -23,6 +25,7 @@ from app.models import (
 )
 from app.db.base import Base
 from app.db.session import SessionLocal
+from app.services.wallet_balances import apply_ledger_transaction
 
 
 class NoopEvents:
@@ -265,7 +268,7 @@ def _complete_for_mission(tenant_id: int, user_id: int, mission_id: str) -> None
                 if wallet_id is None:
                     raise RuntimeError("Wallet not found for completed mission")
 
-                db.execute(
+                ledger_transaction_id = db.scalar(
                     text(
                         """
                         INSERT INTO ledger_transactions (
@@ -282,6 +285,7 @@ def _complete_for_mission(tenant_id: int, user_id: int, mission_id: str) -> None
                             :amount_cents,
                             CAST(:metadata AS jsonb)
                         )
+                        RETURNING id
                         """
                     ),
                     {
@@ -297,6 +301,18 @@ def _complete_for_mission(tenant_id: int, user_id: int, mission_id: str) -> None
                         ),
                     },
                 )
+                # Raw inserts skip the ORM after_insert hook, so keep wallet_balances in step here.
+                apply_ledger_transaction(
+                    db.connection(),
+                    LedgerTransaction(
+                        id=int(ledger_transaction_id),
+                        tenant_id=tenant_id,
+                        wallet_id=int(wallet_id),
+                        type=LedgerTransactionType.EARN,
+                        amount_cents=coin_reward,
+                        metadata_json={},
+                    ),
+                )
         except Exception as exc:
             raise RuntimeError("Failed to complete mission") from exc
 
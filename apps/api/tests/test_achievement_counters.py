@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import Achievement, GameSession, GameType, LessonProgress
+from app.services import achievement_engine
+
+
+class _FakeScalarResult:
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def scalar_one_or_none(self) -> Any:
+        return self._value
+
+
+class _FakeConnection:
+    def __init__(self, subject_name: str | None = "Matemática") -> None:
+        self.subject_name = subject_name
+        self.counter_calls: list[dict[str, Any]] = []
+
+    def execute(self, stmt: Any, params: dict[str, Any]) -> _FakeScalarResult | None:
+        if "FROM lessons" in str(stmt):
+            return _FakeScalarResult(self.subject_name)
+        self.counter_calls.append(params)
+        return None
+
+
+def _persisted_progress(*, completed: bool, xp_granted: int) -> LessonProgress:
+    progress = LessonProgress(user_id=3, lesson_id=11)
+    set_committed_value(progress, "completed", completed)
+    set_committed_value(progress, "xp_granted", xp_granted)
+    return progress
+
+
+def test_lesson_progress_counters_apply_completion_and_subject_xp_deltas() -> None:
+    connection = _FakeConnection()
+    progress = _persisted_progress(completed=False, xp_granted=0)
+    progress.completed = True
+    progress.xp_granted = 40
+
+    achievement_engine.apply_lesson_progress_counters(connection, progress, inserted=False)
+
+    assert connection.counter_calls == [
+        {"user_id": 3, "counter_key": "lessons_completed", "value": 1, "reset": False},
+        {"user_id": 3, "counter_key": "subject_xp:matematica", "value": 40, "reset": False},
+    ]
+
+    # Idempotent replay keeps the first grant: no counter changes at all.
+    replay = _FakeConnection()
+    unchanged = _persisted_progress(completed=True, xp_granted=40)
+    unchanged.attempts = 2
+    achievement_engine.apply_lesson_progress_counters(replay, unchanged, inserted=False)
+    assert replay.counter_calls == []
+
+
+def test_tictactoe_loss_resets_win_streak_counter() -> None:
+    connection = _FakeConnection()
+
+    achievement_engine.apply_game_session_counters(
+        connection, GameSession(user_id=5, game_type=GameType.TICTACTOE, score=520)
+    )
+    achievement_engine.apply_game_session_counters(
+        connection, GameSession(user_id=5, game_type=GameType.TICTACTOE, score=100)
+    )
+    achievement_engine.apply_game_session_counters(
+        connection, GameSession(user_id=5, game_type=GameType.MEMORY, score=900)
+    )
+
+    assert [(call["value"], call["reset"]) for call in connection.counter_calls] == [
+        (1, False),
+        (0, True),
+    ]
+
+
+class _FakeRows:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _FakeEvaluationDB:
+    def __init__(
+        self,
+        *,
+        achievements: list[Achievement],
+        unlocked_ids: list[int],
+        counters: list[tuple[str, int]],
+    ) -> None:
+        self.achievements = achievements
+        self.unlocked_ids = unlocked_ids
+        self.counters = counters
+        self.added: list[Any] = []
+        self.queries = 0
+
+    def scalars(self, stmt: Any) -> _FakeRows:
+        self.queries += 1
+        if "user_achievements" in str(stmt):
+            return _FakeRows(self.unlocked_ids)
+        return _FakeRows(self.achievements)
+
+    def execute(self, _stmt: Any) -> _FakeRows:
+        self.queries += 1
+        return _FakeRows(self.counters)
+
+    def scalar(self, _stmt: Any) -> int:
+        self.queries += 1
+        return 8
+
+    def add(self, item: Any) -> None:
+        self.added.append(item)
+
+    def flush(self) -> None:
+        return None
+
+
+def test_learning_evaluation_uses_one_snapshot_of_counters_and_unlocks() -> None:
+    achievements = []
+    for index, item in enumerate(achievement_engine.DEFAULT_ACHIEVEMENTS, start=1):
+        achievements.append(Achievement(id=index, slug=item["slug"], xp_reward=0, coin_reward=0))
+    by_slug = {item.slug: item for item in achievements}
+    db = _FakeEvaluationDB(
+        achievements=achievements,
+        unlocked_ids=[by_slug["learning_first_lesson_completed"].id],
+        counters=[
+            ("lessons_completed", 12),
+            ("subject_xp:matematica", 80),
+            ("subject_xp:mathematics", 30),
+        ],
+    )
+    profile = SimpleNamespace(xp=0, level=1, axion_coins=0)
+
+    unlocked = achievement_engine.evaluate_achievements_after_learning(
+        db,  # type: ignore[arg-type]
+        user_id=3,
+        profile=profile,  # type: ignore[arg-type]
+        stars=2,
+    )
+
+    assert unlocked == ["learning_streak_7_days", "learning_math_100_xp"]
+    assert db.queries == 4
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.models import QuestionDifficulty, QuestionResult, UserSkillMastery
+from app.services import adaptive_learning
+
+
+class _FakeScalarResult:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _FakeBatchDB:
+    def __init__(self, existing: list[UserSkillMastery]) -> None:
+        self.existing = existing
+        self.added: list[Any] = []
+        self.executed: list[tuple[Any, Any]] = []
+        self.flushes = 0
+
+    def scalars(self, _stmt: Any) -> _FakeScalarResult:
+        return _FakeScalarResult(self.existing)
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    def execute(self, stmt: Any, params: Any = None) -> None:
+        self.executed.append((stmt, params))
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def _answer(question_id: str, result: QuestionResult) -> adaptive_learning.QuestionAnswerInput:
+    return adaptive_learning.QuestionAnswerInput(
+        question_id=question_id,
+        template_id=None,
+        generated_variant_id=None,
+        variant_id=None,
+        result=result,
+        time_ms=1200,
+    )
+
+
+def test_answer_batch_applies_answers_in_order_with_one_history_insert(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    existing = UserSkillMastery(
+        user_id=5, skill_id="skill-a", mastery=0.5, streak_correct=2, streak_wrong=0
+    )
+    db = _FakeBatchDB([existing])
+    targets = {
+        "q1": ("skill-a", QuestionDifficulty.MEDIUM),
+        "q2": ("skill-b", QuestionDifficulty.HARD),
+        "q3": ("skill-a", QuestionDifficulty.EASY),
+    }
+    energy_calls: list[int] = []
+    monkeypatch.setattr(
+        adaptive_learning,
+        "resolve_effective_learning_settings",
+        lambda *_args, **_kwargs: SimpleNamespace(enable_spaced_repetition=True),
+    )
+    monkeypatch.setattr(
+        adaptive_learning,
+        "_resolve_answer_targets",
+        lambda _db, answers: [targets[str(item.question_id)] for item in answers],
+    )
+    monkeypatch.setattr(
+        adaptive_learning, "get_energy_discount_multiplier", lambda *_args, **_kwargs: 1.0
+    )
+    monkeypatch.setattr(
+        adaptive_learning,
+        "consume_wrong_answer_energy",
+        lambda _db, *, user_id, cost: energy_calls.append(cost),
+    )
+
+    tracked = adaptive_learning.track_question_answers(
+        db,  # type: ignore[arg-type]
+        user_id=5,
+        answers=[
+            _answer("q1", QuestionResult.CORRECT),
+            _answer("q2", QuestionResult.WRONG),
+            _answer("q3", QuestionResult.WRONG),
+        ],
+        tenant_id=1,
+    )
+
+    assert [
+        (item.skill_id, item.mastery, item.streak_correct, item.streak_wrong) for item in tracked
+    ] == [
+        ("skill-a", 0.56, 3, 0),
+        ("skill-b", 0.0, 0, 1),
+        ("skill-a", 0.496, 0, 1),
+    ]
+    assert tracked[0].mastery_delta == pytest.approx(0.06)
+    assert float(existing.mastery) == 0.496
+    assert [row.skill_id for row in db.added] == ["skill-b"]
+    assert energy_calls == [2]
+    assert len(db.executed) == 1
+    history_rows = db.executed[0][1]
+    assert [row["question_id"] for row in history_rows] == ["q1", "q2", "q3"]
+    assert [row["difficulty_served"] for row in history_rows] == [
+        QuestionDifficulty.MEDIUM,
+        QuestionDifficulty.HARD,
+        QuestionDifficulty.EASY,
+    ]
+
+
+def test_answer_batch_rejects_unknown_question() -> None:
+    class _EmptyDB(_FakeBatchDB):
+        def scalars(self, _stmt: Any) -> _FakeScalarResult:
+            return _FakeScalarResult([])
+
+    with pytest.raises(ValueError, match="Question not found"):
+        adaptive_learning._resolve_answer_targets(
+            _EmptyDB([]),  # type: ignore[arg-type]
+            [_answer("00000000-0000-0000-0000-000000000001", QuestionResult.CORRECT)],
+        )
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.models import LessonDifficulty, LessonProgress, LessonType, SubjectAgeGroup
+from app.services import aprender
+
+
+def _structure(
+    lessons_per_unit: list[int], *, required_levels: list[int] | None = None
+) -> aprender.SubjectPathStructure:
+    units: list[aprender.PathUnit] = []
+    lesson_id = 100
+    for unit_index, lesson_count in enumerate(lessons_per_unit):
+        unit_id = unit_index + 1
+        lessons = []
+        for order in range(1, lesson_count + 1):
+            lesson_id += 1
+            lessons.append(
+                aprender.PathLesson(
+                    id=lesson_id,
+                    unit_id=unit_id,
+                    title=f"Licao {lesson_id}",
+                    order=order,
+                    xp_reward=20,
+                    difficulty=LessonDifficulty.EASY,
+                    type=LessonType.QUIZ,
+                )
+            )
+        units.append(
+            aprender.PathUnit(
+                id=unit_id,
+                subject_id=7,
+                title=f"Unidade {unit_id}",
+                description=None,
+                order=unit_id,
+                required_level=(required_levels or [1] * len(lessons_per_unit))[unit_index],
+                lessons=tuple(lessons),
+            )
+        )
+    return aprender.SubjectPathStructure(
+        subject=aprender.PathSubject(
+            id=7,
+            name="Matematica",
+            age_group=SubjectAgeGroup.AGE_9_12,
+            age_min=9,
+            age_max=12,
+            icon=None,
+            color=None,
+            order=1,
+        ),
+        units=tuple(units),
+        lesson_positions={
+            lesson.id: (unit_index, lesson_index)
+            for unit_index, unit in enumerate(units)
+            for lesson_index, lesson in enumerate(unit.lessons)
+        },
+    )
+
+
+def _patch_user_state(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    level: int,
+    completed_counts: dict[int, int],
+    completed_lesson_ids: set[int],
+) -> list[list[int]]:
+    progress_reads: list[list[int]] = []
+
+    def _progress(_db: Any, *, user_id: int, lesson_ids: list[int]) -> dict[int, Any]:
+        progress_reads.append(list(lesson_ids))
+        return {
+            lesson_id: SimpleNamespace(completed=True, score=90, completed_at=None)
+            for lesson_id in lesson_ids
+            if lesson_id in completed_lesson_ids
+        }
+
+    monkeypatch.setattr(
+        aprender,
+        "get_or_create_game_profile",
+        lambda *_args, **_kwargs: SimpleNamespace(level=level),
+    )
+    monkeypatch.setattr(
+        aprender,
+        "_unit_completed_counts",
+        lambda _db, *, user_id, unit_ids: {
+            unit_id: completed_counts.get(unit_id, 0) for unit_id in unit_ids
+        },
+    )
+    monkeypatch.setattr(aprender, "_progress_by_lesson", _progress)
+    return progress_reads
+
+
+def test_subject_path_uses_unit_counters_for_completion_and_unlocks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    structure = _structure([5, 2, 2])
+    monkeypatch.setattr(aprender, "get_subject_structure", lambda *_args, **_kwargs: structure)
+    _patch_user_state(
+        monkeypatch, level=3, completed_counts={1: 4}, completed_lesson_ids={101, 102, 103, 104}
+    )
+
+    path = aprender.build_subject_path(object(), user_id=9, subject_id=7)  # type: ignore[arg-type]
+
+    assert [unit.completion_rate for unit in path.units] == [0.8, 0.0, 0.0]
+    assert [unit.unlocked for unit in path.units] == [True, True, False]
+    assert [lesson.unlocked for lesson in path.units[0].lessons] == [True, True, True, True, True]
+    assert [lesson.unlocked for lesson in path.units[1].lessons] == [True, False]
+    assert path.subject.name == "Matematica"
+
+
+def test_lesson_unlock_check_reads_only_neighbouring_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    structure = _structure([5, 3], required_levels=[1, 2])
+    progress_reads = _patch_user_state(
+        monkeypatch, level=2, completed_counts={1: 4}, completed_lesson_ids={106}
+    )
+
+    assert (
+        aprender._is_lesson_unlocked(object(), user_id=9, structure=structure, lesson_id=107)
+        is True
+    )  # type: ignore[arg-type]
+    assert progress_reads[-1] == [107, 106]
+    assert (
+        aprender._is_lesson_unlocked(object(), user_id=9, structure=structure, lesson_id=108)
+        is False
+    )  # type: ignore[arg-type]
+    assert (
+        aprender._is_lesson_unlocked(object(), user_id=9, structure=structure, lesson_id=999)
+        is False
+    )  # type: ignore[arg-type]
+
+    _patch_user_state(monkeypatch, level=1, completed_counts={1: 5}, completed_lesson_ids=set())
+    assert (
+        aprender._is_lesson_unlocked(object(), user_id=9, structure=structure, lesson_id=106)
+        is False
+    )  # type: ignore[arg-type]
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def execute(self, _stmt: Any, params: dict[str, Any]) -> None:
+        self.calls.append(params)
+
+
+def test_unit_counter_only_moves_on_completion_transitions() -> None:
+    connection = _FakeConnection()
+
+    aprender.apply_lesson_progress_unit_counter(
+        connection, LessonProgress(user_id=9, lesson_id=101, completed=True), inserted=True
+    )
+    aprender.apply_lesson_progress_unit_counter(
+        connection, LessonProgress(user_id=9, lesson_id=102, completed=False), inserted=True
+    )
+
+    assert connection.calls == [{"user_id": 9, "lesson_id": 101, "delta": 1}]
+
+
+def test_subject_structure_is_cached_until_invalidated(monkeypatch: pytest.MonkeyPatch) -> None:
+    loads: list[int] = []
+    structure = _structure([1])
+
+    def _load(_db: Any, *, subject_id: int) -> aprender.SubjectPathStructure:
+        loads.append(subject_id)
+        return structure
+
+    aprender.invalidate_subject_structure_cache()
+    monkeypatch.setattr(aprender, "_load_subject_structure_from_db", _load)
+    monkeypatch.setattr(aprender.app_settings, "aprender_structure_cache_ttl_seconds", 300)
+
+    assert aprender.get_subject_structure(object(), subject_id=7) is structure  # type: ignore[arg-type]
+    assert aprender.get_subject_structure(object(), subject_id=7) is structure  # type: ignore[arg-type]
+    aprender.invalidate_subject_structure_cache(7)
+    aprender.get_subject_structure(object(), subject_id=7)  # type: ignore[arg-type]
+    aprender.invalidate_subject_structure_cache()
+
+    assert loads == [7, 7]
+
+
+def test_structure_cache_misses_reload_unknown_lessons(monkeypatch: pytest.MonkeyPatch) -> None:
+    loads: list[int] = []
+    cached = _structure([1])
+    fresh = _structure([2])
+
+    def _load(_db: Any, *, subject_id: int) -> aprender.SubjectPathStructure:
+        loads.append(subject_id)
+        return cached if len(loads) == 1 else fresh
+
+    aprender.invalidate_subject_structure_cache()
+    monkeypatch.setattr(aprender, "_load_subject_structure_from_db", _load)
+    monkeypatch.setattr(aprender.app_settings, "aprender_structure_cache_ttl_seconds", 300)
+
+    new_lesson_id = next(iter(set(fresh.lesson_positions) - set(cached.lesson_positions)))
+    assert aprender.get_subject_structure(object(), subject_id=7) is cached  # type: ignore[arg-type]
+    assert aprender.get_subject_structure(object(), subject_id=7, lesson_id=new_lesson_id) is fresh  # type: ignore[arg-type]
+    assert aprender.get_subject_structure(object(), subject_id=7) is fresh  # type: ignore[arg-type]
+    aprender.invalidate_subject_structure_cache()
+
+    assert loads == [7, 7]
+
+
+def test_structure_cache_is_invalidated_when_the_session_commits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = Session(create_engine("sqlite://"))
+    aprender.invalidate_subject_structure_cache()
+    monkeypatch.setattr(aprender.app_settings, "aprender_structure_cache_ttl_seconds", 300)
+    monkeypatch.setattr(
+        aprender, "_load_subject_structure_from_db", lambda *_args, **_kwargs: _structure([1])
+    )
+    try:
+        aprender.get_subject_structure(session, subject_id=7)
+        session.execute(text("SELECT 1"))
+        aprender.invalidate_subject_structure_cache_after_commit(session)
+        assert 7 in aprender._SUBJECT_STRUCTURE_CACHE
+        session.commit()
+        assert 7 not in aprender._SUBJECT_STRUCTURE_CACHE
+
+        aprender.get_subject_structure(session, subject_id=7)
+        session.execute(text("SELECT 1"))
+        aprender.invalidate_subject_structure_cache_after_commit(session)
+        session.rollback()
+        assert 7 not in aprender._SUBJECT_STRUCTURE_CACHE
+    finally:
+        session.close()
+        aprender.invalidate_subject_structure_cache()
@@ -51,20 +51,16 @@ def test_xp_increments_after_lesson_completion(monkeypatch: Any) -> None:
     profile = SimpleNamespace(xp=120, level=2, daily_xp=0, axion_coins=0)
     learning_status = SimpleNamespace(unit_boost_multiplier=1.0, unit_boost_remaining_lessons=0)
 
-    path = SimpleNamespace(
-        units=[
-            SimpleNamespace(
-                lessons=[
-                    SimpleNamespace(lesson=lesson, unlocked=True),
-                ]
-            )
-        ]
+    structure = SimpleNamespace(
+        units=[SimpleNamespace(id=unit.id, lessons=(SimpleNamespace(id=lesson.id),))],
+        lesson_positions={lesson.id: (0, 0)},
     )
 
-    monkeypatch.setattr(aprender, "build_subject_path", lambda *_args, **_kwargs: path)
+    monkeypatch.setattr(aprender, "get_subject_structure", lambda *_args, **_kwargs: structure)
+    monkeypatch.setattr(aprender, "_is_lesson_unlocked", lambda *_args, **_kwargs: True)
     monkeypatch.setattr(aprender, "_get_or_create_learning_status", lambda *_args, **_kwargs: learning_status)
     monkeypatch.setattr(aprender, "_resolve_learning_settings", lambda *_args, **_kwargs: (9999, 1.0))
-    monkeypatch.setattr(aprender, "_is_unit_completed", lambda *_args, **_kwargs: False)
+    monkeypatch.setattr(aprender, "_unit_completed_lessons", lambda *_args, **_kwargs: 0)
     monkeypatch.setattr(aprender, "register_learning_lesson_completion", lambda *_args, **_kwargs: None)
     monkeypatch.setattr(aprender, "evaluate_achievements_after_learning", lambda *_args, **_kwargs: [])
     monkeypatch.setattr(aprender, "get_or_create_game_profile", lambda *_args, **_kwargs: profile)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.models import ChildProfile, Membership, MembershipRole, Tenant, TenantType, User
+from app.services import auth_context
+from app.services.axion_child_profile import resolve_child_for_user
+from app.services.axion_feature_vector import _resolve_tenant_id
+
+
+class _FakeRow:
+    def __init__(self, row: tuple[Any, ...] | None) -> None:
+        self._row = row
+
+    def first(self) -> tuple[Any, ...] | None:
+        return self._row
+
+
+class _FakeAuthDB:
+    def __init__(self, row: tuple[Any, ...]) -> None:
+        self.row = row
+        self.info: dict[str, Any] = {}
+        self.statements: list[str] = []
+
+    def execute(self, stmt: Any) -> _FakeRow:
+        self.statements.append(str(stmt))
+        return _FakeRow(self.row)
+
+    def scalar(self, stmt: Any) -> Any:
+        raise AssertionError(f"unexpected query: {stmt}")
+
+    def scalars(self, stmt: Any) -> Any:
+        raise AssertionError(f"unexpected query: {stmt}")
+
+    def get(self, *_args: Any) -> Any:
+        raise AssertionError("unexpected primary key lookup")
+
+
+def _identity() -> tuple[User, Tenant, Membership, ChildProfile]:
+    user = User(id=10, email="parent@local.com", name="Parent", password_hash="hashed")
+    tenant = Tenant(id=21, type=TenantType.FAMILY, name="Family", slug="family-beta")
+    membership = Membership(id=5, user_id=user.id, tenant_id=tenant.id, role=MembershipRole.PARENT)
+    child = ChildProfile(id=31, tenant_id=tenant.id, display_name="Kid")
+    return user, tenant, membership, child
+
+
+@pytest.fixture(autouse=True)
+def _clear_auth_cache(monkeypatch: pytest.MonkeyPatch) -> Any:
+    monkeypatch.setattr(auth_context.app_settings, "auth_context_cache_ttl_seconds", 30)
+    auth_context.invalidate_auth_context_cache()
+    yield
+    auth_context.invalidate_auth_context_cache()
+
+
+def test_request_dependencies_share_one_joined_query() -> None:
+    user, tenant, membership, child = _identity()
+    db = _FakeAuthDB((user, tenant, membership, child))
+    request = SimpleNamespace(
+        state=SimpleNamespace(), url=SimpleNamespace(path="/api/learning/path")
+    )
+    token = create_access_token(user_id=user.id, tenant_id=tenant.id, role="PARENT")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    resolved_tenant = deps.get_current_tenant(db, request, credentials, "family-beta")  # type: ignore[arg-type]
+    resolved_user = deps.get_current_user(db, request, credentials, "family-beta")  # type: ignore[arg-type]
+    resolved_membership = deps.get_current_membership(db, resolved_user, resolved_tenant)  # type: ignore[arg-type]
+
+    assert (resolved_user, resolved_tenant, resolved_membership) == (user, tenant, membership)
+    assert request.state.tenant_id == tenant.id
+    assert len(db.statements) == 1
+    assert resolve_child_for_user(db, user_id=user.id, tenant_id=tenant.id) == child.id  # type: ignore[arg-type]
+    assert _resolve_tenant_id(db, user_id=user.id) == tenant.id  # type: ignore[arg-type]
+    assert auth_context.get_request_auth_context(db, user_id=99) is None  # type: ignore[arg-type]
+
+
+def test_context_ids_are_cached_per_jti_and_rows_are_reloaded() -> None:
+    user, tenant, membership, child = _identity()
+    first = _FakeAuthDB((user, tenant, membership, child))
+    auth_context.load_auth_context(first, user_id=user.id, tenant_slug="family-beta", jti="abc")  # type: ignore[arg-type]
+    assert "child_profiles_1" in first.statements[0]
+
+    second = _FakeAuthDB((user, tenant, None, child))
+    context = auth_context.load_auth_context(
+        second, user_id=user.id, tenant_slug="family-beta", jti="abc"
+    )  # type: ignore[arg-type]
+    assert "child_profiles_1" not in second.statements[0]
+    assert "tenants.id =" in second.statements[0]
+    assert context.membership is None
+
+    auth_context.invalidate_auth_context_cache("abc")
+    third = _FakeAuthDB((user, tenant, membership, child))
+    auth_context.load_auth_context(third, user_id=user.id, tenant_slug="family-beta", jti="abc")  # type: ignore[arg-type]
+    assert "child_profiles_1" in third.statements[0]
+
+
+def test_context_without_membership_is_not_served_to_services() -> None:
+    user, tenant, _membership, _child = _identity()
+    db = _FakeAuthDB((user, tenant, None, None))
+
+    context = auth_context.load_auth_context(
+        db, user_id=user.id, tenant_slug="family-beta", jti="outsider"
+    )  # type: ignore[arg-type]
+
+    assert "memberships.id IS NOT NULL" in db.statements[0]
+    assert context.membership is None
+    assert auth_context.get_request_auth_context(db, user_id=user.id) is None  # type: ignore[arg-type]
+    assert auth_context._cached_ids("outsider", "family-beta") is None
+    auth_context.load_auth_context(db, user_id=user.id, tenant_slug="family-beta", jti="outsider")  # type: ignore[arg-type]
+    assert len(db.statements) == 1
@@ -71,3 +71,63 @@ def test_prerequisite_uses_mastery_score_not_delta(monkeypatch) -> None:
         mastery_threshold=0.6,
     )
     assert allowed is False
+
+
+class _FakeResult:
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[tuple]:
+        return self._rows
+
+
+class _FakeBulkDB:
+    def __init__(self, results: list[list[tuple]]) -> None:
+        self.results = list(results)
+        self.inserted: list[tuple[str, list[dict]]] = []
+        self.reads = 0
+
+    def execute(self, stmt, params=None):
+        if params is not None:
+            self.inserted.append((stmt.table.name, params))
+            return None
+        self.reads += 1
+        return _FakeResult(self.results.pop(0))
+
+    def scalars(self, _stmt):
+        self.reads += 1
+        return _FakeResult(self.results.pop(0))
+
+
+def test_bulk_filter_uses_fixed_reads_and_records_only_changed_states(monkeypatch) -> None:
+    unlocks: list[int] = []
+    monkeypatch.setattr(prereq, "safe_increment_prereq_unlock_total", lambda: unlocks.append(1))
+    db = _FakeBulkDB(
+        [
+            [(200, 100), (300, 101), (400, 102)],
+            [100, 101],
+            [(100, " Math "), (101, "science"), (102, "math")],
+            [("math", 0.8), ("science", 0.3)],
+            [("200", "false"), ("300", "false"), ("500", "true")],
+        ]
+    )
+
+    allowed = prereq.filter_candidates_by_prerequisites(
+        db,  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=10,
+        candidate_content_ids=[200, 300, 400, 500, 200],
+        mastery_threshold=0.6,
+    )
+
+    assert allowed == [200, 500, 200]
+    assert db.reads == 5
+    assert len(db.inserted) == 1
+    table_name, rows = db.inserted[0]
+    assert table_name == "event_log"
+    assert [(row["type"], row["payload"]) for row in rows] == [
+        ("axion_prereq_unlocked", {"content_id": 200}),
+        ("axion_prereq_eligibility_state", {"content_id": 200, "eligible": True}),
+        ("axion_prereq_eligibility_state", {"content_id": 400, "eligible": False}),
+    ]
+    assert unlocks == [1]
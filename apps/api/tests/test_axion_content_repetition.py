@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from types import SimpleNamespace
 
-from app.services.axion_content_repetition import compute_content_fingerprint, filter_repeated_candidates
+from app.services.axion_content_repetition import (
+    compute_content_fingerprint,
+    filter_repeated_candidates,
+)
 
 
 class _FakeScalarRows:
@@ -19,9 +23,11 @@ class _FakeDB:
         self._catalog_rows = catalog_rows
         self._history_rows = history_rows
         self._calls = 0
+        self.statements: list[object] = []
 
-    def scalars(self, *_args: object, **_kwargs: object) -> _FakeScalarRows:
+    def scalars(self, stmt: object, *_args: object, **_kwargs: object) -> _FakeScalarRows:
         self._calls += 1
+        self.statements.append(stmt)
         if self._calls == 1:
             return _FakeScalarRows(self._catalog_rows)
         return _FakeScalarRows(self._history_rows)
@@ -94,3 +100,29 @@ def test_repeat_allowed_for_review_after_incorrect() -> None:
     )
     assert eligible == [1003]
 
+
+def test_repetition_reads_recency_index_instead_of_history() -> None:
+    fp = compute_content_fingerprint(
+        normalized_text="3 x 3", content_type="question", subject="math"
+    )
+    db = _FakeDB(
+        catalog_rows=[SimpleNamespace(content_id=1004, content_fingerprint=fp)], history_rows=[]
+    )
+
+    filter_repeated_candidates(
+        db, tenant_id=1, child_id=10, candidate_content_ids=[1004], window_days=7
+    )
+
+    recency_stmt = str(db.statements[1])
+    assert "FROM child_content_recency" in recency_stmt
+    assert "child_content_history" not in recency_stmt
+    assert "ORDER BY" not in recency_stmt
+
+
+def test_history_trigger_upserts_latest_served_per_fingerprint() -> None:
+    versions = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+    migration = (versions / "0133_child_content_recency_trigger.py").read_text(encoding="utf-8")
+
+    assert "AFTER INSERT OR UPDATE" in migration
+    assert "ON CONFLICT (tenant_id, child_id, content_fingerprint) DO UPDATE" in migration
+    assert ">= (child_content_recency.served_at, child_content_recency.history_id)" in migration
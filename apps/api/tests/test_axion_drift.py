@@ -1,32 +1,60 @@
 from __future__ import annotations
 
+from collections import Counter
+from datetime import UTC, datetime
+
+from app.jobs import axion_drift_evaluation
 from app.services import axion_drift
 
 
+def _histograms(payloads: list[dict[str, object]]) -> dict[str, Counter[str]]:
+    output: dict[str, Counter[str]] = {}
+    for row in axion_drift.build_feature_histogram_rows(
+        {
+            "tenant_id": 1,
+            "snapshot_at": datetime(2026, 10, 19, tzinfo=UTC),
+            "features_json": payload,
+        }
+        for payload in payloads
+    ):
+        output.setdefault(row["feature_name"], Counter())[row["feature_value"]] += row[
+            "sample_count"
+        ]
+    return output
+
+
+def _patch_aggregates(monkeypatch, *, baseline, recent, outcome_means=(100.0, 100.0)) -> None:
+    monkeypatch.setattr(
+        axion_drift,
+        "_load_feature_histograms",
+        lambda *_args, **_kwargs: {1: (_histograms(baseline), _histograms(recent))},
+    )
+    monkeypatch.setattr(
+        axion_drift, "_load_outcome_means", lambda *_args, **_kwargs: {1: outcome_means}
+    )
+
+
 def test_feature_drift_detected(monkeypatch) -> None:
-    monkeypatch.setattr(axion_drift, "_load_outcome_means", lambda *_args, **_kwargs: (100.0, 100.0))
-    monkeypatch.setattr(axion_drift, "_load_feature_payloads", lambda *_args, **_kwargs: [])
+    _patch_aggregates(
+        monkeypatch, baseline=[{"variant": "A"}] * 200, recent=[{"variant": "B"}] * 200
+    )
     monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_warn_threshold", 0.2)
     monkeypatch.setattr(axion_drift.settings, "axion_outcome_drift_warn_pct", 20.0)
 
-    # Repatch with explicit toggling through call counter.
-    calls = {"n": 0}
-
-    def _feature_loader(*_args, **_kwargs):
-        calls["n"] += 1
-        return (["A"] * 200) if calls["n"] == 1 else (["B"] * 200)
-
-    monkeypatch.setattr(axion_drift, "_load_feature_signatures", _feature_loader)
-
     result = axion_drift.evaluate_drift_status(object(), tenant_id=1, experiment_key="nba_retention_v1")
     assert result.feature_drift_score > 0.2
+    assert result.baseline_feature_samples == 200
+    assert result.recent_feature_samples == 200
     assert result.status in {"WARN", "CRITICAL"}
 
 
 def test_outcome_drift_detected(monkeypatch) -> None:
-    monkeypatch.setattr(axion_drift, "_load_feature_signatures", lambda *_args, **_kwargs: ["A"] * 100)
-    monkeypatch.setattr(axion_drift, "_load_feature_payloads", lambda *_args, **_kwargs: [])
-    monkeypatch.setattr(axion_drift, "_load_outcome_means", lambda *_args, **_kwargs: (100.0, 60.0))
+    _patch_aggregates(
+        monkeypatch,
+        baseline=[{"variant": "A"}] * 100,
+        recent=[{"variant": "A"}] * 100,
+        outcome_means=(100.0, 60.0),
+    )
     monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_warn_threshold", 0.2)
     monkeypatch.setattr(axion_drift.settings, "axion_outcome_drift_warn_pct", 20.0)
 
@@ -46,15 +74,7 @@ def test_per_feature_drift_reports_top_features(monkeypatch) -> None:
         {"age_bucket": "13_plus", "plan_type": "PRO", "streak_length": 2},
         {"age_bucket": "13_plus", "plan_type": "PRO", "streak_length": 3},
     ]
-    calls = {"n": 0}
-
-    def _payloads(*_args, **_kwargs):
-        calls["n"] += 1
-        return baseline if calls["n"] == 1 else recent
-
-    monkeypatch.setattr(axion_drift, "_load_feature_signatures", lambda *_args, **_kwargs: ["S"] * 10)
-    monkeypatch.setattr(axion_drift, "_load_feature_payloads", _payloads)
-    monkeypatch.setattr(axion_drift, "_load_outcome_means", lambda *_args, **_kwargs: (100.0, 100.0))
+    _patch_aggregates(monkeypatch, baseline=baseline, recent=recent)
     monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_warn_threshold", 0.2)
     monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_thresholds_json", None)
 
@@ -68,15 +88,7 @@ def test_per_feature_drift_reports_top_features(monkeypatch) -> None:
 def test_feature_specific_threshold_applied(monkeypatch) -> None:
     baseline = [{"streak_length": 1}, {"streak_length": 1}, {"streak_length": 2}, {"streak_length": 2}]
     recent = [{"streak_length": 2}, {"streak_length": 2}, {"streak_length": 2}, {"streak_length": 2}]
-    calls = {"n": 0}
-
-    def _payloads(*_args, **_kwargs):
-        calls["n"] += 1
-        return baseline if calls["n"] == 1 else recent
-
-    monkeypatch.setattr(axion_drift, "_load_feature_signatures", lambda *_args, **_kwargs: ["S"] * 10)
-    monkeypatch.setattr(axion_drift, "_load_feature_payloads", _payloads)
-    monkeypatch.setattr(axion_drift, "_load_outcome_means", lambda *_args, **_kwargs: (100.0, 100.0))
+    _patch_aggregates(monkeypatch, baseline=baseline, recent=recent)
     monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_warn_threshold", 0.2)
     monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_thresholds_json", '{"streak_length":0.8}')
 
@@ -84,3 +96,78 @@ def test_feature_specific_threshold_applied(monkeypatch) -> None:
     streak_row = next(item for item in result.per_feature_drift if item["feature_name"] == "streak_length")
     assert streak_row["threshold"] == 0.8
     assert streak_row["status"] == "OK"
+
+
+def test_missing_feature_counts_as_null_in_per_feature_drift(monkeypatch) -> None:
+    baseline = [{"streak_length": 2, "plan_type": "PRO"}] * 4
+    recent = [{"streak_length": 2}] * 2 + [{"streak_length": 2, "plan_type": "PRO"}] * 2
+    _patch_aggregates(monkeypatch, baseline=baseline, recent=recent)
+    monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_thresholds_json", None)
+
+    result = axion_drift.evaluate_drift_status(
+        object(), tenant_id=1, experiment_key="nba_retention_v1"
+    )
+    drift_by_feature = {
+        item["feature_name"]: item["drift_score"] for item in result.per_feature_drift
+    }
+    assert drift_by_feature == {"plan_type": 0.5, "streak_length": 0.0}
+    assert axion_drift.FEATURE_SIGNATURE_KEY not in drift_by_feature
+
+
+def test_histogram_rows_group_snapshots_by_tenant_day_and_value() -> None:
+    day_one = datetime(2026, 10, 18, 23, 59, tzinfo=UTC)
+    day_two = datetime(2026, 10, 19, 0, 1, tzinfo=UTC)
+    snapshots = [
+        {
+            "tenant_id": 1,
+            "snapshot_at": day_one,
+            "features_json": {"plan_type": "PRO", "streak_length": 2},
+        },
+        {
+            "tenant_id": 1,
+            "snapshot_at": day_one,
+            "features_json": {"streak_length": 2, "plan_type": "PRO"},
+        },
+        {
+            "tenant_id": 1,
+            "snapshot_at": day_two,
+            "features_json": {"plan_type": "FREE", "streak_length": 2},
+        },
+        {
+            "tenant_id": 2,
+            "snapshot_at": day_one,
+            "features_json": {"plan_type": "PRO", "streak_length": 2},
+        },
+    ]
+
+    rows = axion_drift.build_feature_histogram_rows(snapshots)
+    counts = {
+        (r["tenant_id"], r["stat_date"].isoformat(), r["feature_name"], r["feature_value"]): r[
+            "sample_count"
+        ]
+        for r in rows
+    }
+
+    assert counts[(1, "2026-10-18", "plan_type", '"PRO"')] == 2
+    assert counts[(1, "2026-10-18", "streak_length", "2")] == 2
+    assert counts[(1, "2026-10-19", "plan_type", '"FREE"')] == 1
+    assert counts[(2, "2026-10-18", "plan_type", '"PRO"')] == 1
+    signature = axion_drift.feature_signature({"plan_type": "PRO", "streak_length": 2})
+    assert counts[(1, "2026-10-18", axion_drift.FEATURE_SIGNATURE_KEY, signature)] == 2
+    assert rows == sorted(
+        rows, key=lambda r: (r["tenant_id"], r["stat_date"], r["feature_name"], r["feature_value"])
+    )
+
+
+def test_drift_evaluation_job_reports_drifting_tenants(monkeypatch) -> None:
+    _patch_aggregates(
+        monkeypatch, baseline=[{"variant": "A"}] * 200, recent=[{"variant": "B"}] * 200
+    )
+    monkeypatch.setattr(axion_drift.settings, "axion_feature_drift_warn_threshold", 0.2)
+    monkeypatch.setattr(axion_drift.settings, "axion_outcome_drift_warn_pct", 20.0)
+
+    result = axion_drift_evaluation.run_axion_drift_evaluation_job(object())  # type: ignore[arg-type]
+
+    assert result["tenants_evaluated"] == 1
+    assert result["tenants_warned"] == 1
+    assert result["warned_tenant_ids"] == [1]
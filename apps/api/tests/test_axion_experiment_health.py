@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 
 from app.services import axion_experiment_health as health
 
@@ -37,6 +38,30 @@ class _FakeSummaryDB:
         return None
 
 
+def _patch_variant_stats(monkeypatch, fake_metrics) -> None:
+    """Serve the grouped per-variant stats from a per-variant fake, like the old per-query mocks."""
+
+    def _fake_load(
+        db: object, *, experiment_keys: list[str], **_kwargs: object
+    ) -> dict[str, health.ExperimentVariantStats]:
+        variants = health._get_active_variants(db, experiment_key=experiment_keys[0])
+        return {
+            key: health.ExperimentVariantStats(
+                experiment_key=key,
+                retention={
+                    variant.lower(): fake_metrics(db, filters=SimpleNamespace(variant=variant))
+                    for variant in variants
+                },
+                error_counts={},
+                crash_counts={},
+                invalid_decision_counts={},
+            )
+            for key in experiment_keys
+        }
+
+    monkeypatch.setattr(health, "load_experiment_variant_stats", _fake_load)
+
+
 def test_evaluate_experiment_health_auto_pauses_on_abrupt_started_drop(monkeypatch) -> None:
     db = _FakeDB()
     state: dict[str, object] = {"deactivated": False, "audit_calls": 0, "alerts": 0}
@@ -53,9 +78,7 @@ def test_evaluate_experiment_health_auto_pauses_on_abrupt_started_drop(monkeypat
             return {"cta_to_session_started_conversion": 58.0, "exposures_total": 20}
         return {"cta_to_session_started_conversion": 50.0, "exposures_total": 140}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
-    monkeypatch.setattr(health, "_count_experiment_events", lambda *_args, **_kwargs: 0)
-    monkeypatch.setattr(health, "_count_invalid_decisions", lambda *_args, **_kwargs: 0)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     monkeypatch.setattr(
         health,
         "_deactivate_experiment",
@@ -96,17 +119,14 @@ def test_alert_sent_on_auto_pause(monkeypatch) -> None:
     state: dict[str, int] = {"alerts": 0}
 
     monkeypatch.setattr(health, "_get_active_variants", lambda *_args, **_kwargs: ["CONTROL", "VARIANT_A"])
-    monkeypatch.setattr(
-        health,
-        "get_axion_retention_metrics",
+    _patch_variant_stats(
+        monkeypatch,
         lambda _db, *, filters: (
             {"cta_to_session_started_conversion": 60.0, "exposures_total": 100}
             if getattr(filters, "variant", None) == "CONTROL"
             else {"cta_to_session_started_conversion": 20.0, "exposures_total": 100}
         ),
     )
-    monkeypatch.setattr(health, "_count_experiment_events", lambda *_args, **_kwargs: 0)
-    monkeypatch.setattr(health, "_count_invalid_decisions", lambda *_args, **_kwargs: 0)
     monkeypatch.setattr(health, "_deactivate_experiment", lambda *_args, **_kwargs: 1)
     monkeypatch.setattr(health, "_resolve_audit_context", lambda *_args, **_kwargs: (1, 1))
     monkeypatch.setattr(health, "_write_auto_pause_audit", lambda *_args, **_kwargs: None)
@@ -158,7 +178,7 @@ def test_evaluate_experiment_winner_marks_variant_when_significant_uplift(monkey
             }
         return {"cta_click_users": 3000, "cta_session_started_converted_users": 985, "cta_to_session_started_conversion": 32.83, "d7_rate": 20.17}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     monkeypatch.setattr(
         health,
         "_set_winner_variant",
@@ -310,7 +330,7 @@ def test_auto_pause_when_negative_significant(monkeypatch) -> None:
             "d7_rate": 18.0,
         }
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     monkeypatch.setattr(health, "_resolve_audit_context", lambda *_args, **_kwargs: (1, 1))
     monkeypatch.setattr(
         health,
@@ -380,7 +400,7 @@ def test_rollout_progression(monkeypatch) -> None:
             return {"cta_click_users": 1000, "cta_session_started_converted_users": 380}
         return {"cta_click_users": 2000, "cta_session_started_converted_users": 680}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
 
     result = health.evaluate_rollout_progression(
         db,
@@ -426,7 +446,7 @@ def test_no_scale_if_not_significant(monkeypatch) -> None:
             return {"cta_click_users": 1000, "cta_session_started_converted_users": 305}
         return {"cta_click_users": 2000, "cta_session_started_converted_users": 605}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     monkeypatch.setattr(health, "_two_proportion_pvalue", lambda *_args, **_kwargs: 0.20)
 
     result = health.evaluate_rollout_progression(
@@ -449,8 +469,6 @@ def test_auto_disable_canary_on_negative_lift(monkeypatch) -> None:
     state: dict[str, object] = {"disabled": 0}
 
     monkeypatch.setattr(health, "_get_active_variants", lambda *_args, **_kwargs: ["CONTROL", "VARIANT_A"])
-    monkeypatch.setattr(health, "_count_experiment_events", lambda *_args, **_kwargs: 0)
-    monkeypatch.setattr(health, "_count_invalid_decisions", lambda *_args, **_kwargs: 0)
     monkeypatch.setattr(health, "_two_proportion_pvalue", lambda *_args, **_kwargs: 0.01)
     monkeypatch.setattr(
         health,
@@ -482,7 +500,7 @@ def test_auto_disable_canary_on_negative_lift(monkeypatch) -> None:
             "exposures_total": 2000,
         }
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
 
     result = health.evaluate_experiment_health(
         db,
@@ -523,7 +541,7 @@ def test_rollout_does_not_increase_without_min_sample(monkeypatch) -> None:
             return {"cta_click_users": 1000, "cta_session_started_converted_users": 380}
         return {"cta_click_users": 2000, "cta_session_started_converted_users": 680}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     result = health.evaluate_rollout_progression(db, experiment_key="nba_retention_v1", auto_commit=True)
 
     assert result.scaled is False
@@ -558,7 +576,7 @@ def test_rollout_does_not_increase_before_min_days(monkeypatch) -> None:
             return {"cta_click_users": 1000, "cta_session_started_converted_users": 380}
         return {"cta_click_users": 2000, "cta_session_started_converted_users": 680}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     result = health.evaluate_rollout_progression(db, experiment_key="nba_retention_v1", auto_commit=True)
 
     assert result.scaled is False
@@ -599,7 +617,7 @@ def test_rollout_increases_when_eligible(monkeypatch) -> None:
             return {"cta_click_users": 1000, "cta_session_started_converted_users": 380}
         return {"cta_click_users": 2000, "cta_session_started_converted_users": 680}
 
-    monkeypatch.setattr(health, "get_axion_retention_metrics", _fake_metrics)
+    _patch_variant_stats(monkeypatch, _fake_metrics)
     result = health.evaluate_rollout_progression(db, experiment_key="nba_retention_v1", auto_commit=True)
 
     assert result.scaled is True
@@ -608,3 +626,85 @@ def test_rollout_increases_when_eligible(monkeypatch) -> None:
     assert result.new_rollout_percent == 10
     assert state["updated_to"] == 10
     assert state["event_calls"] == 1
+
+
+def test_load_experiment_variant_stats_groups_all_experiments_in_two_statements() -> None:
+    class _Rows:
+        def __init__(self, rows: list[dict[str, object]]) -> None:
+            self._rows = rows
+
+        def mappings(self) -> _Rows:
+            return self
+
+        def all(self) -> list[dict[str, object]]:
+            return self._rows
+
+    class _GroupedDB:
+        def __init__(self) -> None:
+            self.statements: list[str] = []
+
+        def execute(self, stmt: object, params: dict[str, object] | None = None) -> _Rows:
+            sql = str(stmt)
+            self.statements.append(sql)
+            if "WITH exposure_base AS" in sql:
+                assert params is not None and params["experiment_keys"] == [
+                    "exp_a",
+                    "nba_retention_v1",
+                ]
+                return _Rows(
+                    [
+                        {
+                            "experiment_key": "nba_retention_v1",
+                            "variant": "control",
+                            "exposures_total": 100,
+                            "cta_click_users": 50,
+                            "cta_session_started_converted_users": 20,
+                        },
+                        {
+                            "experiment_key": "nba_retention_v1",
+                            "variant": "variant_a",
+                            "exposures_total": 60,
+                            "cta_click_users": 30,
+                            "cta_session_started_converted_users": 15,
+                        },
+                        {"experiment_key": "exp_a", "variant": "control", "exposures_total": 10},
+                    ]
+                )
+            return _Rows(
+                [
+                    {
+                        "experiment_key": "nba_retention_v1",
+                        "variant": "variant_a",
+                        "error_count": 4,
+                        "crash_count": 1,
+                        "invalid_decisions": 0,
+                    },
+                    {
+                        "experiment_key": "nba_retention_v1",
+                        "variant": "control",
+                        "error_count": 2,
+                        "crash_count": 0,
+                        "invalid_decisions": 0,
+                    },
+                    {
+                        "experiment_key": "exp_a",
+                        "variant": "variant_b",
+                        "error_count": 0,
+                        "crash_count": 0,
+                        "invalid_decisions": 3,
+                    },
+                ]
+            )
+
+    db = _GroupedDB()
+    stats = health.load_experiment_variant_stats(db, experiment_keys=["nba_retention_v1", "exp_a"])
+
+    assert len(db.statements) == 2
+    nba = stats["nba_retention_v1"]
+    assert nba.variant_metrics("CONTROL")["cta_to_session_started_conversion"] == 40.0
+    assert nba.variant_metrics("VARIANT_A")["cta_click_users"] == 30
+    assert nba.variant_metrics("VARIANT_B")["cta_click_users"] == 0
+    assert nba.exposures_total == 160
+    assert nba.error_count == 6
+    assert nba.crash_count == 1
+    assert stats["exp_a"].invalid_decisions == 3
@@ -48,3 +48,91 @@ def test_feature_vector_version_matches_registry(monkeypatch) -> None:
 
     assert result["feature_version"] == 7
 
+
+
+class _FakeResult:
+    def __init__(self, row: object) -> None:
+        self._row = row
+
+    def first(self) -> object:
+        return self._row
+
+
+class _FakeStoreDB:
+    def __init__(self, row: object) -> None:
+        self.row = row
+        self.executed: list[str] = []
+
+    def execute(self, stmt: object, *_args: object) -> _FakeResult:
+        self.executed.append(str(stmt))
+        return _FakeResult(self.row)
+
+
+def test_feature_vector_reads_one_feature_store_row(monkeypatch) -> None:
+    today = fv.datetime.now(fv.UTC).date()
+    row = fv.AxionUserFeatures(
+        user_id=42,
+        tenant_id=10,
+        feature_version=2,
+        as_of_day=today - fv.timedelta(days=1),
+        age_bucket="9_12",
+        plan_type="PRO",
+        streak_length=4,
+        last_session_gap=3,
+        historical_completion_rate=0.5,
+        historical_retention_rate=0.2,
+    )
+    monkeypatch.setattr(
+        fv,
+        "_resolve_feature_version",
+        lambda _db: (_ for _ in ()).throw(AssertionError("live path")),
+    )
+    # Played two hours ago: the live gap wins over the snapshot taken at the end of yesterday.
+    db = _FakeStoreDB((row, fv.datetime.now(fv.UTC) - fv.timedelta(hours=2), None))
+
+    result = fv.build_feature_vector(db, user_id=42, experiment_key=None)
+
+    assert len(db.executed) == 1
+    assert "FROM axion_user_features" in db.executed[0]
+    assert "max(learning_sessions.started_at)" in db.executed[0]
+    assert result["feature_version"] == 2
+    assert result["feature_values"] == ["9_12", "PRO", 4, 0, 0.5, 0.2]
+    assert result["metadata"]["tenant_id"] == 10
+
+
+def test_feature_vector_falls_back_to_live_resolution_without_store_row(monkeypatch) -> None:
+    monkeypatch.setattr(fv, "_resolve_feature_version", lambda _db: 1)
+    monkeypatch.setattr(fv, "_resolve_tenant_id", lambda _db, *, user_id: None)
+    monkeypatch.setattr(
+        fv, "_resolve_age_bucket", lambda _db, *, user_id, experiment_key: "unknown"
+    )
+    monkeypatch.setattr(fv, "_resolve_plan_type", lambda _db, *, tenant_id: "UNKNOWN")
+    monkeypatch.setattr(fv, "_resolve_streak_length", lambda _db, *, user_id: 0)
+    monkeypatch.setattr(fv, "_resolve_last_session_gap_days", lambda _db, *, user_id: 999)
+    monkeypatch.setattr(fv, "_resolve_historical_completion_rate", lambda _db, *, user_id: 0.0)
+    monkeypatch.setattr(fv, "_resolve_historical_retention_rate", lambda _db, *, user_id: 0.0)
+
+    result = fv.build_feature_vector(_FakeStoreDB(None), user_id=5, experiment_key=None)
+
+    assert result["feature_values"] == ["unknown", "UNKNOWN", 0, 999, 0.0, 0.0]
+
+
+class _FakeRefreshDB:
+    def __init__(self) -> None:
+        self.params: dict[str, object] = {}
+
+    def execute(self, _stmt: object, params: dict[str, object]) -> object:
+        self.params = params
+        return type("_Result", (), {"rowcount": 3})()
+
+
+def test_feature_store_refresh_snapshots_the_completed_day() -> None:
+    db = _FakeRefreshDB()
+
+    assert fv.refresh_feature_store(db, feature_version=1) == 3  # type: ignore[arg-type]
+
+    yesterday = fv.datetime.now(fv.UTC).date() - fv.timedelta(days=1)
+    assert db.params["as_of_day"] == yesterday
+    assert db.params["as_of_end"] == fv.datetime.combine(
+        fv.datetime.now(fv.UTC).date(), fv.time.min, tzinfo=fv.UTC
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 import re
+from time import perf_counter
 from types import SimpleNamespace
 from uuid import uuid4
 
@@ -10,12 +11,21 @@ import pytest
 from fastapi import HTTPException
 
 from app.api.routes.axion import _load_user_decision
-from app.models import AxionDecision, AxionDecisionContext, AxionExperiment, AxionFeatureRegistry, AxionFeatureSnapshot, AxionRewardContract
+from app.models import (
+    AxionContentCatalog,
+    AxionDecision,
+    AxionDecisionContext,
+    AxionExperiment,
+    AxionFeatureRegistry,
+    AxionFeatureSnapshot,
+    AxionRewardContract,
+)
 from app.models import Plan
-from app.services import axion_flags
+from app.services import axion_decision_telemetry, axion_flags
 from app.services import axion_mode
 from app.services.axion_experiments import resolve_nba_variant
 from app.services.axion_facts import AxionFacts, EnergyFacts, RecentApprovalsFacts, WalletFacts
+from app.services.axion_decision_telemetry import DecisionTelemetrySink
 from app.services.axion_mode import NbaModeResolution
 from app.services.axion_orchestrator import AxionOrchestratorDecision, select_next_best_action
 from app.services.axion_core_v2 import AxionStateSnapshot
@@ -377,6 +387,8 @@ def test_rollout_is_deterministic(monkeypatch: pytest.MonkeyPatch) -> None:
 
 def test_latency_metric_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _FakeDBWithAdd()
+    sink = DecisionTelemetrySink(max_buffered=10, flush_interval_seconds=60)
+    monkeypatch.setattr(axion_mode, "decision_telemetry_sink", sink)
     monkeypatch.setattr(axion_mode.settings, "app_env", "staging")
     monkeypatch.setattr(axion_mode, "resolve_nba_variant_for_experiment", lambda *_args, **_kwargs: None)
     monkeypatch.setattr(
@@ -401,11 +413,12 @@ def test_latency_metric_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
     assert mode.enabled is True
-    events = [item for item in db.added if getattr(item, "type", "") == "axion_decision_latency_ms"]
+    assert not any(getattr(item, "type", "") == "axion_decision_latency_ms" for item in db.added)
+    _snapshots, events = sink.drain()
     assert len(events) == 1
     event = events[0]
-    assert getattr(event, "type") == "axion_decision_latency_ms"
-    payload = getattr(event, "payload")
+    assert event["type"] == "axion_decision_latency_ms"
+    payload = event["payload"]
     assert "start_time" in payload
     assert "end_time" in payload
     assert "duration_ms" in payload
@@ -414,6 +427,8 @@ def test_latency_metric_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
 
 def test_feature_snapshot_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
     db = _FakeDBWithAdd()
+    sink = DecisionTelemetrySink(max_buffered=10, flush_interval_seconds=60)
+    monkeypatch.setattr(axion_mode, "decision_telemetry_sink", sink)
     monkeypatch.setattr(axion_mode.settings, "app_env", "staging")
     monkeypatch.setattr(axion_mode, "resolve_nba_variant_for_experiment", lambda *_args, **_kwargs: None)
     monkeypatch.setattr(
@@ -438,17 +453,68 @@ def test_feature_snapshot_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
     assert mode.enabled is True
-    snapshots = [item for item in db.added if isinstance(item, AxionFeatureSnapshot)]
+    assert not any(isinstance(item, AxionFeatureSnapshot) for item in db.added)
+    snapshots, _events = sink.drain()
     assert len(snapshots) == 1
     snapshot = snapshots[0]
-    assert snapshot.user_id == 30
-    assert snapshot.tenant_id == 10
-    assert snapshot.experiment_key is None
-    assert snapshot.variant is None
-    assert snapshot.feature_version == 1
-    assert snapshot.features_json["context"] == "child_tab"
-    assert snapshot.features_json["child_id"] == 20
-    assert snapshot.features_json["nba_enabled_final"] is True
+    assert snapshot["user_id"] == 30
+    assert snapshot["tenant_id"] == 10
+    assert snapshot["experiment_key"] is None
+    assert snapshot["variant"] is None
+    assert snapshot["feature_version"] == 1
+    assert snapshot["features_json"]["context"] == "child_tab"
+    assert snapshot["features_json"]["child_id"] == 20
+    assert snapshot["features_json"]["nba_enabled_final"] is True
+
+
+class _FakeTelemetrySession:
+    def __init__(self) -> None:
+        self.executed: list[tuple[str, list[dict[str, object]]]] = []
+        self.commits = 0
+        self.closed = False
+
+    def execute(self, stmt: object, rows: list[dict[str, object]]) -> None:
+        self.executed.append((stmt.table.name, rows))  # type: ignore[attr-defined]
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_decision_telemetry_sink_drops_on_overflow_and_flushes_in_bulk(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dropped: list[int] = []
+    monkeypatch.setattr(
+        axion_decision_telemetry,
+        "safe_increment_telemetry_dropped_total",
+        lambda count=1: dropped.append(count),
+    )
+    session = _FakeTelemetrySession()
+    sink = DecisionTelemetrySink(
+        max_buffered=3, flush_interval_seconds=60, session_factory=lambda: session
+    )
+
+    assert sink.submit_feature_snapshot({"user_id": 1}) is True
+    assert sink.submit_event({"type": "axion_decision_latency_ms"}) is True
+    assert sink.submit_event({"type": "axion_decision_latency_ms"}) is True
+    assert sink.submit_event({"type": "axion_decision_latency_ms"}) is False
+    assert dropped == [1]
+
+    assert sink.flush() == 3
+    assert [(table, len(rows)) for table, rows in session.executed] == [
+        ("axion_feature_snapshot", 1),
+        ("event_log", 2),
+    ]
+    assert session.commits == 1
+    assert session.closed is True
+    assert sink.buffered == 0
+    assert sink.flush() == 0
 
 
 def test_decision_row_written_level4(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -1247,11 +1313,15 @@ def test_age_used_from_date_of_birth_not_from_cache(monkeypatch: pytest.MonkeyPa
         resolve_calls.append({"child_id": child_id, **kwargs})
         return 6
 
-    def _age_gate(_db, *, candidate_content_ids: list[int], child_age: int) -> list[int]:
+    def _age_gate(
+        _db, *, candidate_content_ids: list[int], child_age: int, **_kwargs: object
+    ) -> list[int]:
         age_gating_ages.append(int(child_age))
         return [int(item) for item in candidate_content_ids]
 
-    def _safety_gate(_db, *, candidate_content_ids: list[int], child_age: int) -> list[int]:
+    def _safety_gate(
+        _db, *, candidate_content_ids: list[int], child_age: int, **_kwargs: object
+    ) -> list[int]:
         safety_gating_ages.append(int(child_age))
         return [int(item) for item in candidate_content_ids]
 
@@ -1526,6 +1596,84 @@ def test_guardrails_filtered_set_is_used_by_selection(monkeypatch: pytest.Monkey
     assert decision.metadata_json.get("selected_content_id") == 702
 
 
+
+class _FakeGuardrailsDB:
+    def __init__(self, catalog_rows: list[AxionContentCatalog]) -> None:
+        self.catalog_rows = catalog_rows
+        self.reads: list[str] = []
+        self.inserts: list[list[dict[str, object]]] = []
+
+    def execute(self, stmt: object, params: object = None) -> _FakeScalarRows:
+        if params is not None:
+            self.inserts.append(list(params))  # type: ignore[arg-type]
+            return _FakeScalarRows([])
+        sql = str(stmt)
+        self.reads.append(sql)
+        if "FROM axion_content_catalog LEFT OUTER JOIN content_prerequisites" in sql:
+            edges = {
+                row.content_id: [row.content_id - 1]
+                for row in self.catalog_rows
+                if row.content_id % 10 == 0
+            }
+            return _FakeScalarRows(
+                [(row, edges.get(row.content_id, [])) for row in self.catalog_rows]
+            )
+        return _FakeScalarRows([])
+
+    def scalars(self, stmt: object) -> _FakeScalarRows:
+        self.reads.append(str(stmt))
+        return _FakeScalarRows([])
+
+
+def test_guardrails_pipeline_loads_50_candidates_in_constant_round_trips(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    rows = [
+        AxionContentCatalog(
+            content_id=content_id,
+            content_type="question",
+            subject="math",
+            difficulty=1,
+            age_min=6 if content_id % 7 else 13,
+            age_max=12 if content_id % 7 else 18,
+            safety_tags=[],
+            is_active=True,
+            content_fingerprint=f"fp-{content_id}",
+        )
+        for content_id in range(1001, 1051)
+    ]
+    db = _FakeGuardrailsDB(rows)
+    monkeypatch.setattr(axion_mode, "resolve_child_age", lambda *_args, **_kwargs: 9)
+    monkeypatch.setattr(axion_mode.settings, "axion_safety_allowed_tags_csv", "")
+
+    started = perf_counter()
+    result = axion_mode._apply_guardrails_pipeline(
+        db,  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=20,
+        user_id=30,
+        context="child_tab",
+        correlation_id="corr-50",
+        child_age=9,
+        candidate_content_ids=[row.content_id for row in rows],
+        content_mode="learn",
+    )
+    elapsed = perf_counter() - started
+
+    age_blocked = {row.content_id for row in rows if row.content_id % 7 == 0}
+    prereq_blocked = {row.content_id for row in rows if row.content_id % 10 == 0}
+    assert result.fallback_applied is False
+    assert result.candidate_ids == [
+        row.content_id for row in rows if row.content_id not in age_blocked | prereq_blocked
+    ]
+    # Context load, served prerequisites, prerequisite subjects, eligibility states and recency,
+    # whatever the pool size (no subject rows here, so the mastery read is skipped).
+    assert len(db.reads) == 5
+    assert sum("FROM axion_content_catalog" in sql for sql in db.reads) == 2
+    assert len(db.inserts) == 1
+    assert elapsed < 0.5
+
+
 class _FakeDBForBrief:
     def __init__(self) -> None:
         self.added: list[object] = []
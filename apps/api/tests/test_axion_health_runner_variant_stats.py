@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from app.services import axion_experiment_health_runner as runner_mod
+from app.services.axion_experiment_health_runner import AxionExperimentHealthRunner
+
+
+class _ScalarRows:
+    def __init__(self, values: list[str]) -> None:
+        self._values = values
+
+    def all(self) -> list[str]:
+        return self._values
+
+
+class _FakeDB:
+    def __init__(self) -> None:
+        self.commits = 0
+        self.rollbacks = 0
+        self.added: list[object] = []
+
+    def scalars(self, *_args, **_kwargs) -> _ScalarRows:
+        return _ScalarRows(["exp_a", "exp_b"])
+
+    def scalar(self, *_args, **_kwargs):
+        return 1
+
+    def get(self, *_args, **_kwargs):
+        return None
+
+    def add(self, value: object) -> None:
+        self.added.append(value)
+
+    def execute(self, *_args, **_kwargs):
+        return None
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        return
+
+
+def test_health_runner_loads_variant_stats_once_for_all_experiments(monkeypatch) -> None:
+    db = _FakeDB()
+    loads: list[list[str]] = []
+    seen: dict[str, object] = {}
+    monkeypatch.setattr(runner_mod, "_resolve_health_runner_enabled", lambda: True)
+    monkeypatch.setattr(runner_mod, "lock_experiment_for_update", lambda *_args, **_kwargs: True)
+    monkeypatch.setattr(
+        runner_mod,
+        "evaluate_auto_rollback",
+        lambda *_args, **_kwargs: SimpleNamespace(rolled_back=False, reasons=[]),
+    )
+
+    def _fake_load(_db, *, experiment_keys):
+        loads.append(list(experiment_keys))
+        return {key: f"stats:{key}" for key in experiment_keys}
+
+    def _fake_health(_db, *, experiment_key, variant_stats=None, **_kwargs):
+        seen[experiment_key] = variant_stats
+        return SimpleNamespace(paused=False, reasons=[], metrics={})
+
+    monkeypatch.setattr(runner_mod, "load_experiment_variant_stats", _fake_load)
+    monkeypatch.setattr(runner_mod, "evaluate_experiment_health", _fake_health)
+    monkeypatch.setattr(
+        runner_mod,
+        "evaluate_rollout_progression",
+        lambda *_args, **_kwargs: SimpleNamespace(
+            scaled=False, reason="not_eligible", previous_rollout_percent=5, new_rollout_percent=5
+        ),
+    )
+
+    report = AxionExperimentHealthRunner(db).run_selected(
+        ["exp_a", "exp_b"], active_only=True, enabled=True
+    )
+
+    assert loads == [["exp_a", "exp_b"]]
+    assert seen == {"exp_a": "stats:exp_a", "exp_b": "stats:exp_b"}
+    assert report.experiments_processed == 2
+    assert report.experiments_skipped_locked == 0
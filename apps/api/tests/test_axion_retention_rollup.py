@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+from app.services.axion_retention import (
+    AxionRetentionFilters,
+    get_axion_retention_counts_by_variant,
+    get_axion_retention_metrics,
+)
+from app.services.axion_retention_rollup import (
+    refresh_axion_retention_rollups,
+    resolve_refresh_window,
+    rollups_support_filters,
+)
+
+
+class _FakeMappings:
+    def __init__(self, row: dict[str, object] | list[dict[str, object]] | None) -> None:
+        self._row = row
+
+    def first(self) -> dict[str, object] | None:
+        return self._row[0] if isinstance(self._row, list) else self._row
+
+    def all(self) -> list[dict[str, object]]:
+        return self._row if isinstance(self._row, list) else []
+
+
+class _FakeResult:
+    def __init__(
+        self, row: dict[str, object] | list[dict[str, object]] | None = None, rowcount: int = 0
+    ) -> None:
+        self._row = row
+        self.rowcount = rowcount
+
+    def mappings(self) -> _FakeMappings:
+        return _FakeMappings(self._row)
+
+
+class _FakeRollupDB:
+    def __init__(
+        self,
+        *,
+        watermark: date | None,
+        rollup_row: dict[str, object] | list[dict[str, object]] | None = None,
+        raw_row: dict[str, object] | list[dict[str, object]] | None = None,
+    ) -> None:
+        self.watermark = watermark
+        self.rollup_row = rollup_row
+        self.raw_row = raw_row
+        self.statements: list[tuple[str, dict[str, object]]] = []
+
+    def get(self, _model: object, _key: object) -> object | None:
+        if self.watermark is None:
+            return None
+        return SimpleNamespace(watermark_day=self.watermark)
+
+    def execute(self, stmt: object, params: dict[str, object] | None = None) -> _FakeResult:
+        sql = str(stmt) if hasattr(stmt, "text") else "UPSERT rollup_watermarks"
+        self.statements.append((sql, params or {}))
+        if "INSERT INTO axion_retention_daily_rollup" in sql:
+            return _FakeResult(rowcount=12)
+        if "stored_rows AS" in sql:
+            return _FakeResult(self.rollup_row)
+        if "WITH exposure_base AS" in sql:
+            return _FakeResult(self.raw_row)
+        return _FakeResult()
+
+
+def _filters(**overrides: object) -> AxionRetentionFilters:
+    values: dict[str, object] = {
+        "tenant_id": None,
+        "action_type": None,
+        "context": None,
+        "persona": None,
+        "experiment_key": "nba_retention_v1",
+        "variant": None,
+        "nba_reason": None,
+        "destination": None,
+        "dedupe_exposure_per_day": True,
+        "lookback_days": 30,
+        "date_from": date(2026, 10, 1),
+        "date_to": date(2026, 10, 19),
+    }
+    values.update(overrides)
+    return AxionRetentionFilters(**values)
+
+
+def test_rollup_read_rebuilds_days_after_watermark_in_the_same_statement() -> None:
+    db = _FakeRollupDB(
+        watermark=date(2026, 10, 18),
+        rollup_row={
+            "exposures_total": 100,
+            "cohort_users": 50,
+            "retained_d1_users": 10,
+            "total_sessions_30d": 80.0,
+        },
+    )
+
+    metrics = get_axion_retention_metrics(db, filters=_filters(), use_rollups=True)
+
+    assert metrics["exposures_total"] == 100
+    assert metrics["cohort_users"] == 50
+    assert metrics["d1_rate"] == 20.0
+    assert len(db.statements) == 1
+    sql, params = db.statements[0]
+    assert params["day_to"] == date(2026, 10, 18)
+    assert params["window_start"].date() == date(2026, 10, 19)
+    assert params["window_end"].date() == date(2026, 10, 20)
+    # Users are deduped across the window and persona is resolved at read time, not refresh time.
+    assert "SELECT DISTINCT ON (experiment_key, variant, child_id, day)" in sql
+    assert "GROUP BY experiment_key, variant, user_id" in sql
+    assert "LEFT JOIN user_persona_state ups" in sql
+
+
+def test_rollup_read_skips_raw_events_when_watermark_covers_range() -> None:
+    db = _FakeRollupDB(watermark=date(2026, 10, 19), rollup_row={"exposures_total": 3})
+
+    get_axion_retention_metrics(db, filters=_filters(), use_rollups=True)
+
+    _sql, params = db.statements[0]
+    assert params["day_to"] == date(2026, 10, 19)
+    assert params["window_start"] == params["window_end"]
+
+
+def test_unsupported_filters_fall_back_to_raw_query() -> None:
+    db = _FakeRollupDB(watermark=date(2026, 10, 18), raw_row={"exposures_total": 7})
+
+    assert rollups_support_filters(_filters(nba_reason="streak_risk")) is False
+    assert rollups_support_filters(_filters(dedupe_exposure_per_day=False)) is False
+    metrics = get_axion_retention_metrics(
+        db, filters=_filters(nba_reason="streak_risk"), use_rollups=True
+    )
+
+    assert metrics["exposures_total"] == 7
+    assert all("axion_retention_daily_rollup" not in sql for sql, _ in db.statements)
+
+
+def test_grouped_rollup_read_returns_one_row_per_variant() -> None:
+    db = _FakeRollupDB(
+        watermark=date(2026, 10, 18),
+        rollup_row=[
+            {
+                "experiment_key": "nba_retention_v1",
+                "variant": "control",
+                "exposures_total": 100,
+                "cohort_users": 50,
+            },
+            {
+                "experiment_key": "nba_retention_v1",
+                "variant": "variant_a",
+                "exposures_total": 30,
+                "cohort_users": 12,
+            },
+        ],
+    )
+
+    rows = get_axion_retention_counts_by_variant(
+        db,
+        experiment_keys=["NBA_Retention_v1"],
+        filters=_filters(experiment_key=None),
+        use_rollups=True,
+    )
+
+    by_variant = {row["variant"]: row for row in rows}
+    assert by_variant["control"]["cohort_users"] == 50
+    assert by_variant["variant_a"]["exposures_total"] == 30
+    assert len(db.statements) == 1
+    rollup_sql, rollup_params = db.statements[0]
+    assert "LOWER(base.experiment_key) = ANY(:experiment_keys)" in rollup_sql
+    assert rollup_params["experiment_keys"] == ["nba_retention_v1"]
+    assert rollup_params["window_start"].date() == date(2026, 10, 19)
+
+
+def test_refresh_rematerializes_maturation_window_and_advances_watermark() -> None:
+    db = _FakeRollupDB(watermark=date(2026, 10, 17))
+
+    result = refresh_axion_retention_rollups(db, through_day=date(2026, 10, 18))
+
+    assert result == {"days": 31, "rows": 12, "watermark": "2026-10-18"}
+    delete_sql, delete_params = db.statements[0]
+    assert delete_sql.startswith("DELETE FROM axion_retention_daily_rollup")
+    assert delete_params == {"start_day": date(2026, 9, 18), "end_day": date(2026, 10, 18)}
+    assert "INSERT INTO axion_retention_daily_rollup" in db.statements[1][0]
+    assert db.statements[-1][0] == "UPSERT rollup_watermarks"
+
+
+def test_refresh_window_backfills_without_watermark() -> None:
+    assert resolve_refresh_window(
+        watermark=None, through_day=date(2026, 10, 18), backfill_days=7
+    ) == (
+        date(2026, 10, 12),
+        date(2026, 10, 18),
+    )
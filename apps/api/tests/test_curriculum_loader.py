@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pytest
 
-from app.services.curriculum_loader import CurriculumLoader, CurriculumValidationError
+from app.services.curriculum_loader import (
+    DEFAULT_CURRICULUM_ARTIFACT_PATH,
+    DEFAULT_CURRICULUM_DIR,
+    CurriculumLoader,
+    CurriculumValidationError,
+    compile_curriculum_artifact,
+    curriculum_content_hash,
+    load_curriculum_loader,
+)
 
 
 def test_curriculum_loader_exposes_subjects_skills_and_lessons() -> None:
@@ -97,3 +106,45 @@ def test_curriculum_loader_rejects_duplicate_skill_ids_across_subjects(tmp_path:
 
     with pytest.raises(CurriculumValidationError, match="Duplicate skill identifier across subjects"):
         CurriculumLoader(curriculum_dir=tmp_path)
+
+
+def test_compiled_artifact_matches_yaml_sources() -> None:
+    artifact = json.loads(DEFAULT_CURRICULUM_ARTIFACT_PATH.read_text(encoding="utf-8"))
+
+    # Regenerate with `python -m scripts.compile_curriculum` after editing the YAML files.
+    assert artifact["content_hash"] == curriculum_content_hash()
+    from_artifact = CurriculumLoader.from_artifact(artifact)
+    from_yaml = CurriculumLoader()
+    assert from_artifact.get_curriculum() == from_yaml.get_curriculum()
+
+
+def test_load_curriculum_loader_falls_back_to_yaml_only_when_allowed(tmp_path: Path) -> None:
+    (tmp_path / "math.yaml").write_text(
+        (DEFAULT_CURRICULUM_DIR / "math.yaml").read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    artifact_path = tmp_path / "compiled" / "curriculum.json"
+
+    with pytest.raises(CurriculumValidationError, match="artifact unavailable"):
+        load_curriculum_loader(
+            artifact_path=artifact_path, curriculum_dir=tmp_path, allow_yaml_fallback=False
+        )
+    assert load_curriculum_loader(
+        artifact_path=artifact_path, curriculum_dir=tmp_path, allow_yaml_fallback=True
+    ).get_subjects() == ["math"]
+
+    compile_curriculum_artifact(tmp_path, artifact_path)
+    (tmp_path / "math.yaml").write_text(
+        (tmp_path / "math.yaml")
+        .read_text(encoding="utf-8")
+        .replace("addition_mastery", "addition_review"),
+        encoding="utf-8",
+    )
+    stale = load_curriculum_loader(
+        artifact_path=artifact_path, curriculum_dir=tmp_path, allow_yaml_fallback=True
+    )
+    trusted = load_curriculum_loader(
+        artifact_path=artifact_path, curriculum_dir=tmp_path, allow_yaml_fallback=False
+    )
+    assert stale.get_lessons("addition")[-1] == "addition_review"
+    assert trusted.get_lessons("addition")[-1] == "addition_mastery"
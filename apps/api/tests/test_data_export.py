@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from app.api.routes import export as export_routes
+from app.jobs import data_export as job_module
+from app.services.data_export import (
+    ExportCursor,
+    InvalidExportCursorError,
+    decode_export_cursor,
+    encode_export_cursor,
+    iter_csv_chunks,
+    iter_ndjson_chunks,
+)
+
+
+def _mood_records(count: int):
+    for index in range(count):
+        day = f"2026-01-{index + 1:02d}"
+        yield (
+            "mood_history",
+            {"child_id": 7, "date": day, "mood": "HAPPY"},
+            ExportCursor(section="mood_history", after=(day,)),
+        )
+
+
+def test_export_cursor_roundtrip_and_rejects_garbage() -> None:
+    cursor = ExportCursor(section="logs", after=("2026-01-03", 42))
+    assert decode_export_cursor(encode_export_cursor(cursor)) == cursor
+
+    with pytest.raises(InvalidExportCursorError):
+        decode_export_cursor("not-a-cursor")
+    with pytest.raises(InvalidExportCursorError):
+        decode_export_cursor(encode_export_cursor(ExportCursor(section="unknown", after=(1,))))
+    with pytest.raises(InvalidExportCursorError):
+        decode_export_cursor(
+            encode_export_cursor(ExportCursor(section="logs", after=("bad-date", 1)))
+        )
+
+
+def test_ndjson_chunks_group_rows_and_carry_resume_cursor() -> None:
+    chunks = list(iter_ndjson_chunks(_mood_records(5), chunk_rows=2))
+
+    assert len(chunks) == 3
+    lines = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [line["data"]["date"] for line in lines] == [f"2026-01-0{day}" for day in range(1, 6)]
+    assert decode_export_cursor(lines[-1]["cursor"]) == ExportCursor(
+        section="mood_history", after=("2026-01-05",)
+    )
+
+
+def test_csv_chunks_emit_header_once_with_cursor_column() -> None:
+    body = "".join(iter_csv_chunks(_mood_records(3), section="mood_history", chunk_rows=2))
+    rows = body.splitlines()
+
+    assert rows[0] == "child_id,date,mood,cursor"
+    assert len(rows) == 4
+    assert rows[1].startswith("7,2026-01-01,HAPPY,")
+
+
+class _FakeJobDB:
+    def __init__(self, job: SimpleNamespace) -> None:
+        self.job = job
+        self.commits = 0
+        self.rollbacks = 0
+        self.parts: dict[tuple[str, int], bytes] = {}
+        self.pending_parts: dict[tuple[str, int], bytes] = {}
+
+    def get(self, _model, job_id: str):
+        return self.job if job_id == self.job.id else None
+
+    def execute(self, stmt):
+        params = stmt.compile().params
+        if stmt.is_insert:
+            self.pending_parts[(params["job_id"], params["part"])] = params["data"]
+        return SimpleNamespace(rowcount=0)
+
+    def scalar(self, stmt):
+        params = stmt.compile().params
+        return self.parts.get((params["job_id_1"], params["part_1"]))
+
+    def commit(self) -> None:
+        self.commits += 1
+        self.parts.update(self.pending_parts)
+        self.pending_parts.clear()
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+        self.pending_parts.clear()
+
+
+def _job() -> SimpleNamespace:
+    return SimpleNamespace(
+        id="job-1",
+        tenant_id=3,
+        child_id=7,
+        status=job_module.EXPORT_JOB_PENDING,
+        row_count=0,
+        storage_key=None,
+        file_size_bytes=None,
+        error=None,
+        completed_at=None,
+        expires_at=None,
+    )
+
+
+def test_generate_data_export_stores_gzip_ndjson_parts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(job_module.settings, "export_artifact_part_bytes", 32)
+    monkeypatch.setattr(job_module.settings, "export_job_ttl_hours", 24)
+    monkeypatch.setattr(job_module, "iter_export_records", lambda _db, **_kwargs: _mood_records(4))
+    db = _FakeJobDB(_job())
+
+    result = job_module.generate_data_export(db, job_id="job-1")
+    db.commit()
+
+    assert result["status"] == job_module.EXPORT_JOB_DONE
+    assert result["rows"] == 4
+    assert db.job.row_count == 4
+    assert db.job.storage_key == "data_export_artifact_parts/job-1"
+    assert db.job.expires_at - db.job.completed_at == timedelta(hours=24)
+    assert len(db.parts) > 1
+    artifact = b"".join(job_module.iter_export_artifact(db, job_id="job-1"))
+    assert len(artifact) == db.job.file_size_bytes
+    assert len(gzip.decompress(artifact).decode("utf-8").splitlines()) == 4
+
+
+def test_generate_data_export_marks_failed_and_discards_partial_parts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _broken_records(_db, **_kwargs):
+        yield from _mood_records(1)
+        raise RuntimeError("cursor lost")
+
+    monkeypatch.setattr(job_module, "iter_export_records", _broken_records)
+    db = _FakeJobDB(_job())
+
+    result = job_module.generate_data_export(db, job_id="job-1")
+    db.commit()
+
+    assert result["status"] == job_module.EXPORT_JOB_FAILED
+    assert db.job.error == "cursor lost"
+    assert db.job.storage_key is None
+    assert db.rollbacks == 1
+    assert db.parts == {}
+
+
+class _FakePurgeDB:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt))
+        return SimpleNamespace(rowcount=2 if stmt.is_delete else 1)
+
+
+def test_purge_expired_data_exports_deletes_parts_and_expires_jobs() -> None:
+    db = _FakePurgeDB()
+
+    result = job_module.purge_expired_data_exports(db, now=datetime(2026, 10, 19, tzinfo=UTC))
+
+    assert result == {"expired_jobs": 1, "deleted_parts": 2}
+    assert db.statements[0].startswith("DELETE FROM data_export_artifact_parts")
+    assert "data_export_jobs.expires_at <=" in db.statements[0]
+    assert db.statements[1].startswith("UPDATE data_export_jobs SET status=")
+
+
+def test_download_streams_stored_artifact_and_rejects_expired_jobs() -> None:
+    job = _job()
+    job.status = job_module.EXPORT_JOB_DONE
+    job.storage_key = "data_export_artifact_parts/job-1"
+    job.expires_at = datetime.now(UTC) + timedelta(hours=1)
+    db = _FakeJobDB(job)
+    db.parts = {("job-1", 0): b"ab", ("job-1", 1): b"c"}
+    tenant = SimpleNamespace(id=3)
+
+    response = export_routes.download_export_job("job-1", db, tenant, None)  # type: ignore[arg-type]
+
+    assert (
+        response.headers["content-disposition"] == 'attachment; filename="export_7_job-1.ndjson.gz"'
+    )
+    assert response.media_type == "application/gzip"
+
+    job.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    with pytest.raises(HTTPException) as exc:
+        export_routes.download_export_job("job-1", db, tenant, None)  # type: ignore[arg-type]
+    assert exc.value.status_code == 410
+
+
+class _FakeCreateDB:
+    def __init__(self) -> None:
+        self.added: list[object] = []
+        self.commits = 0
+
+    def scalar(self, _stmt):
+        return SimpleNamespace(id=7, tenant_id=3)
+
+    def add(self, item: object) -> None:
+        self.added.append(item)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def test_create_export_job_marks_failed_when_enqueue_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _enqueue_down(_job_id: str) -> str:
+        raise RedisError("down")
+
+    monkeypatch.setattr(export_routes, "enqueue_data_export", _enqueue_down)
+    db = _FakeCreateDB()
+
+    with pytest.raises(HTTPException) as exc:
+        export_routes.create_export_job(
+            7,
+            db,  # type: ignore[arg-type]
+            SimpleNamespace(id=3),  # type: ignore[arg-type]
+            SimpleNamespace(user_id=11),  # type: ignore[arg-type]
+        )
+
+    assert exc.value.status_code == 503
+    job = db.added[0]
+    assert job.status == job_module.EXPORT_JOB_FAILED
+    assert job.error == "enqueue_failed"
+    assert db.commits == 2
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.jobs.event_log_partitions import (
+    detach_expired_event_log_partitions,
+    ensure_event_log_partitions,
+    parse_partition_month,
+    partition_name_for,
+)
+from app.models import EventLog, _promote_event_log_hot_columns
+
+
+class _FakeResult:
+    def __init__(self, rows: list[object] | None = None) -> None:
+        self._rows = rows or []
+
+    def scalars(self) -> _FakeResult:
+        return self
+
+    def all(self) -> list[object]:
+        return self._rows
+
+
+class _FakePartitionDB:
+    def __init__(self, existing: list[str]) -> None:
+        self.existing = existing
+        self.statements: list[str] = []
+
+    def execute(self, stmt: object, *_args: object, **_kwargs: object) -> _FakeResult:
+        sql = str(stmt)
+        if "pg_inherits" in sql:
+            return _FakeResult(rows=list(self.existing))
+        self.statements.append(sql)
+        return _FakeResult()
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def execute(self, *_args: object, **_kwargs: object) -> _FakeResult:
+        self.calls += 1
+        return _FakeResult()
+
+
+def test_partition_name_roundtrip() -> None:
+    name = partition_name_for(date(2026, 3, 1))
+    assert name == "event_log_y2026m03"
+    assert parse_partition_month(name) == date(2026, 3, 1)
+    assert parse_partition_month("event_log_default") is None
+
+
+def test_ensure_partitions_creates_only_missing_months() -> None:
+    db = _FakePartitionDB(
+        existing=["event_log_default", "event_log_y2026m10", "event_log_y2026m11"]
+    )
+
+    created = ensure_event_log_partitions(db, months_ahead=3, reference_date=date(2026, 10, 19))
+
+    assert created == ["event_log_y2026m12", "event_log_y2027m01"]
+    assert any(
+        "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+        for sql in db.statements
+    )
+
+
+def test_detach_moves_expired_partitions_to_archive_schema() -> None:
+    db = _FakePartitionDB(
+        existing=[
+            "event_log_default",
+            "event_log_y2024m12",
+            "event_log_y2025m04",
+            "event_log_y2026m10",
+        ],
+    )
+
+    detached = detach_expired_event_log_partitions(
+        db,
+        retain_months=18,
+        archive_schema="event_log_archive",
+        reference_date=date(2026, 10, 19),
+    )
+
+    assert detached == ["event_log_y2024m12"]
+    assert "ALTER TABLE event_log DETACH PARTITION event_log_y2024m12" in db.statements
+    assert "ALTER TABLE event_log_y2024m12 SET SCHEMA event_log_archive" in db.statements
+
+
+def test_detach_rejects_unsafe_archive_schema() -> None:
+    db = _FakePartitionDB(existing=["event_log_y2020m01"])
+    try:
+        detach_expired_event_log_partitions(
+            db, retain_months=1, archive_schema="archive; DROP TABLE x"
+        )
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for unsafe schema name")
+
+
+def test_hot_event_keeps_explicit_decision_columns_without_lookup() -> None:
+    decision_id = "8f14e45f-ceea-467f-a5b4-2f2a0a6f3b1e"
+    target = EventLog(
+        tenant_id=1,
+        actor_user_id=2,
+        child_id=None,
+        type="axion_session_completed",
+        payload={"decision_id": decision_id.upper(), "variant": "VARIANT_B"},
+        experiment_key="nba_retention_v1",
+        variant="VARIANT_A",
+    )
+    connection = _FakeConnection()
+
+    _promote_event_log_hot_columns(None, connection, target)
+
+    assert target.decision_id == decision_id
+    assert target.experiment_key == "nba_retention_v1"
+    assert target.variant == "VARIANT_A"
+    assert connection.calls == 0
+
+
+def test_cold_event_promotes_payload_without_lookup() -> None:
+    target = EventLog(
+        tenant_id=1,
+        actor_user_id=None,
+        child_id=None,
+        type="experiment_shadow_reward_computed",
+        payload={"decision_id": "not-a-uuid", "experiment_key": "nba_retention_v1"},
+    )
+    connection = _FakeConnection()
+
+    _promote_event_log_hot_columns(None, connection, target)
+
+    assert target.decision_id is None
+    assert target.experiment_key == "nba_retention_v1"
+    assert target.variant is None
+    assert connection.calls == 0
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import game_ranking
+
+
+def _redis_order(entries: list[tuple[float, datetime, int]], game_id: str) -> list[int]:
+    metric = game_ranking.metric_for_game(game_id)
+    keyed = [
+        (
+            game_ranking._leaderboard_score(metric, value),
+            game_ranking._leaderboard_member(last_played_at=played_at, child_id=child_id),
+        )
+        for value, played_at, child_id in entries
+    ]
+    return [game_ranking._member_child_id(member) for _score, member in sorted(keyed)]
+
+
+def test_sorted_set_encoding_preserves_direction_and_tie_breaks() -> None:
+    base = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+    entries = [
+        (120.0, base, 4),
+        (300.0, base - timedelta(hours=1), 3),
+        (300.0, base, 9),
+        (300.0, base, 2),
+    ]
+
+    # Score descending, then most recent play, then lowest child_id.
+    assert _redis_order(entries, "quiz") == [2, 9, 3, 4]
+    # Memory ranks by best time ascending with the same tie-breaks.
+    assert _redis_order(entries, "memory") == [4, 2, 9, 3]
+
+
+class _FakePipeline:
+    def __init__(self, results: list[Any]) -> None:
+        self._results = results
+
+    def zcard(self, _key: str) -> None:
+        return None
+
+    def zrange(self, _key: str, _start: int, _end: int) -> None:
+        return None
+
+    def hget(self, _key: str, _field: str) -> None:
+        return None
+
+    def execute(self) -> list[Any]:
+        return self._results
+
+
+class _FakeRedis:
+    def __init__(
+        self,
+        *,
+        members: list[str],
+        me_member: str | None,
+        me_rank: int | None,
+        me_score: float | None,
+    ) -> None:
+        self.members = members
+        self.me_member = me_member
+        self.me_rank = me_rank
+        self.me_score = me_score
+        self.closed = False
+
+    def exists(self, _key: str) -> int:
+        return 1
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline([25, self.members, self.me_member])
+
+    def zrank(self, _key: str, _member: str) -> int | None:
+        return self.me_rank
+
+    def zscore(self, _key: str, _member: str) -> float | None:
+        return self.me_score
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeRowsResult:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _FakeDB:
+    def __init__(self, rows: list[Any]) -> None:
+        self.rows = rows
+        self.executed = 0
+
+    def execute(self, _stmt: Any) -> _FakeRowsResult:
+        self.executed += 1
+        return _FakeRowsResult(self.rows)
+
+
+def test_weekly_ranking_reads_positions_from_sorted_set(monkeypatch: pytest.MonkeyPatch) -> None:
+    played_at = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+    members = [
+        game_ranking._leaderboard_member(last_played_at=played_at, child_id=8),
+        game_ranking._leaderboard_member(last_played_at=played_at, child_id=5),
+    ]
+    fake_redis = _FakeRedis(members=members, me_member="x:000000000007", me_rank=11, me_score=-40.0)
+    rows = [
+        SimpleNamespace(
+            child_id=5,
+            display_name="Bruna",
+            avatar_key=None,
+            metric_score=90.0,
+            last_played_at=played_at,
+        ),
+        SimpleNamespace(
+            child_id=8,
+            display_name="Ana",
+            avatar_key="fox",
+            metric_score=95.0,
+            last_played_at=played_at,
+        ),
+    ]
+    monkeypatch.setattr(game_ranking.settings, "games_leaderboard_enabled", True)
+    monkeypatch.setattr(game_ranking, "_leaderboard_redis", lambda: fake_redis)
+
+    snapshot = game_ranking.get_weekly_ranking_snapshot(
+        _FakeDB(rows),  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=7,
+        game_id="quiz",
+        limit=10,
+    )
+
+    assert [(item.position, item.player, item.score) for item in snapshot.top] == [
+        (1, "An***", 95.0),
+        (2, "Br***", 90.0),
+    ]
+    assert snapshot.me.position == 12
+    assert snapshot.me.score == 40.0
+    assert snapshot.me.in_top is False
+    assert snapshot.me.total_players == 25
+    assert fake_redis.closed is True
+
+
+def test_weekly_ranking_falls_back_to_leaderboard_rows_without_redis(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _unavailable() -> Any:
+        raise RedisError("down")
+
+    captured: dict[str, Any] = {}
+
+    def _fake_snapshot(_db: Any, **kwargs: Any) -> str:
+        captured.update(kwargs)
+        return "snapshot"
+
+    monkeypatch.setattr(game_ranking.settings, "games_leaderboard_enabled", True)
+    monkeypatch.setattr(game_ranking, "_leaderboard_redis", _unavailable)
+    monkeypatch.setattr(game_ranking, "_snapshot_from_ranking_rows", _fake_snapshot)
+
+    result = game_ranking.get_weekly_ranking_snapshot(
+        _FakeDB([]),  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=7,
+        game_id="memory",
+    )
+
+    assert result == "snapshot"
+    assert captured["metric"].direction == "asc"
+    assert "game_weekly_leaderboard" in str(captured["ranking_rows"].element)
+
+
+def test_sorted_set_writes_wait_for_the_outer_commit() -> None:
+    session = Session(create_engine("sqlite://"))
+    written: list[str] = []
+    try:
+        session.execute(text("SELECT 1"))
+        game_ranking._after_commit(session, lambda: written.append("rolled_back"))
+        session.rollback()
+
+        session.execute(text("SELECT 1"))
+        game_ranking._after_commit(session, lambda: written.append("outer"))
+        with pytest.raises(ValueError):
+            with session.begin_nested():
+                game_ranking._after_commit(session, lambda: written.append("savepoint"))
+                raise ValueError("item failed")
+        assert written == []
+        session.commit()
+    finally:
+        session.close()
+
+    assert written == ["outer"]
+
+
+class _FakeRemovePipeline:
+    def __init__(self) -> None:
+        self.calls: list[tuple[Any, ...]] = []
+        self.executed = False
+
+    def eval(self, *args: Any) -> None:
+        self.calls.append(args)
+
+    def execute(self) -> list[int]:
+        self.executed = True
+        return [1 for _ in self.calls]
+
+
+def test_soft_deleted_child_is_removed_from_live_sorted_sets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pipe = _FakeRemovePipeline()
+    fake_redis = SimpleNamespace(pipeline=lambda transaction=True: pipe, close=lambda: None)
+    monkeypatch.setattr(game_ranking, "_leaderboard_redis", lambda: fake_redis)
+    rows = [
+        SimpleNamespace(game_id="quiz", week_start=date(2026, 10, 12)),
+        SimpleNamespace(game_id="memory", week_start=date(2026, 10, 19)),
+    ]
+
+    game_ranking.remove_child_from_weekly_leaderboards(
+        _FakeDB(rows),  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=7,
+    )
+
+    assert [call[2:] for call in pipe.calls] == [
+        ("games:leaderboard:1:quiz:2026-10-12", "games:leaderboard:1:quiz:2026-10-12:members", "7"),
+        (
+            "games:leaderboard:1:memory:2026-10-19",
+            "games:leaderboard:1:memory:2026-10-19:members",
+            "7",
+        ),
+    ]
+    assert all(call[0] == game_ranking._LEADERBOARD_REMOVE_LUA for call in pipe.calls)
+    assert pipe.executed is True
+
+
+def test_cold_sorted_set_hydration_merges_instead_of_replacing() -> None:
+    played_at = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+    calls: list[tuple[Any, ...]] = []
+    fake_redis = SimpleNamespace(eval=lambda *args: calls.append(args))
+    rows = [SimpleNamespace(child_id=5, metric_score=-90.0, last_played_at=played_at)]
+    ranking_rows, metric = game_ranking._leaderboard_ranking_rows(
+        tenant_id=1,
+        game_id="quiz",
+        week_start=date(2026, 10, 19),
+    )
+
+    game_ranking._hydrate_leaderboard(
+        _FakeDB(rows),  # type: ignore[arg-type]
+        fake_redis,  # type: ignore[arg-type]
+        key="games:leaderboard:1:quiz:2026-10-19",
+        scored_rows=game_ranking._signed_rows(ranking_rows, metric),
+    )
+
+    member = game_ranking._leaderboard_member(last_played_at=played_at, child_id=5)
+    assert calls == [
+        (
+            game_ranking._LEADERBOARD_HYDRATE_LUA,
+            2,
+            "games:leaderboard:1:quiz:2026-10-19",
+            "games:leaderboard:1:quiz:2026-10-19:members",
+            game_ranking._leaderboard_ttl_seconds(),
+            "5",
+            -90.0,
+            member,
+        )
+    ]
+    assert "DEL" not in game_ranking._LEADERBOARD_HYDRATE_LUA
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import GameChildDailyStats
+from app.services import game_metagame
+
+
+class _FakeResult:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+    def one(self) -> Any:
+        return self._rows[0]
+
+
+class _FakeDB:
+    def __init__(self, results: list[list[Any]]) -> None:
+        self.results = results
+        self.statements: list[Any] = []
+
+    def execute(self, stmt: Any) -> _FakeResult:
+        self.statements.append(stmt)
+        return _FakeResult(self.results.pop(0))
+
+    def scalars(self, _stmt: Any) -> _FakeResult:
+        return _FakeResult([])
+
+
+def test_summary_reads_daily_rows_and_uses_half_open_ranges() -> None:
+    today = datetime.now(UTC).date()
+    week_start, _week_end = game_metagame._week_bounds(today)
+    daily_rows = [
+        (week_start - timedelta(days=7), 4, 120),
+        (today - timedelta(days=1), 2, 30),
+        (today, 3, 45),
+    ]
+    db = _FakeDB(
+        [
+            daily_rows,
+            [(6, 1, 2)],
+            [("quiz", 5, None), ("memory", 2, None)],
+        ]
+    )
+
+    summary = game_metagame.build_games_metagame_summary(db, child_id=7)  # type: ignore[arg-type]
+
+    stats = summary.stats
+    assert stats.total_sessions == 9
+    assert stats.daily_sessions == 3
+    assert stats.xp_today == 45
+    # Yesterday only counts for the week when today is not a Monday.
+    assert stats.weekly_sessions == (3 if today == week_start else 5)
+    assert (stats.records_total, stats.records_today, stats.records_week) == (6, 1, 2)
+    assert stats.favorite_game_id == "quiz"
+    assert stats.distinct_games_played == 2
+    assert summary.streak_current == 2
+
+    compiled = " ".join(str(stmt) for stmt in db.statements)
+    assert "CAST" not in compiled.upper()
+    assert "game_personal_bests.last_surpassed_at <" in compiled
+
+
+def test_record_child_daily_stats_upserts_utc_day_row() -> None:
+    captured: list[Any] = []
+    db = SimpleNamespace(execute=captured.append)
+    played_at = datetime(2026, 10, 19, 23, 30, tzinfo=UTC) + timedelta(hours=2)
+
+    game_metagame.record_child_daily_stats(
+        db, child_id=7, tenant_id=1, xp_earned=-5, played_at=played_at
+    )  # type: ignore[arg-type]
+
+    stmt = captured[0]
+    assert stmt.table.name == GameChildDailyStats.__tablename__
+    params = stmt.compile().params
+    assert params["stat_date"] == date(2026, 10, 20)
+    assert params["xp_earned"] == 0
+    assert "ON CONFLICT" in str(stmt.compile(dialect=postgresql.dialect())).upper()
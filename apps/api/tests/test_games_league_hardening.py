@@ -249,3 +249,198 @@ def test_league_claim_changes_do_not_break_weekly_ranking_route(monkeypatch: pyt
     )
     assert response.game_id == "quiz"
     assert response.me.position == 4
+
+
+class _FakeExecuteResult:
+    def __init__(self, rows: list[object]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[object]:
+        return list(self._rows)
+
+
+class _FakeRolloverDB:
+    def __init__(self, scalars_values: list[list[object]], scoreboard: list[object]) -> None:
+        self._scalars_values = scalars_values
+        self._scoreboard = scoreboard
+        self.executed: list[object] = []
+        self.flush_calls = 0
+        self.conflicts: set[object] = set()
+
+    def scalars(self, _query: object) -> _FakeScalarsResult:
+        return _FakeScalarsResult(self._scalars_values.pop(0))
+
+    def execute(self, query: object) -> _FakeExecuteResult:
+        self.executed.append(query)
+        if isinstance(query, _FakeClaimInsert):
+            return _FakeExecuteResult(
+                [
+                    SimpleNamespace(child_id=row["child_id"])
+                    for row in query.rows
+                    if row["child_id"] not in self.conflicts
+                ]
+            )
+        return _FakeExecuteResult(self._scoreboard)
+
+    def flush(self) -> None:
+        self.flush_calls += 1
+
+
+class _FakeClaimInsert:
+    def __init__(self, _model: object) -> None:
+        self.rows: list[dict[str, object]] = []
+        self.conflict_constraint: str | None = None
+
+    def values(self, rows: list[dict[str, object]]) -> _FakeClaimInsert:
+        self.rows = rows
+        return self
+
+    def on_conflict_do_nothing(self, *, constraint: str) -> _FakeClaimInsert:
+        self.conflict_constraint = constraint
+        return self
+
+    def returning(self, *_columns: object) -> _FakeClaimInsert:
+        return self
+
+
+def test_batch_rollover_ranks_each_group_once_and_bulk_writes_claims(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    previous_week = date(2026, 3, 2)
+    current_week = date(2026, 3, 9)
+    played_at = datetime(2026, 3, 5, 12, 0, tzinfo=UTC)
+
+    def _profile(child_id: int, tier: str, last_applied: date) -> SimpleNamespace:
+        return SimpleNamespace(
+            tenant_id=1,
+            child_id=child_id,
+            user_id=100 + child_id,
+            current_tier=tier,
+            last_cycle_applied_week_start=last_applied,
+        )
+
+    # Child 12 already rolled over from SILVER to GOLD and still ranks in last week's SILVER group.
+    profiles = [
+        _profile(10, "SILVER", previous_week),
+        _profile(11, "SILVER", previous_week),
+        _profile(12, "GOLD", current_week),
+        _profile(13, "BRONZE", previous_week),
+    ]
+    applied_claim = SimpleNamespace(child_id=12, tier_from="SILVER", tier_to="GOLD")
+    scoreboard = [
+        SimpleNamespace(tenant_id=1, child_id=11, score_week=300, last_played_at=played_at),
+        SimpleNamespace(tenant_id=1, child_id=12, score_week=500, last_played_at=played_at),
+        SimpleNamespace(tenant_id=1, child_id=10, score_week=10, last_played_at=played_at),
+    ]
+    monkeypatch.setattr(game_league, "pg_insert", _FakeClaimInsert)
+    db = _FakeRolloverDB([[1], profiles, [applied_claim]], scoreboard)
+
+    result = game_league.run_league_week_rollover(
+        db,  # type: ignore[arg-type]
+        timezone_name="UTC",
+        now_utc=datetime(2026, 3, 10, 9, 0, tzinfo=UTC),
+    )
+
+    assert result == {"tenants": 1, "groups": 2, "profiles_rolled": 3, "claims_created": 3}
+    assert len(db.executed) == 2
+    claim_insert = db.executed[1]
+    assert isinstance(claim_insert, _FakeClaimInsert)
+    assert claim_insert.conflict_constraint == "uq_game_league_reward_claims_child_cycle"
+    claims = {int(row["child_id"]): row for row in claim_insert.rows}
+    assert (claims[11]["position"], claims[11]["result_status"], claims[11]["tier_to"]) == (
+        2,
+        "safe",
+        "SILVER",
+    )
+    assert (claims[10]["position"], claims[10]["result_status"], claims[10]["tier_to"]) == (
+        3,
+        "relegated",
+        "BRONZE",
+    )
+    assert (claims[13]["position"], claims[13]["result_status"], claims[13]["tier_to"]) == (
+        1,
+        "promoted",
+        "SILVER",
+    )
+    assert all(row["cycle_week_start"] == previous_week for row in claim_insert.rows)
+    assert [profile.current_tier for profile in profiles] == ["BRONZE", "SILVER", "GOLD", "SILVER"]
+    assert all(profile.last_cycle_applied_week_start == current_week for profile in profiles)
+
+
+def test_lazy_rollover_applies_precomputed_claim() -> None:
+    profile = SimpleNamespace(current_tier="SILVER", last_cycle_applied_week_start=date(2026, 3, 2))
+    claim = SimpleNamespace(tier_to="GOLD")
+    db = _FakeScalarDB([claim])
+
+    game_league._apply_week_rollover(
+        db,  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=10,
+        user_id=100,
+        profile=profile,  # type: ignore[arg-type]
+        current_week_start_date=date(2026, 3, 9),
+        timezone_name="UTC",
+    )
+
+    assert profile.current_tier == "GOLD"
+    assert profile.last_cycle_applied_week_start == date(2026, 3, 9)
+    assert db.flush_calls == 1
+
+
+def _pending_profiles(previous_week: date) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            tenant_id=1,
+            child_id=child_id,
+            user_id=100 + child_id,
+            current_tier="SILVER",
+            last_cycle_applied_week_start=previous_week,
+        )
+        for child_id in (10, 11)
+    ]
+
+
+def test_rollover_follows_the_stored_claim_on_conflict(monkeypatch: pytest.MonkeyPatch) -> None:
+    previous_week = date(2026, 3, 2)
+    profiles = _pending_profiles(previous_week)
+    played_at = datetime(2026, 3, 5, 12, 0, tzinfo=UTC)
+    scoreboard = [
+        SimpleNamespace(tenant_id=1, child_id=10, score_week=300, last_played_at=played_at)
+    ]
+    stored_claim = SimpleNamespace(child_id=11, tier_from="SILVER", tier_to="SILVER")
+    monkeypatch.setattr(game_league, "pg_insert", _FakeClaimInsert)
+    db = _FakeRolloverDB([[1], profiles, [], [stored_claim]], scoreboard)
+    db.conflicts = {11}
+
+    result = game_league.run_league_week_rollover(
+        db,  # type: ignore[arg-type]
+        timezone_name="UTC",
+        now_utc=datetime(2026, 3, 10, 9, 0, tzinfo=UTC),
+    )
+
+    # Child 11 finished last and would be relegated, but the stored claim wins.
+    assert result["claims_created"] == 1
+    assert [profile.current_tier for profile in profiles] == ["GOLD", "SILVER"]
+
+
+def test_child_rollover_ranks_the_group_but_writes_only_that_child(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    previous_week = date(2026, 3, 2)
+    profiles = _pending_profiles(previous_week)
+    monkeypatch.setattr(game_league, "pg_insert", _FakeClaimInsert)
+    db = _FakeRolloverDB([[1], profiles, []], [])
+
+    result = game_league.run_league_week_rollover(
+        db,  # type: ignore[arg-type]
+        tenant_id=1,
+        child_id=11,
+        timezone_name="UTC",
+        now_utc=datetime(2026, 3, 10, 9, 0, tzinfo=UTC),
+    )
+
+    claim_insert = db.executed[1]
+    assert isinstance(claim_insert, _FakeClaimInsert)
+    assert [(row["child_id"], row["group_size"]) for row in claim_insert.rows] == [(11, 2)]
+    assert result["profiles_rolled"] == 1
+    assert profiles[0].last_cycle_applied_week_start == previous_week
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.models import SubjectAgeGroup, WeeklyMissionType
+from app.services import learning_retention
+
+
+class _FakeScalarResult:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _FakeMissionDB:
+    def __init__(
+        self, *, season_events: list[Any] | None = None, missions: list[Any] | None = None
+    ) -> None:
+        self.season_events = season_events or []
+        self.missions = missions or []
+        self.executed: list[Any] = []
+
+    def scalars(self, stmt: Any) -> _FakeScalarResult:
+        if "season_events" in str(stmt):
+            return _FakeScalarResult(self.season_events)
+        return _FakeScalarResult(self.missions)
+
+    def execute(self, stmt: Any, params: Any = None) -> None:
+        self.executed.append(stmt)
+
+
+def _mission(mission_id: str, *, is_seasonal: bool = False) -> Any:
+    return SimpleNamespace(id=mission_id, is_seasonal=is_seasonal)
+
+
+@pytest.fixture(autouse=True)
+def _clear_mission_cache() -> Any:
+    learning_retention.invalidate_weekly_mission_cache()
+    yield
+    learning_retention.invalidate_weekly_mission_cache()
+
+
+def test_provision_submits_base_and_seasonal_rows_per_age_group(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    event = SimpleNamespace(name="Festa Junina", theme_key="festa_junina")
+    db = _FakeMissionDB(season_events=[event])
+    submitted: list[list[dict[str, object]]] = []
+    monkeypatch.setattr(
+        learning_retention, "_pick_subject_for_age_group", lambda *_args, **_kwargs: 3
+    )
+    monkeypatch.setattr(
+        learning_retention, "_insert_missing_missions", lambda _db, rows: submitted.append(rows)
+    )
+
+    result = learning_retention.provision_weekly_missions(
+        db,  # type: ignore[arg-type]
+        target_date=date(2026, 10, 21),
+        weeks_ahead=1,
+    )
+
+    age_groups = list(SubjectAgeGroup)
+    assert result == {"weeks": 2, "missions_submitted": 2 * 4 * len(age_groups)}
+    assert [rows[0]["start_date"] for rows in submitted] == [date(2026, 10, 19), date(2026, 10, 26)]
+    seasonal = [row for row in submitted[0] if row["is_seasonal"]]
+    assert [row["age_group"] for row in seasonal] == age_groups
+    assert {row["theme_key"] for row in seasonal} == {"festa_junina"}
+    assert all(row["mission_type"] == WeeklyMissionType.XP_GAINED for row in seasonal)
+
+
+def test_weekly_missions_are_resolved_from_cache_after_first_read(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    missions = [_mission("m1"), _mission("m2"), _mission("m3")]
+    db = _FakeMissionDB(missions=missions)
+    week_loads: list[SubjectAgeGroup] = []
+
+    def _load(_db: Any, *, age_group: SubjectAgeGroup, **_kwargs: Any) -> list[Any]:
+        week_loads.append(age_group)
+        return missions
+
+    monkeypatch.setattr(
+        learning_retention,
+        "_resolve_user_age_group",
+        lambda *_args, **_kwargs: SubjectAgeGroup.AGE_9_12,
+    )
+    monkeypatch.setattr(
+        learning_retention, "get_active_season_events", lambda *_args, **_kwargs: []
+    )
+    monkeypatch.setattr(learning_retention, "_load_week_missions", _load)
+    monkeypatch.setattr(
+        learning_retention,
+        "_insert_missing_missions",
+        lambda *_args: pytest.fail("missions should not be created"),
+    )
+    monkeypatch.setattr(learning_retention.settings, "learning_missions_cache_ttl_seconds", 600)
+
+    for user_id in (1, 2):
+        current = learning_retention.ensure_weekly_missions_for_user(
+            db,  # type: ignore[arg-type]
+            user_id=user_id,
+            tenant_id=1,
+            target_date=date(2026, 10, 21),
+        )
+        assert current == missions
+
+    assert week_loads == [SubjectAgeGroup.AGE_9_12]
+    progress_inserts = [str(stmt) for stmt in db.executed]
+    assert len(progress_inserts) == 2
+    assert all("ON CONFLICT" in stmt for stmt in progress_inserts)
+
+
+def test_missing_week_falls_back_to_inline_provisioning_without_caching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    event = SimpleNamespace(name="Primavera", theme_key="primavera")
+    loads = iter(
+        [
+            [_mission("m1")],
+            [_mission("m1"), _mission("m2"), _mission("m3"), _mission("s1", is_seasonal=True)],
+        ]
+    )
+    inserted: list[list[dict[str, object]]] = []
+    monkeypatch.setattr(
+        learning_retention, "get_active_season_events", lambda *_args, **_kwargs: [event]
+    )
+    monkeypatch.setattr(
+        learning_retention, "_load_week_missions", lambda *_args, **_kwargs: next(loads)
+    )
+    monkeypatch.setattr(
+        learning_retention, "_pick_subject_for_age_group", lambda *_args, **_kwargs: None
+    )
+    monkeypatch.setattr(
+        learning_retention, "_insert_missing_missions", lambda _db, rows: inserted.append(rows)
+    )
+
+    mission_ids = learning_retention._resolve_week_mission_ids(
+        object(),  # type: ignore[arg-type]
+        age_group=SubjectAgeGroup.AGE_6_8,
+        today=date(2026, 10, 21),
+    )
+
+    assert mission_ids == ("m1", "m2", "m3", "s1")
+    assert len(inserted) == 1
+    assert [row["theme_key"] for row in inserted[0] if row["is_seasonal"]] == ["primavera"]
+    assert learning_retention._MISSION_SET_CACHE == {}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.models import QuestionDifficulty
+from app.services import adaptive_learning, learning_settings_cache
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.info: dict[str, Any] = {}
+
+
+@pytest.fixture(autouse=True)
+def _clear_settings_cache() -> Any:
+    learning_settings_cache.invalidate_tenant_learning_settings()
+    yield
+    learning_settings_cache.invalidate_tenant_learning_settings()
+
+
+def test_tenant_settings_are_shared_across_requests_until_invalidated(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        learning_settings_cache.app_settings, "learning_settings_cache_ttl_seconds", 60
+    )
+    loads: list[tuple[int, int | None]] = []
+
+    def _resolve(db: _FakeSession, tenant_id: int) -> int:
+        def _load() -> int:
+            loads.append((tenant_id, None))
+            return tenant_id * 10
+
+        return learning_settings_cache.cached_tenant_setting(
+            db,  # type: ignore[arg-type]
+            kind="single_child",
+            tenant_id=tenant_id,
+            child_id=None,
+            load=_load,
+        )
+
+    assert _resolve(_FakeSession(), 1) == 10
+    assert _resolve(_FakeSession(), 1) == 10
+    assert _resolve(_FakeSession(), 2) == 20
+    learning_settings_cache.invalidate_tenant_learning_settings(1)
+    assert _resolve(_FakeSession(), 1) == 10
+    assert _resolve(_FakeSession(), 2) == 20
+
+    assert loads == [(1, None), (2, None), (1, None)]
+
+
+def test_request_memo_resolves_each_tenant_once_without_shared_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        learning_settings_cache.app_settings, "learning_settings_cache_ttl_seconds", 0
+    )
+    row = SimpleNamespace(
+        max_daily_learning_xp=150,
+        max_lessons_per_day=4,
+        difficulty_ceiling=QuestionDifficulty.MEDIUM,
+        enable_spaced_repetition=False,
+        enable_coins_rewards=True,
+        xp_multiplier=1.5,
+        coins_enabled=True,
+        enabled_subjects={"3": False},
+    )
+    child_reads: list[int] = []
+    row_reads: list[tuple[int, int]] = []
+
+    def _child(_db: Any, *, tenant_id: int) -> int:
+        child_reads.append(tenant_id)
+        return 7
+
+    class _SettingsSession(_FakeSession):
+        def scalar(self, _stmt: Any) -> Any:
+            row_reads.append((1, 7))
+            return row
+
+    monkeypatch.setattr(learning_settings_cache, "_load_tenant_single_child_id", _child)
+    db = _SettingsSession()
+
+    first = adaptive_learning.resolve_effective_learning_settings(db, tenant_id=1)  # type: ignore[arg-type]
+    second = adaptive_learning.resolve_effective_learning_settings(db, tenant_id=1)  # type: ignore[arg-type]
+
+    assert first is second
+    assert child_reads == [1]
+    assert row_reads == [(1, 7)]
+    assert first.difficulty_ceiling == QuestionDifficulty.MEDIUM
+    assert adaptive_learning._subject_enabled(first, 3) is False
+    with pytest.raises(FrozenInstanceError):
+        first.max_lessons_per_day = 99  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        first.enabled_subjects["3"] = True  # type: ignore[index]
+
+    learning_settings_cache.invalidate_tenant_learning_settings(1, db=db)  # type: ignore[arg-type]
+    adaptive_learning.resolve_effective_learning_settings(db, tenant_id=1)  # type: ignore[arg-type]
+    assert child_reads == [1, 1]
+
+
+def test_shared_cache_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        learning_settings_cache.app_settings, "learning_settings_cache_ttl_seconds", 60
+    )
+    monkeypatch.setattr(learning_settings_cache, "_MAX_CACHE_ENTRIES", 3)
+    clock = {"now": 100.0}
+    monkeypatch.setattr(learning_settings_cache.time, "monotonic", lambda: clock["now"])
+
+    def _resolve(tenant_id: int) -> int:
+        return learning_settings_cache.cached_tenant_setting(
+            _FakeSession(),  # type: ignore[arg-type]
+            kind="single_child",
+            tenant_id=tenant_id,
+            child_id=None,
+            load=lambda: tenant_id,
+        )
+
+    _resolve(1)
+    _resolve(2)
+    clock["now"] = 200.0
+    _resolve(3)
+    _resolve(4)
+    assert set(learning_settings_cache._TENANT_SETTINGS_CACHE) == {
+        ("single_child", 3, None),
+        ("single_child", 4, None),
+    }
+
+    _resolve(5)
+    _resolve(6)
+    assert len(learning_settings_cache._TENANT_SETTINGS_CACHE) == 3
+    assert ("single_child", 3, None) not in learning_settings_cache._TENANT_SETTINGS_CACHE
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from threading import Event, Thread
+from typing import Any
+
+import pytest
+from argon2 import PasswordHasher
+
+from app.api.routes import auth
+from app.core import security
+from app.models import User
+from app.observability import axion_metrics
+from app.schemas.auth import LoginRequest
+
+
+def test_saturated_hashing_queue_rejects_without_waiting(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(axion_metrics, "_METRICS_BACKEND", axion_metrics._InMemoryAxionMetrics())
+    monkeypatch.setattr(security.settings, "password_hash_workers", 1)
+    monkeypatch.setattr(security.settings, "password_hash_queue_limit", 0)
+    started = Event()
+    release = Event()
+
+    def _slow_hash(_password: str) -> str:
+        started.set()
+        release.wait(timeout=5)
+        return "hashed"
+
+    worker = Thread(target=security._run_password_hashing, args=(_slow_hash, "secret"))
+    worker.start()
+    try:
+        assert started.wait(timeout=5)
+        rejected_before = security.password_hashing_stats()["rejected_total"]
+        with pytest.raises(security.PasswordHashingBusyError):
+            security.hash_password("other-secret")
+        stats = security.password_hashing_stats()
+        assert stats["in_flight"] == 1
+        assert stats["rejected_total"] == rejected_before + 1
+        health = axion_metrics.get_axion_metrics_health()
+        assert health["password_hash_in_flight"] == 1
+        assert health["password_hash_rejected_total"] == 1
+    finally:
+        release.set()
+        worker.join(timeout=5)
+
+    assert security.password_hashing_stats()["in_flight"] == 0
+    assert axion_metrics.get_axion_metrics_health()["password_hash_in_flight"] == 0
+    assert security.verify_password("secret", security.hash_password("secret")) is True
+
+
+class _FakeLoginDB:
+    def __init__(self, user: User) -> None:
+        self.user = user
+
+    def scalar(self, *_args: Any, **_kwargs: Any) -> User:
+        return self.user
+
+
+def test_login_rehashes_passwords_stored_with_outdated_costs() -> None:
+    legacy_hash = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash("Axion@123")
+    user = User(id=10, email="parent@local.com", name="Parent", password_hash=legacy_hash)
+    user.failed_login_attempts = 0
+    user.locked_until = None
+
+    authenticated = auth._authenticate_user_credentials(
+        _FakeLoginDB(user),  # type: ignore[arg-type]
+        LoginRequest(email="parent@local.com", password="Axion@123"),
+    )
+
+    assert authenticated is user
+    assert user.password_hash != legacy_hash
+    assert security.password_needs_rehash(user.password_hash) is False
+    assert security.verify_password("Axion@123", user.password_hash) is True
+
+
+def test_hashing_capacity_stays_well_below_the_request_threadpool(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(security.settings, "password_hash_workers", 4)
+    monkeypatch.setattr(security.settings, "password_hash_queue_limit", 32)
+
+    assert security.password_hashing_stats()["capacity"] == 10
@@ -87,8 +87,8 @@ def test_decide_approve_creates_earn_transaction() -> None:
         PotAllocation(tenant_id=1, wallet_id=30, pot=PotType.DONATE, percent=20),
     ]
     db = _FakeDB(
-        scalar_values=[log, task, child, wallet, wallet],
-        scalars_values=[allocations, [], []],
+        scalar_values=[log, task, child, wallet, wallet, None],
+        scalars_values=[allocations, []],
     )
     events = _FakeEvents()
     tenant = Tenant(type=TenantType.FAMILY, name="Family", slug="family")
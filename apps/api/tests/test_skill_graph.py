@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import pytest
+
 from app.services.skill_graph import (
+    SkillGraph,
+    SkillNode,
     StudentState,
     build_graph,
     get_lessons_for_skill,
@@ -86,3 +90,40 @@ def test_get_next_skill_respects_age_group_and_difficulty_preferences() -> None:
 
     assert next_skill is not None
     assert next_skill.id == "earth_and_space"
+
+
+def _node(skill_id: str, *prerequisites: str, subject: str = "math") -> SkillNode:
+    return SkillNode(
+        id=skill_id,
+        subject=subject,
+        skill=skill_id,
+        subskill=(),
+        lessons=(f"{skill_id}_intro",),
+        prerequisites=prerequisites,
+        age_groups=("9_11",),
+        difficulty_progression=("easy", "medium", "hard"),
+        lesson_order_index=0,
+    )
+
+
+def test_compiled_graph_resolves_diamond_prerequisites_in_topological_order() -> None:
+    graph = SkillGraph(
+        {
+            "fractions": _node("fractions", "division", "multiplication"),
+            "division": _node("division", "multiplication"),
+            "multiplication": _node("multiplication", "addition"),
+            "addition": _node("addition"),
+        }
+    )
+
+    assert graph.topological_order == ("addition", "multiplication", "division", "fractions")
+    assert graph.get_prerequisite_skills("fractions") == ["addition", "multiplication", "division"]
+    assert graph.has_prerequisite("fractions", "addition") is True
+    assert graph.has_prerequisite("addition", "fractions") is False
+    with pytest.raises(TypeError):
+        graph.nodes["x"] = _node("x")  # type: ignore[index]
+
+
+def test_compiled_graph_rejects_prerequisite_cycles() -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        SkillGraph({"a": _node("a", "b"), "b": _node("b", "a")})
@@ -7,12 +7,29 @@ from app.api.routes import sync as sync_module
 from app.api.routes.sync import sync_batch
 from app.models import MembershipRole, Tenant, TenantType, User
 from app.schemas.sync import SyncBatchRequest
+from app.services.sync_batch import SyncBatchContext
+
+
+class _FakeSavepoint:
+    def __init__(self, db: _FakeDB) -> None:
+        self.db = db
+
+    def __enter__(self) -> _FakeSavepoint:
+        self.db.savepoints += 1
+        return self
+
+    def __exit__(self, exc_type: Any, *_exc: Any) -> bool:
+        if exc_type is not None:
+            self.db.savepoint_rollbacks += 1
+        return False
 
 
 class _FakeDB:
     def __init__(self) -> None:
         self.commit_count = 0
         self.rollback_count = 0
+        self.savepoints = 0
+        self.savepoint_rollbacks = 0
 
     def commit(self) -> None:
         self.commit_count += 1
@@ -20,6 +37,41 @@ class _FakeDB:
     def rollback(self) -> None:
         self.rollback_count += 1
 
+    def begin_nested(self) -> _FakeSavepoint:
+        return _FakeSavepoint(self)
+
+
+def _context(**overrides: Any) -> SyncBatchContext:
+    values: dict[str, Any] = {
+        "tenant_id": 1,
+        "processed_item_ids": set(),
+        "children": {},
+        "active_task_ids": set(),
+        "missions": {},
+        "existing_marks": set(),
+    }
+    values.update(overrides)
+    return SyncBatchContext(**values)
+
+
+def _patch_context(monkeypatch: Any, context: SyncBatchContext) -> list[list[str]]:
+    recorded: list[list[str]] = []
+    monkeypatch.setattr(sync_module, "load_sync_batch_context", lambda *_args, **_kwargs: context)
+    monkeypatch.setattr(
+        sync_module,
+        "record_processed_items",
+        lambda *_args, items, **_kwargs: recorded.append([item.id for item in items]),
+    )
+    return recorded
+
+
+def _tenant_and_user() -> tuple[Tenant, User]:
+    tenant = Tenant(type=TenantType.FAMILY, name="Family", slug="family")
+    tenant.id = 1
+    user = User(email="parent@test.com", name="Parent", password_hash="x")
+    user.id = 5
+    return tenant, user
+
 
 class _FakeEvents:
     pass
@@ -42,6 +94,7 @@ def test_sync_batch_processes_in_order_and_reports_failures(monkeypatch: Any) ->
     monkeypatch.setattr(sync_module, "_process_routine_mark", fake_process_routine_mark)
     monkeypatch.setattr(sync_module, "_process_coach_use", fake_process_coach_use)
     monkeypatch.setattr(sync_module, "_process_daily_mission_complete", fake_process_daily_mission_complete)
+    recorded = _patch_context(monkeypatch, _context())
 
     payload = SyncBatchRequest(
         items=[
@@ -72,10 +125,7 @@ def test_sync_batch_processes_in_order_and_reports_failures(monkeypatch: Any) ->
         ],
     )
     db = _FakeDB()
-    tenant = Tenant(type=TenantType.FAMILY, name="Family", slug="family")
-    tenant.id = 1
-    user = User(email="parent@test.com", name="Parent", password_hash="x")
-    user.id = 5
+    tenant, user = _tenant_and_user()
 
     result = sync_batch(
         payload=payload,
@@ -90,5 +140,103 @@ def test_sync_batch_processes_in_order_and_reports_failures(monkeypatch: Any) ->
     assert result.processed == 3
     assert len(result.failed) == 1
     assert result.failed[0].id == "2"
-    assert db.commit_count == 3
-    assert db.rollback_count == 1
+    assert db.commit_count == 1
+    assert db.rollback_count == 0
+    assert recorded == [["1", "3", "4"]]
+
+
+def test_sync_batch_defers_marks_to_one_flush_and_skips_replayed_items(monkeypatch: Any) -> None:
+    today = datetime.now(UTC).date().isoformat()
+    context = _context(
+        processed_item_ids={"already-synced"},
+        children={1: object()},
+        active_task_ids={2, 3},
+        existing_marks={(1, 3, datetime.now(UTC).date())},
+    )
+    recorded = _patch_context(monkeypatch, context)
+    flushed: list[int] = []
+    monkeypatch.setattr(
+        sync_module,
+        "flush_sync_batch",
+        lambda *_args, **_kwargs: flushed.append(len(context.pending_marks)),
+    )
+
+    def _mark(item_id: str, task_id: int) -> dict[str, Any]:
+        return {
+            "id": item_id,
+            "type": "routine.mark",
+            "payload": {"child_id": 1, "task_id": task_id, "date": today},
+            "createdAt": datetime.now(UTC),
+        }
+
+    payload = SyncBatchRequest(
+        items=[
+            _mark("already-synced", 2),
+            _mark("a", 2),
+            _mark("b", 2),
+            _mark("c", 3),
+            _mark("d", 9),
+        ],
+    )
+    db = _FakeDB()
+    tenant, user = _tenant_and_user()
+
+    result = sync_batch(
+        payload=payload,
+        db=db,  # type: ignore[arg-type]
+        events=_FakeEvents(),  # type: ignore[arg-type]
+        tenant=tenant,
+        user=user,
+        _=MembershipRole.PARENT,  # type: ignore[arg-type]
+    )
+
+    assert result.processed == 4
+    assert [(item.id, item.error) for item in result.failed] == [("d", "Task not found")]
+    # "b" repeats "a" and "c" already exists: only one mark is inserted, in a single flush.
+    assert flushed == [1]
+    assert db.savepoints == 1
+    assert recorded == [["b", "c", "a"]]
+    assert db.commit_count == 1
+
+
+def test_sync_batch_retries_deferred_items_one_savepoint_each_after_a_failed_flush(
+    monkeypatch: Any,
+) -> None:
+    today = datetime.now(UTC).date().isoformat()
+    context = _context(children={1: object()}, active_task_ids={2, 3})
+    recorded = _patch_context(monkeypatch, context)
+    flushed: list[list[str]] = []
+
+    def _flush(_db: Any, _events: Any, flush_context: SyncBatchContext, **_kwargs: Any) -> None:
+        flushed.append([mark.item_id for mark in flush_context.pending_marks])
+        if any(mark.task_id == 3 for mark in flush_context.pending_marks):
+            raise ValueError("task deleted concurrently")
+
+    monkeypatch.setattr(sync_module, "flush_sync_batch", _flush)
+
+    def _mark(item_id: str, task_id: int) -> dict[str, Any]:
+        return {
+            "id": item_id,
+            "type": "routine.mark",
+            "payload": {"child_id": 1, "task_id": task_id, "date": today},
+            "createdAt": datetime.now(UTC),
+        }
+
+    db = _FakeDB()
+    tenant, user = _tenant_and_user()
+
+    result = sync_batch(
+        payload=SyncBatchRequest(items=[_mark("a", 2), _mark("b", 3)]),
+        db=db,  # type: ignore[arg-type]
+        events=_FakeEvents(),  # type: ignore[arg-type]
+        tenant=tenant,
+        user=user,
+        _=MembershipRole.PARENT,  # type: ignore[arg-type]
+    )
+
+    assert flushed == [["a", "b"], ["a"], ["b"]]
+    assert result.processed == 1
+    assert [(item.id, item.error) for item in result.failed] == [("b", "task deleted concurrently")]
+    assert db.savepoints == 3
+    assert db.savepoint_rollbacks == 2
+    assert recorded == [["a"]]
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.models import (
+    LedgerTransaction,
+    LedgerTransactionType,
+    WalletBalance,
+    WalletBalanceCheckpoint,
+)
+from app.services.wallet import ledger_balance_delta
+from app.services.wallet_balances import (
+    _LEDGER_DELTAS_SQL,
+    apply_ledger_transaction,
+    get_wallet_balance,
+    verify_wallet_balances,
+)
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    def execute(self, stmt: Any, params: dict[str, Any]) -> None:
+        self.calls.append((str(stmt), params))
+
+
+class _FakeResult:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows = rows
+
+    def mappings(self) -> _FakeResult:
+        return self
+
+    def all(self) -> list[dict[str, Any]]:
+        return self._rows
+
+
+class _FakeVerifyDB:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.executed: list[tuple[Any, Any]] = []
+
+    def execute(self, stmt: Any, params: Any = None) -> _FakeResult:
+        self.executed.append((stmt, params))
+        return _FakeResult(self.rows if not self.executed[1:] else [])
+
+    def scalar(self, _stmt: Any) -> None:
+        return None
+
+
+def _verify_row(
+    wallet_id: int,
+    *,
+    expected: tuple[int, int, int, int],
+    actual: tuple[int, int, int, int],
+    last_id: int,
+    checkpoint_id: int,
+) -> dict[str, Any]:
+    columns = ("total_cents", "spend_cents", "save_cents", "donate_cents")
+    row: dict[str, Any] = {
+        "wallet_id": wallet_id,
+        "tenant_id": 1,
+        "last_ledger_transaction_id": last_id,
+        "checkpoint_ledger_transaction_id": checkpoint_id,
+    }
+    row.update(
+        {f"expected_{column}": value for column, value in zip(columns, expected, strict=True)}
+    )
+    row.update(dict(zip(columns, actual, strict=True)))
+    return row
+
+
+def test_ledger_balance_delta_matches_signed_pot_replay() -> None:
+    split = {"pot_split": {"SPEND": 50, "SAVE": 30, "DONATE": 20}}
+
+    assert ledger_balance_delta(LedgerTransactionType.ALLOWANCE, 100, split) == {
+        "total": 100,
+        "SPEND": 50,
+        "SAVE": 30,
+        "DONATE": 20,
+    }
+    assert ledger_balance_delta(LedgerTransactionType.SPEND, 100, split) == {
+        "total": -100,
+        "SPEND": -50,
+        "SAVE": -30,
+        "DONATE": -20,
+    }
+    assert ledger_balance_delta(LedgerTransactionType.EARN, 40, {"source": "x"}) == {
+        "total": 40,
+        "SPEND": 0,
+        "SAVE": 0,
+        "DONATE": 0,
+    }
+
+
+def test_apply_ledger_transaction_upserts_running_balance() -> None:
+    connection = _FakeConnection()
+    tx = LedgerTransaction(
+        id=9,
+        tenant_id=1,
+        wallet_id=3,
+        type=LedgerTransactionType.SPEND,
+        amount_cents=25,
+        metadata_json={"pot_split": {"SPEND": 25, "SAVE": 0, "DONATE": 0}},
+    )
+
+    apply_ledger_transaction(connection, tx)
+
+    sql, params = connection.calls[0]
+    assert "ON CONFLICT (wallet_id) DO UPDATE" in sql
+    assert params == {
+        "wallet_id": 3,
+        "tenant_id": 1,
+        "total_cents": -25,
+        "spend_cents": -25,
+        "save_cents": 0,
+        "donate_cents": 0,
+        "ledger_transaction_id": 9,
+    }
+
+
+def test_get_wallet_balance_defaults_to_zero_without_row() -> None:
+    snapshot = get_wallet_balance(_FakeVerifyDB([]), wallet_id=5)  # type: ignore[arg-type]
+
+    assert snapshot.total_cents == 0
+    assert snapshot.pot_balances_cents == {"SPEND": 0, "SAVE": 0, "DONATE": 0}
+
+
+def test_get_wallet_balance_is_not_served_from_the_identity_map() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    WalletBalance.__table__.create(engine)
+    with Session(engine) as db:
+        db.add(
+            WalletBalance(
+                wallet_id=5,
+                tenant_id=1,
+                total_cents=10,
+                spend_cents=10,
+                save_cents=0,
+                donate_cents=0,
+            )
+        )
+        db.commit()
+        loaded = db.get(WalletBalance, 5)
+        assert loaded is not None and loaded.total_cents == 10
+        # What the after_insert listener does: a write on the connection, outside the ORM.
+        db.connection().execute(
+            update(WalletBalance.__table__).values(total_cents=40, save_cents=30)
+        )
+
+        snapshot = get_wallet_balance(db, wallet_id=5)
+
+        assert snapshot.total_cents == 40
+        assert snapshot.pot_balances_cents["SAVE"] == 30
+
+
+def test_pot_split_replay_only_counts_what_extract_pot_split_counts() -> None:
+    split = {"pot_split": {"SPEND": 2.5, "SAVE": True, "DONATE": "7"}}
+
+    assert ledger_balance_delta(LedgerTransactionType.EARN, 10, split) == {
+        "total": 10,
+        "SPEND": 0,
+        "SAVE": 1,
+        "DONATE": 0,
+    }
+    assert "::numeric::bigint" not in _LEDGER_DELTAS_SQL
+    assert "~ '^-?[0-9]+$'" in _LEDGER_DELTAS_SQL
+    assert (
+        "WHEN 'boolean' THEN CASE WHEN (lt.metadata->'pot_split'->'SAVE')::boolean THEN 1"
+        in _LEDGER_DELTAS_SQL
+    )
+
+
+def test_verify_wallet_balances_reports_drift_and_checkpoints_ledger_values() -> None:
+    db = _FakeVerifyDB(
+        [
+            _verify_row(
+                1, expected=(100, 50, 30, 20), actual=(100, 50, 30, 20), last_id=10, checkpoint_id=4
+            ),
+            _verify_row(
+                2, expected=(70, 70, 0, 0), actual=(75, 75, 0, 0), last_id=12, checkpoint_id=0
+            ),
+            _verify_row(3, expected=(0, 0, 0, 0), actual=(0, 0, 0, 0), last_id=0, checkpoint_id=0),
+        ]
+    )
+
+    result = verify_wallet_balances(db)  # type: ignore[arg-type]
+
+    assert result["wallets_checked"] == 3
+    assert result["drifted"] == 1
+    assert result["drift_cents_total"] == 10
+    assert result["drifts"][0]["wallet_id"] == 2
+    assert result["checkpoints_written"] == 2
+    assert result["repaired"] == 0
+
+    insert_stmt, checkpoints = db.executed[1]
+    assert insert_stmt.table.name == WalletBalanceCheckpoint.__tablename__
+    assert [item["wallet_id"] for item in checkpoints] == [1, 2]
+    assert checkpoints[1]["total_cents"] == 70
+    assert checkpoints[1]["drift_cents"] == 10
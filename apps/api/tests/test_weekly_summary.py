@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+
+from app import worker
+from app.jobs import weekly_summary
+from app.models import EventLog
+
+
+def _row(child_id: int, *, approved: int, pending: int, rejected: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        tenant_id=1,
+        id=child_id,
+        approved_count=approved,
+        pending_count=pending,
+        rejected_count=rejected,
+        total_count=approved + pending + rejected,
+    )
+
+
+class _FakeDB:
+    def __init__(self, rows: list[SimpleNamespace]) -> None:
+        self.rows = rows
+        self.queries: list[Any] = []
+        self.inserts: list[tuple[Any, list[dict[str, Any]]]] = []
+
+    def execute(self, stmt: Any, params: list[dict[str, Any]] | None = None) -> Any:
+        if params is None:
+            self.queries.append(stmt)
+            return iter(self.rows)
+        self.inserts.append((stmt, params))
+        return None
+
+
+def test_weekly_summaries_come_from_one_grouped_query_and_bulk_inserts() -> None:
+    db = _FakeDB(
+        [
+            _row(1, approved=3, pending=1, rejected=0),
+            _row(2, approved=0, pending=0, rejected=0),
+            _row(3, approved=1, pending=0, rejected=2),
+        ]
+    )
+
+    generated = weekly_summary.generate_weekly_summaries(
+        db,  # type: ignore[arg-type]
+        reference_date=date(2026, 10, 22),
+        tenant_id=1,
+        batch_size=2,
+    )
+
+    assert generated == 3
+    assert len(db.queries) == 1
+    sql = str(db.queries[0])
+    assert "GROUP BY" in sql
+    assert "child_profiles.tenant_id = :tenant_id_1" in sql
+    assert [len(rows) for _stmt, rows in db.inserts] == [2, 1]
+    assert all(stmt.table.name == EventLog.__tablename__ for stmt, _rows in db.inserts)
+    first = db.inserts[0][1][0]
+    assert first["type"] == "weekly.summary.generated"
+    assert first["payload"]["start_date"] == "2026-10-19"
+    assert first["payload"]["completion_rate"] == 75.0
+    assert db.inserts[0][1][1]["payload"]["completion_rate"] == 0.0
+
+
+def test_fanout_resolves_the_reference_date_once_for_all_tenants(monkeypatch: Any) -> None:
+    enqueued: list[tuple[str | None, int | None]] = []
+    monkeypatch.setattr(worker, "SessionLocal", lambda: SimpleNamespace(close=lambda: None))
+    monkeypatch.setattr(worker, "list_weekly_summary_tenant_ids", lambda _db: [1, 2, 3])
+    monkeypatch.setattr(
+        worker,
+        "enqueue_weekly_summary",
+        lambda reference_date=None, tenant_id=None: (
+            enqueued.append((reference_date, tenant_id)) or "job"
+        ),
+    )
+
+    result = worker._handle_weekly_summary_fanout({})
+
+    assert result["reference_date"] == date.today().isoformat()
+    assert enqueued == [(result["reference_date"], tenant_id) for tenant_id in (1, 2, 3)]